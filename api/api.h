@@ -176,183 +176,159 @@ namespace shyft {
     template <typename cell>
     struct basic_cell_statistics {
         shared_ptr<vector<cell>> cells;
-        explicit basic_cell_statistics( const shared_ptr<vector<cell>>& cells):cells(cells) {}
+        shared_ptr<shyft::core::catchment_cell_index> cix;///< catchment to cell lookup, as kept by the region-model
+        explicit basic_cell_statistics( const shared_ptr<vector<cell>>& cells):cells(cells),cix(make_shared<shyft::core::catchment_cell_index>(*cells)) {}
+        basic_cell_statistics(const shared_ptr<vector<cell>>& cells, const shared_ptr<shyft::core::catchment_cell_index>& cix) :cells(cells), cix(cix) {
+            if (!cix || cix->n_cells != cells->size())
+                throw runtime_error("the catchment cell index does not match the cells");
+        }
+
+        /** sum area(cell) over cells matching catchment_indexes, all if empty, catchment ids with no cells contributes zero */
+        template <class cell_area>
+        double area_sum(const vector<int>& catchment_indexes, cell_area&& area) const {
+            vector<int> cids;
+            for (auto cid : catchment_indexes)
+                if (cix->contains(cid)) cids.push_back(cid);
+            if (cids.size() == 0 && catchment_indexes.size() > 0)
+                return 0.0;
+            double sum = 0.0;
+            for (auto i : cix->cells_of(cids)) sum += area((*cells)[i]);
+            return sum;
+        }
 
 		double total_area(const vector<int>& catchment_indexes) const {
-			double sum = 0.0;
-			if (catchment_indexes.size() == 0) {
-				for (const auto &c : *cells) sum += c.geo.area();
-		    } else {
-				for (auto cid : catchment_indexes)
-					for (const auto&c : *cells)
-						if ((int)c.geo.catchment_id() == cid) sum += c.geo.area();
-			}
-			return sum;
+			return area_sum(catchment_indexes, [](const cell& c) { return c.geo.area(); });
 		}
 		double forest_area(const vector<int>& catchment_indexes) const {
-			double sum = 0.0;
-			if (catchment_indexes.size() == 0) {
-				for (const auto &c : *cells) sum += c.geo.area()*c.geo.land_type_fractions_info().forest();
-			} else {
-				for (auto cid : catchment_indexes)
-					for (const auto&c : *cells)
-						if ( (int)c.geo.catchment_id() == cid) sum += c.geo.area()*c.geo.land_type_fractions_info().forest();
-			}
-			return sum;
+			return area_sum(catchment_indexes, [](const cell& c) { return c.geo.area()*c.geo.land_type_fractions_info().forest(); });
 		}
 		double glacier_area(const vector<int>& catchment_indexes) const {
-			double sum = 0.0;
-			if (catchment_indexes.size() == 0) {
-				for (const auto &c : *cells) sum += c.geo.area()*c.geo.land_type_fractions_info().glacier();
-			} else {
-				for (auto cid : catchment_indexes)
-					for (const auto&c : *cells)
-						if ((int)c.geo.catchment_id() == cid) sum += c.geo.area()*c.geo.land_type_fractions_info().glacier();
-			}
-			return sum;
+			return area_sum(catchment_indexes, [](const cell& c) { return c.geo.area()*c.geo.land_type_fractions_info().glacier(); });
 		}
 		double lake_area(const vector<int>& catchment_indexes) const {
-			double sum = 0.0;
-			if (catchment_indexes.size() == 0) {
-				for (const auto &c : *cells) sum += c.geo.area()*c.geo.land_type_fractions_info().lake();
-			} else {
-				for (auto cid : catchment_indexes)
-					for (const auto&c : *cells)
-						if ((int)c.geo.catchment_id() == cid) sum += c.geo.area()*c.geo.land_type_fractions_info().lake();
-			}
-			return sum;
+			return area_sum(catchment_indexes, [](const cell& c) { return c.geo.area()*c.geo.land_type_fractions_info().lake(); });
 		}
 		double reservoir_area(const vector<int>& catchment_indexes) const {
-			double sum = 0.0;
-			if (catchment_indexes.size() == 0) {
-				for (const auto &c : *cells) sum += c.geo.area()*c.geo.land_type_fractions_info().reservoir();
-			} else {
-				for (auto cid : catchment_indexes)
-					for (const auto&c : *cells)
-						if ((int)c.geo.catchment_id() == cid) sum += c.geo.area()*c.geo.land_type_fractions_info().reservoir();
-			}
-			return sum;
+			return area_sum(catchment_indexes, [](const cell& c) { return c.geo.area()*c.geo.land_type_fractions_info().reservoir(); });
 		}
 		double unspecified_area(const vector<int>& catchment_indexes) const {
-			double sum = 0.0;
-			if (catchment_indexes.size() == 0) {
-				for (const auto &c : *cells) sum += c.geo.area()*c.geo.land_type_fractions_info().unspecified();
-			} else {
-				for (auto cid : catchment_indexes)
-					for (const auto&c : *cells)
-						if ((int)c.geo.catchment_id() == cid) sum += c.geo.area()*c.geo.land_type_fractions_info().unspecified();
-			}
-			return sum;
+			return area_sum(catchment_indexes, [](const cell& c) { return c.geo.area()*c.geo.land_type_fractions_info().unspecified(); });
 		}
         apoint_ts discharge(const vector<int>& catchment_indexes) const {
             return apoint_ts(*shyft::core::cell_statistics::
-                     sum_catchment_feature(*cells, catchment_indexes,
-                            [](const cell& c){ return c.rc.avg_discharge; }));
+                     sum_catchment_feature(*cells, *cix, catchment_indexes,
+                            [](const cell& c)->const auto& { return c.rc.avg_discharge; }));
         }
 		vector<double> discharge(const vector<int>& catchment_indexes,size_t ith_timestep) const {
 			return shyft::core::cell_statistics::
-				catchment_feature(*cells, catchment_indexes,
-				[](const cell& c) { return c.rc.avg_discharge; }, ith_timestep);
+				catchment_feature(*cells, *cix, catchment_indexes,
+				[](const cell& c)->const auto& { return c.rc.avg_discharge; }, ith_timestep);
+		}
+		/** returns the discharge sum of each catchment in catchment_indexes, as row-major catchment_indexes.size() x n_steps matrix */
+		vector<double> discharge_matrix(const vector<int>& catchment_indexes, size_t& n_steps) const {
+			return shyft::core::cell_statistics::
+				sum_catchment_feature_matrix(*cells, *cix, catchment_indexes,
+					[](const cell& c)->const auto& { return c.rc.avg_discharge; }, n_steps);
 		}
 		double discharge_value(const vector<int>& catchment_indexes, size_t ith_timestep) const {
 			return shyft::core::cell_statistics::
-				sum_catchment_feature_value(*cells, catchment_indexes,
-					[](const cell& c) { return c.rc.avg_discharge; }, ith_timestep);
+				sum_catchment_feature_value(*cells, *cix, catchment_indexes,
+					[](const cell& c)->const auto& { return c.rc.avg_discharge; }, ith_timestep);
 		}
         apoint_ts charge(const vector<int>& catchment_indexes) const {
             return apoint_ts(*shyft::core::cell_statistics::
-                sum_catchment_feature(*cells, catchment_indexes,
-                    [](const cell& c) { return c.rc.charge_m3s; }));
+                sum_catchment_feature(*cells, *cix, catchment_indexes,
+                    [](const cell& c)->const auto& { return c.rc.charge_m3s; }));
         }
         vector<double> charge(const vector<int>& catchment_indexes, size_t ith_timestep) const {
             return shyft::core::cell_statistics::
-                catchment_feature(*cells, catchment_indexes,
-                    [](const cell& c) { return c.rc.charge_m3s; }, ith_timestep);
+                catchment_feature(*cells, *cix, catchment_indexes,
+                    [](const cell& c)->const auto& { return c.rc.charge_m3s; }, ith_timestep);
         }
         double charge_value(const vector<int>& catchment_indexes, size_t ith_timestep) const {
             return shyft::core::cell_statistics::
-                sum_catchment_feature_value(*cells, catchment_indexes,
-                    [](const cell& c) { return c.rc.charge_m3s; }, ith_timestep);
+                sum_catchment_feature_value(*cells, *cix, catchment_indexes,
+                    [](const cell& c)->const auto& { return c.rc.charge_m3s; }, ith_timestep);
         }
 
 		apoint_ts temperature(const vector<int>& catchment_indexes) const {
             return apoint_ts(*shyft::core::cell_statistics::
-                     average_catchment_feature(*cells, catchment_indexes,
-                            [](const cell& c){ return c.env_ts.temperature; }));
+                     average_catchment_feature(*cells, *cix, catchment_indexes,
+                            [](const cell& c)->const auto& { return c.env_ts.temperature; }));
         }
 		vector<double> temperature(const vector<int>& catchment_indexes, size_t ith_timestep) const {
 			return shyft::core::cell_statistics::
-				catchment_feature(*cells, catchment_indexes,
-				[](const cell& c) { return c.env_ts.temperature; }, ith_timestep);
+				catchment_feature(*cells, *cix, catchment_indexes,
+				[](const cell& c)->const auto& { return c.env_ts.temperature; }, ith_timestep);
 		}
 		double temperature_value(const vector<int>& catchment_indexes, size_t ith_timestep) const {
 			return shyft::core::cell_statistics::
-				average_catchment_feature_value(*cells, catchment_indexes,
-					[](const cell& c) { return c.env_ts.temperature; }, ith_timestep);
+				average_catchment_feature_value(*cells, *cix, catchment_indexes,
+					[](const cell& c)->const auto& { return c.env_ts.temperature; }, ith_timestep);
 		}
 
 		apoint_ts precipitation(const vector<int>& catchment_indexes) const {
             return apoint_ts(*shyft::core::cell_statistics::
-                     average_catchment_feature(*cells, catchment_indexes,
-                            [](const cell& c){ return c.env_ts.precipitation; }));
+                     average_catchment_feature(*cells, *cix, catchment_indexes,
+                            [](const cell& c)->const auto& { return c.env_ts.precipitation; }));
         }
 		vector<double> precipitation(const vector<int>& catchment_indexes,size_t ith_timestep) const {
 			return shyft::core::cell_statistics::
-				catchment_feature(*cells, catchment_indexes,
-				[](const cell& c) { return c.env_ts.precipitation; }, ith_timestep);
+				catchment_feature(*cells, *cix, catchment_indexes,
+				[](const cell& c)->const auto& { return c.env_ts.precipitation; }, ith_timestep);
 		}
 		double precipitation_value(const vector<int>& catchment_indexes, size_t ith_timestep) const {
 			return shyft::core::cell_statistics::
-				average_catchment_feature_value(*cells, catchment_indexes,
-					[](const cell& c) { return c.env_ts.precipitation; }, ith_timestep);
+				average_catchment_feature_value(*cells, *cix, catchment_indexes,
+					[](const cell& c)->const auto& { return c.env_ts.precipitation; }, ith_timestep);
 		}
 
 		apoint_ts radiation(const vector<int>& catchment_indexes) const {
             return apoint_ts(*shyft::core::cell_statistics::
-                     average_catchment_feature(*cells, catchment_indexes,
-                            [](const cell& c){ return c.env_ts.radiation; }));
+                     average_catchment_feature(*cells, *cix, catchment_indexes,
+                            [](const cell& c)->const auto& { return c.env_ts.radiation; }));
         }
 		vector<double> radiation(const vector<int>& catchment_indexes,size_t ith_timestep) const {
 			return shyft::core::cell_statistics::
-				catchment_feature(*cells, catchment_indexes,
-				[](const cell& c) { return c.env_ts.radiation; }, ith_timestep);
+				catchment_feature(*cells, *cix, catchment_indexes,
+				[](const cell& c)->const auto& { return c.env_ts.radiation; }, ith_timestep);
 		}
 		double radiation_value(const vector<int>& catchment_indexes, size_t ith_timestep) const {
 			return shyft::core::cell_statistics::
-				average_catchment_feature_value(*cells, catchment_indexes,
-					[](const cell& c) { return c.env_ts.radiation; }, ith_timestep);
+				average_catchment_feature_value(*cells, *cix, catchment_indexes,
+					[](const cell& c)->const auto& { return c.env_ts.radiation; }, ith_timestep);
 		}
 
 		apoint_ts wind_speed(const vector<int>& catchment_indexes) const {
             return apoint_ts(*shyft::core::cell_statistics::
-                     average_catchment_feature(*cells, catchment_indexes,
-                            [](const cell& c){ return c.env_ts.wind_speed; }));
+                     average_catchment_feature(*cells, *cix, catchment_indexes,
+                            [](const cell& c)->const auto& { return c.env_ts.wind_speed; }));
         }
 		vector<double> wind_speed(const vector<int>& catchment_indexes,size_t ith_timestep) const {
 			return shyft::core::cell_statistics::
-				catchment_feature(*cells, catchment_indexes,
-				[](const cell& c) { return c.env_ts.wind_speed; }, ith_timestep);
+				catchment_feature(*cells, *cix, catchment_indexes,
+				[](const cell& c)->const auto& { return c.env_ts.wind_speed; }, ith_timestep);
 		}
 		double wind_speed_value(const vector<int>& catchment_indexes, size_t ith_timestep) const {
 			return shyft::core::cell_statistics::
-				average_catchment_feature_value(*cells, catchment_indexes,
-					[](const cell& c) { return c.env_ts.wind_speed; }, ith_timestep);
+				average_catchment_feature_value(*cells, *cix, catchment_indexes,
+					[](const cell& c)->const auto& { return c.env_ts.wind_speed; }, ith_timestep);
 		}
 
 		apoint_ts rel_hum(const vector<int>& catchment_indexes) const {
             return apoint_ts(*shyft::core::cell_statistics::
-                     average_catchment_feature(*cells, catchment_indexes,
-                            [](const cell& c){ return c.env_ts.rel_hum; }));
+                     average_catchment_feature(*cells, *cix, catchment_indexes,
+                            [](const cell& c)->const auto& { return c.env_ts.rel_hum; }));
         }
 		vector<double> rel_hum(const vector<int>& catchment_indexes, size_t ith_timestep) const {
 			return shyft::core::cell_statistics::
-				catchment_feature(*cells, catchment_indexes,
-				[](const cell& c) { return c.env_ts.rel_hum; }, ith_timestep);
+				catchment_feature(*cells, *cix, catchment_indexes,
+				[](const cell& c)->const auto& { return c.env_ts.rel_hum; }, ith_timestep);
 		}
 		double rel_hum_value(const vector<int>& catchment_indexes, size_t ith_timestep) const {
 			return shyft::core::cell_statistics::
-				average_catchment_feature_value(*cells, catchment_indexes,
-					[](const cell& c) { return c.env_ts.rel_hum; }, ith_timestep);
+				average_catchment_feature_value(*cells, *cix, catchment_indexes,
+					[](const cell& c)->const auto& { return c.env_ts.rel_hum; }, ith_timestep);
 		}
 	};
 
@@ -364,17 +340,17 @@ namespace shyft {
 		apoint_ts discharge(const vector<int>& catchment_indexes) const {
             return apoint_ts(*shyft::core::cell_statistics::
                 sum_catchment_feature(*cells, catchment_indexes,
-                [](const cell& c) { return c.sc.kirchner_discharge; }));
+                [](const cell& c)->const auto& { return c.sc.kirchner_discharge; }));
         }
 		vector<double> discharge(const vector<int>& catchment_indexes, size_t ith_timestep) const {
 			return shyft::core::cell_statistics::
 				catchment_feature(*cells, catchment_indexes,
-				[](const cell& c) { return c.sc.kirchner_discharge; }, ith_timestep);
+				[](const cell& c)->const auto& { return c.sc.kirchner_discharge; }, ith_timestep);
 		}
 		double discharge_value(const vector<int>& catchment_indexes, size_t ith_timestep) const {
 			return shyft::core::cell_statistics::
 				sum_catchment_feature_value(*cells, catchment_indexes,
-					[](const cell& c) { return c.sc.kirchner_discharge; }, ith_timestep);
+					[](const cell& c)->const auto& { return c.sc.kirchner_discharge; }, ith_timestep);
 		}
 	};
 
@@ -386,17 +362,17 @@ namespace shyft {
 		apoint_ts discharge(const vector<int>& catchment_indexes) const {
 			return apoint_ts(*shyft::core::cell_statistics::
 				sum_catchment_feature(*cells, catchment_indexes,
-					[](const cell& c) { return c.sc.soil_moisture; }));
+					[](const cell& c)->const auto& { return c.sc.soil_moisture; }));
 		}
 		vector<double> discharge(const vector<int>& catchment_indexes, size_t ith_timestep) const {
 			return shyft::core::cell_statistics::
 				catchment_feature(*cells, catchment_indexes,
-					[](const cell& c) { return c.sc.soil_moisture; }, ith_timestep);
+					[](const cell& c)->const auto& { return c.sc.soil_moisture; }, ith_timestep);
 		}
 		double discharge_value(const vector<int>& catchment_indexes, size_t ith_timestep) const {
 			return shyft::core::cell_statistics::
 				sum_catchment_feature_value(*cells, catchment_indexes,
-					[](const cell& c) { return c.sc.soil_moisture; }, ith_timestep);
+					[](const cell& c)->const auto& { return c.sc.soil_moisture; }, ith_timestep);
 		}
 	};
 
@@ -408,17 +384,17 @@ namespace shyft {
 		apoint_ts discharge(const vector<int>& catchment_indexes) const {
 			return apoint_ts(*shyft::core::cell_statistics::
 				sum_catchment_feature(*cells, catchment_indexes,
-					[](const cell& c) { return c.sc.tank_uz; }));			//to be modified
+					[](const cell& c)->const auto& { return c.sc.tank_uz; }));			//to be modified
 		}
 		vector<double> discharge(const vector<int>& catchment_indexes, size_t ith_timestep) const {
 			return shyft::core::cell_statistics::
 				catchment_feature(*cells, catchment_indexes,
-					[](const cell& c) { return c.sc.tank_uz; }, ith_timestep);		//to be modified
+					[](const cell& c)->const auto& { return c.sc.tank_uz; }, ith_timestep);		//to be modified
 		}
 		double discharge_value(const vector<int>& catchment_indexes, size_t ith_timestep) const {
 			return shyft::core::cell_statistics::
 				sum_catchment_feature_value(*cells, catchment_indexes,
-					[](const cell& c) { return c.sc.tank_uz; }, ith_timestep);			//to be modified
+					[](const cell& c)->const auto& { return c.sc.tank_uz; }, ith_timestep);			//to be modified
 		}
 	};
 
@@ -432,129 +408,129 @@ namespace shyft {
 		apoint_ts albedo(const vector<int>& catchment_indexes) const {
             return apoint_ts(*shyft::core::cell_statistics::
                 average_catchment_feature(*cells, catchment_indexes,
-                [](const cell& c) { return c.sc.gs_albedo; }));
+                [](const cell& c)->const auto& { return c.sc.gs_albedo; }));
         }
 		vector<double> albedo(const vector<int>& catchment_indexes,size_t ith_timestep) const {
 			return shyft::core::cell_statistics::
 				catchment_feature(*cells, catchment_indexes,
-				[](const cell& c) { return c.sc.gs_albedo; }, ith_timestep);
+				[](const cell& c)->const auto& { return c.sc.gs_albedo; }, ith_timestep);
 		}
 		double albedo_value(const vector<int>& catchment_indexes, size_t ith_timestep) const {
 			return shyft::core::cell_statistics::
 				average_catchment_feature_value(*cells, catchment_indexes,
-					[](const cell& c) { return c.sc.gs_albedo; }, ith_timestep);
+					[](const cell& c)->const auto& { return c.sc.gs_albedo; }, ith_timestep);
 		}
 
 		apoint_ts lwc(const vector<int>& catchment_indexes) const {
             return apoint_ts(*shyft::core::cell_statistics::
                 average_catchment_feature(*cells, catchment_indexes,
-                [](const cell& c) { return c.sc.gs_lwc; }));
+                [](const cell& c)->const auto& { return c.sc.gs_lwc; }));
         }
 		vector<double> lwc(const vector<int>& catchment_indexes, size_t ith_timestep) const {
 			return shyft::core::cell_statistics::
 				catchment_feature(*cells, catchment_indexes,
-				[](const cell& c) { return c.sc.gs_lwc; }, ith_timestep);
+				[](const cell& c)->const auto& { return c.sc.gs_lwc; }, ith_timestep);
 		}
 		double lwc_value(const vector<int>& catchment_indexes, size_t ith_timestep) const {
 			return shyft::core::cell_statistics::
 				average_catchment_feature_value(*cells, catchment_indexes,
-					[](const cell& c) { return c.sc.gs_lwc; }, ith_timestep);
+					[](const cell& c)->const auto& { return c.sc.gs_lwc; }, ith_timestep);
 		}
 
 		apoint_ts surface_heat(const vector<int>& catchment_indexes) const {
             return apoint_ts(*shyft::core::cell_statistics::
                 average_catchment_feature(*cells, catchment_indexes,
-                [](const cell& c) { return c.sc.gs_surface_heat; }));
+                [](const cell& c)->const auto& { return c.sc.gs_surface_heat; }));
         }
 		vector<double> surface_heat(const vector<int>& catchment_indexes,size_t ith_timestep) const {
 			return shyft::core::cell_statistics::
 				catchment_feature(*cells, catchment_indexes,
-				[](const cell& c) { return c.sc.gs_surface_heat; }, ith_timestep);
+				[](const cell& c)->const auto& { return c.sc.gs_surface_heat; }, ith_timestep);
 		}
 		double surface_heat_value(const vector<int>& catchment_indexes, size_t ith_timestep) const {
 			return shyft::core::cell_statistics::
 				average_catchment_feature_value(*cells, catchment_indexes,
-					[](const cell& c) { return c.sc.gs_surface_heat; }, ith_timestep);
+					[](const cell& c)->const auto& { return c.sc.gs_surface_heat; }, ith_timestep);
 		}
 
 		apoint_ts alpha(const vector<int>& catchment_indexes) const {
             return apoint_ts(*shyft::core::cell_statistics::
                 average_catchment_feature(*cells, catchment_indexes,
-                [](const cell& c) { return c.sc.gs_alpha; }));
+                [](const cell& c)->const auto& { return c.sc.gs_alpha; }));
         }
 		vector<double> alpha(const vector<int>& catchment_indexes,size_t ith_timestep) const {
 			return shyft::core::cell_statistics::
 				catchment_feature(*cells, catchment_indexes,
-				[](const cell& c) { return c.sc.gs_alpha; }, ith_timestep);
+				[](const cell& c)->const auto& { return c.sc.gs_alpha; }, ith_timestep);
 		}
 		double alpha_value(const vector<int>& catchment_indexes, size_t ith_timestep) const {
 			return shyft::core::cell_statistics::
 				average_catchment_feature_value(*cells, catchment_indexes,
-					[](const cell& c) { return c.sc.gs_alpha; }, ith_timestep);
+					[](const cell& c)->const auto& { return c.sc.gs_alpha; }, ith_timestep);
 		}
 
 		apoint_ts sdc_melt_mean(const vector<int>& catchment_indexes) const {
             return apoint_ts(*shyft::core::cell_statistics::
                 average_catchment_feature(*cells, catchment_indexes,
-                [](const cell& c) { return c.sc.gs_sdc_melt_mean; }));
+                [](const cell& c)->const auto& { return c.sc.gs_sdc_melt_mean; }));
         }
 		vector<double> sdc_melt_mean(const vector<int>& catchment_indexes,size_t ith_timestep) const {
 			return shyft::core::cell_statistics::
 				catchment_feature(*cells, catchment_indexes,
-				[](const cell& c) { return c.sc.gs_sdc_melt_mean; }, ith_timestep);
+				[](const cell& c)->const auto& { return c.sc.gs_sdc_melt_mean; }, ith_timestep);
 		}
 		double sdc_melt_mean_value(const vector<int>& catchment_indexes, size_t ith_timestep) const {
 			return shyft::core::cell_statistics::
 				average_catchment_feature_value(*cells, catchment_indexes,
-					[](const cell& c) { return c.sc.gs_sdc_melt_mean; }, ith_timestep);
+					[](const cell& c)->const auto& { return c.sc.gs_sdc_melt_mean; }, ith_timestep);
 		}
 
 		apoint_ts acc_melt(const vector<int>& catchment_indexes) const {
             return apoint_ts(*shyft::core::cell_statistics::
                 average_catchment_feature(*cells, catchment_indexes,
-                [](const cell& c) { return c.sc.gs_acc_melt; }));
+                [](const cell& c)->const auto& { return c.sc.gs_acc_melt; }));
         }
 		vector<double> acc_melt(const vector<int>& catchment_indexes,size_t ith_timestep) const {
 			return shyft::core::cell_statistics::
 				catchment_feature(*cells, catchment_indexes,
-				[](const cell& c) { return c.sc.gs_acc_melt; }, ith_timestep);
+				[](const cell& c)->const auto& { return c.sc.gs_acc_melt; }, ith_timestep);
 		}
 		double acc_melt_value(const vector<int>& catchment_indexes, size_t ith_timestep) const {
 			return shyft::core::cell_statistics::
 				average_catchment_feature_value(*cells, catchment_indexes,
-					[](const cell& c) { return c.sc.gs_acc_melt; }, ith_timestep);
+					[](const cell& c)->const auto& { return c.sc.gs_acc_melt; }, ith_timestep);
 		}
 
 		apoint_ts iso_pot_energy(const vector<int>& catchment_indexes) const {
             return apoint_ts(*shyft::core::cell_statistics::
                 average_catchment_feature(*cells, catchment_indexes,
-                [](const cell& c) { return c.sc.gs_iso_pot_energy; }));
+                [](const cell& c)->const auto& { return c.sc.gs_iso_pot_energy; }));
         }
 		vector<double> iso_pot_energy(const vector<int>& catchment_indexes,size_t ith_timestep) const {
 			return shyft::core::cell_statistics::
 				catchment_feature(*cells, catchment_indexes,
-				[](const cell& c) { return c.sc.gs_iso_pot_energy; }, ith_timestep);
+				[](const cell& c)->const auto& { return c.sc.gs_iso_pot_energy; }, ith_timestep);
 		}
 		double iso_pot_energy_value(const vector<int>& catchment_indexes, size_t ith_timestep) const {
 			return shyft::core::cell_statistics::
 				average_catchment_feature_value(*cells, catchment_indexes,
-					[](const cell& c) { return c.sc.gs_iso_pot_energy; }, ith_timestep);
+					[](const cell& c)->const auto& { return c.sc.gs_iso_pot_energy; }, ith_timestep);
 		}
 
 		apoint_ts temp_swe(const vector<int>& catchment_indexes) const {
             return apoint_ts(*shyft::core::cell_statistics::
                 average_catchment_feature(*cells, catchment_indexes,
-                [](const cell& c) { return c.sc.gs_temp_swe; }));
+                [](const cell& c)->const auto& { return c.sc.gs_temp_swe; }));
         }
 		vector<double> temp_swe(const vector<int>& catchment_indexes,size_t ith_timestep) const {
 			return shyft::core::cell_statistics::
 				catchment_feature(*cells, catchment_indexes,
-				[](const cell& c) { return c.sc.gs_temp_swe; }, ith_timestep);
+				[](const cell& c)->const auto& { return c.sc.gs_temp_swe; }, ith_timestep);
 		}
 		double temp_swe_value(const vector<int>& catchment_indexes, size_t ith_timestep) const {
 			return shyft::core::cell_statistics::
 				average_catchment_feature_value(*cells, catchment_indexes,
-					[](const cell& c) { return c.sc.gs_temp_swe; }, ith_timestep);
+					[](const cell& c)->const auto& { return c.sc.gs_temp_swe; }, ith_timestep);
 		}
 	};
 
@@ -567,54 +543,54 @@ namespace shyft {
 		apoint_ts sca(const vector<int>& catchment_indexes) const {
             return apoint_ts(*shyft::core::cell_statistics::
                 average_catchment_feature(*cells, catchment_indexes,
-                [](const cell& c) { return c.rc.snow_sca; }));
+                [](const cell& c)->const auto& { return c.rc.snow_sca; }));
         }
 		vector<double> sca(const vector<int>& catchment_indexes, size_t ith_timestep) const {
 			return shyft::core::cell_statistics::
 				catchment_feature(*cells, catchment_indexes,
-				[](const cell& c) { return c.rc.snow_sca; }, ith_timestep);
+				[](const cell& c)->const auto& { return c.rc.snow_sca; }, ith_timestep);
 		}
 		double sca_value(const vector<int>& catchment_indexes, size_t ith_timestep) const {
 			return shyft::core::cell_statistics::
 				average_catchment_feature_value(*cells, catchment_indexes,
-					[](const cell& c) { return c.rc.snow_sca; }, ith_timestep);
+					[](const cell& c)->const auto& { return c.rc.snow_sca; }, ith_timestep);
 		}
 
 		apoint_ts swe(const vector<int>& catchment_indexes) const {
             return apoint_ts(*shyft::core::cell_statistics::
                 average_catchment_feature(*cells, catchment_indexes,
-                [](const cell& c) { return c.rc.snow_swe; }));
+                [](const cell& c)->const auto& { return c.rc.snow_swe; }));
         }
 		vector<double> swe(const vector<int>& catchment_indexes, size_t ith_timestep) const {
 			return shyft::core::cell_statistics::
 				catchment_feature(*cells, catchment_indexes,
-				[](const cell& c) { return c.rc.snow_swe; }, ith_timestep);
+				[](const cell& c)->const auto& { return c.rc.snow_swe; }, ith_timestep);
 		}
 		double swe_value(const vector<int>& catchment_indexes, size_t ith_timestep) const {
 			return shyft::core::cell_statistics::
 				average_catchment_feature_value(*cells, catchment_indexes,
-					[](const cell& c) { return c.rc.snow_swe; }, ith_timestep);
+					[](const cell& c)->const auto& { return c.rc.snow_swe; }, ith_timestep);
 		}
 
 		apoint_ts outflow(const vector<int>& catchment_indexes) const {
             return apoint_ts(*shyft::core::cell_statistics::
                 sum_catchment_feature(*cells, catchment_indexes,
-                [](const cell& c) { return c.rc.snow_outflow; }));
+                [](const cell& c)->const auto& { return c.rc.snow_outflow; }));
         }
 		vector<double> outflow(const vector<int>& catchment_indexes, size_t ith_timestep) const {
 			return shyft::core::cell_statistics::
 				catchment_feature(*cells, catchment_indexes,
-				[](const cell& c) { return c.rc.snow_outflow; }, ith_timestep);
+				[](const cell& c)->const auto& { return c.rc.snow_outflow; }, ith_timestep);
 		}
 		double outflow_value(const vector<int>& catchment_indexes, size_t ith_timestep) const {
 			return shyft::core::cell_statistics::
 				sum_catchment_feature_value(*cells, catchment_indexes,
-					[](const cell& c) { return c.rc.snow_outflow; }, ith_timestep);
+					[](const cell& c)->const auto& { return c.rc.snow_outflow; }, ith_timestep);
 		}
         apoint_ts glacier_melt(const vector<int>& catchment_indexes) const {
             return apoint_ts(*shyft::core::cell_statistics::
                 sum_catchment_feature(*cells, catchment_indexes,
-                    [](const cell& c) {
+                    [](const cell& c)->const auto& {
                 return c.rc.glacier_melt;
             }
                 )
@@ -623,12 +599,12 @@ namespace shyft {
         vector<double> glacier_melt(const vector<int>& catchment_indexes, size_t ith_timestep) const {
             return shyft::core::cell_statistics::
                 catchment_feature(*cells, catchment_indexes,
-                    [](const cell& c) { return c.rc.glacier_melt; }, ith_timestep);
+                    [](const cell& c)->const auto& { return c.rc.glacier_melt; }, ith_timestep);
         }
         double glacier_melt_value(const vector<int>& catchment_indexes, size_t ith_timestep) const {
             return shyft::core::cell_statistics::
                 sum_catchment_feature_value(*cells, catchment_indexes,
-                    [](const cell& c) { return c.rc.glacier_melt; }, ith_timestep);
+                    [](const cell& c)->const auto& { return c.rc.glacier_melt; }, ith_timestep);
         }
 
 	};
@@ -642,97 +618,97 @@ namespace shyft {
 		apoint_ts alpha(const vector<int>& catchment_indexes) const {
             return apoint_ts(*shyft::core::cell_statistics::
                 average_catchment_feature(*cells, catchment_indexes,
-                [](const cell& c) { return c.sc.snow_alpha; }));
+                [](const cell& c)->const auto& { return c.sc.snow_alpha; }));
         }
 		vector<double> alpha(const vector<int>& catchment_indexes, size_t ith_timestep) const {
 			return shyft::core::cell_statistics::
 				catchment_feature(*cells, catchment_indexes,
-				[](const cell& c) { return c.sc.snow_alpha; }, ith_timestep);
+				[](const cell& c)->const auto& { return c.sc.snow_alpha; }, ith_timestep);
 		}
 		double alpha_value(const vector<int>& catchment_indexes, size_t ith_timestep) const {
 			return shyft::core::cell_statistics::
 				average_catchment_feature_value(*cells, catchment_indexes,
-					[](const cell& c) { return c.sc.snow_alpha; }, ith_timestep);
+					[](const cell& c)->const auto& { return c.sc.snow_alpha; }, ith_timestep);
 		}
 
 		apoint_ts nu(const vector<int>& catchment_indexes) const {
             return apoint_ts(*shyft::core::cell_statistics::
                 average_catchment_feature(*cells, catchment_indexes,
-                [](const cell& c) { return c.sc.snow_nu; }));
+                [](const cell& c)->const auto& { return c.sc.snow_nu; }));
         }
 		vector<double> nu(const vector<int>& catchment_indexes, size_t ith_timestep) const {
 			return shyft::core::cell_statistics::
 				catchment_feature(*cells, catchment_indexes,
-				[](const cell& c) { return c.sc.snow_nu; }, ith_timestep);
+				[](const cell& c)->const auto& { return c.sc.snow_nu; }, ith_timestep);
 		}
 		double nu_value(const vector<int>& catchment_indexes, size_t ith_timestep) const {
 			return shyft::core::cell_statistics::
 				average_catchment_feature_value(*cells, catchment_indexes,
-					[](const cell& c) { return c.sc.snow_nu; }, ith_timestep);
+					[](const cell& c)->const auto& { return c.sc.snow_nu; }, ith_timestep);
 		}
 
 		apoint_ts lwc(const vector<int>& catchment_indexes) const {
             return apoint_ts(*shyft::core::cell_statistics::
                 average_catchment_feature(*cells, catchment_indexes,
-                [](const cell& c) { return c.sc.snow_lwc; }));
+                [](const cell& c)->const auto& { return c.sc.snow_lwc; }));
         }
 		vector<double> lwc(const vector<int>& catchment_indexes, size_t ith_timestep) const {
 			return shyft::core::cell_statistics::
 				catchment_feature(*cells, catchment_indexes,
-				[](const cell& c) { return c.sc.snow_lwc; }, ith_timestep);
+				[](const cell& c)->const auto& { return c.sc.snow_lwc; }, ith_timestep);
 		}
 		double lwc_value(const vector<int>& catchment_indexes, size_t ith_timestep) const {
 			return shyft::core::cell_statistics::
 				average_catchment_feature_value(*cells, catchment_indexes,
-					[](const cell& c) { return c.sc.snow_lwc; }, ith_timestep);
+					[](const cell& c)->const auto& { return c.sc.snow_lwc; }, ith_timestep);
 		}
 
 		apoint_ts residual(const vector<int>& catchment_indexes) const {
             return apoint_ts(*shyft::core::cell_statistics::
                 average_catchment_feature(*cells, catchment_indexes,
-                [](const cell& c) { return c.sc.snow_residual; }));
+                [](const cell& c)->const auto& { return c.sc.snow_residual; }));
         }
 		vector<double> residual(const vector<int>& catchment_indexes, size_t ith_timestep) const {
 			return shyft::core::cell_statistics::
 				catchment_feature(*cells, catchment_indexes,
-				[](const cell& c) { return c.sc.snow_residual; }, ith_timestep);
+				[](const cell& c)->const auto& { return c.sc.snow_residual; }, ith_timestep);
 		}
 		double residual_value(const vector<int>& catchment_indexes, size_t ith_timestep) const {
 			return shyft::core::cell_statistics::
 				average_catchment_feature_value(*cells, catchment_indexes,
-					[](const cell& c) { return c.sc.snow_residual; }, ith_timestep);
+					[](const cell& c)->const auto& { return c.sc.snow_residual; }, ith_timestep);
 		}
 
 		apoint_ts swe(const vector<int>& catchment_indexes) const {
             return apoint_ts(*shyft::core::cell_statistics::
                 average_catchment_feature(*cells, catchment_indexes,
-                [](const cell& c) { return c.sc.snow_swe; }));
+                [](const cell& c)->const auto& { return c.sc.snow_swe; }));
         }
 		vector<double> swe(const vector<int>& catchment_indexes, size_t ith_timestep) const {
 			return shyft::core::cell_statistics::
 				catchment_feature(*cells, catchment_indexes,
-				[](const cell& c) { return c.sc.snow_swe; }, ith_timestep);
+				[](const cell& c)->const auto& { return c.sc.snow_swe; }, ith_timestep);
 		}
 		double swe_value(const vector<int>& catchment_indexes, size_t ith_timestep) const {
 			return shyft::core::cell_statistics::
 				average_catchment_feature_value(*cells, catchment_indexes,
-					[](const cell& c) { return c.sc.snow_swe; }, ith_timestep);
+					[](const cell& c)->const auto& { return c.sc.snow_swe; }, ith_timestep);
 		}
 
 		apoint_ts sca(const vector<int>& catchment_indexes) const {
             return apoint_ts(*shyft::core::cell_statistics::
                 average_catchment_feature(*cells, catchment_indexes,
-                [](const cell& c) { return c.sc.snow_sca; }));
+                [](const cell& c)->const auto& { return c.sc.snow_sca; }));
         }
 		vector<double> sca(const vector<int>& catchment_indexes, size_t ith_timestep) const {
 			return shyft::core::cell_statistics::
 				catchment_feature(*cells, catchment_indexes,
-				[](const cell& c) { return c.sc.snow_sca; }, ith_timestep);
+				[](const cell& c)->const auto& { return c.sc.snow_sca; }, ith_timestep);
 		}
 		double sca_value(const vector<int>& catchment_indexes, size_t ith_timestep) const {
 			return shyft::core::cell_statistics::
 				average_catchment_feature_value(*cells, catchment_indexes,
-					[](const cell& c) { return c.sc.snow_sca; }, ith_timestep);
+					[](const cell& c)->const auto& { return c.sc.snow_sca; }, ith_timestep);
 		}
 	};
 
@@ -745,38 +721,38 @@ namespace shyft {
 		apoint_ts outflow(const vector<int>& catchment_indexes) const {
             return apoint_ts(*shyft::core::cell_statistics::
                 sum_catchment_feature(*cells, catchment_indexes,
-                [](const cell& c) { return c.rc.snow_outflow; }));
+                [](const cell& c)->const auto& { return c.rc.snow_outflow; }));
         }
 		vector<double> outflow(const vector<int>& catchment_indexes, size_t ith_timestep) const {
 			return shyft::core::cell_statistics::
 				catchment_feature(*cells, catchment_indexes,
-				[](const cell& c) { return c.rc.snow_outflow; }, ith_timestep);
+				[](const cell& c)->const auto& { return c.rc.snow_outflow; }, ith_timestep);
 		}
 		double outflow_value(const vector<int>& catchment_indexes, size_t ith_timestep) const {
 			return shyft::core::cell_statistics::
 				sum_catchment_feature_value(*cells, catchment_indexes,
-					[](const cell& c) { return c.rc.snow_outflow; }, ith_timestep);
+					[](const cell& c)->const auto& { return c.rc.snow_outflow; }, ith_timestep);
 		}
 
 		apoint_ts total_stored_water(const vector<int>& catchment_indexes) const {
             return apoint_ts(*shyft::core::cell_statistics::
                 sum_catchment_feature(*cells, catchment_indexes,
-                [](const cell& c) { return c.rc.snow_total_stored_water; }));
+                [](const cell& c)->const auto& { return c.rc.snow_total_stored_water; }));
         }
 		vector<double> total_stored_water(const vector<int>& catchment_indexes, size_t ith_timestep) const {
 			return shyft::core::cell_statistics::
 				catchment_feature(*cells, catchment_indexes,
-				[](const cell& c) { return c.rc.snow_total_stored_water; }, ith_timestep);
+				[](const cell& c)->const auto& { return c.rc.snow_total_stored_water; }, ith_timestep);
 		}
 		double total_stored_water_value(const vector<int>& catchment_indexes, size_t ith_timestep) const {
 			return shyft::core::cell_statistics::
 				average_catchment_feature_value(*cells, catchment_indexes,
-					[](const cell& c) { return c.rc.snow_total_stored_water; }, ith_timestep);
+					[](const cell& c)->const auto& { return c.rc.snow_total_stored_water; }, ith_timestep);
 		}
         apoint_ts glacier_melt(const vector<int>& catchment_indexes) const {
             return apoint_ts(*shyft::core::cell_statistics::
                 sum_catchment_feature(*cells, catchment_indexes,
-                    [](const cell& c) {
+                    [](const cell& c)->const auto& {
                 return c.rc.glacier_melt;
             }
                 )
@@ -785,12 +761,12 @@ namespace shyft {
         vector<double> glacier_melt(const vector<int>& catchment_indexes, size_t ith_timestep) const {
             return shyft::core::cell_statistics::
                 catchment_feature(*cells, catchment_indexes,
-                    [](const cell& c) { return c.rc.glacier_melt; }, ith_timestep);
+                    [](const cell& c)->const auto& { return c.rc.glacier_melt; }, ith_timestep);
         }
         double glacier_melt_value(const vector<int>& catchment_indexes, size_t ith_timestep) const {
             return shyft::core::cell_statistics::
                 sum_catchment_feature_value(*cells, catchment_indexes,
-                    [](const cell& c) { return c.rc.glacier_melt; }, ith_timestep);
+                    [](const cell& c)->const auto& { return c.rc.glacier_melt; }, ith_timestep);
         }
 
 	};
@@ -804,33 +780,33 @@ namespace shyft {
 		apoint_ts swe(const vector<int>& catchment_indexes) const {
             return apoint_ts(*shyft::core::cell_statistics::
                 average_catchment_feature(*cells, catchment_indexes,
-                [](const cell& c) { return c.sc.snow_swe; }));
+                [](const cell& c)->const auto& { return c.sc.snow_swe; }));
         }
 		vector<double> swe(const vector<int>& catchment_indexes, size_t ith_timestep) const {
 			return shyft::core::cell_statistics::
 				catchment_feature(*cells, catchment_indexes,
-				[](const cell& c) { return c.sc.snow_swe; }, ith_timestep);
+				[](const cell& c)->const auto& { return c.sc.snow_swe; }, ith_timestep);
 		}
 		double swe_value(const vector<int>& catchment_indexes, size_t ith_timestep) const {
 			return shyft::core::cell_statistics::
 				average_catchment_feature_value(*cells, catchment_indexes,
-					[](const cell& c) { return c.sc.snow_swe; }, ith_timestep);
+					[](const cell& c)->const auto& { return c.sc.snow_swe; }, ith_timestep);
 		}
 
 		apoint_ts sca(const vector<int>& catchment_indexes) const {
             return apoint_ts(*shyft::core::cell_statistics::
                 average_catchment_feature(*cells, catchment_indexes,
-                [](const cell& c) { return c.sc.snow_sca; }));
+                [](const cell& c)->const auto& { return c.sc.snow_sca; }));
         }
 		vector<double> sca(const vector<int>& catchment_indexes, size_t ith_timestep) const {
 			return shyft::core::cell_statistics::
 				catchment_feature(*cells, catchment_indexes,
-				[](const cell& c) { return c.sc.snow_sca; }, ith_timestep);
+				[](const cell& c)->const auto& { return c.sc.snow_sca; }, ith_timestep);
 		}
 		double sca_value(const vector<int>& catchment_indexes, size_t ith_timestep) const {
 			return shyft::core::cell_statistics::
 				average_catchment_feature_value(*cells, catchment_indexes,
-					[](const cell& c) { return c.sc.snow_sca; }, ith_timestep);
+					[](const cell& c)->const auto& { return c.sc.snow_sca; }, ith_timestep);
 		}
 	};
 
@@ -843,23 +819,23 @@ namespace shyft {
 		apoint_ts outflow(const vector<int>& catchment_indexes) const {
             return apoint_ts(*shyft::core::cell_statistics::
                 sum_catchment_feature(*cells, catchment_indexes,
-                [](const cell& c) { return c.rc.snow_outflow; }));
+                [](const cell& c)->const auto& { return c.rc.snow_outflow; }));
         }
 		vector<double> outflow(const vector<int>& catchment_indexes, size_t ith_timestep) const {
 			return shyft::core::cell_statistics::
 				catchment_feature(*cells, catchment_indexes,
-				[](const cell& c) { return c.rc.snow_outflow; }, ith_timestep);
+				[](const cell& c)->const auto& { return c.rc.snow_outflow; }, ith_timestep);
 		}
 		double outflow_value(const vector<int>& catchment_indexes, size_t ith_timestep) const {
 			return shyft::core::cell_statistics::
 				sum_catchment_feature_value(*cells, catchment_indexes,
-					[](const cell& c) { return c.rc.snow_outflow; }, ith_timestep);
+					[](const cell& c)->const auto& { return c.rc.snow_outflow; }, ith_timestep);
 		}
 
 		apoint_ts glacier_melt(const vector<int>& catchment_indexes) const {
             return apoint_ts(*shyft::core::cell_statistics::
                 sum_catchment_feature(*cells, catchment_indexes,
-                    [](const cell& c) {
+                    [](const cell& c)->const auto& {
                         return c.rc.glacier_melt;
                     }
                 )
@@ -868,12 +844,12 @@ namespace shyft {
         vector<double> glacier_melt(const vector<int>& catchment_indexes, size_t ith_timestep) const {
 			return shyft::core::cell_statistics::
 				catchment_feature(*cells, catchment_indexes,
-				[](const cell& c) { return c.rc.glacier_melt; }, ith_timestep);
+				[](const cell& c)->const auto& { return c.rc.glacier_melt; }, ith_timestep);
 		}
 		double glacier_melt_value(const vector<int>& catchment_indexes, size_t ith_timestep) const {
 			return shyft::core::cell_statistics::
 				sum_catchment_feature_value(*cells, catchment_indexes,
-					[](const cell& c) { return c.rc.glacier_melt; }, ith_timestep);
+					[](const cell& c)->const auto& { return c.rc.glacier_melt; }, ith_timestep);
 		}
 
 	};
@@ -886,17 +862,17 @@ namespace shyft {
 		apoint_ts output(const vector<int>& catchment_indexes) const {
             return apoint_ts(*shyft::core::cell_statistics::
                 average_catchment_feature(*cells, catchment_indexes,
-                [](const cell& c) { return c.rc.pe_output; }));
+                [](const cell& c)->const auto& { return c.rc.pe_output; }));
         }
 		vector<double> output(const vector<int>& catchment_indexes, size_t ith_timestep) const {
 			return shyft::core::cell_statistics::
 				catchment_feature(*cells, catchment_indexes,
-				[](const cell& c) { return c.rc.pe_output; }, ith_timestep);
+				[](const cell& c)->const auto& { return c.rc.pe_output; }, ith_timestep);
 		}
 		double output_value(const vector<int>& catchment_indexes, size_t ith_timestep) const {
 			return shyft::core::cell_statistics::
 				average_catchment_feature_value(*cells, catchment_indexes,
-					[](const cell& c) { return c.rc.pe_output; }, ith_timestep);
+					[](const cell& c)->const auto& { return c.rc.pe_output; }, ith_timestep);
 		}
 	};
 
@@ -908,17 +884,17 @@ namespace shyft {
 		apoint_ts output(const vector<int>& catchment_indexes) const {
 			return apoint_ts(*shyft::core::cell_statistics::
 				average_catchment_feature(*cells, catchment_indexes,
-					[](const cell& c) { return c.rc.soil_outflow; }));
+					[](const cell& c)->const auto& { return c.rc.soil_outflow; }));
 		}
 		vector<double> output(const vector<int>& catchment_indexes, size_t ith_timestep) const {
 			return shyft::core::cell_statistics::
 				catchment_feature(*cells, catchment_indexes,
-					[](const cell& c) { return c.rc.soil_outflow; }, ith_timestep);
+					[](const cell& c)->const auto& { return c.rc.soil_outflow; }, ith_timestep);
 		}
 		double output_value(const vector<int>& catchment_indexes, size_t ith_timestep) const {
 			return shyft::core::cell_statistics::
 				average_catchment_feature_value(*cells, catchment_indexes,
-					[](const cell& c) { return c.rc.soil_outflow; }, ith_timestep);
+					[](const cell& c)->const auto& { return c.rc.soil_outflow; }, ith_timestep);
 		}
 	};
     template <typename cell>
@@ -929,17 +905,17 @@ namespace shyft {
 		apoint_ts output(const vector<int>& catchment_indexes) const {
             return apoint_ts(*shyft::core::cell_statistics::
                 average_catchment_feature(*cells, catchment_indexes,
-                [](const cell& c) { return c.rc.ae_output; }));
+                [](const cell& c)->const auto& { return c.rc.ae_output; }));
         }
 		vector<double> output(const vector<int>& catchment_indexes, size_t ith_timestep) const {
 			return shyft::core::cell_statistics::
 				catchment_feature(*cells, catchment_indexes,
-				[](const cell& c) { return c.rc.ae_output; }, ith_timestep);
+				[](const cell& c)->const auto& { return c.rc.ae_output; }, ith_timestep);
 		}
 		double output_value(const vector<int>& catchment_indexes, size_t ith_timestep) const {
 			return shyft::core::cell_statistics::
 				average_catchment_feature_value(*cells, catchment_indexes,
-					[](const cell& c) { return c.rc.ae_output; }, ith_timestep);
+					[](const cell& c)->const auto& { return c.rc.ae_output; }, ith_timestep);
 		}
 	};
 
@@ -951,17 +927,17 @@ namespace shyft {
 		apoint_ts output(const vector<int>& catchment_indexes) const {
 			return apoint_ts(*shyft::core::cell_statistics::
 				average_catchment_feature(*cells, catchment_indexes,
-					[](const cell& c) { return c.rc.ae_output; }));
+					[](const cell& c)->const auto& { return c.rc.ae_output; }));
 		}
 		vector<double> output(const vector<int>& catchment_indexes, size_t ith_timestep) const {
 			return shyft::core::cell_statistics::
 				catchment_feature(*cells, catchment_indexes,
-					[](const cell& c) { return c.rc.ae_output; }, ith_timestep);
+					[](const cell& c)->const auto& { return c.rc.ae_output; }, ith_timestep);
 		}
 		double output_value(const vector<int>& catchment_indexes, size_t ith_timestep) const {
 			return shyft::core::cell_statistics::
 				average_catchment_feature_value(*cells, catchment_indexes,
-					[](const cell& c) { return c.rc.ae_output; }, ith_timestep);
+					[](const cell& c)->const auto& { return c.rc.ae_output; }, ith_timestep);
 		}
 	};
 
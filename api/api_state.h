@@ -4,6 +4,8 @@
 #include <vector>
 #include <memory>
 #include <stdexcept>
+#include <cstdint>
+#include <cstring>
 #include "core/core_pch.h"
 
 #include "core/geo_cell_data.h"
@@ -137,6 +139,189 @@ namespace shyft {
                 return missing;
             }
         };
+
+        /** \brief fixed binary record layout of a method-stack state
+        *
+        * Each state is stored as n_fields doubles. The stack_id is written to the
+        * blob header, so that a blob is never applied to a state-vector of another stack.
+        * Specialized for each method stack below.
+        */
+        template <class S> struct state_record;
+
+        template <> struct state_record<shyft::core::pt_gs_k::state> {
+            static const uint32_t stack_id = 1;
+            static const uint32_t n_fields = 9;
+            static void put(const shyft::core::pt_gs_k::state& s, double* d) {
+                d[0] = s.gs.albedo; d[1] = s.gs.lwc; d[2] = s.gs.surface_heat; d[3] = s.gs.alpha;
+                d[4] = s.gs.sdc_melt_mean; d[5] = s.gs.acc_melt; d[6] = s.gs.iso_pot_energy; d[7] = s.gs.temp_swe;
+                d[8] = s.kirchner.q;
+            }
+            static void get(shyft::core::pt_gs_k::state& s, const double* d) {
+                s.gs.albedo = d[0]; s.gs.lwc = d[1]; s.gs.surface_heat = d[2]; s.gs.alpha = d[3];
+                s.gs.sdc_melt_mean = d[4]; s.gs.acc_melt = d[5]; s.gs.iso_pot_energy = d[6]; s.gs.temp_swe = d[7];
+                s.kirchner.q = d[8];
+            }
+        };
+
+        template <> struct state_record<shyft::core::pt_ss_k::state> {
+            static const uint32_t stack_id = 2;
+            static const uint32_t n_fields = 8;
+            static void put(const shyft::core::pt_ss_k::state& s, double* d) {
+                d[0] = s.snow.nu; d[1] = s.snow.alpha; d[2] = s.snow.sca; d[3] = s.snow.swe;
+                d[4] = s.snow.free_water; d[5] = s.snow.residual; d[6] = double(s.snow.num_units);
+                d[7] = s.kirchner.q;
+            }
+            static void get(shyft::core::pt_ss_k::state& s, const double* d) {
+                s.snow.nu = d[0]; s.snow.alpha = d[1]; s.snow.sca = d[2]; s.snow.swe = d[3];
+                s.snow.free_water = d[4]; s.snow.residual = d[5]; s.snow.num_units = (unsigned long)d[6];
+                s.kirchner.q = d[7];
+            }
+        };
+
+        template <> struct state_record<shyft::core::pt_hs_k::state> {
+            static const uint32_t stack_id = 3;
+            static const uint32_t n_fields = 3;
+            static void put(const shyft::core::pt_hs_k::state& s, double* d) {
+                d[0] = s.snow.swe; d[1] = s.snow.sca; d[2] = s.kirchner.q;
+            }
+            static void get(shyft::core::pt_hs_k::state& s, const double* d) {
+                s.snow.swe = d[0]; s.snow.sca = d[1]; s.kirchner.q = d[2];
+            }
+        };
+
+        template <> struct state_record<shyft::core::hbv_stack::state> {
+            static const uint32_t stack_id = 4;
+            static const uint32_t n_fields = 5;
+            static void put(const shyft::core::hbv_stack::state& s, double* d) {
+                d[0] = s.snow.swe; d[1] = s.snow.sca; d[2] = s.soil.sm; d[3] = s.tank.uz; d[4] = s.tank.lz;
+            }
+            static void get(shyft::core::hbv_stack::state& s, const double* d) {
+                s.snow.swe = d[0]; s.snow.sca = d[1]; s.soil.sm = d[2]; s.tank.uz = d[3]; s.tank.lz = d[4];
+            }
+        };
+
+        /** \brief header of a state-vector blob, as produced by state_vector_to_bytes
+        *
+        * The header is followed by payload_size bytes. If not compressed, the payload
+        * is n_fields x n_states doubles, field by field, so that it can be viewed directly
+        * as a numpy array of shape (n_fields,n_states) at offset sizeof(state_blob_header).
+        */
+        struct state_blob_header {
+            char magic[4];///< "SHYS"
+            uint16_t version;///< layout version, currently 1
+            uint16_t flags;///< bit 0 set if the payload is compressed
+            uint32_t stack_id;///< state_record<S>::stack_id of the states
+            uint32_t n_fields;///< number of doubles for each state
+            uint64_t n_states;///< number of states
+            uint64_t payload_size;///< number of bytes following the header
+        };
+        static_assert(sizeof(state_blob_header) == 32, "state_blob_header must be 32 bytes");
+
+        /** \brief serialize a state vector to a compact binary blob
+        *
+        * \param states the states to serialize
+        * \param compress if true, each field column is xor'ed with its previous value, and only
+        *        the significant bytes of the result are stored. Equal neighbour values cost one byte.
+        * \return the blob, a state_blob_header followed by the payload
+        */
+        template <class S>
+        std::vector<char> state_vector_to_bytes(const std::vector<S>& states, bool compress = false) {
+            typedef state_record<S> rec_t;
+            const size_t n = states.size();
+            const size_t nf = rec_t::n_fields;
+            std::vector<double> cols(nf*n);
+            double row[rec_t::n_fields];
+            for (size_t i = 0;i < n;++i) {
+                rec_t::put(states[i], row);
+                for (size_t f = 0;f < nf;++f)
+                    cols[f*n + i] = row[f];
+            }
+            state_blob_header h{ {'S','H','Y','S'}, 1, uint16_t(compress ? 1 : 0), rec_t::stack_id, rec_t::n_fields, uint64_t(n), 0 };
+            std::vector<char> r;
+            if (!compress) {
+                h.payload_size = cols.size()*sizeof(double);
+                r.resize(sizeof(h) + h.payload_size);
+                std::memcpy(r.data() + sizeof(h), cols.data(), h.payload_size);
+            } else {
+                r.resize(sizeof(h));
+                r.reserve(sizeof(h) + cols.size()*2);
+                for (size_t f = 0;f < nf;++f) {
+                    uint64_t prev = 0;
+                    for (size_t i = 0;i < n;++i) {
+                        uint64_t b;
+                        std::memcpy(&b, &cols[f*n + i], sizeof(b));
+                        uint64_t x = b^prev;
+                        prev = b;
+                        char k = 0;
+                        while (k < 8 && (x >> (8*k))) ++k;
+                        r.push_back(k);
+                        for (char j = 0;j < k;++j)
+                            r.push_back(char((x >> (8*j)) & 0xff));
+                    }
+                }
+                h.payload_size = r.size() - sizeof(h);
+            }
+            std::memcpy(r.data(), &h, sizeof(h));
+            return r;
+        }
+
+        /** \brief deserialize a blob produced by state_vector_to_bytes
+        *
+        * \param blob pointer to the first byte of the blob
+        * \param size the size of the blob in bytes
+        * \return the states
+        * \throw runtime_error if the blob is malformed, or made from states of another stack
+        */
+        template <class S>
+        std::vector<S> state_vector_from_bytes(const char* blob, size_t size) {
+            typedef state_record<S> rec_t;
+            state_blob_header h;
+            if (size < sizeof(h))
+                throw std::runtime_error("state_vector_from_bytes: blob is smaller than the header");
+            std::memcpy(&h, blob, sizeof(h));
+            if (std::memcmp(h.magic, "SHYS", 4) != 0 || h.version != 1)
+                throw std::runtime_error("state_vector_from_bytes: not a state blob, or unsupported version");
+            if (h.stack_id != rec_t::stack_id || h.n_fields != rec_t::n_fields)
+                throw std::runtime_error("state_vector_from_bytes: blob contains states of another method stack");
+            if (h.payload_size != size - sizeof(h))
+                throw std::runtime_error("state_vector_from_bytes: blob payload size does not match blob size");
+            const size_t n = h.n_states;
+            const size_t nf = rec_t::n_fields;
+            const char* p = blob + sizeof(h);
+            std::vector<double> cols(nf*n);
+            if ((h.flags & 1) == 0) {
+                if (h.payload_size != cols.size()*sizeof(double))
+                    throw std::runtime_error("state_vector_from_bytes: blob payload size does not match number of states");
+                std::memcpy(cols.data(), p, h.payload_size);
+            } else {
+                const char* e = p + h.payload_size;
+                for (size_t f = 0;f < nf;++f) {
+                    uint64_t prev = 0;
+                    for (size_t i = 0;i < n;++i) {
+                        if (p >= e)
+                            throw std::runtime_error("state_vector_from_bytes: truncated compressed payload");
+                        int k = *p++;
+                        if (k < 0 || k > 8 || e - p < k)
+                            throw std::runtime_error("state_vector_from_bytes: corrupt compressed payload");
+                        uint64_t x = 0;
+                        for (int j = 0;j < k;++j)
+                            x |= uint64_t((unsigned char)*p++) << (8*j);
+                        prev ^= x;
+                        std::memcpy(&cols[f*n + i], &prev, sizeof(prev));
+                    }
+                }
+                if (p != e)
+                    throw std::runtime_error("state_vector_from_bytes: compressed payload has trailing bytes");
+            }
+            std::vector<S> r(n);
+            double row[rec_t::n_fields];
+            for (size_t i = 0;i < n;++i) {
+                for (size_t f = 0;f < nf;++f)
+                    row[f] = cols[f*n + i];
+                rec_t::get(r[i], row);
+            }
+            return r;
+        }
     }
 }
 //-- serialization support shyft
@@ -22,6 +22,16 @@ namespace expose {
             .def("init",&CellEnvironment::init,args("ta"),"zero all series, set time-axis ta")
             ;
 
+        typedef shyft::core::environment32_t CellEnvironment32;
+        class_<CellEnvironment32>("CellEnvironment32","Contains all ts projected to a certain cell-model, stored as float32 time-series")
+            .def_readwrite("temperature",&CellEnvironment32::temperature)
+            .def_readwrite("precipitation",&CellEnvironment32::precipitation)
+            .def_readwrite("radiation",&CellEnvironment32::radiation)
+            .def_readwrite("wind_speed",&CellEnvironment32::wind_speed)
+            .def_readwrite("rel_hum",&CellEnvironment32::rel_hum)
+            .def("init",&CellEnvironment32::init,args("ta"),"nan-fill all series, set time-axis ta")
+            ;
+
         typedef shyft::core::environment_const_rhum_and_wind_t CellEnvironmentConstRHumWind;
         class_<CellEnvironmentConstRHumWind>("CellEnvironmentConstRHumWind","Contains all ts projected to a certain cell-model using interpolation step (if needed)")
             .def_readwrite("temperature",&CellEnvironmentConstRHumWind::temperature)
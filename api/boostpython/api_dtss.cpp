@@ -3,37 +3,10 @@
 #include "api/time_series.h"
 #include "core/dtss.h"
 #include "core/dtss_client.h"
+#include "py_gil.h"
 
 // also consider policy: from https://www.codevate.com/blog/7-concurrency-with-embedded-python-in-a-multi-threaded-c-application
 
-struct scoped_gil_release {
-    scoped_gil_release() noexcept {
-        py_thread_state = PyEval_SaveThread();
-    }
-    ~scoped_gil_release() noexcept {
-        PyEval_RestoreThread(py_thread_state);
-    }
-    scoped_gil_release(const scoped_gil_release&) = delete;
-    scoped_gil_release(scoped_gil_release&&) = delete;
-    scoped_gil_release& operator=(const scoped_gil_release&) = delete;
-private:
-    PyThreadState * py_thread_state;
-};
-
-struct scoped_gil_aquire {
-    scoped_gil_aquire() noexcept {
-        py_state = PyGILState_Ensure();
-    }
-    ~scoped_gil_aquire() noexcept {
-        PyGILState_Release(py_state);
-    }
-    scoped_gil_aquire(const scoped_gil_aquire&) = delete;
-    scoped_gil_aquire(scoped_gil_aquire&&) = delete;
-    scoped_gil_aquire& operator=(const scoped_gil_aquire&) = delete;
-private:
-    PyGILState_STATE   py_state;
-};
-
 namespace shyft {
     namespace dtss {
 
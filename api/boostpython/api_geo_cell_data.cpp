@@ -2,6 +2,7 @@
 
 #include "core/geo_point.h"
 #include "core/geo_cell_data.h"
+#include "core/cell_model.h"
 namespace expose {
     using namespace shyft::core;
     using namespace boost::python;
@@ -44,5 +45,15 @@ namespace expose {
         .def_readwrite("routing_info",&geo_cell_data::routing,"the routing information for the cell keep destination id and hydrological distance to destination")
         .def("area",&geo_cell_data::area,"returns the area in m^2")
         ;
+
+        class_<catchment_cell_index,bases<>,shared_ptr<catchment_cell_index>>("CatchmentCellIndex",
+                              "The catchment to cell-index lookup of a region-model cell vector.\n"
+                              "It is kept by the region-model, and passed to the statistics objects\n"
+                              "so that catchment statistics only visits the cells of the requested catchments\n",no_init
+        )
+        .def("size",&catchment_cell_index::size,"returns the number of catchments")
+        .def_readonly("n_cells",&catchment_cell_index::n_cells,"number of cells indexed")
+        .def_readonly("catchment_ids",&catchment_cell_index::cids,"the sorted unique catchment ids")
+        ;
     }
 }
@@ -1,5 +1,9 @@
 #include "boostpython_pch.h"
 
+#define NPY_NO_DEPRECATED_API NPY_1_7_API_VERSION
+#include <numpy/arrayobject.h>
+#include "numpy_boost_python.hpp"
+#include "numpy_view.h"
 
 #include "core/utctime_utilities.h"
 #include "core/time_axis.h"
@@ -140,6 +144,15 @@ namespace expose {
             return r;
         }
 
+        static boost::python::object time_axis_extract_time_points_as_numpy(shyft::time_axis::generic_dt const&ta) {
+            return numpy_from_vector(time_axis_extract_time_points(ta));
+        }
+
+        static void* np_import() {
+            import_array();
+            return nullptr;
+        }
+
         static void e_generic_dt() {
             using namespace shyft::time_axis;
             namespace py = boost::python;
@@ -249,6 +262,13 @@ namespace expose {
                 ;//.def("full_range",&point_dt::full_range,"returns a timeaxis that covers [-oo..+oo> ").staticmethod("full_range")
                 //.def("null_range",&point_dt::null_range,"returns a null timeaxis").staticmethod("null_range");
             //e_time_axis_std<generic_dt>(g_dt);
+            def("time_axis_extract_time_points_as_numpy", time_axis_extract_time_points_as_numpy, args("time_axis"),
+                doc_intro("Extract all time_axis.period(i).start plus time_axis.total_period().end into a numpy array")
+                doc_intro("The array takes over the extracted time-points, so there is no extra copy through UtcTimeVector")
+                doc_parameters()
+                doc_parameter("time_axis","TimeAxis","time-axis to extract all time-points from")
+                doc_returns("time_points","np.ndarray","all time_axis.period(i).start plus time_axis.total_period().end, dtype=np.int64")
+            );
             def("time_axis_extract_time_points", time_axis_extract_time_points, args("time_axis"),
                 doc_intro("Extract all time_axis.period(i).start plus time_axis.total_period().end into a UtcTimeVector")
                 doc_parameters()
@@ -259,6 +279,7 @@ namespace expose {
 
     }
     void api_time_axis() {
+        time_axis::np_import();
         time_axis::e_fixed_dt();
         time_axis::e_point_dt();
         time_axis::e_calendar_dt();
@@ -1,11 +1,18 @@
 #include "boostpython_pch.h"
 
+#define NPY_NO_DEPRECATED_API NPY_1_7_API_VERSION
+#include <numpy/arrayobject.h>
+#include "numpy_boost_python.hpp"
+
 #include "core/utctime_utilities.h"
 #include "core/time_axis.h"
 #include "core/time_series.h"
 #include "core/predictions.h"
 #include "api/api.h"
 #include "api/time_series.h"
+#include "py_gil.h"
+#include "numpy_view.h"
+#include "py_convertible.h"
 
 namespace expose {
     using namespace shyft;
@@ -26,6 +33,79 @@ namespace expose {
     }
 
 
+    static void* np_import() {
+        import_array();
+        return nullptr;
+    }
+
+    /** numpy array of the values, a view for concrete time-series that keeps the time-series alive, otherwise the evaluated values */
+    static py::object apoint_ts_as_numpy(shyft::api::apoint_ts const& ts, bool writable) {
+        using namespace shyft::api;
+        if (!ts.ts)
+            return numpy_from_vector(vector<double>{});
+        auto g = dynamic_pointer_cast<gpoint_ts>(ts.ts);
+        if (!g) {
+            if (auto r = dynamic_pointer_cast<aref_ts>(ts.ts))
+                g = r->rep;
+        }
+        if (g) {
+            auto& v = g->rep.v;
+            return numpy_view(v.data(), v.size(), owning_capsule(shared_ptr<ipoint_ts>(g)), writable);
+        }
+        if (writable)
+            throw runtime_error("TimeSeries.as_numpy(writable=True) requires a concrete time-series, not an expression");
+        return numpy_from_vector(ts.values());
+    }
+
+    // ats_vector computations that releases the GIL while evaluating the expressions
+    static shyft::api::ats_vector ats_vector_evaluate(shyft::api::ats_vector const& tsv) {
+        scoped_gil_release gil;
+        return tsv.evaluate();
+    }
+    static shyft::api::ats_vector ats_vector_percentiles(shyft::api::ats_vector const& tsv, shyft::api::gta_t const& ta, vector<int> const& percentiles) {
+        scoped_gil_release gil;
+        return tsv.percentiles(ta, percentiles);
+    }
+    static shyft::api::ats_vector ats_vector_percentiles_f(shyft::api::ats_vector const& tsv, time_axis::fixed_dt const& ta, vector<int> const& percentiles) {
+        scoped_gil_release gil;
+        return tsv.percentiles_f(ta, percentiles);
+    }
+
+    static numpy_boost<double, 2> ats_vector_to_numpy(shyft::api::ats_vector const& tsv, shyft::api::gta_t const& ta) {
+        vector<vector<double>> v;
+        {
+            scoped_gil_release gil;
+            v = tsv.average_values(ta);
+        }
+        int dims[] = { int(tsv.size()), int(ta.size()) };
+        numpy_boost<double, 2> r(dims);
+        for (size_t i = 0; i < v.size(); ++i)
+            std::copy(begin(v[i]), end(v[i]), r.data() + i*ta.size());
+        return r;
+    }
+
+    static shyft::api::ats_vector ats_vector_from_numpy(shyft::api::gta_t const& ta, numpy_boost<double, 2> const& a, time_series::ts_point_fx point_fx) {
+        using shyft::api::apoint_ts;
+        size_t n_ts = a.shape()[0];
+        size_t n_pts = a.shape()[1];
+        if (ta.size() != n_pts)
+            throw std::runtime_error("time-axis should have same length as second dim in numpy array");
+        shyft::api::ats_vector r; r.reserve(n_ts);
+        const bool contiguous = a.strides()[1] == 1;
+        for (size_t i = 0; i < n_ts; ++i) {
+            vector<double> v;
+            if (contiguous) {
+                const double* row = a.data() + std::ptrdiff_t(i)*a.strides()[0];
+                v.assign(row, row + n_pts);
+            } else {
+                v.reserve(n_pts);
+                for (size_t j = 0; j < n_pts; ++j) v.emplace_back(a[i][j]);
+            }
+            r.emplace_back(ta, std::move(v), point_fx);
+        }
+        return r;
+    }
+
     static void expose_ats_vector() {
         using namespace shyft::api;
         typedef ats_vector(ats_vector::*m_double)(double)const;
@@ -53,21 +133,45 @@ namespace expose {
                  doc_parameters()
                  doc_parameter("t","int","seconds since epoch 1970 UTC")
             )
-            .def("percentiles",&ats_vector::percentiles,args("time_axis","percentiles"),
+            .def("to_numpy",&ats_vector_to_numpy,(py::arg("self"),py::arg("time_axis")),
+                doc_intro("Evaluates all time-series as true-average over the time-axis, in parallel,")
+                doc_intro("and returns the values as a 2-d numpy array, one row for each time-series.")
+                doc_intro("Time-series that already have the specified time-axis, and stair-case point interpretation, are used as is.")
+                doc_parameters()
+                doc_parameter("time_axis","TimeAxis","the time-axis that all time-series are mapped into")
+                doc_returns("values","np.ndarray","numpy array of dtype=np.float64, and shape(n_ts,len(time_axis))")
+            )
+            .def("from_numpy",&ats_vector_from_numpy,(py::arg("time_axis"),py::arg("np_array"),py::arg("point_fx")),
+                doc_intro("Create a TsVector from specified time_axis, 2-d np_array and point_fx,")
+                doc_intro("all time-series gets the same time-axis.")
+                doc_parameters()
+                doc_parameter("time_axis","TimeAxis","time-axis that matches in length to 2nd dim of np_array")
+                doc_parameter("np_array","np.ndarray","numpy array of dtype=np.float64, and shape(n_ts,n_points)")
+                doc_parameter("point_fx","point interpretation", "one of POINT_AVERAGE_VALUE|POINT_INSTANT_VALUE")
+                doc_returns("tsv","TsVector","a TsVector of length first np_array dim, n_ts, each with time-axis, values and point_fx")
+            )
+            .staticmethod("from_numpy")
+            .def("evaluate",&ats_vector_evaluate,
+                doc_intro("Evaluates all the time-series expressions in parallel, with the python GIL released")
+                doc_returns("evaluated","TsVector","a new TsVector with the concrete time-series values of the expressions")
+            )
+            .def("percentiles",&ats_vector_percentiles,args("time_axis","percentiles"),
                 doc_intro("Calculate the percentiles, NIST R7, excel,R definition, of the timeseries")
                 doc_intro("over the specified time-axis.")
                 doc_intro("The time-series point_fx interpretation is used when performing")
                 doc_intro("the true-average over the time_axis periods.")
+                doc_intro("The computation is done in parallel over the time-steps, with the python GIL released.")
                 doc_parameters()
                 doc_parameter("percentiles","IntVector","A list of numbers,[ 0, 25,50,-1,75,100] will return 6 time-series,\n -1 -> arithmetic average\n -1000 -> min extreme value\n +1000 max extreme value")
                 doc_parameter("time_axis","TimeAxis","The time-axis used when applying true-average to the time-series")
                 doc_returns("calculated_percentiles","TsVector","Time-series list with evaluated percentile results, same length as input")
             )
-            .def("percentiles",&ats_vector::percentiles_f,args("time_axis","percentiles"),
+            .def("percentiles",&ats_vector_percentiles_f,args("time_axis","percentiles"),
                 doc_intro("Calculate the percentiles, NIST R7, excel,R definition, of the timeseries")
                 doc_intro("over the specified time-axis.")
                 doc_intro("The time-series point_fx interpretation is used when performing")
                 doc_intro("the true-average over the time_axis periods.")
+                doc_intro("The computation is done in parallel over the time-steps, with the python GIL released.")
                 doc_parameters()
                 doc_parameter("percentiles","IntVector","A list of numbers,[ 0, 25,50,-1,75,100] will return 6 time-series,\n -1 -> arithmetic average\n -1000 -> min extreme value\n +1000 max extreme value")
                 doc_parameter("time_axis","TimeAxisFixedDeltaT","The time-axis used when applying true-average to the time-series")
@@ -309,6 +413,30 @@ namespace expose {
     }
 
 
+    template <class TA>
+    static void point_ts32(const char *ts_type_name,const char *doc) {
+        typedef time_series::point_ts32<TA> pts_t;
+        class_<pts_t,bases<>,shared_ptr<pts_t>,boost::noncopyable>(ts_type_name, doc)
+            .def(init<const TA&,const vector<double>&,time_series::ts_point_fx>(
+				(py::arg("self"),py::arg("ta"),py::arg("v"),py::arg("policy")),
+				doc_intro("constructs a new timeseries from timeaxis, points and policy, values are stored as float32")
+				)
+			)
+            .def(init<const TA&,double,time_series::ts_point_fx>(
+				(py::arg("self"),py::arg("ta"),py::arg("fill_value"),py::arg("policy")),
+				doc_intro("constructs a new timeseries from timeaxis, fill-value and policy")
+				)
+			)
+            DEF_STD_TS_STUFF()
+            .def("as_point_ts",&pts_t::as_point_ts,(py::arg("self")),
+				doc_intro("returns a copy of the time-series with double values")
+			)
+			.def("get_time_axis", &pts_t::time_axis,(py::arg("self")),
+				"returns the time-axis", return_internal_reference<>()
+			)
+            ;
+    }
+
     BOOST_PYTHON_MEMBER_FUNCTION_OVERLOADS(point_ts_overloads     ,shyft::api::TsFactory::create_point_ts,4,5);
     BOOST_PYTHON_MEMBER_FUNCTION_OVERLOADS(time_point_ts_overloads,shyft::api::TsFactory::create_time_point_ts,3,4);
 
@@ -485,6 +613,47 @@ namespace expose {
 
 			.def("get_time_axis", &shyft::api::apoint_ts::time_axis,(py::arg("self")), "returns the time-axis", return_internal_reference<>())
 			.add_property("values", &shyft::api::apoint_ts::values,"return the values (possibly calculated on the fly)")
+			.def("materialize", &shyft::api::apoint_ts::materialize, (py::arg("self")),
+				doc_intro("If this is an average, integral, accumulate or min_max_check expression, compute and keep the values,")
+				doc_intro("so that later .value(i) and .values calls are served from memory.")
+				doc_intro("The kept values are dropped when a symbolic time-series is bound, or by .do_bind().")
+				doc_intro("They are not invalidated when a concrete source time-series is changed by .set(), .fill() or .append(),")
+				doc_intro("call .materialize() or .update_tail() again after such changes.")
+				doc_intro("Has no effect for other expressions and concrete time-series.")
+				doc_see_also("TimeSeries.average,TimeSeries.integral,TimeSeries.accumulate,TimeSeries.update_tail")
+			)
+			.def("update_tail", &shyft::api::apoint_ts::update_tail, (py::arg("self"), py::arg("t")),
+				doc_intro("Update the values kept by .materialize() after the source time-series has changed at and after t,")
+				doc_intro("typically after .append() to the source. Only the values that depends on the source from t")
+				doc_intro("and on are computed. If there are no kept values, this is the same as .materialize().")
+				doc_parameters()
+				doc_parameter("t","int","the time from where the source has changed, e.g. the start of the appended time-series")
+				doc_see_also("TimeSeries.materialize,TimeSeries.append")
+			)
+			.def("append", &shyft::api::apoint_ts::append, (py::arg("self"), py::arg("ts")),
+				doc_intro("Append the values of ts to this concrete time-series.")
+				doc_intro("The time-axis is extended, keeping its type if ts continues it with the same kind of")
+				doc_intro("fixed or calendar intervals, otherwise it becomes a point time-axis,")
+				doc_intro("with a nan-interval covering any gap between the two.")
+				doc_intro("Expressions that take their time-axis from this time-series, like a+b, a*2.0, .abs() or .time_shift(),")
+				doc_intro("keep the time-axis they had when built, and must be rebuilt to cover the appended values.")
+				doc_intro(".average(), .integral() and .accumulate() have their own time-axis, and see the new values within it,")
+				doc_intro("use .update_tail() to update materialized expressions.")
+				doc_intro("Arrays from .as_numpy() taken before the append are no longer valid.")
+				doc_parameters()
+				doc_parameter("ts","TimeSeries","the time-series to append, must start at or after the end of this")
+				doc_see_also("TimeSeries.update_tail,TimeSeries.as_numpy")
+			)
+			.def("as_numpy", &apoint_ts_as_numpy, (py::arg("self"), py::arg("writable") = false),
+				doc_intro("returns the values as a 1-d numpy array.")
+				doc_intro("For a concrete time-series, the array is a view of the values, no copy, and it keeps the values alive.")
+				doc_intro("Do not .append() to the time-series while using the array, since that could move the values,")
+				doc_intro("take a new view after appending.")
+				doc_intro("For an expression, the array holds the evaluated values.")
+				doc_parameters()
+				doc_parameter("writable","bool","if True, writes to the array are written to the time-series, only for concrete time-series, default False, read-only")
+				doc_returns("values","np.ndarray","the values of the time-series")
+			)
 			// operators
 			.def(self * self)
 			.def(double() * self)
@@ -995,7 +1164,35 @@ namespace expose {
 			;
 	}
 
+    static numpy_boost<double, 2> as_score_matrix(vector<double> const& v, size_t n_models, size_t n_ta) {
+        int dims[] = { int(n_models), int(n_ta) };
+        numpy_boost<double, 2> r(dims);
+        std::copy(begin(v), end(v), r.data());
+        return r;
+    }
+
+    static numpy_boost<double, 2> nash_sutcliffe_matrix(shyft::api::ats_vector const& observations, shyft::api::ats_vector const& models, vector<shyft::api::gta_t> const& time_axes) {
+        vector<double> v;
+        {
+            scoped_gil_release gil;
+            v = shyft::api::nash_sutcliffe(observations, models, time_axes);
+        }
+        return as_score_matrix(v, models.size(), time_axes.size());
+    }
+
+    static numpy_boost<double, 2> kling_gupta_matrix(shyft::api::ats_vector const& observations, shyft::api::ats_vector const& models, vector<shyft::api::gta_t> const& time_axes, double s_r, double s_a, double s_b) {
+        vector<double> v;
+        {
+            scoped_gil_release gil;
+            v = shyft::api::kling_gupta(observations, models, time_axes, s_r, s_a, s_b);
+        }
+        return as_score_matrix(v, models.size(), time_axes.size());
+    }
+
 	static void expose_correlation_functions() {
+        typedef double (*kg_fx)(const shyft::api::apoint_ts&, const shyft::api::apoint_ts&, const shyft::api::gta_t&, double, double, double);
+        typedef double (*ns_fx)(const shyft::api::apoint_ts&, const shyft::api::apoint_ts&, const shyft::api::gta_t&);
+        py_api::iterable_converter().from_python<vector<shyft::api::gta_t>>();
 		const char * kg_doc =
 			doc_intro("Computes the kling-gupta KGEs correlation for the two time-series over the specified time_axis")
 			doc_parameters()
@@ -1006,7 +1203,7 @@ namespace expose {
 			doc_parameter("s_a","float","the kling gupta scale a factor(weight the relative average of the goal function)")
 			doc_parameter("s_b","float","the kling gupta scale b factor(weight the relative standard deviation of the goal function)")
             doc_returns("KGEs","float","The  KGEs= 1-EDs that have a maximum at 1.0");
-		def("kling_gupta", shyft::api::kling_gupta, args("observation_ts", "model_ts", "time_axis", "s_r", "s_a", "s_b"),
+		def("kling_gupta", (kg_fx)shyft::api::kling_gupta, args("observation_ts", "model_ts", "time_axis", "s_r", "s_a", "s_b"),
 			kg_doc
 		);
 
@@ -1020,10 +1217,37 @@ namespace expose {
 			doc_parameter("time_axis","TimeAxis","the time-axis that is used for the computation")
 			doc_returns("ns","float","The  n.s performance, that have a maximum at 1.0");
 
-		def("nash_sutcliffe", shyft::api::nash_sutcliffe, args("observation_ts", "model_ts", "time_axis"),
+		def("nash_sutcliffe", (ns_fx)shyft::api::nash_sutcliffe, args("observation_ts", "model_ts", "time_axis"),
 			ns_doc
 		);
 
+		def("nash_sutcliffe_matrix", nash_sutcliffe_matrix, args("observations", "models", "time_axes"),
+			doc_intro("Computes the Nash-Sutcliffe model effiency coefficient (n.s) for each of the models,")
+			doc_intro("over each of the time-axes, in parallel, with the python GIL released.")
+			doc_intro("The observations are averaged once for each time-axis, and shared among the models.")
+			doc_parameters()
+			doc_parameter("observations","TsVector","one observed time-series used for all models, or one for each model")
+			doc_parameter("models","TsVector","the time-series that are the model simulated / calculated ts")
+			doc_parameter("time_axes","list","list of TimeAxis to compute the n.s over, e.g. lead-time windows")
+			doc_returns("ns","np.ndarray","The n.s performance, shape(len(models),len(time_axes)), nan if no values")
+			doc_see_also("nash_sutcliffe")
+		);
+
+		def("kling_gupta_matrix", kling_gupta_matrix, args("observations", "models", "time_axes", "s_r", "s_a", "s_b"),
+			doc_intro("Computes the kling-gupta KGEs for each of the models,")
+			doc_intro("over each of the time-axes, in parallel, with the python GIL released.")
+			doc_intro("The observations are averaged once for each time-axis, and shared among the models.")
+			doc_parameters()
+			doc_parameter("observations","TsVector","one observed time-series used for all models, or one for each model")
+			doc_parameter("models","TsVector","the time-series that are the model simulated / calculated ts")
+			doc_parameter("time_axes","list","list of TimeAxis to compute the KGEs over, e.g. lead-time windows")
+			doc_parameter("s_r","float","the kling gupta scale r factor(weight the correlation of goal function)")
+			doc_parameter("s_a","float","the kling gupta scale a factor(weight the relative average of the goal function)")
+			doc_parameter("s_b","float","the kling gupta scale b factor(weight the relative standard deviation of the goal function)")
+			doc_returns("KGEs","np.ndarray","The KGEs= 1-EDs, shape(len(models),len(time_axes)), nan if no values")
+			doc_see_also("kling_gupta")
+		);
+
 
 	}
 	static void expose_periodic_ts() {
@@ -1187,6 +1411,7 @@ namespace expose {
 	}
 
     void timeseries() {
+        np_import();
         enum_<time_series::ts_point_fx>("point_interpretation_policy")
             .value("POINT_INSTANT_VALUE",time_series::POINT_INSTANT_VALUE)
             .value("POINT_AVERAGE_VALUE",time_series::POINT_AVERAGE_VALUE)
@@ -1242,6 +1467,7 @@ namespace expose {
             ;
         point_ts<time_axis::fixed_dt>("TsFixed","A time-series with a fixed delta t time-axis, used by the Shyft core,see also TimeSeries for end-user ts");
         point_ts<time_axis::point_dt>("TsPoint","A time-series with a variable delta time-axis, used by the Shyft core,see also TimeSeries for end-user ts");
+        point_ts32<time_axis::fixed_dt>("TsFixed32","As TsFixed, but values stored as float32, used by the Shyft core float32 storage model types");
         TsFactory();
 		expose_rating_curve_classes();
         expose_apoint_ts();
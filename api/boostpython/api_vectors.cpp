@@ -5,6 +5,7 @@
 #include "numpy_boost_python.hpp"
 
 #include "py_convertible.h"
+#include "numpy_view.h"
 #include "core/utctime_utilities.h"
 #include "core/geo_point.h"
 #include "core/geo_cell_data.h"
@@ -60,6 +61,8 @@ namespace expose {
 
     template<class T>
     static vector<T> FromNdArray(const numpy_boost<T,1>& npv) {
+        if(npv.strides()[0]==1) // contiguous, one block copy
+            return vector<T>(npv.data(),npv.data()+npv.shape()[0]);
         vector<T> r;r.reserve(npv.shape()[0]);
         for(size_t i=0;i<npv.shape()[0];++i) {
             r.push_back(npv[i]);
@@ -71,12 +74,18 @@ namespace expose {
     static numpy_boost<T,1> ToNpArray(const vector<T>&v) {
         int dims[]={int(v.size())};
         numpy_boost<T,1> r(dims);
-        for(size_t i=0;i<r.size();++i) {
-            r[i]=v[i];
-        }
+        std::copy(begin(v),end(v),r.data());
         return r;
     }
 
+    /** zero-copy numpy view of the vector, the numpy array keeps the python vector object alive */
+    template<class T>
+    static py::object AsNpArray(py::object self,bool writable) {
+        vector<T>& v = py::extract<vector<T>&>(self);
+        Py_INCREF(self.ptr());
+        return numpy_view(v.data(),v.size(),self.ptr(),writable);
+    }
+
     template <class T>
     static void expose_vector(const char *name) {
         typedef std::vector<T> XVector;
@@ -87,6 +96,14 @@ namespace expose {
         .def("FromNdArray",FromNdArray<T>).staticmethod("FromNdArray") // BW compatible
         .def("from_numpy",FromNdArray<T>).staticmethod("from_numpy")// static construct from numpy TODO: fix __init__
         .def("to_numpy",ToNpArray<T>,"convert to numpy") // Ok, to make numpy 1-d arrays
+        .def("as_numpy",AsNpArray<T>,(py::arg("self"),py::arg("writable")=false),
+            doc_intro("returns a 1-d numpy array that is a view of the vector, no copy.")
+            doc_intro("The array keeps this vector alive. Do not change the size of the vector while using the array,")
+            doc_intro("since that could move the elements.")
+            doc_parameters()
+            doc_parameter("writable","bool","if True, writes to the array are written to the vector, default False, read-only")
+            doc_returns("array","np.ndarray","1-d numpy view of the elements")
+        )
         ;
         numpy_boost_python_register_type<T, 1>(); // register the numpy object so we can access it in C++
         py_api::iterable_converter().from_python<XVector>();
@@ -2,6 +2,7 @@
 #include "expose_statistics.h"
 #include "api/api.h"
 #include "api/api_state.h"
+#include "py_gil.h"
 
 namespace expose {
     using namespace boost::python;
@@ -39,6 +40,151 @@ namespace expose {
         return r;
     }
 
+    /** numpy array of the double field f of the sub-state m, e.g. state.kirchner.q, for all states in sv */
+    template <class S, class M, M S::*m, double M::*f>
+    static numpy_boost<double, 1> state_field_get(const vector<S>& sv) {
+        int dims[] = { int(sv.size()) };
+        numpy_boost<double, 1> r(dims);
+        double *d = r.data();
+        for (const auto& s : sv)
+            *d++ = (s.*m).*f;
+        return r;
+    }
+
+    /** set the double field f of the sub-state m for all states in sv from a numpy array of the same size */
+    template <class S, class M, M S::*m, double M::*f>
+    static void state_field_set(vector<S>& sv, const numpy_boost<double, 1>& a) {
+        if (size_t(a.shape()[0]) != sv.size())
+            throw runtime_error("state_field_set: size of array must equal size of state vector");
+        const double *d = a.data();
+        for (auto& s : sv)
+            (s.*m).*f = *d++;
+    }
+
+    /** add a read/write numpy property name to the state vector class sv_class, for the double field f of sub-state m */
+    template <class S, class M, M S::*m, double M::*f, class SVC>
+    static void state_field(SVC& sv_class, const char* name, const char* doc) {
+        sv_class.add_property(name, state_field_get<S, M, m, f>, state_field_set<S, M, m, f>, doc);
+    }
+
+    /** serialize a state vector to python bytes, see shyft::api::state_vector_to_bytes */
+    template <class S>
+    static object state_vector_serialize(const vector<S>& sv, bool compress) {
+        auto b = shyft::api::state_vector_to_bytes(sv, compress);
+        return object(handle<>(PyBytes_FromStringAndSize(b.data(), b.size())));
+    }
+
+    /** deserialize a state vector from any python object supporting the buffer protocol */
+    template <class S>
+    static vector<S> state_vector_deserialize(object blob) {
+        Py_buffer view;
+        if (PyObject_GetBuffer(blob.ptr(), &view, PyBUF_SIMPLE) != 0)
+            throw_error_already_set();
+        try {
+            auto r = shyft::api::state_vector_from_bytes<S>(static_cast<const char*>(view.buf), size_t(view.len));
+            PyBuffer_Release(&view);
+            return r;
+        } catch (...) {
+            PyBuffer_Release(&view);
+            throw;
+        }
+    }
+
+    /** add serialize_to_bytes and the static deserialize_from_bytes to the state vector class sv_class */
+    template <class S, class SVC>
+    static void state_vector_serialization(SVC& sv_class) {
+        sv_class
+            .def("serialize_to_bytes", state_vector_serialize<S>, (boost::python::arg("self"), boost::python::arg("compress") = false),
+                doc_intro("serialize the states to a compact binary blob, with a fixed record layout for the method stack")
+                doc_intro("The blob starts with a 32 byte header. If not compressed, it is followed by the state fields,")
+                doc_intro("field by field, so numpy.frombuffer(blob,numpy.float64,offset=32).reshape(-1,len(states))")
+                doc_intro("is a view with one row for each field, in the same order as the numpy state field properties.")
+                doc_parameters()
+                doc_parameter("compress", "bool", "default False, if True, store only the bytes that differ from the previous value of each field")
+                doc_returns("blob", "bytes", "the serialized states")
+            )
+            .def("deserialize_from_bytes", state_vector_deserialize<S>, args("blob"),
+                doc_intro("create a state vector from a blob made by serialize_to_bytes")
+                doc_parameters()
+                doc_parameter("blob", "bytes", "any object supporting the buffer protocol, e.g. bytes, bytearray or a numpy array")
+                doc_returns("states", "StateVector", "the deserialized states, raises RuntimeError if the blob is malformed or from another stack")
+            )
+            .staticmethod("deserialize_from_bytes")
+            ;
+    }
+
+    template <class M>
+    static numpy_boost<double, 1> cell_areas(const M& m) {
+        auto cells = m.get_cells();
+        int dims[] = { int(cells->size()) };
+        numpy_boost<double, 1> r(dims);
+        double *d = r.data();
+        for (const auto& c : *cells)
+            *d++ = c.geo.area();
+        return r;
+    }
+
+    template <class M>
+    static numpy_boost<double, 2> cell_mid_points(const M& m) {
+        auto cells = m.get_cells();
+        int dims[] = { int(cells->size()), 3 };
+        numpy_boost<double, 2> r(dims);
+        double *d = r.data();
+        for (const auto& c : *cells) {
+            const auto& p = c.geo.mid_point();
+            *d++ = p.x; *d++ = p.y; *d++ = p.z;
+        }
+        return r;
+    }
+
+    template <class M>
+    static numpy_boost<int, 1> cell_catchment_ids(const M& m) {
+        auto cells = m.get_cells();
+        int dims[] = { int(cells->size()) };
+        numpy_boost<int, 1> r(dims);
+        int *d = r.data();
+        for (const auto& c : *cells)
+            *d++ = int(c.geo.catchment_id());
+        return r;
+    }
+
+    template <class M>
+    static numpy_boost<double, 2> cell_land_type_fractions(const M& m) {
+        auto cells = m.get_cells();
+        int dims[] = { int(cells->size()), 5 };
+        numpy_boost<double, 2> r(dims);
+        double *d = r.data();
+        for (const auto& c : *cells) {
+            const auto& f = c.geo.land_type_fractions_info();
+            *d++ = f.glacier(); *d++ = f.lake(); *d++ = f.reservoir(); *d++ = f.forest(); *d++ = f.unspecified();
+        }
+        return r;
+    }
+
+    /** create cells from a numpy array, either structured with named fields, or 2d with one row for each cell */
+    template <class T>
+    static vector<T> create_from_geo_cell_data_array(object a) {
+        static const char* names[] = { "x", "y", "z", "area", "catchment_id", "radiation_slope_factor", "glacier", "lake", "reservoir", "forest" };
+        object m = a;
+        if (a.attr("dtype").attr("names") != object()) {
+            boost::python::list cols;
+            for (auto n : names)
+                cols.append(a[n]);
+            m = import("numpy").attr("column_stack")(cols);
+        }
+        numpy_boost<double, 2> v = extract<numpy_boost<double, 2>>(m);
+        if (v.shape()[1] < 10)
+            throw invalid_argument("create_from_geo_cell_data_array: array must have at least 10 columns, x,y,z,area,cid,rsf,glacier,lake,reservoir,forest");
+        const size_t n = v.shape()[0];
+        vector<T> r(n);
+        for (size_t i = 0; i < n; ++i) {
+            // clamp negative (or nan) fractions to zero and normalize, like LandTypeFractions(g,l,r,f,u) in python
+            shyft::core::land_type_fractions ltf(v[i][6], v[i][7], v[i][8], v[i][9], 1.0 - v[i][6] - v[i][7] - v[i][8] - v[i][9]);
+            r[i].geo = shyft::core::geo_cell_data(shyft::core::geo_point(v[i][0], v[i][1], v[i][2]), v[i][3], int(v[i][4]), v[i][5], ltf);
+        }
+        return r;
+    }
+
     template<class C>
     static void cell_state_etc(const char *stack_name) {
         typedef typename C::state_t cstate_t;
@@ -86,6 +232,14 @@ namespace expose {
 
     }
 
+    /** the per-cell statistics, not for cells that accumulate catchment discharge, since they keep no cell discharge */
+    template <class T>
+    static void cell_statistics(const char *cell_name, std::false_type) {
+        expose::statistics::basic_cell<T>(cell_name);
+    }
+    template <class T>
+    static void cell_statistics(const char *cell_name, std::true_type) {}
+
     template <class T>
     static void cell(const char *cell_name,const char* cell_doc) {
       class_<T>(cell_name,cell_doc)
@@ -115,13 +269,45 @@ namespace expose {
              "Notice that the context and usage of these two functions is related\n"
              "to python orchestration and repository data-caching\n")
              .staticmethod("create_from_geo_cell_data_vector")
+        .def("create_from_geo_cell_data_array",create_from_geo_cell_data_array<T>,args("a"),
+             doc_intro("create a cell-vector from a numpy array, without creating python objects for each cell.")
+             doc_intro("The array is either a structured array with the fields")
+             doc_intro("x,y,z,area,catchment_id,radiation_slope_factor,glacier,lake,reservoir,forest")
+             doc_intro("or a 2d array with one row for each cell, columns in that order,")
+             doc_intro("as for create_from_geo_cell_data_vector. An 11th unspecified fraction column is ignored,")
+             doc_intro("since it is computed from the other fractions.")
+             doc_intro("Fractions are treated as LandTypeFractions(glacier,lake,reservoir,forest,unspecified),")
+             doc_intro("negative values are clipped to zero and the fractions are normalized to sum 1.0.")
+             doc_parameters()
+             doc_parameter("a","ndarray","the geo cell data, one element or row for each cell")
+             doc_returns("cells","<Cell>Vector","a vector of cells with geo_cell_data filled in")
+        )
+             .staticmethod("create_from_geo_cell_data_array")
 
         ;
-      expose::statistics::basic_cell<T>(cell_name);//common for all type of cells, so expose it here
+      cell_statistics<T>(cell_name, shyft::core::is_catchment_accumulator<typename T::response_collector_t>());//common for all type of cells, so expose it here
       cell_state_io<T>(cell_name);
     }
 
 
+    /** run_cells_streamed with a python callable as sink, called as sink(time_axis, catchment_ids, discharge_numpy_matrix)
+     *  The GIL is released while the blocks are computed, so that other python threads, e.g. prefetching
+     *  the next chunk of forcing, can run meanwhile, and taken again for each call to the sink.
+     */
+    template <class M>
+    static void run_cells_streamed(M& m, const shyft::core::interpolation_parameter& ip_parameter, const typename M::timeaxis_t& time_axis,
+                                   const typename M::region_env_t& env, size_t block_steps, const vector<int>& catchment_ids, object sink, size_t use_ncore) {
+        scoped_gil_release gil;
+        m.run_cells_streamed(ip_parameter, time_axis, env, block_steps, catchment_ids,
+            [&sink](const typename M::timeaxis_t& ta, const vector<int>& cids, const vector<double>& q) {
+                scoped_gil_aquire py_gil;
+                int dims[] = { int(cids.size()), int(ta.size()) };
+                numpy_boost<double, 2> r(dims);
+                std::copy(std::begin(q), std::end(q), r.data());
+                sink(ta, cids, r);
+            }, use_ncore);
+    }
+
     template <class M>
     static void model(const char *model_name,const char *model_doc) {
         char m_doc[5000];
@@ -156,6 +342,13 @@ namespace expose {
                         "Then use the connect_catchment_to_river(cid,rid) method\n"
                         "to route cell discharge into the river-network\n")
          .def("has_routing",&M::has_routing,"true if some cells routes to river-network")
+         .def("get_catchment_discharge_sum",&M::get_catchment_discharge_sum,args("cid"),
+                doc_intro("returns the discharge sum [m3/s] of the cells of the catchment, as accumulated by the last run_cells,")
+                doc_intro("only for models with cells that accumulate catchment discharge, e.g. PTGSKCatchmentDischargeModel")
+                doc_parameters()
+                doc_parameter("cid","int","the catchment id")
+                doc_returns("discharge","TsFixed","the catchment discharge sum on the model time-axis")
+         )
          .def("river_output_flow_m3s",&M::river_output_flow_m3s,args("rid"),"returns the routed output flow of the specified river id (rid))")
          .def("river_upstream_inflow_m3s",&M::river_upstream_inflow_m3s,args("rid"),"returns the routed upstream inflow to the specified river id (rid))")
          .def("river_local_inflow_m3s",&M::river_local_inflow_m3s,args("rid"),"returns the routed local inflow from connected cells to the specified river id (rid))")
@@ -170,6 +363,14 @@ namespace expose {
          "\t river identifier, can be set to 0 to indicate disconnect from routing"
          )
          .def("number_of_catchments",&M::number_of_catchments,"compute and return number of catchments using info in cells.geo.catchment_id()")
+         .def("get_catchment_cell_index",&M::get_catchment_cell_index,"returns the catchment to cell-index lookup of the cells, pass it to the statistics constructor for fast catchment statistics")
+         .def("cell_areas",cell_areas<M>,"returns a numpy array with the area [m2] of each cell, in order of appearance")
+         .def("cell_mid_points",cell_mid_points<M>,"returns a numpy array, shape (n_cells,3), with the x,y,z of each cell mid_point")
+         .def("cell_catchment_ids",cell_catchment_ids<M>,"returns a numpy int array with the catchment_id of each cell")
+         .def("cell_land_type_fractions",cell_land_type_fractions<M>,
+             "returns a numpy array, shape (n_cells,5), with the glacier,lake,reservoir,forest and unspecified\n"
+             "land type fractions of each cell\n"
+         )
 		 .def("extract_geo_cell_data",&M::extract_geo_cell_data,
              "extracts the geo_cell_data and return it as GeoCellDataVector that can\n"
              "be passed into a the constructor of a new region-model (clone-operation)\n"
@@ -216,6 +417,23 @@ namespace expose {
                 doc_parameter("start_step","int","start_step in the time-axis to start at, default=0, meaning start at the beginning")
                 doc_parameter("n_steps","int","number of steps to run in a partial run, default=0 indicating the complete time-axis is covered")
          )
+         .def("run_cells_streamed",run_cells_streamed<M>,(boost::python::arg("interpolation_parameter"),boost::python::arg("time_axis"),boost::python::arg("env"),
+                boost::python::arg("block_steps"),boost::python::arg("catchment_ids"),boost::python::arg("sink"),boost::python::arg("use_ncore")=0),
+                doc_intro("run interpolation and cells in time-blocks, streaming the catchment discharge of each block to a sink")
+                doc_intro("Only the current block is kept in the cells, so memory is proportional to cells x block_steps,")
+                doc_intro("instead of cells x time_axis.size(). The cell state is carried from one block to the next.")
+                doc_intro("When done, the model time_axis and cell time-series are those of the last block.")
+                doc_intro("The GIL is released while computing, so other python threads can run, except during the sink calls.")
+                doc_parameters()
+                doc_parameter("interpolation_parameter","InterpolationParameter","contains wanted parameters for the interpolation")
+                doc_parameter("time_axis","TimeAxis","the complete time-axis to run")
+                doc_parameter("env","RegionEnvironment","contains the region environment with geo-localized time-series for P,T,R,W,Rh")
+                doc_parameter("block_steps","int","number of time-steps in each block, the last block can be shorter")
+                doc_parameter("catchment_ids","IntVector","catchment ids to aggregate, if empty, all catchments calculated by the catchment calculation filter, ids not calculated raises an error")
+                doc_parameter("sink","callable","called as sink(block_time_axis, catchment_ids, discharge) for each block, discharge is a numpy array catchment_ids x block steps [m3/s]")
+                doc_parameter("use_ncore","int","number of worker threads, 0 means use the model ncore")
+                doc_returns("nothing","","")
+         )
          .def("run_interpolation",run_interpolation_f,(boost::python::arg("interpolation_parameter"),boost::python::arg("time_axis"),boost::python::arg("env"),boost::python::arg("best_effort")=true),
                 doc_intro("run_interpolation interpolates region_environment temp,precip,rad.. point sources")
                 doc_intro("to a value representative for the cell.mid_point().")
@@ -254,7 +472,12 @@ namespace expose {
                     "\n"
                     "param catchment_id_list is a catchment id vector\n"
          )
-         .def("set_calculation_filter", &M::set_catchment_calculation_filter, args("catchment_id_list","river_id_list"),
+         .def("get_catchment_calculation_filter",&M::get_catchment_calculation_filter,
+                    "returns the catchment ids of the current calculation filter, empty if there is no filter\n"
+                    "(i.e. all catchments are calculated). The list can be passed to set_catchment_calculation_filter\n"
+                    "to re-establish the filter\n"
+         )
+         .def("set_calculation_filter", &M::set_calculation_filter, args("catchment_id_list","river_id_list"),
                  "set/reset the catchment *and* river based calculation filter. This affects what get simulate/calculated during\n"
                  "the run command. Pass an empty list to reset/clear the filter (i.e. no filter).\n"
                  "\n"
@@ -291,6 +514,13 @@ namespace expose {
                     "param on_or_off true|or false.\n"
                     "note if the underlying cell do not support snow sca|swe collection, this \n"
         )
+        .def("set_response_collection",&M::set_response_collection,args("catchment_id","mask"),
+                    "set which response variables to collect for specified or all cells\n"
+                    "disabled variables are not allocated, nor written to during the run.\n"
+                    "param catchment_id to set the collection for, -1 means all cells\n"
+                    "param mask the response variables to collect, e.g. for pt_gs_k: PTGSKResponseVariable.AVG_DISCHARGE|PTGSKResponseVariable.SNOW_SWE\n"
+                    "note if the underlying cell do not support selective response collection, this call raises RuntimeError\n"
+        )
         .def("get_cells",&M::get_cells,"cells as shared_ptr<vector<cell_t>>")
         .def("size",&M::size,"return number of cells")
         .add_property("cells",&M::get_cells,"cells of the model")
@@ -329,6 +559,47 @@ namespace expose {
 
 
 
+    /** a python callable as optimizer trace callback, aquiring the gil for the call */
+    template <class P>
+    struct py_trace_callback {
+        object cb;
+        void operator()(double goal_fn, const P& p) const {
+            scoped_gil_aquire gil;
+            try {
+                boost::python::call<void>(cb.ptr(), goal_fn, p);
+            } catch (const boost::python::error_already_set&) {
+                PyErr_Print();// an error in the callback should not stop the optimization
+            }
+        }
+    };
+
+    template <class O>
+    static void set_trace_callback(O& o, object cb) {
+        if (cb.ptr() == Py_None)
+            o.set_trace_callback(nullptr);
+        else
+            o.set_trace_callback(py_trace_callback<typename O::parameter_t>{cb});
+    }
+
+    // the optimize methods release the gil, so that the trace callback can be called from the parallel evaluation threads
+    template <class O, class P>
+    static P optimize_bobyqa_(O& o, const P& p, size_t max_n_evaluations, double tr_start, double tr_stop) {
+        scoped_gil_release gil;
+        return o.optimize(p, max_n_evaluations, tr_start, tr_stop);
+    }
+
+    template <class O, class P>
+    static P optimize_dream_(O& o, const P& p, size_t max_n_evaluations) {
+        scoped_gil_release gil;
+        return o.optimize_dream(p, max_n_evaluations);
+    }
+
+    template <class O, class P>
+    static P optimize_sceua_(O& o, const P& p, size_t max_n_evaluations, double x_eps, double y_eps) {
+        scoped_gil_release gil;
+        return o.optimize_sceua(p, max_n_evaluations, x_eps, y_eps);
+    }
+
     template<class RegionModel>
     static void
     model_calibrator(const char *optimizer_name) {
@@ -339,14 +610,14 @@ namespace expose {
         typedef typename Optimizer::target_specification_t target_specification_t;
 
         // fix overloads mapping vs. vector& new parameter stuff
-        std::vector<double>(Optimizer::*optimize_v)(const std::vector<double>&, size_t, double, double ) = &Optimizer::optimize;
-        parameter_t(Optimizer::*optimize_p)(const parameter_t&, size_t, double, double) = &Optimizer::optimize;
+        std::vector<double>(*optimize_v)(Optimizer&, const std::vector<double>&, size_t, double, double ) = &optimize_bobyqa_<Optimizer, std::vector<double>>;
+        parameter_t(*optimize_p)(Optimizer&, const parameter_t&, size_t, double, double) = &optimize_bobyqa_<Optimizer, parameter_t>;
 
-        std::vector<double>(Optimizer::*optimize_dream_v)(const std::vector<double>&, size_t) = &Optimizer::optimize_dream;
-        parameter_t(Optimizer::*optimize_dream_p)(const parameter_t&, size_t) = &Optimizer::optimize_dream;
+        std::vector<double>(*optimize_dream_v)(Optimizer&, const std::vector<double>&, size_t) = &optimize_dream_<Optimizer, std::vector<double>>;
+        parameter_t(*optimize_dream_p)(Optimizer&, const parameter_t&, size_t) = &optimize_dream_<Optimizer, parameter_t>;
 
-        std::vector<double> (Optimizer::*optimize_sceua_v)(const std::vector<double>&,size_t,double,double)=&Optimizer::optimize_sceua;
-        parameter_t(Optimizer::*optimize_sceua_p)(const parameter_t&, size_t, double, double) = &Optimizer::optimize_sceua;
+        std::vector<double> (*optimize_sceua_v)(Optimizer&, const std::vector<double>&,size_t,double,double)=&optimize_sceua_<Optimizer, std::vector<double>>;
+        parameter_t(*optimize_sceua_p)(Optimizer&, const parameter_t&, size_t, double, double) = &optimize_sceua_<Optimizer, parameter_t>;
 
         double (Optimizer::*calculate_goal_function_v)(const std::vector<double>&) = &Optimizer::calculate_goal_function;
         double (Optimizer::*calculate_goal_function_p)(const parameter_t&) = &Optimizer::calculate_goal_function;
@@ -478,6 +749,41 @@ namespace expose {
         .def("reset_states",&Optimizer::reset_states,"reset the state of the model to the initial state before starting the run/optimize")
         .def("set_parameter_ranges",&Optimizer::set_parameter_ranges,args("p_min","p_max"),"set the parameter ranges, set min=max=wanted parameter value for those not subject to change during optimization")
         .def("set_verbose_level",&Optimizer::set_verbose_level,args("level"),"set verbose level on stdout during calibration,0 is silent,1 is more etc.")
+        .def("set_parallel_evaluation",&Optimizer::set_parallel_evaluation,args("n_models"),
+                "set number of models used to evaluate populations concurrently in optimize_dream and optimize_sceua.\n"
+                "n_models-1 clones of the region-model are made for each optimization, and the model cores are split between them.\n"
+                "The trace holds the evaluations in the order they complete, which may vary from run to run when n_models > 1.\n"
+                "For sceua the result is the same regardless of n_models. For dream, n_models > 1 evaluates the proposals of\n"
+                "all chains in an iteration as one batch, a generation-wise variant of the sequential sampler used for n_models=1.\n"
+                "Early abort, see set_early_abort, is not applied when n_models > 1.\n"
+                "param n_models number of models, default 1, meaning sequential evaluation\n")
+        .def("get_parallel_evaluation",&Optimizer::get_parallel_evaluation,"returns number of models used to evaluate populations concurrently")
+        .def("set_trace_callback",&set_trace_callback<Optimizer>,args("callback"),
+                "set a callable that is called as callback(goal_function_value,parameter) for each evaluation, as it is traced,\n"
+                "so that the progress of an optimization can be followed while it runs.\n"
+                "With parallel evaluation, the callback is called from the threads of the models, one call at a time.\n"
+                "Errors raised by the callback are printed, and do not stop the optimization.\n"
+                "param callback the callable, or None to remove the callback\n")
+        .def("set_early_abort",&Optimizer::set_early_abort,(boost::python::arg("enable"),boost::python::arg("margin")=0.0,boost::python::arg("n_checks")=4),
+                "enable/disable early abort of goal-function evaluations during optimize.\n"
+                "When enabled, the model is run in n_checks blocks of time-steps, and after each block a lower bound\n"
+                "of the goal-function is computed from the elapsed part of the period.\n"
+                "Only DISCHARGE targets with NASH_SUTCLIFFE,RMSE or ABS_DIFF contributes to the lower bound, other targets counts as 0.\n"
+                "If the lower bound exceeds the best value found so far by more than margin, the remaining blocks are skipped\n"
+                "and the lower bound is returned as the goal-function value, traced with trace_aborted(i) True\n"
+                "param enable true to enable, default disabled\n"
+                "param margin the lower bound must exceed the best value + margin to abort, must be >= 0\n"
+                "param n_checks number of blocks to split the run into\n")
+        .def("get_early_abort",&Optimizer::get_early_abort,"returns true if early abort of goal-function evaluations is enabled")
+        .def("set_warm_up",&Optimizer::set_warm_up,(boost::python::arg("n_steps"),boost::python::arg("invalidating_parameters")),
+                "enable/disable the warm-up checkpoint for goal-function evaluations during optimize.\n"
+                "The first n_steps of the model time-axis is run once as a spin-up period, and the resulting cell-states\n"
+                "are used as starting point for each evaluation, that then only runs the remaining time-steps.\n"
+                "The spin-up is run with the parameters optimize was started with, except for the invalidating parameters,\n"
+                "so a change in any of those triggers a new spin-up. The spin-up period is excluded from the goal-function.\n"
+                "param n_steps number of spin-up time-steps, 0 disables the checkpoint\n"
+                "param invalidating_parameters StringVector with names of parameters, as given by parameter.get_name(i), that invalidates the checkpoint\n")
+        .def("get_warm_up_steps",&Optimizer::get_warm_up_steps,"returns the number of warm-up time-steps, 0 if disabled")
         .def("calculate_goal_function",calculate_goal_function_v,args("full_vector_of_parameters"),
                 "(deprecated)calculate the goal_function as used by minbobyqa,etc.,\n"
                 "using the full set of  parameters vectors (as passed to optimize())\n"
@@ -511,6 +817,10 @@ namespace expose {
         .def("trace_goal_function_value",&Optimizer::trace_goal_fn,args("i"),
             doc_intro("returns the i'th goal function value")
         )
+        .def("trace_aborted",&Optimizer::trace_aborted,args("i"),
+            doc_intro("returns true if the i'th evaluation was aborted early, see set_early_abort,")
+            doc_intro("and the i'th trace_goal_function_value is a lower bound, not the goal function value")
+        )
         .def("trace_parameter",&Optimizer::trace_parameter,args("i"),
             doc_intro("returns the i'th parameter tried, corresponding to the ")
             doc_intro("i'th trace_goal_function value")
@@ -1,4 +1,6 @@
 #pragma once
+#include <numpy/arrayobject.h>
+#include "numpy_boost_python.hpp"
 
 namespace expose {
     namespace statistics {
@@ -8,6 +10,21 @@ namespace expose {
         typedef size_t ix_;
         using namespace boost::python;
 
+        static void* np_import() {
+            import_array();
+            return nullptr;
+        }
+
+        template <class bc_stat>
+        static numpy_boost<double, 2> discharge_matrix(const bc_stat& s, cids_ catchment_indexes) {
+            size_t n_steps = 0;
+            auto v = s.discharge_matrix(catchment_indexes, n_steps);
+            int dims[] = { int(catchment_indexes.size()), int(n_steps) };
+            numpy_boost<double, 2> r(dims);
+            std::copy(std::begin(v), std::end(v), r.data());
+            return r;
+        }
+
         template<class cell>
         static void kirchner(const char *cell_name) {
             char state_name[200];sprintf(state_name,"%sKirchnerStateStatistics",cell_name);
@@ -320,8 +337,15 @@ namespace expose {
 
 
 
+            np_import();// discharge_matrix returns numpy arrays
             class_<bc_stat>(base_name,"provides statistics for cell environment plus mandatory discharge",no_init)
                 .def(init<std::shared_ptr<std::vector<cell>> >(args("cells"),"construct basic cell statistics object"))
+                .def(init<std::shared_ptr<std::vector<cell>>, std::shared_ptr<shyft::core::catchment_cell_index> >(args("cells","catchment_cell_index"),
+                     "construct basic cell statistics object, using the catchment cell index of the region-model\n"
+                     "(model.get_catchment_cell_index()) to avoid building it for each statistics object"))
+                .def("discharge_matrix",discharge_matrix<bc_stat>,args("catchment_indexes"),
+                     "returns a numpy array, shape (len(catchment_indexes), n_steps),\n"
+                     "where row i is the discharge sum[m3/s] for catchment_indexes[i], computed in one pass over the cells")
                 .def("discharge",discharge_ts,args("catchment_indexes"), "returns sum  for catcment_ids")
                 .def("discharge",discharge_vd,args("catchment_indexes","i"),"returns  for cells matching catchments_ids at the i'th timestep")
 				.def("discharge_value", &bc_stat::discharge_value, args("catchment_indexes", "i"), "returns  for cells matching catchments_ids at the i'th timestep")
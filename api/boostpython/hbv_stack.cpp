@@ -59,9 +59,16 @@ namespace expose {
 				;
 
 			typedef std::vector<state> HbvStateVector;
-			class_<HbvStateVector, bases<>, std::shared_ptr<HbvStateVector> >("HbvStateVector")
+			auto state_vector = class_<HbvStateVector, bases<>, std::shared_ptr<HbvStateVector> >("HbvStateVector")
 				.def(vector_indexing_suite<HbvStateVector>())
 				;
+			expose::state_field<state, hbv_snow::state, &state::snow, &hbv_snow::state::swe>(state_vector, "snow_swe", "numpy array of hbv-snow state swe for all states, assignable from a numpy array of equal size");
+			expose::state_field<state, hbv_snow::state, &state::snow, &hbv_snow::state::sca>(state_vector, "snow_sca", "numpy array of hbv-snow state sca for all states, assignable from a numpy array of equal size");
+			expose::state_field<state, hbv_soil::state, &state::soil, &hbv_soil::state::sm>(state_vector, "soil_sm", "numpy array of hbv-soil state sm for all states, assignable from a numpy array of equal size");
+			expose::state_field<state, hbv_tank::state, &state::tank, &hbv_tank::state::uz>(state_vector, "tank_uz", "numpy array of hbv-tank state uz for all states, assignable from a numpy array of equal size");
+			expose::state_field<state, hbv_tank::state, &state::tank, &hbv_tank::state::lz>(state_vector, "tank_lz", "numpy array of hbv-tank state lz for all states, assignable from a numpy array of equal size");
+			expose::state_vector_serialization<state>(state_vector);
+
 			class_<response>("HbvResponse", "This struct contains the responses of the methods used in the Hbv assembly")
 				.def_readwrite("pt", &response::pt, "priestley_taylor response")
 				.def_readwrite("snow", &response::snow, "hbb_snow response")
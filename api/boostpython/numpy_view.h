@@ -0,0 +1,56 @@
+#pragma once
+// include after <numpy/arrayobject.h> and numpy_boost_python.hpp, import_array() must be called in the including file
+#include <memory>
+
+namespace expose {
+
+    /** \brief PyCapsule destructor that deletes the owned object of type P */
+    template<class P>
+    static void capsule_delete(PyObject* c) {
+        delete static_cast<P*>(PyCapsule_GetPointer(c, nullptr));
+    }
+
+    /** \brief returns a new PyCapsule that owns a moved copy of p, usable as base object for numpy arrays */
+    template<class P>
+    static PyObject* owning_capsule(P&& p) {
+        using P_ = typename std::decay<P>::type;
+        auto* h = new P_(std::forward<P>(p));
+        PyObject* c = PyCapsule_New(h, nullptr, &capsule_delete<P_>);
+        if (!c) {
+            delete h;
+            boost::python::throw_error_already_set();
+        }
+        return c;
+    }
+
+    /** \brief zero-copy 1-d numpy view of n values at data
+     *
+     * \param data pointer to the first element, must stay valid as long as owner is alive
+     * \param n number of elements
+     * \param owner a new reference to the object that owns data, it is stolen and kept alive as the array base
+     * \param writable if false, the numpy array is flagged read-only
+     * \return the numpy array
+     */
+    template<class T>
+    static boost::python::object numpy_view(T* data, size_t n, PyObject* owner, bool writable) {
+        npy_intp dims[] = { npy_intp(n) };
+        PyObject* a = PyArray_SimpleNewFromData(1, dims, ::detail::numpy_type_map<T>(), (void*)data);
+        if (!a) {
+            Py_DECREF(owner);
+            boost::python::throw_error_already_set();
+        }
+        if (!writable)
+            PyArray_CLEARFLAGS((PyArrayObject*)a, NPY_ARRAY_WRITEABLE);
+        PyArray_SetBaseObject((PyArrayObject*)a, owner);
+        return boost::python::object(boost::python::handle<>(a));
+    }
+
+    /** \brief 1-d numpy array that takes over the memory of the vector v, no copy */
+    template<class T>
+    static boost::python::object numpy_from_vector(std::vector<T>&& v) {
+        auto p = std::make_shared<std::vector<T>>(std::move(v));
+        T* data = p->data();
+        size_t n = p->size();
+        return numpy_view(data, n, owning_capsule(std::move(p)), true);
+    }
+}
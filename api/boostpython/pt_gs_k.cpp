@@ -59,9 +59,19 @@ namespace expose {
                 ;
 
             typedef std::vector<state> PTGSKStateVector;
-            class_<PTGSKStateVector,bases<>,std::shared_ptr<PTGSKStateVector> >("PTGSKStateVector")
+            auto state_vector = class_<PTGSKStateVector,bases<>,std::shared_ptr<PTGSKStateVector> >("PTGSKStateVector")
                 .def(vector_indexing_suite<PTGSKStateVector>())
                 ;
+            expose::state_field<state, gamma_snow::state, &state::gs, &gamma_snow::state::albedo>(state_vector, "gs_albedo", "numpy array of gamma-snow state albedo for all states, assignable from a numpy array of equal size");
+            expose::state_field<state, gamma_snow::state, &state::gs, &gamma_snow::state::lwc>(state_vector, "gs_lwc", "numpy array of gamma-snow state lwc for all states, assignable from a numpy array of equal size");
+            expose::state_field<state, gamma_snow::state, &state::gs, &gamma_snow::state::surface_heat>(state_vector, "gs_surface_heat", "numpy array of gamma-snow state surface_heat for all states, assignable from a numpy array of equal size");
+            expose::state_field<state, gamma_snow::state, &state::gs, &gamma_snow::state::alpha>(state_vector, "gs_alpha", "numpy array of gamma-snow state alpha for all states, assignable from a numpy array of equal size");
+            expose::state_field<state, gamma_snow::state, &state::gs, &gamma_snow::state::sdc_melt_mean>(state_vector, "gs_sdc_melt_mean", "numpy array of gamma-snow state sdc_melt_mean for all states, assignable from a numpy array of equal size");
+            expose::state_field<state, gamma_snow::state, &state::gs, &gamma_snow::state::acc_melt>(state_vector, "gs_acc_melt", "numpy array of gamma-snow state acc_melt for all states, assignable from a numpy array of equal size");
+            expose::state_field<state, gamma_snow::state, &state::gs, &gamma_snow::state::iso_pot_energy>(state_vector, "gs_iso_pot_energy", "numpy array of gamma-snow state iso_pot_energy for all states, assignable from a numpy array of equal size");
+            expose::state_field<state, gamma_snow::state, &state::gs, &gamma_snow::state::temp_swe>(state_vector, "gs_temp_swe", "numpy array of gamma-snow state temp_swe for all states, assignable from a numpy array of equal size");
+            expose::state_field<state, kirchner::state, &state::kirchner, &kirchner::state::q>(state_vector, "kirchner_q", "numpy array of kirchner state q for all states, assignable from a numpy array of equal size");
+            expose::state_vector_serialization<state>(state_vector);
 
 
             class_<response>("PTGSKResponse","This struct contains the responses of the methods used in the PTGSK assembly")
@@ -76,6 +86,17 @@ namespace expose {
 
         static void
         collectors() {
+            enum_<pt_gs_k::response_variable>("PTGSKResponseVariable","response variables of the PTGSKAllCollector, combine with | to a collection mask")
+                .value("AVG_DISCHARGE",pt_gs_k::AVG_DISCHARGE)
+                .value("CHARGE_M3S",pt_gs_k::CHARGE_M3S)
+                .value("SNOW_SCA",pt_gs_k::SNOW_SCA)
+                .value("SNOW_SWE",pt_gs_k::SNOW_SWE)
+                .value("SNOW_OUTFLOW",pt_gs_k::SNOW_OUTFLOW)
+                .value("GLACIER_MELT",pt_gs_k::GLACIER_MELT)
+                .value("AE_OUTPUT",pt_gs_k::AE_OUTPUT)
+                .value("PE_OUTPUT",pt_gs_k::PE_OUTPUT)
+                .value("ALL_RESPONSES",pt_gs_k::ALL_RESPONSES)
+                ;
             typedef shyft::core::pt_gs_k::all_response_collector PTGSKAllCollector;
             class_<PTGSKAllCollector>("PTGSKAllCollector", "collect all cell response from a run")
                 .def_readonly("destination_area",&PTGSKAllCollector::destination_area,"a copy of cell area [m2]")
@@ -87,6 +108,21 @@ namespace expose {
                 .def_readonly("ae_output",&PTGSKAllCollector::ae_output,"actual evap mm/h")
                 .def_readonly("pe_output",&PTGSKAllCollector::pe_output,"pot evap mm/h")
                 .def_readonly("end_reponse",&PTGSKAllCollector::end_reponse,"end_response, at the end of collected")
+                .def_readwrite("collect_mask",&PTGSKAllCollector::collect_mask,"PTGSKResponseVariable bits to collect, the others are empty")
+            ;
+
+            typedef shyft::core::pt_gs_k::all_response_collector32 PTGSKAllCollector32;
+            class_<PTGSKAllCollector32>("PTGSKAllCollector32", "collect all cell response from a run, stored as float32 time-series")
+                .def_readonly("destination_area",&PTGSKAllCollector32::destination_area,"a copy of cell area [m2]")
+                .def_readonly("avg_discharge",&PTGSKAllCollector32::avg_discharge,"Kirchner Discharge given in [m^3/s] for the timestep")
+                .def_readonly("snow_sca",&PTGSKAllCollector32::snow_sca," gamma snow covered area fraction, sca.. 0..1 - at the end of timestep (state)")
+                .def_readonly("snow_swe",&PTGSKAllCollector32::snow_swe,"gamma snow swe, [mm] over the cell sca.. area, - at the end of timestep")
+                .def_readonly("snow_outflow",&PTGSKAllCollector32::snow_outflow," gamma snow output [m^3/s] for the timestep")
+                .def_readonly("glacier_melt", &PTGSKAllCollector32::glacier_melt, " glacier melt (outflow) [m3/s] for the timestep")
+                .def_readonly("ae_output",&PTGSKAllCollector32::ae_output,"actual evap mm/h")
+                .def_readonly("pe_output",&PTGSKAllCollector32::pe_output,"pot evap mm/h")
+                .def_readonly("end_reponse",&PTGSKAllCollector32::end_reponse,"end_response, at the end of collected")
+                .def_readwrite("collect_mask",&PTGSKAllCollector32::collect_mask,"PTGSKResponseVariable bits to collect, the others are empty")
             ;
 
             typedef shyft::core::pt_gs_k::discharge_collector PTGSKDischargeCollector;
@@ -98,6 +134,12 @@ namespace expose {
                 .def_readonly("end_reponse",&PTGSKDischargeCollector::end_response,"end_response, at the end of collected")
                 .def_readwrite("collect_snow",&PTGSKDischargeCollector::collect_snow,"controls collection of snow routine")
                 ;
+            typedef shyft::core::pt_gs_k::catchment_discharge_collector PTGSKCatchmentDischargeCollector;
+            class_<PTGSKCatchmentDischargeCollector>("PTGSKCatchmentDischargeCollector",
+                "adds the cell discharge directly into the catchment sum of the model, keeps no cell time-series, see PTGSKCatchmentDischargeModel")
+                .def_readonly("destination_area",&PTGSKCatchmentDischargeCollector::destination_area,"a copy of cell area [m2]")
+                .def_readonly("end_response",&PTGSKCatchmentDischargeCollector::end_response,"end_response, at the end of collected")
+                ;
             typedef shyft::core::pt_gs_k::null_collector PTGSKNullCollector;
             class_<PTGSKNullCollector>("PTGSKNullCollector","collector that does not collect anything, useful during calibration to minimize memory&maximize speed")
                 ;
@@ -124,6 +166,13 @@ namespace expose {
               typedef shyft::core::cell<parameter, environment_t, state, null_collector, discharge_collector> PTGSKCellOpt;
               expose::cell<PTGSKCellAll>("PTGSKCellAll","tbd: PTGSKCellAll doc");
               expose::cell<PTGSKCellOpt>("PTGSKCellOpt","tbd: PTGSKCellOpt doc");
+              expose::cell<pt_gs_k::cell_catchment_discharge_t>("PTGSKCellCatchmentDischarge","cell that adds its discharge directly into the catchment sums of the model, no cell time-series");
+              typedef pt_gs_k::cell_complete_response32_t PTGSKCellAll32;
+              expose::cell<PTGSKCellAll32>("PTGSKCellAll32","as PTGSKCellAll, but with forcing and response time-series stored as float32");
+              expose::statistics::gamma_snow<PTGSKCellAll32>("PTGSKCell32");
+              expose::statistics::actual_evapotranspiration<PTGSKCellAll32>("PTGSKCell32");
+              expose::statistics::priestley_taylor<PTGSKCellAll32>("PTGSKCell32");
+              expose::statistics::kirchner<PTGSKCellAll32>("PTGSKCell32");
               expose::statistics::gamma_snow<PTGSKCellAll>("PTGSKCell");//it only gives meaning to expose the *All collect cell-type
               expose::statistics::actual_evapotranspiration<PTGSKCellAll>("PTGSKCell");
               expose::statistics::priestley_taylor<PTGSKCellAll>("PTGSKCell");
@@ -138,6 +187,10 @@ namespace expose {
             typedef shyft::core::region_model<pt_gs_k::cell_complete_response_t, shyft::api::a_region_environment> PTGSKModel;
             expose::model<PTGSKModel>("PTGSKModel","PTGSK");
             expose::model<PTGSKOptModel>("PTGSKOptModel","PTGSK");
+            typedef shyft::core::region_model<pt_gs_k::cell_complete_response32_t, shyft::api::a_region_environment> PTGSKModel32;
+            expose::model<PTGSKModel32>("PTGSKModel32","PTGSK");
+            typedef shyft::core::region_model<pt_gs_k::cell_catchment_discharge_t, shyft::api::a_region_environment> PTGSKCatchmentDischargeModel;
+            expose::model<PTGSKCatchmentDischargeModel>("PTGSKCatchmentDischargeModel","PTGSK");
             def_clone_to_similar_model<PTGSKModel, PTGSKOptModel>("create_opt_model_clone");
             def_clone_to_similar_model<PTGSKOptModel,PTGSKModel>("create_full_model_clone");
         }
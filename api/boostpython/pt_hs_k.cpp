@@ -56,9 +56,13 @@ namespace expose {
                 ;
 
             typedef std::vector<state> PTHSKStateVector;
-            class_<PTHSKStateVector,bases<>,std::shared_ptr<PTHSKStateVector> >("PTHSKStateVector")
+            auto state_vector = class_<PTHSKStateVector,bases<>,std::shared_ptr<PTHSKStateVector> >("PTHSKStateVector")
                 .def(vector_indexing_suite<PTHSKStateVector>())
                 ;
+            expose::state_field<state, hbv_snow::state, &state::snow, &hbv_snow::state::swe>(state_vector, "snow_swe", "numpy array of hbv-snow state swe for all states, assignable from a numpy array of equal size");
+            expose::state_field<state, hbv_snow::state, &state::snow, &hbv_snow::state::sca>(state_vector, "snow_sca", "numpy array of hbv-snow state sca for all states, assignable from a numpy array of equal size");
+            expose::state_field<state, kirchner::state, &state::kirchner, &kirchner::state::q>(state_vector, "kirchner_q", "numpy array of kirchner state q for all states, assignable from a numpy array of equal size");
+            expose::state_vector_serialization<state>(state_vector);
             class_<response>("PTHSKResponse","This struct contains the responses of the methods used in the PTHSK assembly")
                 .def_readwrite("pt",&response::pt,"priestley_taylor response")
                 .def_readwrite("snow",&response::snow,"hbc-snow response")
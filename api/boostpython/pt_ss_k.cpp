@@ -60,9 +60,17 @@ namespace expose {
                 ;
 
             typedef std::vector<state> PTSSKStateVector;
-            class_<PTSSKStateVector,bases<>,std::shared_ptr<PTSSKStateVector> >("PTSSKStateVector")
+            auto state_vector = class_<PTSSKStateVector,bases<>,std::shared_ptr<PTSSKStateVector> >("PTSSKStateVector")
                 .def(vector_indexing_suite<PTSSKStateVector>())
                 ;
+            expose::state_field<state, skaugen::state, &state::snow, &skaugen::state::nu>(state_vector, "snow_nu", "numpy array of skaugen snow state nu for all states, assignable from a numpy array of equal size");
+            expose::state_field<state, skaugen::state, &state::snow, &skaugen::state::alpha>(state_vector, "snow_alpha", "numpy array of skaugen snow state alpha for all states, assignable from a numpy array of equal size");
+            expose::state_field<state, skaugen::state, &state::snow, &skaugen::state::sca>(state_vector, "snow_sca", "numpy array of skaugen snow state sca for all states, assignable from a numpy array of equal size");
+            expose::state_field<state, skaugen::state, &state::snow, &skaugen::state::swe>(state_vector, "snow_swe", "numpy array of skaugen snow state swe for all states, assignable from a numpy array of equal size");
+            expose::state_field<state, skaugen::state, &state::snow, &skaugen::state::free_water>(state_vector, "snow_free_water", "numpy array of skaugen snow state free_water for all states, assignable from a numpy array of equal size");
+            expose::state_field<state, skaugen::state, &state::snow, &skaugen::state::residual>(state_vector, "snow_residual", "numpy array of skaugen snow state residual for all states, assignable from a numpy array of equal size");
+            expose::state_field<state, kirchner::state, &state::kirchner, &kirchner::state::q>(state_vector, "kirchner_q", "numpy array of kirchner state q for all states, assignable from a numpy array of equal size");
+            expose::state_vector_serialization<state>(state_vector);
 
 
             class_<response>("PTSSKResponse","This struct contains the responses of the methods used in the PTSSK assembly")
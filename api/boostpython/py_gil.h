@@ -0,0 +1,35 @@
+#pragma once
+// include after boost python/python headers
+/** \brief releases the python GIL for the lifetime of the object
+ *
+ * Use it around lengthy c++ computations that does not touch python objects,
+ * so that other python threads can run meanwhile.
+ */
+struct scoped_gil_release {
+    scoped_gil_release() noexcept {
+        py_thread_state = PyEval_SaveThread();
+    }
+    ~scoped_gil_release() noexcept {
+        PyEval_RestoreThread(py_thread_state);
+    }
+    scoped_gil_release(const scoped_gil_release&) = delete;
+    scoped_gil_release(scoped_gil_release&&) = delete;
+    scoped_gil_release& operator=(const scoped_gil_release&) = delete;
+private:
+    PyThreadState * py_thread_state;
+};
+
+/** \brief ensures the python GIL is held for the lifetime of the object, e.g. in c++ callbacks to python */
+struct scoped_gil_aquire {
+    scoped_gil_aquire() noexcept {
+        py_state = PyGILState_Ensure();
+    }
+    ~scoped_gil_aquire() noexcept {
+        PyGILState_Release(py_state);
+    }
+    scoped_gil_aquire(const scoped_gil_aquire&) = delete;
+    scoped_gil_aquire(scoped_gil_aquire&&) = delete;
+    scoped_gil_aquire& operator=(const scoped_gil_aquire&) = delete;
+private:
+    PyGILState_STATE   py_state;
+};
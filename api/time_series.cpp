@@ -2,6 +2,9 @@
 
 #include <dlib/statistics.h>
 #include <memory>
+#include <map>
+#include <tuple>
+#include <cstring>
 #include "time_series.h"
 #include "core/time_series_merge.h"
 #include "core/time_series_qm.h"
@@ -170,6 +173,290 @@ namespace shyft{
 
         }
 
+        /** \brief sequential evaluation of a ts at increasing time-points
+        *
+        * Used when the operands of a binary operation have different time-axis.
+        * The walker keeps the index of the current interval in the ts time-axis,
+        * and steps it forward as t increases, so that a complete merge-walk costs
+        * O(n) instead of a binary search for each point.
+        * Terminals are evaluated from their values, with linear interpolation
+        * for instant point interpretation, exactly as point_ts(t).
+        * Expressions with average(stair-case) interpretation are deflated once using .values().
+        * Expressions with instant interpretation are evaluated using value_at(t),
+        * since their f(t) is not in general the linear interpolation of their values.
+        */
+        struct ts_walker {
+            const apoint_ts& ts;
+            const gta_t& ta;
+            const utcperiod p;
+            const size_t n;
+            const bool linear;
+            std::vector<double> vx;///< computed values of an expression
+            const vector<double>* v;///< terminal values, or vx, null if ts(t) must be used
+            size_t i{string::npos};///< current interval index
+            utctime t_next{no_utctime};///< start of interval i+1, or the end of the time-axis
+
+            explicit ts_walker(const apoint_ts& ts)
+                :ts(ts), ta(ts.time_axis()), p(ta.total_period()), n(ta.size()),
+                 linear(ts.point_interpretation() == ts_point_fx::POINT_INSTANT_VALUE), v(terminal_values(ts)) {
+                if (!v && !linear) {
+                    vx = ts.values();
+                    v = &vx;
+                }
+            }
+
+            utctime next_time() const { return i + 1 < n ? ta.time(i + 1) : p.end; }
+
+            /** f(t), t must be increasing between calls */
+            double operator()(utctime t) {
+                if (!v)
+                    return ts(t);
+                if (t < p.start || t >= p.end)
+                    return nan;
+                if (i == string::npos) {
+                    i = ta.index_of(t);
+                    t_next = next_time();
+                } else {
+                    while (t >= t_next) {
+                        ++i;
+                        t_next = next_time();
+                    }
+                }
+                if (linear && i + 1 < n && std::isfinite((*v)[i + 1])) {
+                    const utctime t1 = ta.time(i);
+                    double f = double(t_next - t)/double(t_next - t1);
+                    return (*v)[i]*f + (1.0 - f)*(*v)[i + 1];
+                }
+                return (*v)[i];
+            }
+        };
+
+        /** element-wise a op b over a block of m values, SA,SB is the stride of a,b, 0 for a scalar */
+        template <size_t SA, size_t SB>
+        static void block_op(double* o, const double* a, iop_t op, const double* b, size_t m) {
+            switch (op) {
+            case OP_ADD:for (size_t i = 0; i < m; ++i) o[i] = a[SA*i] + b[SB*i]; return;
+            case OP_SUB:for (size_t i = 0; i < m; ++i) o[i] = a[SA*i] - b[SB*i]; return;
+            case OP_MUL:for (size_t i = 0; i < m; ++i) o[i] = a[SA*i] * b[SB*i]; return;
+            case OP_DIV:for (size_t i = 0; i < m; ++i) o[i] = a[SA*i] / b[SB*i]; return;
+            case OP_MAX:for (size_t i = 0; i < m; ++i) o[i] = std::max(a[SA*i], b[SB*i]); return;
+            case OP_MIN:for (size_t i = 0; i < m; ++i) o[i] = std::min(a[SA*i], b[SB*i]); return;
+            default: break;
+            }
+            throw runtime_error("Unsupported operation " + to_string(int(op)));
+        }
+
+        /** values of already evaluated (shared) sub-expressions, keyed by expression node */
+        typedef std::map<const ipoint_ts*, std::shared_ptr<const std::vector<double>>> ts_values_cache;
+
+        /** \brief fused evaluation of a chain of element-wise binary operations
+        *
+        * The expression tree of abin_op_ts, abin_op_ts_scalar and abin_op_scalar_ts nodes,
+        * that all have the same time-axis, is compiled into a small stack program.
+        * Anything else (terminals, other expression types, cached sub-expressions) are leaves.
+        * The program is then run block by block, so that the intermediate results
+        * are kept in small cache-friendly buffers, instead of full size vectors.
+        */
+        struct fused_ts_program {
+            enum code_t { LEAF, TS_OP_TS, TS_OP_SCALAR, SCALAR_OP_TS };
+            struct instr {
+                code_t code;
+                iop_t op;
+                const double* src;///< leaf values
+                double c;///< scalar operand
+            };
+            std::vector<instr> code;
+            std::vector<std::vector<double>> owned;///< values of leaves that needed evaluation
+            size_t depth{0};
+            size_t max_depth{0};
+            const ts_values_cache* cache;
+
+            /** compile the program for root, that must be is_fusable */
+            explicit fused_ts_program(const ipoint_ts* root, const ts_values_cache* cache = nullptr) :cache(cache) {
+                emit_op(root);
+            }
+
+            /** true if node is an element-wise operation that can be part of a fused chain */
+            static bool is_fusable(const ipoint_ts* node) {
+                if (auto b = dynamic_cast<const abin_op_ts*>(node))
+                    return b->bound && b->lhs.time_axis() == b->rhs.time_axis();
+                if (auto b = dynamic_cast<const abin_op_ts_scalar*>(node))
+                    return b->bound;
+                if (auto b = dynamic_cast<const abin_op_scalar_ts*>(node))
+                    return b->bound;
+                return false;
+            }
+
+            void push(code_t c, iop_t op, const double* src = nullptr, double x = 0.0) {
+                code.push_back(instr{ c, op, src, x });
+                if (c == LEAF) max_depth = std::max(max_depth, ++depth);
+                else if (c == TS_OP_TS) --depth;
+            }
+
+            void emit_op(const ipoint_ts* node) {
+                if (auto b = dynamic_cast<const abin_op_ts*>(node)) {
+                    emit(b->lhs);
+                    emit(b->rhs);
+                    push(TS_OP_TS, b->op);
+                } else if (auto b = dynamic_cast<const abin_op_ts_scalar*>(node)) {
+                    emit(b->lhs);
+                    push(TS_OP_SCALAR, b->op, nullptr, b->rhs);
+                } else if (auto b = dynamic_cast<const abin_op_scalar_ts*>(node)) {
+                    emit(b->rhs);// notice: abin_op_scalar_ts::values() computes max/min as max(ts,scalar)
+                    bool commutes = b->op == OP_ADD || b->op == OP_MUL || b->op == OP_MAX || b->op == OP_MIN;
+                    push(commutes ? TS_OP_SCALAR : SCALAR_OP_TS, b->op, nullptr, b->lhs);
+                }
+            }
+
+            void emit(const apoint_ts& ts) {
+                auto node = ts.ts.get();
+                if (cache) {
+                    auto f = cache->find(node);
+                    if (f != cache->end()) {
+                        push(LEAF, OP_NONE, f->second->data());
+                        return;
+                    }
+                }
+                if (is_fusable(node)) {
+                    emit_op(node);
+                    return;
+                }
+                const vector<double>* v = terminal_values(ts);
+                if (!v) {
+                    owned.emplace_back(ts.values());
+                    v = &owned.back();
+                }
+                push(LEAF, OP_NONE, v->data());
+            }
+
+            std::vector<double> run(size_t n) const {
+                const size_t block_size = 1024;
+                std::vector<double> r(n);
+                std::vector<std::vector<double>> regs(max_depth, std::vector<double>(block_size));
+                std::vector<const double*> stack(max_depth);
+                for (size_t b = 0; b < n; b += block_size) {
+                    const size_t m = std::min(block_size, n - b);
+                    size_t d = 0;
+                    for (size_t k = 0; k < code.size(); ++k) {
+                        const auto& x = code[k];
+                        if (x.code == LEAF) {
+                            stack[d++] = x.src + b;
+                            continue;
+                        }
+                        if (x.code == TS_OP_TS) --d;
+                        double* o = k + 1 == code.size() ? r.data() + b : regs[d - 1].data();// last instruction writes the result
+                        switch (x.code) {
+                        case TS_OP_TS: block_op<1, 1>(o, stack[d - 1], x.op, stack[d], m); break;
+                        case TS_OP_SCALAR: block_op<1, 0>(o, stack[d - 1], x.op, &x.c, m); break;
+                        case SCALAR_OP_TS: block_op<0, 1>(o, &x.c, x.op, stack[d - 1], m); break;
+                        default: break;
+                        }
+                        stack[d - 1] = o;
+                    }
+                }
+                return r;
+            }
+        };
+
+        /** values of ts, fusing element-wise chains, and using the cache for shared sub-expressions */
+        static std::vector<double> fused_values(const apoint_ts& ts, const ts_values_cache* cache = nullptr) {
+            if (!fused_ts_program::is_fusable(ts.ts.get()))
+                return ts.values();
+            return fused_ts_program(ts.ts.get(), cache).run(ts.time_axis().size());
+        }
+
+        /** \brief identify equal sub-expressions of a set of expressions
+        *
+        * Each node is given an id, equal for nodes with the same operation on operands with
+        * equal ids (hash-consing). Terminals are identified by their values, other nodes by identity.
+        * Ids are assigned in post-order, so the operands of a node have lower ids than the node.
+        */
+        struct ts_expression_ids {
+            typedef std::tuple<int, int, size_t, size_t, uint64_t> key_t;// kind, op, lhs id, rhs id, scalar bits
+            std::map<const ipoint_ts*, size_t> id_of;
+            std::map<key_t, size_t> ids;
+            std::vector<size_t> use_count;///< number of references to each id, from parent nodes or roots
+            std::vector<std::vector<const ipoint_ts*>> nodes;///< the nodes of each id
+            std::vector<apoint_ts> first;///< the first node found for each id
+
+            static uint64_t bits(double x) { uint64_t b; std::memcpy(&b, &x, sizeof(b)); return b; }
+
+            size_t operand(const apoint_ts& ts) {
+                size_t i = id(ts);
+                ++use_count[i];
+                return i;
+            }
+
+            size_t id(const apoint_ts& ts) {
+                auto node = ts.ts.get();
+                auto f = id_of.find(node);
+                if (f != id_of.end())
+                    return f->second;
+                key_t k;
+                if (fused_ts_program::is_fusable(node)) {
+                    if (auto b = dynamic_cast<const abin_op_ts*>(node)) {
+                        size_t l = operand(b->lhs), r = operand(b->rhs);
+                        k = key_t{ 1, int(b->op), l, r, 0 };
+                    } else if (auto b = dynamic_cast<const abin_op_ts_scalar*>(node)) {
+                        k = key_t{ 2, int(b->op), operand(b->lhs), 0, bits(b->rhs) };
+                    } else {
+                        auto c = dynamic_cast<const abin_op_scalar_ts*>(node);
+                        k = key_t{ 3, int(c->op), 0, operand(c->rhs), bits(c->lhs) };
+                    }
+                } else {
+                    const vector<double>* v = terminal_values(ts);
+                    k = key_t{ 0, 0, v ? size_t(v) : size_t(node), 0, 0 };
+                }
+                auto g = ids.find(k);
+                size_t i;
+                if (g == ids.end()) {
+                    i = use_count.size();
+                    ids[k] = i;
+                    use_count.push_back(0);
+                    nodes.emplace_back();
+                    first.push_back(ts);
+                } else {
+                    i = g->second;
+                }
+                nodes[i].push_back(node);
+                id_of[node] = i;
+                return i;
+            }
+        };
+
+        std::vector<std::vector<double>> deflate_ts_vector_values(const std::vector<apoint_ts>& tsv) {
+            ts_expression_ids ex;
+            for (const auto& ts : tsv)
+                if (ts.ts) ex.operand(ts);
+            // evaluate sub-expressions used more than once, operands before the nodes using them
+            ts_values_cache cache;
+            for (size_t i = 0; i < ex.first.size(); ++i) {
+                if (ex.use_count[i] < 2 || !fused_ts_program::is_fusable(ex.first[i].ts.get()))
+                    continue;// terminals are already values, other expressions are evaluated by identity as before
+                auto v = std::make_shared<const std::vector<double>>(fused_values(ex.first[i], &cache));
+                for (auto node : ex.nodes[i])
+                    cache[node] = v;
+            }
+            std::vector<std::vector<double>> r(tsv.size());
+            auto deflate_range = [&tsv, &r, &cache](size_t i0, size_t n) {
+                for (size_t i = i0; i < i0 + n; ++i) {
+                    auto f = cache.find(tsv[i].ts.get());
+                    r[i] = f != cache.end() ? *f->second : fused_values(tsv[i], &cache);
+                }
+            };
+            auto n_threads = thread::hardware_concurrency();
+            if (n_threads < 2) n_threads = 4;// hard coded minimum
+            std::vector<std::future<void>> calcs;
+            size_t ps = 1 + tsv.size()/n_threads;
+            for (size_t p = 0; p < tsv.size(); ) {
+                size_t np = p + ps <= tsv.size() ? ps : tsv.size() - p;
+                calcs.push_back(std::async(std::launch::async, deflate_range, p, np));
+                p += np;
+            }
+            for (auto &f : calcs) f.get();
+            return r;
+        }
+
         /** implementation of apoint_ts op apoint_ts
         *
         *  Try to optimize the evaluation by considering
@@ -178,11 +465,14 @@ namespace shyft{
         *  If one is a terminal-value (concrete point ts)
         *  then just reference the values, otherwise get the computed values.
         *
-        * If time-axis not aligned, just compute value-by-value.
+        * If time-axis not aligned, do a merge-walk over the result time-axis,
+        * stepping each operand forward using a ts_walker.
         *
         */
         std::vector<double> abin_op_ts::values() const {
-			if (lhs.time_axis() == rhs.time_axis()) {
+			if (lhs.time_axis() == rhs.time_axis() && lhs.size() == time_axis().size()) {// not if appended to, see apoint_ts::append
+                if (fused_ts_program::is_fusable(lhs.ts.get()) || fused_ts_program::is_fusable(rhs.ts.get()))
+                    return fused_ts_program(this).run(time_axis().size());
                 const vector<double>* lhs_v{terminal_values(lhs)};
                 const vector<double>* rhs_v{terminal_values(rhs)};
                 if(lhs_v && rhs_v) {
@@ -202,11 +492,15 @@ namespace shyft{
                     return l;
                 }
 			} else {
-				std::vector<double> r; r.reserve(time_axis().size());
-				for (size_t i = 0; i < time_axis().size(); ++i) {
-					r.push_back(value(i));//TODO: improve speed using accessors with ix-hint for lhs/rhs stepwise traversal
-				}
-				return r;
+                const auto& ta = time_axis();
+                const size_t n = ta.size();
+                ts_walker l(lhs), r(rhs);
+                std::vector<double> x; x.reserve(n);
+                for (size_t i = 0; i < n; ++i) {
+                    const utctime t = ta.time(i);
+                    x.emplace_back(do_op(l(t), op, r(t)));
+                }
+                return x;
 			}
         }
 
@@ -246,6 +540,8 @@ namespace shyft{
         *  (avoid switch every single lookup during integration)
         */
 		std::vector<double> average_ts::values() const {
+            if (auto m = memo.get())
+                return *m;
 			if (ts->time_axis()== ta && ts->point_interpretation()==ts_point_fx::POINT_AVERAGE_VALUE) {
 				return ts->values(); // elide trivial average_ts cases
 			}
@@ -264,6 +560,8 @@ namespace shyft{
         }
 
          std::vector<double> integral_ts::values() const {
+            if (auto m = memo.get())
+                return *m;
             switch(ts->time_axis().gt) { // pull out the real&fast time-axis before doing computations here:
                 case time_axis::generic_dt::FIXED:    return make_interval(integral_value<ts_src<time_axis::fixed_dt>>,ts->time_axis().f,ts,ta);
                 case time_axis::generic_dt::CALENDAR: return make_interval(integral_value<ts_src<time_axis::calendar_dt>>,ts->time_axis().c,ts,ta);
@@ -301,7 +599,68 @@ namespace shyft{
 			} else {
 				throw runtime_error("the supplied argument time-series must be a point ts or something that directly resolves to one");
 			}
+        }
+
+        void apoint_ts::materialize() {
+            if (needs_bind())
+                throw runtime_error("materialize: the time-series needs bind");
+            if (auto a = dynamic_pointer_cast<average_ts>(ts)) a->materialize();
+            else if (auto i = dynamic_pointer_cast<integral_ts>(ts)) i->materialize();
+            else if (auto c = dynamic_pointer_cast<accumulate_ts>(ts)) c->materialize();
+            else if (auto q = dynamic_pointer_cast<qac_ts>(ts)) q->materialize();
+        }
 
+        void apoint_ts::update_tail(utctime t) {
+            if (needs_bind())
+                throw runtime_error("update_tail: the time-series needs bind");
+            if (auto a = dynamic_pointer_cast<average_ts>(ts)) a->update_tail(t);
+            else if (auto i = dynamic_pointer_cast<integral_ts>(ts)) i->update_tail(t);
+            else if (auto c = dynamic_pointer_cast<accumulate_ts>(ts)) c->update_tail(t);
+            else if (auto q = dynamic_pointer_cast<qac_ts>(ts)) q->update_tail(t);
+        }
+
+        void apoint_ts::append(const apoint_ts& x) {
+            auto g = dynamic_pointer_cast<gpoint_ts>(ts);
+            if (!g) {
+                if (auto r = dynamic_pointer_cast<aref_ts>(ts))
+                    g = r->rep;
+            }
+            if (!g)
+                throw runtime_error("append: requires a concrete time-series");
+            if (!x.ts || x.size() == 0)
+                return;
+            auto& c = g->core_ts();
+            const auto& xta = x.time_axis();
+            auto xv = x.values();
+            if (c.size() == 0) {
+                c.ta = xta;
+                c.v = move(xv);
+                return;
+            }
+            const utctime t_end = c.total_period().end;
+            const utctime x_start = xta.total_period().start;
+            if (x_start < t_end)
+                throw runtime_error("append: the time-series to append must start at or after the end of this time-series");
+            if (x_start == t_end && c.ta.gt == time_axis::generic_dt::FIXED && xta.gt == time_axis::generic_dt::FIXED && c.ta.f.dt == xta.f.dt) {
+                c.ta.f.n += xta.size();
+            } else if (x_start == t_end && c.ta.gt == time_axis::generic_dt::CALENDAR && xta.gt == time_axis::generic_dt::CALENDAR
+                && c.ta.c.dt == xta.c.dt && c.ta.c.cal->tz_info->name() == xta.c.cal->tz_info->name()) {
+                c.ta.c.n += xta.size();
+            } else { // point time-axis, with a nan interval for the gap, if any
+                if (c.ta.gt != time_axis::generic_dt::POINT) {
+                    vector<utctime> tp; tp.reserve(c.size());
+                    for (size_t i = 0; i < c.size(); ++i) tp.push_back(c.ta.time(i));
+                    c.ta = gta_t(tp, t_end);
+                }
+                auto& tp = c.ta.p.t;// extend in place, so repeated appends are linear
+                if (x_start > t_end) {
+                    tp.push_back(t_end);
+                    c.v.push_back(shyft::nan);
+                }
+                for (size_t i = 0; i < xta.size(); ++i) tp.push_back(xta.time(i));
+                c.ta.p.t_end = xta.total_period().end;
+            }
+            c.v.insert(c.v.end(), xv.begin(), xv.end());
         }
         string apoint_ts::id() const {
             if(!dynamic_pointer_cast<aref_ts>(ts))
@@ -403,9 +762,28 @@ namespace shyft{
 				find_ts_bind_info(dynamic_cast<const api::rating_curve_ts*>(its.get())->ts.level_ts.ts, r);
 			} else if ( dynamic_cast<const api::krls_interpolation_ts*>(its.get()) ) {
 				find_ts_bind_info(dynamic_cast<const api::krls_interpolation_ts*>(its.get())->ts.ts, r);
+			} else if ( dynamic_cast<const api::convolve_w_ts*>(its.get()) ) {
+				find_ts_bind_info(dynamic_cast<const api::convolve_w_ts*>(its.get())->ts_impl.ts.ts, r);
+			} else if ( dynamic_cast<const api::qac_ts*>(its.get()) ) {
+				auto qac = dynamic_cast<const api::qac_ts*>(its.get());
+				find_ts_bind_info(qac->ts, r);
+				find_ts_bind_info(qac->cts, r);
 			}
         }
 
+        void ts_values_memo::set(std::vector<double>&& x, srcs_t srcs) {
+            std::vector<api::ts_bind_info> bi;
+            for (const auto& s : srcs)
+                find_ts_bind_info(s, bi);
+            auto n = std::make_shared<entry>();
+            n->v = std::move(x);
+            for (const auto& b : bi) {
+                auto r = dynamic_pointer_cast<const api::aref_ts>(b.ts.ts);
+                n->refs.emplace_back(r, r->rep);
+            }
+            std::atomic_store(&e, std::shared_ptr<const entry>(n));
+        }
+
         std::vector<ts_bind_info> apoint_ts::find_ts_bind_info() const {
             std::vector<ts_bind_info> r;
             shyft::api::find_ts_bind_info(ts, r);
@@ -563,6 +941,10 @@ namespace shyft{
 
         std::vector<double> abin_op_scalar_ts::values() const {
           bind_check();
+          if (rhs.size() != time_axis().size())
+              return indexed_values(*this);
+          if (fused_ts_program::is_fusable(rhs.ts.get()))
+              return fused_ts_program(this).run(time_axis().size());
           const vector<double> *rhs_v{terminal_values(rhs)};
           if(rhs_v) {
               const auto& r_v=*rhs_v;
@@ -602,6 +984,10 @@ namespace shyft{
         }
         std::vector<double> abin_op_ts_scalar::values() const {
             bind_check();
+            if (lhs.size() != time_axis().size())
+                return indexed_values(*this);
+            if (fused_ts_program::is_fusable(lhs.ts.get()))
+                return fused_ts_program(this).run(time_axis().size());
             const vector<double>* lhs_v{terminal_values(lhs)};
             if(lhs_v) { // avoid a copy, but does not help much..
                 std::vector<double> r;r.reserve(lhs_v->size());
@@ -657,6 +1043,65 @@ namespace shyft{
 			average_accessor<apoint_ts, gta_t> m(model_ts, ta);
 			return 1.0 - shyft::time_series::kling_gupta_goal_function<dlib::running_scalar_covariance<double>>(o, m, s_r, s_a, s_b);
 		}
+        /** accessor for goal functions, to already averaged values */
+        struct values_accessor {
+            const vector<double>& v;
+            size_t size() const {return v.size();}
+            double value(size_t i) const {return v[i];}
+        };
+
+        /** evaluate score(obs_values,model_values) for all models and time-axes, in parallel.
+         *  The values are the true average of the ts over the time-axis, as in the average_accessor
+         */
+        template <class Fx>
+        static vector<double> skill_score_matrix(const vector<apoint_ts>& observations, const vector<apoint_ts>& models, const vector<gta_t>& tas, Fx&& score) {
+            if (!(observations.size() == 1 || observations.size() == models.size()))
+                throw runtime_error("observations should have one time-series, or one for each model");
+            const size_t n_ta = tas.size();
+            vector<double> r(models.size()*n_ta, shyft::nan);
+            if (r.size() == 0)
+                return r;
+            // the averaged observations, one vector for each time-axis, computed once
+            vector<vector<vector<double>>> obs_v(n_ta);
+            for (size_t k = 0; k < n_ta; ++k) {
+                vector<apoint_ts> a; a.reserve(observations.size());
+                for (const auto& o : observations) a.push_back(o.average(tas[k]));
+                obs_v[k] = deflate_ts_vector_values(a);
+            }
+            auto score_range = [&](size_t j0, size_t n) {// j is the flat index model*n_ta + time-axis
+                for (size_t j = j0; j < j0 + n; ++j) {
+                    size_t i = j/n_ta, k = j%n_ta;
+                    auto m = models[i].average(tas[k]).values();
+                    const auto& o = obs_v[k][observations.size() == 1 ? 0 : i];
+                    if (o.size() && m.size() == o.size())
+                        r[j] = score(values_accessor{o}, values_accessor{m});
+                }
+            };
+            auto n_threads = thread::hardware_concurrency();
+            if (n_threads < 2) n_threads = 4;// hard coded minimum
+            vector<future<void>> calcs;
+            size_t ps = 1 + r.size()/n_threads;
+            for (size_t p = 0; p < r.size(); ) {
+                size_t np = p + ps <= r.size() ? ps : r.size() - p;
+                calcs.push_back(std::async(std::launch::async, score_range, p, np));
+                p += np;
+            }
+            for (auto &f : calcs) f.get();
+            return r;
+        }
+
+        vector<double> nash_sutcliffe(const vector<apoint_ts>& observations, const vector<apoint_ts>& models, const vector<gta_t>& tas) {
+            return skill_score_matrix(observations, models, tas, [](const values_accessor& o, const values_accessor& m) {
+                return 1.0 - shyft::time_series::nash_sutcliffe_goal_function(o, m);
+            });
+        }
+
+        vector<double> kling_gupta(const vector<apoint_ts>& observations, const vector<apoint_ts>& models, const vector<gta_t>& tas, double s_r, double s_a, double s_b) {
+            return skill_score_matrix(observations, models, tas, [s_r, s_a, s_b](const values_accessor& o, const values_accessor& m) {
+                return 1.0 - shyft::time_series::kling_gupta_goal_function<dlib::running_scalar_covariance<double>>(o, m, s_r, s_a, s_b);
+            });
+        }
+
 		// glacier_melt_ts as apoint_ts with it's internal being a glacier_melt_ts
         struct aglacier_melt_ts:ipoint_ts {
             glacier_melt_ts<std::shared_ptr<ipoint_ts>> gm;
@@ -956,6 +1401,25 @@ namespace shyft{
         }
 
         double qac_ts::value(size_t i) const {
+            if (auto m = memo.get()) {
+                if (i < m->size())
+                    return (*m)[i];
+            }
+            return compute_value(i);
+        }
+
+        void qac_ts::update_tail(utctime t) {
+            auto m = memo.get();
+            if (!m || ts->size() == 0 || p.max_timespan >= t - ts->time(0)) {
+                materialize();// no kept values, or the fill could reach back to the start
+                return;
+            }
+            // the previous last point could be filled now, and fill is limited to max_timespan
+            size_t i0 = std::min(tail_start_index(ts->time_axis(), tail_change_start(*ts, t - p.max_timespan)), m->size() ? m->size() - 1 : 0);
+            memo.update_tail(i0, ts->size(), {ts, cts}, [this](size_t i) {return compute_value(i);});
+        }
+
+        double qac_ts::compute_value(size_t i) const {
 
             double x=ts->value(i);
             if(p.is_ok_quality(x))
@@ -1018,6 +1482,10 @@ namespace shyft{
 
         vector<double> qac_ts::values() const {
             const size_t n{size()};
+            if (auto m = memo.get()) {
+                if (m->size() == n)
+                    return *m;
+            }
             vector<double> r;r.reserve(n);
             for(size_t i=0;i<n;++i)
                 r.emplace_back(value(i));
@@ -6,6 +6,7 @@
 #include <memory>
 #include <utility>
 #include <map>
+#include <atomic>
 
 #include "core/core_pch.h"
 
@@ -280,6 +281,37 @@ namespace shyft {
              */
             void bind(const apoint_ts& bts);
 
+            /** if this ts is an average, integral, accumulate or qac expression,
+             * compute and keep its values, so that later value(i) and values() calls
+             * are served from memory instead of re-computing from the source.
+             * The values are dropped when a symbolic ts is bound, or by do_bind().
+             * They are not invalidated when a concrete source ts is changed by set, fill or append,
+             * call materialize() or update_tail() again after such changes.
+             * Other expressions, and concrete time-series are not affected.
+             * \throw runtime_error if the ts needs bind
+             */
+            void materialize();
+
+            /** update the values kept by materialize() after the source has changed at and after t,
+             * typically after appending to the source, see append.
+             * Only the values that depend on the source from t and on are computed,
+             * if there are no kept values, this is the same as materialize().
+             * \throw runtime_error if the ts needs bind
+             */
+            void update_tail(utctime t);
+
+            /** append the values of ts to this concrete time-series.
+             * The time-axis is extended, keeping its type if ts continues it with the same kind of
+             * fixed or calendar intervals, otherwise it becomes a point time-axis,
+             * with a nan-interval covering any gap between the two.
+             * Expressions that take their time-axis from this ts, like a+b, a*2.0, abs or time_shift,
+             * keep the time-axis they had when built, and must be rebuilt to cover the appended values.
+             * average, integral and accumulate have their own time-axis, and see the new values within it.
+             * \param ts the time-series to append, must start at or after the end of this
+             * \throw runtime_error if this is not a concrete time-series, or if ts starts before the end of this
+             */
+            void append(const apoint_ts& ts);
+
             /** recursive search through the expression that this ts represents,
              *  and return a list of bind_ts_info that can be used to
              *  inspect and possibly 'bind' to values \ref bind.
@@ -387,6 +419,80 @@ namespace shyft {
             x_serialize_decl();
        };
 
+        /** \brief memoized values of an expression node, see apoint_ts::materialize
+         *
+         * The values are only used as long as each aref_ts reachable from the node
+         * is still bound to the ts it was bound to when the values were computed,
+         * and they are dropped by do_bind() of the node.
+         * Changes to the values of a concrete source, like set, fill or append,
+         * are not detected, the owner must call materialize or update_tail.
+         * The entry is replaced atomically, so get() can race with materialize().
+         */
+        struct ts_values_memo {
+            using values_t=std::shared_ptr<const std::vector<double>>;
+            using srcs_t=std::initializer_list<std::shared_ptr<ipoint_ts>>;
+            struct entry {
+                std::vector<double> v;///< the values
+                std::vector<std::pair<std::shared_ptr<const aref_ts>,aref_ts::ref_ts_t>> refs;///< the reachable aref_ts, and what they were bound to
+            };
+            std::shared_ptr<const entry> e;///< the entry, if materialized
+            /** \return the memoized values, or nullptr if not materialized or a reachable aref_ts is re-bound */
+            values_t get() const {
+                auto x=std::atomic_load(&e);
+                if(!x)
+                    return nullptr;
+                for(const auto& r:x->refs)
+                    if(r.first->rep!=r.second)
+                        return nullptr;
+                return values_t(x,&x->v);
+            }
+            /** keep x as the values computed from the sources srcs */
+            void set(std::vector<double>&& x,srcs_t srcs);
+            void clear() {std::atomic_store(&e,std::shared_ptr<const entry>());}
+            /** keep the memoized values [0..i0>, and use fx(i) for the values [i0..n> */
+            template<class Fx>
+            void update_tail(size_t i0, size_t n, srcs_t srcs, Fx&& fx) {
+                std::vector<double> r;r.reserve(n);
+                if(auto m=get())
+                    r.assign(m->begin(),m->begin()+std::min(std::min(i0,n),m->size()));
+                for(size_t i=r.size();i<n;++i)
+                    r.push_back(fx(i));
+                set(std::move(r),srcs);
+            }
+        };
+
+        /** \brief the values of ts, by value(i) over its time-axis
+         *
+         * Used by expressions that keep the time-axis of their source, when the source
+         * has been appended to after the expression was built, see apoint_ts::append.
+         */
+        inline std::vector<double> indexed_values(const ipoint_ts& ts) {
+            std::vector<double> r; r.reserve(ts.size());
+            for (size_t i = 0; i < ts.size(); ++i)
+                r.push_back(ts.value(i));
+            return r;
+        }
+
+        /** \brief the start of the source ts interval influenced by changes to the source at and after t
+         *
+         * The value of the source point before t extends into, or is interpolated towards, t,
+         * so that is where the change starts.
+         */
+        inline utctime tail_change_start(const ipoint_ts& src, utctime t) {
+            size_t k=src.index_of(t);
+            if(k==std::string::npos)
+                k= t < src.total_period().start ? 0 : src.size();
+            return k>0 ? std::min(t,src.time(k-1)) : t;
+        }
+
+        /** \brief the first index of ta that has a period ending after t */
+        inline size_t tail_start_index(const gta_t& ta, utctime t) {
+            size_t i=ta.index_of(t);
+            if(i==std::string::npos)
+                return t < ta.total_period().start ? 0 : ta.size();
+            return i;
+        }
+
         /** \brief The average_ts is used for providing ts average values over a time-axis
          *
          * Given a any ts, concrete, or an expression, provide the true average values on the
@@ -408,6 +514,7 @@ namespace shyft {
         struct average_ts:ipoint_ts {
             gta_t ta;
             std::shared_ptr<ipoint_ts> ts;
+            ts_values_memo memo;///< values when materialized, not serialized
             // useful constructors
             average_ts(gta_t&& ta,const apoint_ts& ats):ta(std::move(ta)),ts(ats.ts) {}
             average_ts(gta_t&& ta,apoint_ts&& ats):ta(std::move(ta)),ts(std::move(ats.ts)) {}
@@ -427,9 +534,14 @@ namespace shyft {
             virtual utctime time(size_t i) const {return ta.time(i);};
             virtual double value(size_t i) const {
                 #ifdef _DEBUG
-                if(i>ta.size())
+                if(i>=ta.size())
                     return nan;
                 #endif
+                if(auto m=memo.get())
+                    return (*m)[i];
+                return compute_value(i);
+            }
+            double compute_value(size_t i) const {
                 size_t ix_hint=(i*ts->size())/ta.size();// assume almost fixed delta-t.
                 return average_value(*ts,ta.period(i),ix_hint,ts->point_interpretation() == ts_point_fx::POINT_INSTANT_VALUE);
             }
@@ -441,7 +553,12 @@ namespace shyft {
             }
 			virtual std::vector<double> values() const;
             virtual bool needs_bind() const { return ts->needs_bind();}
-            virtual void do_bind() {ts->do_bind();}
+            virtual void do_bind() {memo.clear();ts->do_bind();}
+            void materialize() {memo.clear();memo.set(values(),{ts});}
+            void update_tail(utctime t) {
+                if(!memo.get()) {materialize();return;}
+                memo.update_tail(tail_start_index(ta,tail_change_start(*ts,t)),ta.size(),{ts},[this](size_t i) {return compute_value(i);});
+            }
             x_serialize_decl();
 
         };
@@ -467,6 +584,7 @@ namespace shyft {
         struct integral_ts :ipoint_ts {
             gta_t ta;
             std::shared_ptr<ipoint_ts> ts;
+            ts_values_memo memo;///< values when materialized, not serialized
             // useful constructors
             integral_ts(gta_t&& ta, const apoint_ts& ats) :ta(std::move(ta)), ts(ats.ts) {}
             integral_ts(gta_t&& ta, apoint_ts&& ats) :ta(std::move(ta)), ts(std::move(ats.ts)) {}
@@ -485,8 +603,13 @@ namespace shyft {
             virtual size_t size() const { return ta.size(); }
             virtual utctime time(size_t i) const { return ta.time(i); };
             virtual double value(size_t i) const {
-                if (i>ta.size())
+                if (i>=ta.size())
                     return nan;
+                if (auto m = memo.get())
+                    return (*m)[i];
+                return compute_value(i);
+            }
+            double compute_value(size_t i) const {
                 size_t ix_hint = (i*ts->size()) / ta.size();// assume almost fixed delta-t.
                 utctimespan tsum = 0;
                 return accumulate_value(*ts, ta.period(i), ix_hint,tsum, ts->point_interpretation() == ts_point_fx::POINT_INSTANT_VALUE);
@@ -499,7 +622,12 @@ namespace shyft {
             }
             virtual std::vector<double> values() const ;
             virtual bool needs_bind() const { return ts->needs_bind();}
-            virtual void do_bind() {ts->do_bind();}
+            virtual void do_bind() {memo.clear();ts->do_bind();}
+            void materialize() {memo.clear();memo.set(values(),{ts});}
+            void update_tail(utctime t) {
+                if (!memo.get()) {materialize();return;}
+                memo.update_tail(tail_start_index(ta, tail_change_start(*ts, t)), ta.size(), {ts}, [this](size_t i) {return compute_value(i);});
+            }
             x_serialize_decl();
 
         };
@@ -531,6 +659,7 @@ namespace shyft {
         struct accumulate_ts :ipoint_ts {
             gta_t ta;
             std::shared_ptr<ipoint_ts> ts;
+            ts_values_memo memo;///< values when materialized, not serialized
             // useful constructors
             accumulate_ts(gta_t&& ta, const apoint_ts& ats) :ta(std::move(ta)), ts(ats.ts) {}
             accumulate_ts(gta_t&& ta, apoint_ts&& ats) :ta(std::move(ta)), ts(std::move(ats.ts)) {}
@@ -549,10 +678,12 @@ namespace shyft {
             virtual size_t size() const { return ta.size(); }
             virtual utctime time(size_t i) const { return ta.time(i); };
             virtual double value(size_t i) const {
-                if (i>ta.size())
+                if (i>=ta.size())
                     return nan;
                 if (i == 0)// by definition,0.0 at i=0
                     return 0.0;
+                if (auto m = memo.get())
+                    return (*m)[i];
                 size_t ix_hint = 0;// assume almost fixed delta-t.
                 utctimespan tsum;
                 return accumulate_value(*ts, utcperiod(ta.time(0), ta.time(i)), ix_hint, tsum, ts->point_interpretation() == ts_point_fx::POINT_INSTANT_VALUE);
@@ -568,6 +699,8 @@ namespace shyft {
                 return accumulate_value(*this, utcperiod(ta.time(0), t), ix_hint, tsum, ts->point_interpretation() == ts_point_fx::POINT_INSTANT_VALUE);// also note: average of non-nan areas !;
             }
             virtual std::vector<double> values() const {
+                if (auto m = memo.get())
+                    return *m;
                 std::vector<double> r;r.reserve(ta.size());
                 accumulate_accessor<ipoint_ts, gta_t> accumulate(*ts, ta);// use accessor, that
                 for (size_t i = 0;i<ta.size();++i) {                      // given sequential access
@@ -576,7 +709,22 @@ namespace shyft {
                 return r;
             }
             virtual bool needs_bind() const { return ts->needs_bind();}
-            virtual void do_bind() {ts->do_bind();}
+            virtual void do_bind() {memo.clear();ts->do_bind();}
+            void materialize() {memo.clear();memo.set(values(),{ts});}
+            void update_tail(utctime t) {
+                auto m = memo.get();
+                size_t i0 = tail_start_index(ta, tail_change_start(*ts, t));
+                if (!m || i0 == 0 || m->size() != ta.size()) {materialize();return;}
+                // the value at i0 only depends on the source before t, continue from there as the accumulate_accessor does
+                double q = (*m)[i0];
+                size_t ix_hint = 0;
+                utctimespan tsum = 0;
+                const bool linear = ts->point_interpretation() == ts_point_fx::POINT_INSTANT_VALUE;
+                memo.update_tail(i0 + 1, ta.size(), {ts}, [&](size_t i) {
+                    q += accumulate_value(*ts, utcperiod(ta.time(i - 1), ta.time(i)), ix_hint, tsum, linear);
+                    return q;
+                });
+            }
             // to help the average function, return the i'th point of the underlying timeseries
             //point get(size_t i) const {return point(ts->time(i),ts->value(i));}
             x_serialize_decl();
@@ -641,7 +789,7 @@ namespace shyft {
             virtual utctime time(size_t i) const {return ta.time(i);};
             virtual double value(size_t i) const {return ts->value(i);}
             virtual double value_at(utctime t) const {return ts->value_at(t-dt);}
-            virtual std::vector<double> values() const {return ts->values();}
+            virtual std::vector<double> values() const {return ts->size() == ta.size() ? ts->values() : indexed_values(*this);}
             virtual bool needs_bind() const { return ts->needs_bind();}
             virtual void do_bind() {ts->do_bind();local_do_bind();}
             x_serialize_decl();
@@ -693,6 +841,8 @@ namespace shyft {
             virtual double value(size_t i) const { return abs(ts->value(i)); }
             virtual double value_at(utctime t) const { return abs(ts->value_at(t)); }
             virtual std::vector<double> values() const {
+                if (ts->size() != ta.size())
+                    return indexed_values(*this);
                 auto vv=ts->values();
                 for (auto &v : vv) v = abs(v);
                 return vv;
@@ -1045,6 +1195,7 @@ namespace shyft {
             shared_ptr<ipoint_ts> ts;///< the source ts
             shared_ptr<ipoint_ts> cts;///< optional ts with replacement values
             qac_parameter p;///< the parameters that control how the qac is done
+            ts_values_memo memo;///< values when materialized, not serialized
 
             // useful constructors
 
@@ -1072,16 +1223,20 @@ namespace shyft {
             virtual double value(size_t i) const ;
             virtual double value_at(utctime t) const ;
             virtual vector<double> values() const;
+            double compute_value(size_t i) const;
 
             // methods for binding and symbolic ts
             virtual bool needs_bind() const {
                 return ts->needs_bind() || (cts && cts->needs_bind());
             }
             virtual void do_bind() {
+                memo.clear();
                 ts->do_bind();
                 if(cts)
                     cts->do_bind();
             }
+            void materialize() {memo.clear();memo.set(values(),{ts,cts});}
+            void update_tail(utctime t);
 
             x_serialize_decl();
 
@@ -1272,6 +1427,23 @@ namespace shyft {
 
         double kling_gupta(const apoint_ts& observation_ts, const apoint_ts&  model_ts, const gta_t& ta, double s_r, double s_a, double s_b);
 
+        /** \brief nash_sutcliffe for many observation/model pairs and time-axes, computed in parallel
+         *
+         * The observations are averaged once for each time-axis, and shared among the models.
+         * \param observations one observation for all models, or one for each model
+         * \param models the model time-series
+         * \param tas the time-axes to evaluate each pair over
+         * \return the n.s values, row-major matrix of shape (models.size(), tas.size())
+         * \throw runtime_error if observations.size() is neither 1 nor models.size()
+         */
+        std::vector<double> nash_sutcliffe(const std::vector<apoint_ts>& observations, const std::vector<apoint_ts>& models, const std::vector<gta_t>& tas);
+
+        /** \brief kling_gupta for many observation/model pairs and time-axes, computed in parallel
+         *
+         * \see nash_sutcliffe for the arguments and layout of the result
+         */
+        std::vector<double> kling_gupta(const std::vector<apoint_ts>& observations, const std::vector<apoint_ts>& models, const std::vector<gta_t>& tas, double s_r, double s_a, double s_b);
+
         apoint_ts create_periodic_pattern_ts(const vector<double>& pattern, utctimespan dt,utctime t0, const gta_t& ta);
 
         apoint_ts operator+(const apoint_ts& lhs,const apoint_ts& rhs) ;
@@ -1312,31 +1484,31 @@ namespace shyft {
             extend_ts_split_policy split_policy, extend_ts_fill_policy fill_policy,
             utctime split_at, double fill_value );
 
+        /** \brief evaluate the values of a vector of expressions
+         *
+         * Sub-expressions that are equal (same element-wise operations on the same
+         * terminals, or the same expression node) and used more than once, within one
+         * or across several of the expressions, are evaluated only once.
+         * Chains of element-wise operations on a common time-axis are evaluated
+         * in one blocked pass, without full size intermediate vectors.
+         * The expressions are evaluated in parallell.
+         * \return the values of each of the expressions, in the same order
+         */
+        std::vector<std::vector<double>> deflate_ts_vector_values(const std::vector<apoint_ts>& tsv);
+
         /** Given a vector of expressions, deflate(evaluate) the expressions and return the
          * equivalent concrete point-time-series of the expressions in the
          * preferred destination type Ts
          * Useful for the dtss,
-         * evaluates the expressions in parallell
+         * evaluates the expressions in parallell, see deflate_ts_vector_values
          */
         template <class Ts,class TsV>
         std::vector<Ts>
         deflate_ts_vector(TsV const&tsv1) {
-            std::vector<Ts> tsv2(tsv1.size());
-
-            auto deflate_range=[&tsv1,&tsv2](size_t i0,size_t n) {
-                for(size_t i=i0;i<i0+n;++i)
-                    tsv2[i]= Ts(tsv1[i].time_axis(),tsv1[i].values(),tsv1[i].point_interpretation());
-            };
-            auto n_threads =  thread::hardware_concurrency();
-            if(n_threads <2) n_threads=4;// hard coded minimum
-            std::vector<std::future<void>> calcs;
-            size_t ps= 1 + tsv1.size()/n_threads;
-            for (size_t p = 0;p < tsv1.size(); ) {
-                size_t np = p + ps <= tsv1.size() ? ps : tsv1.size() - p;
-                calcs.push_back(std::async(std::launch::async, deflate_range, p, np));
-                p += np;
-            }
-            for (auto &f : calcs) f.get();
+            auto v = deflate_ts_vector_values(tsv1);
+            std::vector<Ts> tsv2; tsv2.reserve(tsv1.size());
+            for (size_t i = 0;i < tsv1.size();++i)
+                tsv2.emplace_back(tsv1[i].time_axis(), std::move(v[i]), tsv1[i].point_interpretation());
             return tsv2;
         }
 
@@ -1379,6 +1551,22 @@ namespace shyft {
                 for (auto const &ts : *this ) r.push_back(ts(t));
                 return r;
             }
+            /** evaluate all expressions in parallel, return a new ats_vector with the concrete point time-series */
+            ats_vector evaluate() const {
+                return ats_vector(deflate_ts_vector<apoint_ts>(*this));
+            }
+            /** evaluate all time-series as true-average over ta, in parallel, returning the values of each time-series.
+             * time-series that already are stair-case on time-axis ta are used as is, and empty time-series gives nan values
+             */
+            std::vector<std::vector<double>> average_values(gta_t const &ta) const {
+                std::vector<apoint_ts> a;a.reserve(size());
+                for(auto const &ts:*this) {
+                    if(!ts.ts) a.emplace_back(ta,shyft::nan,POINT_AVERAGE_VALUE);
+                    else if(ts.time_axis()==ta && ts.point_interpretation()==POINT_AVERAGE_VALUE) a.push_back(ts);
+                    else a.push_back(ts.average(ta));
+                }
+                return deflate_ts_vector_values(a);
+            }
             ats_vector percentiles(gta_t const &ta,vector<int> const& percentile_list) const {
                 ats_vector r;r.reserve(percentile_list.size());
                 auto rp= shyft::time_series::calculate_percentiles(ta,deflate_ts_vector<gts_t>(*this),percentile_list);
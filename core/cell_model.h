@@ -22,6 +22,7 @@ namespace shyft {
 		using namespace shyft;
 		// and typedefs for commonly used types in the model
 		typedef point_ts<time_axis::fixed_dt> pts_t;
+		typedef point_ts32<time_axis::fixed_dt> pts32_t;///< float32 storage variant of pts_t
 		typedef constant_timeseries<time_axis::fixed_dt> cts_t;
 		typedef time_axis::fixed_dt timeaxis_t;
 
@@ -74,6 +75,8 @@ namespace shyft {
 		typedef environment<timeaxis_t, pts_t, pts_t, pts_t, cts_t, cts_t> environment_const_rhum_and_wind_t;
 		///< environment type with all properties as general time_series
 		typedef environment<timeaxis_t, pts_t, pts_t, pts_t, pts_t, pts_t> environment_t;
+		///< environment type with all properties stored as float32 time_series, half the memory of environment_t
+		typedef environment<timeaxis_t, pts32_t, pts32_t, pts32_t, pts32_t, pts32_t> environment32_t;
 
 		///< utility function to create an instance of a environment based on function (auto-template by arguments)
 		template<class timeaxis, class temperature_ts, class precipitation_ts, class radiation_ts, class relhum_ts, class windspeed_ts>
@@ -141,6 +144,10 @@ namespace shyft {
 			void set_state_collection(bool on) {}
 			///< collecting the snow sca and swe on for calibration scenarios, default throws
 			void set_snow_sca_swe_collection(bool on) {/*default simply ignore*/}
+			///< select the response variables to collect, a stack specific bit-mask, default throws, not supported
+			void set_response_collection(unsigned int mask) {
+			    throw runtime_error("set_response_collection: selective response collection is not supported by this cell type");
+			}
 			/// run the cell method stack for  a specified time-axis, to be specialized by cell type
 			void run(const timeaxis_t& t, int start_step, int n_steps) {}
 			///< operator equal if same midpoint and catchment-id
@@ -148,18 +155,108 @@ namespace shyft {
 			    return geo.mid_point()==x.geo.mid_point()&& geo.catchment_id()==x.geo.catchment_id();
 			}
 		};
-        /**Utility function used to  initialize a pts_t in the core, typically making space, fill a ts
+        /** \brief trait, true if the response collector RC accumulates discharge directly into catchment sums
+         *
+         * Such collectors keep no per-cell series, but a double *catchment_acc member,
+         * that the region_model points to the catchment row of the running thread's
+         * accumulator before each cell run, and merges when all cells are done.
+         * \sa region_model::get_catchment_discharge_sums
+         */
+        template <class RC>
+        struct is_catchment_accumulator : std::false_type {};
+
+        /**Utility function used to  initialize a pts_t (or pts32_t) in the core, typically making space, fill a ts
         *  prior to a run to ensure values are zero */
-        inline void ts_init(pts_t&ts, time_axis::fixed_dt const& ta, int start_step, int n_steps, ts_point_fx fx_policy) {
+        template <class ts_t>
+        inline void ts_init(ts_t&ts, time_axis::fixed_dt const& ta, int start_step, int n_steps, ts_point_fx fx_policy) {
             double const fill_value=shyft::nan;
-            if (ts.ta != ta || ta.size()==0 ) {
-                ts = pts_t(ta, fill_value, fx_policy);
+            if (ts.ta != ta && ta.size() && ts.v.size() == ta.size()) {// same length, e.g. next block of a streamed run: reuse the buffer
+                ts.ta = ta;
+                ts.fx_policy = fx_policy;
+                ts.fill(fill_value);
+            } else if (ts.ta != ta || ta.size()==0 ) {
+                ts = ts_t(ta, fill_value, fx_policy);
             } else {
                 ts.fill_range(fill_value, start_step, n_steps);
             }
         }
 
         using namespace std;
+
+        /** \brief catchment to cell-index map, using compressed sparse row (CSR) layout
+         *
+         * Keeps the cell-indexes for each catchment, so that catchment statistics
+         * can visit only the cells of the requested catchments, instead of
+         * scanning all cells for each requested catchment id.
+         * The region_model keeps one, built when the cells are set.
+         */
+        struct catchment_cell_index {
+            vector<int> cids;///< sorted unique catchment ids
+            vector<size_t> offsets;///< the cells of cids[i] are cell_ixs[offsets[i]..offsets[i+1]), size is cids.size()+1
+            vector<size_t> cell_ixs;///< cell indexes grouped by catchment, ascending within each catchment
+            size_t n_cells=0;///< number of cells indexed
+
+            catchment_cell_index()=default;
+
+            template<typename cell>
+            explicit catchment_cell_index(const vector<cell>& cells):n_cells(cells.size()) {
+                cids.reserve(n_cells);
+                for (const auto& c : cells) cids.push_back(int(c.geo.catchment_id()));
+                sort(begin(cids), end(cids));
+                cids.erase(unique(begin(cids), end(cids)), end(cids));
+                vector<size_t> pos; pos.reserve(n_cells);
+                offsets.assign(cids.size() + 1, 0);
+                for (const auto& c : cells) {
+                    pos.push_back(catchment_pos(int(c.geo.catchment_id())));
+                    ++offsets[pos.back() + 1];
+                }
+                for (size_t i = 1; i < offsets.size(); ++i) offsets[i] += offsets[i - 1];
+                cell_ixs.resize(n_cells);
+                auto next = offsets;
+                for (size_t i = 0; i < n_cells; ++i) cell_ixs[next[pos[i]]++] = i;
+            }
+
+            /** number of catchments */
+            size_t size() const { return cids.size(); }
+
+            /** \brief returns the position of catchment id cid in cids
+             * \throw runtime_error if cid does not exist
+             */
+            size_t catchment_pos(int cid) const {
+                auto f = lower_bound(begin(cids), end(cids), cid);
+                if (f == end(cids) || *f != cid)
+                    throw runtime_error(string("one or more supplied catchment_indexes does not exist:") + to_string(cid));
+                return size_t(f - begin(cids));
+            }
+
+            /** true if catchment id cid exists */
+            bool contains(int cid) const { return binary_search(begin(cids), end(cids), cid); }
+
+            /** \brief returns the ascending cell indexes of the cells in the listed catchments
+             * \param catchment_ids list of catchment-ids, if zero length, all cells are returned
+             * \throw runtime_error if a catchment id does not exist
+             */
+            vector<size_t> cells_of(const vector<int>& catchment_ids) const {
+                vector<size_t> r;
+                if (catchment_ids.size() == 0) {
+                    r.resize(n_cells);
+                    for (size_t i = 0; i < n_cells; ++i) r[i] = i;
+                    return r;
+                }
+                vector<bool> seen(cids.size(), false);
+                size_t n_catchments = 0;
+                for (auto cid : catchment_ids) {
+                    auto p = catchment_pos(cid);
+                    if (seen[p]) continue;
+                    seen[p] = true; ++n_catchments;
+                    r.insert(end(r), begin(cell_ixs) + offsets[p], begin(cell_ixs) + offsets[p + 1]);
+                }
+                if (n_catchments > 1)
+                    sort(begin(r), end(r));// keep cell order, so that sums are equal regardless of catchment order
+                return r;
+            }
+        };
+
         /** \brief cell statistics provides ts feature summation over cells
          *
          * Since the cells are different, like different features, based on
@@ -171,6 +268,8 @@ namespace shyft {
          * Using swig/python, we need a helper class in either _api.h, or api.i
          *  to provide the functions to python layer
          *
+         * Each function comes in two versions, one taking a catchment_cell_index of the cells,
+         * like the one kept by the region_model, and one that builds it for the call.
          */
         struct cell_statistics {
 
@@ -178,11 +277,9 @@ namespace shyft {
 			template<typename cell>
 			static void verify_cids_exist(const vector<cell>& cells, const vector<int>& catchment_indexes) {
 				if (catchment_indexes.size() == 0) return;
-				map<int, bool> all_cids;
-				for (const auto&c : cells) all_cids[c.geo.catchment_id()] = true;
+				catchment_cell_index cix(cells);
 				for(auto cid:catchment_indexes)
-					if (all_cids.count(cid) == 0)
-						throw runtime_error(string("one or more supplied catchment_indexes does not exist:") + to_string(cid));
+					cix.catchment_pos(cid);
 			}
 
             /** \brief average_catchment_feature returns the area-weighted average
@@ -190,45 +287,43 @@ namespace shyft {
              * \tparam cell the cell type, assumed to have .geo.area(), and geo.catchment_id()
              * \tparam cell_feature_ts a callable that takes a const cell ref, returns a ts
              * \param cells that we want to perform calculation on
+             * \param cix the catchment_cell_index of the cells
              * \param catchment_indexes list of catchment-id that identifies the cells, if zero length, all are averaged
              * \param cell_ts a callable that fetches the cell feature we want to average
              * \throw runtime_error if number of cells are zero
              * \return area weighted feature sum, as a ts, a  shared_ptr<pts_ts>
              */
             template<typename cell, typename cell_feature_ts>
-            static shared_ptr<pts_t> average_catchment_feature(const vector<cell>& cells, const vector<int>& catchment_indexes,
+            static shared_ptr<pts_t> average_catchment_feature(const vector<cell>& cells, const catchment_cell_index& cix, const vector<int>& catchment_indexes,
                                                                cell_feature_ts&& cell_ts) {
                 if (cells.size() == 0)
                     throw runtime_error("no cells to make statistics on");
-				verify_cids_exist(cells, catchment_indexes);
                 shared_ptr<pts_t> r;
 				double sum_area = 0.0;
-				bool match_all = catchment_indexes.size() == 0;
-				for (const auto& c : cells) {
-                    if (match_all) {
-                        if(!r) r= make_shared<pts_t>(cell_ts(c).ta, 0.0, ts_point_fx::POINT_AVERAGE_VALUE);
-                        r->add_scale(cell_ts(c), c.geo.area());  // c.env_ts.temperature, could be a feature(c) func return ref to ts
-                        sum_area += c.geo.area();
-                    } else {
-                        for (auto cid : catchment_indexes) {
-                            if ( c.geo.catchment_id() == (size_t) cid) { // criteria
-                                if (!r) r = make_shared<pts_t>(cell_ts(c).ta, 0.0, ts_point_fx::POINT_AVERAGE_VALUE);
-                                r->add_scale(cell_ts(c), c.geo.area());  // c.env_ts.temperature, could be a feature(c) func return ref to ts
-                                sum_area += c.geo.area();
-                                break;
-                            }
-                        }
-                    }
+				for (auto i : cix.cells_of(catchment_indexes)) {
+                    const auto& c = cells[i];
+                    const auto& ts = cell_ts(c);
+                    if (!r) r = make_shared<pts_t>(ts.ta, 0.0, ts_point_fx::POINT_AVERAGE_VALUE);
+                    if (ts.size() != r->size())
+                        throw runtime_error("average_catchment_feature: cell time-series must have equal size, verify the response collection of the cells");
+                    r->add_scale(ts, c.geo.area());  // c.env_ts.temperature, could be a feature(c) func return ref to ts
+                    sum_area += c.geo.area();
 				}
 				r->scale_by(1/sum_area); // sih: if no match, then you will get nan here, and I think thats reasonable
 				return r;
 			}
+            template<typename cell, typename cell_feature_ts>
+            static shared_ptr<pts_t> average_catchment_feature(const vector<cell>& cells, const vector<int>& catchment_indexes,
+                                                               cell_feature_ts&& cell_ts) {
+                return average_catchment_feature(cells, catchment_cell_index(cells), catchment_indexes, cell_ts);
+            }
 
 			/** \brief average_catchment_feature_value returns the area-weighted average for a timestep
 			*
 			* \tparam cell the cell type, assumed to have .geo.area(), and geo.catchment_id()
 			* \tparam cell_feature_ts a callable that takes a const cell ref, returns a ts
 			* \param cells that we want to perform calculation on
+			* \param cix the catchment_cell_index of the cells
 			* \param catchment_indexes list of catchment-id that identifies the cells, if zero length, all are averaged
 			* \param cell_ts  a callable that fetches the cell feature we want to average
 			* \param i the i'th time-step for which we compute the value
@@ -236,31 +331,25 @@ namespace shyft {
 			* \return area weighted feature sum, as a double value
 			*/
 			template<typename cell, typename cell_feature_ts>
-			static double average_catchment_feature_value(const vector<cell>& cells, const vector<int>& catchment_indexes,
+			static double average_catchment_feature_value(const vector<cell>& cells, const catchment_cell_index& cix, const vector<int>& catchment_indexes,
 				cell_feature_ts&& cell_ts,size_t i) {
 				if (cells.size() == 0)
 					throw runtime_error("no cells to make statistics on");
-				verify_cids_exist(cells, catchment_indexes);
 				double r = 0.0;
 				double sum_area = 0.0;
-				bool match_all = catchment_indexes.size() == 0;
-				for (const auto& c : cells) {
-					if (match_all) {
-						r += cell_ts(c).value(i)*c.geo.area();  // c.env_ts.temperature, could be a feature(c) func return ref to ts
-						sum_area += c.geo.area();
-					} else {
-						for (auto cid : catchment_indexes) {
-							if (c.geo.catchment_id() == (size_t)cid) { // criteria
-								r += cell_ts(c).value(i)*c.geo.area();  // c.env_ts.temperature, could be a feature(c) func return ref to ts
-								sum_area += c.geo.area();
-								break;
-							}
-						}
-					}
+				for (auto ci : cix.cells_of(catchment_indexes)) {
+					const auto& c = cells[ci];
+					r += cell_ts(c).value(i)*c.geo.area();  // c.env_ts.temperature, could be a feature(c) func return ref to ts
+					sum_area += c.geo.area();
 				}
 				r= r/ sum_area; // sih: if no match, then you will get nan here, and I think thats reasonable
 				return r;
 			}
+			template<typename cell, typename cell_feature_ts>
+			static double average_catchment_feature_value(const vector<cell>& cells, const vector<int>& catchment_indexes,
+				cell_feature_ts&& cell_ts,size_t i) {
+				return average_catchment_feature_value(cells, catchment_cell_index(cells), catchment_indexes, cell_ts, i);
+			}
 
 
            /** \brief sum_catchment_feature returns the sum of cell-features(discharge etc)
@@ -268,41 +357,74 @@ namespace shyft {
              * \tparam cell the cell type, assumed to have geo.catchment_id()
              * \tparam cell_feature_ts a callable that takes a const cell ref, returns a ts
              * \param cells that we want to perform calculation on
+             * \param cix the catchment_cell_index of the cells
              * \param catchment_indexes list of catchment-id that identifies the cells, if zero length, all are summed
              * \param cell_ts a callable that fetches the cell feature we want to sum
              * \throw runtime_error if number of cells are zero
              * \return feature sum, as a ts, a  shared_ptr<pts_ts>
              */
 			template<typename cell, typename cell_feature_ts>
-            static shared_ptr<pts_t> sum_catchment_feature(const vector<cell>& cells, const vector<int>& catchment_indexes,
+            static shared_ptr<pts_t> sum_catchment_feature(const vector<cell>& cells, const catchment_cell_index& cix, const vector<int>& catchment_indexes,
                                                            cell_feature_ts && cell_ts) {
                 if (cells.size() == 0)
                     throw runtime_error("no cells to make statistics on");
-				verify_cids_exist(cells, catchment_indexes);
                 shared_ptr<pts_t> r;
-				bool match_all = catchment_indexes.size() == 0;
-
-				for (const auto& c : cells) {
-                    if (match_all) {
-                        if(!r) r= make_shared<pts_t>(cell_ts(c).ta, 0.0, ts_point_fx::POINT_AVERAGE_VALUE);
-                        r->add(cell_ts(c));
-                    } else {
-                        for (auto cid : catchment_indexes) {
-                            if (c.geo.catchment_id() == (size_t)cid) { //criteria
-                                if (!r) r = make_shared<pts_t>(cell_ts(c).ta, 0.0, ts_point_fx::POINT_AVERAGE_VALUE);
-                                r->add(cell_ts(c));  //c.env_ts.temperature, could be a feature(c) func return ref to ts
-                                break;
-                            }
-                        }
-                    }
+				for (auto i : cix.cells_of(catchment_indexes)) {
+                    const auto& ts = cell_ts(cells[i]);
+                    if (!r) r = make_shared<pts_t>(ts.ta, 0.0, ts_point_fx::POINT_AVERAGE_VALUE);
+                    if (ts.size() != r->size())
+                        throw runtime_error("sum_catchment_feature: cell time-series must have equal size, verify the response collection of the cells");
+                    r->add(ts);  //c.env_ts.temperature, could be a feature(c) func return ref to ts
 				}
 				return r;
 			}
+			template<typename cell, typename cell_feature_ts>
+            static shared_ptr<pts_t> sum_catchment_feature(const vector<cell>& cells, const vector<int>& catchment_indexes,
+                                                           cell_feature_ts && cell_ts) {
+                return sum_catchment_feature(cells, catchment_cell_index(cells), catchment_indexes, cell_ts);
+            }
+
+            /** \brief sum_catchment_feature_matrix returns the sum of cell-features(discharge etc) for each of the listed catchments
+             *
+             * The cells of each catchment are visited once, so the cost is one pass over the cells of the listed catchments.
+             *
+             * \tparam cell the cell type, assumed to have geo.catchment_id()
+             * \tparam cell_feature_ts a callable that takes a const cell ref, returns a ts
+             * \param cells that we want to perform calculation on
+             * \param cix the catchment_cell_index of the cells
+             * \param catchment_indexes list of catchment-id, one row in the result for each
+             * \param cell_ts a callable that fetches the cell feature we want to sum
+             * \param n_steps filled in with the number of time-steps, the row-length
+             * \throw runtime_error if number of cells are zero, or a catchment id does not exist
+             * \return row-major catchment_indexes.size() x n_steps matrix, row i is the sum for catchment_indexes[i]
+             */
+            template<typename cell, typename cell_feature_ts>
+            static vector<double> sum_catchment_feature_matrix(const vector<cell>& cells, const catchment_cell_index& cix, const vector<int>& catchment_indexes,
+                                                               cell_feature_ts && cell_ts, size_t& n_steps) {
+                if (cells.size() == 0)
+                    throw runtime_error("no cells to make statistics on");
+                // the row-length is given by the first cell of the first listed catchment, cells of other catchments might not be calculated
+                n_steps = catchment_indexes.size() ? cell_ts(cells[cix.cell_ixs[cix.offsets[cix.catchment_pos(catchment_indexes.front())]]]).size() : 0;
+                vector<double> r(catchment_indexes.size()*n_steps, 0.0);
+                for (size_t j = 0; j < catchment_indexes.size(); ++j) {
+                    auto p = cix.catchment_pos(catchment_indexes[j]);
+                    double *row = r.data() + j*n_steps;
+                    for (size_t k = cix.offsets[p]; k < cix.offsets[p + 1]; ++k) {
+                        const auto& ts = cell_ts(cells[cix.cell_ixs[k]]);
+                        if (ts.size() != n_steps)
+                            throw runtime_error("sum_catchment_feature_matrix: cell time-series must have equal size");
+                        for (size_t i = 0; i < n_steps; ++i) row[i] += ts.v[i];
+                    }
+                }
+                return r;
+            }
+
 			/** \brief sum_catchment_feature_value returns the sum of cell-features(discharge etc) value at the i'th timestep
 			*
 			* \tparam cell the cell type, assumed to have geo.catchment_id()
 			* \tparam cell_feature_ts a callable that takes a const cell ref, returns a ts
 			* \param cells that we want to perform calculation on
+			* \param cix the catchment_cell_index of the cells
 			* \param catchment_indexes list of catchment-id that identifies the cells, if zero length, all are summed
 			* \param cell_ts a callable that fetches the cell feature we want to sum
 			* \param i the i'th time-step of the time-axis to use
@@ -310,34 +432,27 @@ namespace shyft {
 			* \return feature sum, as a ts, a  shared_ptr<pts_ts>
 			*/
 			template<typename cell, typename cell_feature_ts>
-			static double sum_catchment_feature_value(const vector<cell>& cells, const vector<int>& catchment_indexes,
+			static double sum_catchment_feature_value(const vector<cell>& cells, const catchment_cell_index& cix, const vector<int>& catchment_indexes,
 				cell_feature_ts && cell_ts, size_t i) {
 				if (cells.size() == 0)
 					throw runtime_error("no cells to make statistics on");
-				verify_cids_exist(cells, catchment_indexes);
 				double r = 0.0;
-				bool match_all = catchment_indexes.size() == 0;
-
-				for (const auto& c : cells) {
-					if (match_all) {
-						r += cell_ts(c).value(i);
-					} else {
-						for (auto cid : catchment_indexes) {
-							if (c.geo.catchment_id() == (size_t)cid) { //criteria
-								r+=cell_ts(c).value(i);  //c.env_ts.temperature, could be a feature(c) func return ref to ts
-								break;
-							}
-						}
-					}
-				}
+				for (auto ci : cix.cells_of(catchment_indexes))
+					r += cell_ts(cells[ci]).value(i);  //c.env_ts.temperature, could be a feature(c) func return ref to ts
 				return r;
 			}
+			template<typename cell, typename cell_feature_ts>
+			static double sum_catchment_feature_value(const vector<cell>& cells, const vector<int>& catchment_indexes,
+				cell_feature_ts && cell_ts, size_t i) {
+				return sum_catchment_feature_value(cells, catchment_cell_index(cells), catchment_indexes, cell_ts, i);
+			}
 
 			/** \brief catchment_feature extracts cell-features(discharge etc) for specific i'th period of timeaxis
 			*
 			* \tparam cell the cell type, assumed to have geo.catchment_id()
 			* \tparam cell_feature_ts a callable that takes a const cell ref, returns a ts
 			* \param cells that we want to extract feature from
+			* \param cix the catchment_cell_index of the cells
 			* \param catchment_indexes list of catchment-id that identifies the cells, if zero length, all are summed
 			* \param cell_ts a callable that fetches the cell feature ts
 			* \param i the i'th step on the time-axis of the cell-feature
@@ -345,28 +460,21 @@ namespace shyft {
 			* \return vector filled with feature for the i'th time-step on timeaxis
 			*/
 			template<typename cell, typename cell_feature_ts>
-			static vector<double> catchment_feature(const vector<cell>& cells, const vector<int>& catchment_indexes,
+			static vector<double> catchment_feature(const vector<cell>& cells, const catchment_cell_index& cix, const vector<int>& catchment_indexes,
 				cell_feature_ts && cell_ts,size_t i) {
 				if (cells.size() == 0)
 					throw runtime_error("no cells to make extract from");
-				verify_cids_exist(cells, catchment_indexes);
-				vector<double> r; r.reserve(cells.size());
-				bool match_all = catchment_indexes.size() == 0;
-
-				for (const auto& c : cells) {
-					if (match_all) {
-						r.push_back(cell_ts(c).value(i));
-					} else {
-						for (auto cid : catchment_indexes) {
-							if (c.geo.catchment_id() == (size_t)cid) { //criteria
-								r.push_back(cell_ts(c).value(i));  //c.env_ts.temperature, could be a feature(c) func return ref to ts
-								break;
-							}
-						}
-					}
-				}
+				auto ixs = cix.cells_of(catchment_indexes);
+				vector<double> r; r.reserve(ixs.size());
+				for (auto ci : ixs)
+					r.push_back(cell_ts(cells[ci]).value(i));  //c.env_ts.temperature, could be a feature(c) func return ref to ts
 				return r;
 			}
+			template<typename cell, typename cell_feature_ts>
+			static vector<double> catchment_feature(const vector<cell>& cells, const vector<int>& catchment_indexes,
+				cell_feature_ts && cell_ts,size_t i) {
+				return catchment_feature(cells, catchment_cell_index(cells), catchment_indexes, cell_ts, i);
+			}
 
         };
     } // core
@@ -119,6 +119,15 @@ void shyft::time_axis::point_dt::serialize(Archive & ar, const unsigned int vers
     ;
 }
 
+template <class Archive>
+void shyft::time_axis::piecewise_dt::serialize(Archive & ar, const unsigned int version) {
+    ar
+    & make_nvp("seg", seg)
+    ;
+    if (Archive::is_loading::value)
+        make_index();
+}
+
 template <class Archive>
 void shyft::time_axis::generic_dt::serialize(Archive & ar,const unsigned int version) {
     ar
@@ -474,6 +483,7 @@ x_serialize_implement(shyft::core::calendar);
 x_serialize_implement(shyft::time_axis::fixed_dt);
 x_serialize_implement(shyft::time_axis::calendar_dt);
 x_serialize_implement(shyft::time_axis::point_dt);
+x_serialize_implement(shyft::time_axis::piecewise_dt);
 x_serialize_implement(shyft::time_axis::generic_dt);
 
 //-- export core time-series (except binary-ops)
@@ -546,6 +556,7 @@ x_arch(shyft::core::calendar);
 x_arch(shyft::time_axis::fixed_dt);
 x_arch(shyft::time_axis::calendar_dt);
 x_arch(shyft::time_axis::point_dt);
+x_arch(shyft::time_axis::piecewise_dt);
 x_arch(shyft::time_axis::generic_dt);
 
 x_arch(shyft::time_series::point_ts<shyft::time_axis::fixed_dt>);
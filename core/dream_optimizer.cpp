@@ -44,6 +44,11 @@ namespace optimizer {
         }
 
         vector<double> x_candidates(n_parameters,0.0);	// Temporary vector containing parameter proposals to be evaluated
+        vector<size_t> chain_cr(n_chains, 0);	// The cr index drawn for each chain in the current iteration (n_cr if none)
+        vector<size_t> cand_chain;			// The chains that have a proposal to be evaluated in the current iteration
+        vector<vector<double>> cand_states;	// .. and the corresponding proposals
+        vector<double> cand_prob;			// .. and their evaluated posterior log-densities
+        const bool batch = fx.concurrency() > 1;	// evaluate the proposals of an iteration as one concurrent batch
         vector<double> omega(n_chains,0.0);	// Last-half average log-post-densities for each chain
         vector<int> cr_L(n_cr,0);			// Number of candidates generated for each cr value
         vector<double> cr_D(n_cr,0.0);		// Sum of sq.norm.dist achieved for each cr value
@@ -58,8 +63,9 @@ namespace optimizer {
             for (size_t p = 0; p < n_parameters; ++p) {
                 chain_states[i][p] = random01();
             }
-            chain_prob[i] = fx.evaluate(chain_states[i]);
-
+        }
+        fx.evaluate_batch(chain_states, chain_prob);// the initial population in one batch
+        for (size_t i = 0; i < n_chains; ++i) {
             // Store the best parameter set achieved so far, to serve as diagnostic output,
             // and to replace outlier states during burn-in with the HPD parameter set achieved so far.
             if (chain_prob[i] > fx_optimal) {
@@ -138,20 +144,71 @@ namespace optimizer {
                 x_variance[parameter] -= pow(mean, 2); // Variance of par[j] over chains
             }
 
-            // Develop the MCMC chain with index 'chain'
+            // Metropolis step for chain, with the evaluated candidate x_candidate, returns the jump distance,
+            // the distance between previous (existing) parameter set and the new parameter set (accepted candidate)
+            // squared and scaled by the previous-iter inter-chain posterior variance, zero if not accepted.
+            auto metropolis_step = [&](size_t chain, const vector<double>& x_candidate, double cand_prob_x)->double {
+                double jump_distance = 0;
+                // If the new candidate parameters results in better results (higher posterior log-density) than
+                // the previous results for the same chain, the candidates will be accepted and become the
+                // next item in the sequence. But if it has worse results (lower posterior log-density) it
+                // can still be accepted - with a probability given by the ratio between the density of the
+                // new (candidate) and the existing parameter set. This ratio between the density of the
+                // candidate parameter set and the existing parameter set is calculated by using the exp function
+                // on the log densities that the fx evaluation returns. Since exp is the the inverse of log, this
+                // converts the log-density to density values. And exp(a-b) is the same as exp(a)/exp(b), so this
+                // gives the ratio. To keep all candidates with better density and a randomized rejection of worse,
+                // we compare the ratio to a random [0,1) value. If exp(a), the density of candidate, is larger
+                // than exp(b), the density of existing, the result is larger than 1 and it will never be less
+                // than a random [0,1) value. But if the density of the candidate is less than the density of
+                // the existing it will be in the range [0,1], and therefore it may be rejected depending on
+                // how it compares to a random [0,1) value!
+                //    If the candidate is not accepted we call it post-rejected (rejected after evaluation),
+                // and the existing parameter vector and results will be repeated for this chain (same as when pri-rejected).
+                if (exp(cand_prob_x - chain_prob[chain]) < random01()) { // Using the ratio between the density of the candidate parameter vector and the existing compared to random [0,1) number to randomly reject candidates that are not better than the existing.
+                    // The proposal is a posteriori rejected chainstates[chain] already holds the values.
+                    n_post_rejected++;
+                } else {
+                    // The proposal is accepted. This will also happen when d_eff==0, since then candp==curprob[chain].
+                    ++n_accepted;
+                    chain_prob[chain] = cand_prob_x;
+                    for (size_t i = 0; i < n_parameters; ++i) {
+                        // Calculate jump distance between the new (now accepted) candidate parameter set
+                        // and the existing (previous) parameter set for the chain.
+                        jump_distance += pow(chain_states[chain][i] - x_candidate[i], 2) / x_variance[i];
+                        // Make the accepted candidate parameter set the current parameter set for the chain
+                        chain_states[chain][i] = x_candidate[i];
+                    }
+
+                    // Store the best parameter set achieved so far, to serve as diagnostic output,
+                    // and to replace outlier states during burn-in with the HPD parameter set achieved so far.
+                    if (chain_prob[chain] > fx_optimal) {
+                        fx_optimal = chain_prob[chain];
+                        x=chain_states[chain];
+                    }
+                } // accepted (exp(candp-curprob[chain]) >= unif01())
+                return jump_distance;
+            };
+            // Update the count and dist for cr value m.
+            auto update_cr = [&](size_t i_cr, double jump_distance) {
+                if (doing_burnin) {
+                    cr_L[i_cr]++; // Number of candidates generated for cr value m (i_cr)
+                    cr_D[i_cr] += jump_distance; // If accepted (only then jump_distance is > 0), alter sum of sq.norm.dist achieved for cr value m (i_cr)
+                }
+            };
+
+            // Develop the MCMC chain with index 'chain'.
+            // If fx can evaluate concurrently, the chains are developed in two passes: first generate the proposals
+            // of all chains from the chain states of the previous iteration, then evaluate all proposals inside the
+            // allowed box as one batch, and finally perform the Metropolis step for each chain.
+            // Otherwise each chain is developed in turn, and its proposal sees the updated states of the preceding chains.
             for (size_t chain = 0; chain < n_chains; ++chain) {
-                double jump_distance = 0; // The distance between previous (existing) parameter set and the new parameter set (accepted candidate) - squared and scaled by the previous-iter inter-chain posterior variance.
+                chain_cr[chain] = n_cr;// n_cr marks no proposal for this chain (outlier replaced)
                 if (doing_burnin && outliers && omega[chain] < log_x_limit) {
                     // This chain is an outlier; replace the chain states with the currently best parameter set and prob.
                     // Chains with both current and average llh (log-likelihood) lower than Q1-2*(Q3-Q1) will be aborted and
                     // restarted at the highest-probability state found so far in any chain.
-                    for (size_t i = 0; i < n_parameters; ++i) {
-                        // First calculate jump distance between the new candidates (the currently best
-                        // parameter set) and the existing parameter set for the chain.
-                        jump_distance += pow(chain_states[chain][i] - x[i], 2) / x_variance[i];
-                        // Then set the new candidate (current best) as the current values.
-                        chain_states[chain][i] = x[i];
-                    }
+                    chain_states[chain] = x;// the current best becomes the current values
                     chain_prob[chain] = fx_optimal;
                     n_burnins = iteration_count + min_burnins;
                     ++n_outliers;
@@ -172,6 +229,7 @@ namespace optimizer {
                             break;
                         ++i_cr;
                     }
+                    chain_cr[chain] = i_cr;
                     double cr = (double) (i_cr + 1) / (double) n_cr; // Individual-parameter cross-over probability (the cr value)
 
                     // Generate a candidate point for chain chain by adding up k difference-vectors
@@ -194,59 +252,35 @@ namespace optimizer {
                     // vector is still written out to the text file for diagnostics.
                     if (reject) {
                         ++n_pri_rejected;
-                    } else {
+                        if (!batch)
+                            update_cr(i_cr, 0.0);
+                    } else if (!batch) {
                         // The proposal is inside the allowed box, we must run the model to evaluate likelihood
                         // Evaluate the posterior log-density for the candidate parameters, EvalModel provides the likelihood part.
-                        double cand_prob = fx.evaluate(x_candidates);
-
-                        // If the new candidate parameters results in better results (higher posterior log-density) than
-                        // the previous results for the same chain, the candidates will be accepted and become the
-                        // next item in the sequence. But if it has worse results (lower posterior log-density) it
-                        // can still be accepted - with a probability given by the ratio between the density of the
-                        // new (candidate) and the existing parameter set. This ratio between the density of the
-                        // candidate parameter set and the existing parameter set is calculated by using the exp function
-                        // on the log densities that the fx evaluation returns. Since exp is the the inverse of log, this
-                        // converts the log-density to density values. And exp(a-b) is the same as exp(a)/exp(b), so this
-                        // gives the ratio. To keep all candidates with better density and a randomized rejection of worse,
-                        // we compare the ratio to a random [0,1) value. If exp(a), the density of candidate, is larger
-                        // than exp(b), the density of existing, the result is larger than 1 and it will never be less
-                        // than a random [0,1) value. But if the density of the candidate is less than the density of
-                        // the existing it will be in the range [0,1], and therefore it may be rejected depending on
-                        // how it compares to a random [0,1) value!
-                        //    If the candidate is not accepted we call it post-rejected (rejected after evaluation),
-                        // and the existing parameter vector and results will be repeated for this chain (same as when pri-rejected).
-                        if (exp(cand_prob - chain_prob[chain]) < random01()) { // Using the ratio between the density of the candidate parameter vector and the existing compared to random [0,1) number to randomly reject candidates that are not better than the existing.
-                            // The proposal is a posteriori rejected chainstates[chain] already holds the values.
-                            n_post_rejected++;
-                        } else {
-                            // The proposal is accepted. This will also happen when d_eff==0, since then candp==curprob[chain].
-                            ++n_accepted;
-                            chain_prob[chain] = cand_prob;
-                            for (size_t i = 0; i < n_parameters; ++i) {
-                                // Calculate jump distance between the new (now accepted) candidate parameter set
-                                // and the existing (previous) parameter set for the chain.
-                                jump_distance += pow(chain_states[chain][i] - x_candidates[i], 2) / x_variance[i];
-                                // Make the accepted candidate parameter set the current parameter set for the chain
-                                chain_states[chain][i] = x_candidates[i];
-                            }
-
-                            // Store the best parameter set achieved so far, to serve as diagnostic output,
-                            // and to replace outlier states during burn-in with the HPD parameter set achieved so far.
-                            if (chain_prob[chain] > fx_optimal) {
-                                fx_optimal = chain_prob[chain];
-                                x=chain_states[chain];
-                            }
-                        } // accepted (exp(candp-curprob[chain]) >= unif01())
-                    } // A posteriori evaluated block
-
-                    // Update the count and dist for cr value m.
-                    if (doing_burnin) {
-                        cr_L[i_cr]++; // Number of candidates generated for cr value m (i_cr)
-                        cr_D[i_cr] += jump_distance; // If accepted (only then jump_distance is > 0), alter sum of sq.norm.dist achieved for cr value m (i_cr)
+                        update_cr(i_cr, metropolis_step(chain, x_candidates, fx.evaluate(x_candidates)));
+                    } else {
+                        cand_chain.push_back(chain);
+                        cand_states.push_back(x_candidates);
                     }
-
-                } // Non-outlier block
-            } // for (int chain=0; chain<n_chains; chain++) // End single-chain development.
+                }
+            }
+            if (batch) {
+                // Evaluate the posterior log-density for all the candidate parameters, EvalModel provides the likelihood part.
+                fx.evaluate_batch(cand_states, cand_prob);
+                for (size_t chain = 0, k = 0; chain < n_chains; ++chain) {
+                    const size_t i_cr = chain_cr[chain];
+                    if (i_cr == n_cr)
+                        continue;// outlier, already replaced above
+                    double jump_distance = 0;
+                    if (k < cand_chain.size() && cand_chain[k] == chain) {
+                        jump_distance = metropolis_step(chain, cand_states[k], cand_prob[k]);
+                        ++k;
+                    }
+                    update_cr(i_cr, jump_distance);
+                } // for (int chain=0; chain<n_chains; chain++) // End single-chain development.
+                cand_chain.clear();
+                cand_states.clear();
+            }
 
 
             if (doing_burnin) {
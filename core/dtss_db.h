@@ -20,6 +20,7 @@ namespace fs = boost::filesystem;
 #include <io.h>
 #else
 #include <sys/io.h>
+#include <unistd.h>
 #define O_BINARY 0
 #define O_SEQUENTIAL 0
 #include <sys/stat.h>
@@ -60,7 +61,8 @@ using gts_t = shyft::time_series::point_ts<gta_t>;
  * Format specification:
  * The binary format of the file is then defined as :
  *   <ts.db.file>   -> <header><time-axis><values>
- *       <header>   -> 'TS1' <point_fx> <ta_type> <n> <data_period>
+ *       <header>   -> <signature> <point_fx> <ta_type> <n> <data_period>
+ *    <signature>   -> 'TS1' | 'TS2' // 'TS2' only for compact point_dt time-axis, see below
  *     <point_fx>   -> ts_point_fx:uint8_t
  *      <ta_type>   -> time_axis::generic_dt::generic_type:uint8_t
  *            <n>   -> uint32_t // number points
@@ -77,10 +79,21 @@ using gts_t = shyft::time_series::point_ts<gta_t>;
  *        <tz_sz>   -> uint32_t // the size of tz-info string bytes following
  *        <tz_name> -> uint8_t[<tz_sz>] // length given by  tz_sz above
  *
- *   if ta_type == point_dt:
+ *   if ta_type == point_dt and signature == 'TS1':
  *        <t_end>   -> int64_t // the end of the last interval, aka t_end
  *        <t>       -> int64_t[<n>] // <n> from the header
  *
+ *   if ta_type == point_dt and signature == 'TS2': // run-length encoded, time_axis::piecewise_dt
+ *        <n_seg>   -> uint32_t // number of segments
+ *        <seg>     -> ts_db_segment[<n_seg>] // contiguous segments, sum of <count> equals <n>
+ *    ts_db_segment -> <start> <delta_t> <count>
+ *        <start>   -> int64_t
+ *        <delta_t> -> int64_t
+ *        <count>   -> uint32_t
+ *
+ *   The writer selects 'TS2' for point_dt time-axis whenever it is smaller than
+ *   the plain 'TS1' representation, e.g. for regular series with some gaps.
+ *
  * <values>         -> double[<n>] // <n> from the header
  *
  */
@@ -96,6 +109,15 @@ struct ts_db_header {
 	ts_db_header(time_series::ts_point_fx point_fx, time_axis::generic_dt::generic_type ta_type, uint32_t n, utcperiod data_period)
 		: point_fx(point_fx), ta_type(ta_type), n(n), data_period(data_period) {
 	}
+	/** true if the time-axis is a run-length encoded point_dt, ref. 'TS2' */
+	bool is_compact_point_ta() const { return ta_type == time_axis::generic_dt::POINT && signature[2] == '2'; }
+};
+
+/** \brief Storage layer record for one segment of a compact point_dt time-axis */
+struct ts_db_segment {
+	int64_t t = 0; ///< start of the segment
+	int64_t dt = 0; ///< delta-t for the periods of the segment
+	uint32_t n = 0; ///< number of periods in the segment
 };
 #pragma pack(pop)
 
@@ -403,6 +425,34 @@ private:
 		ts_db_header h = mk_header(ats);
 		write(fh, static_cast<const void*>(&h), sizeof(h));
 	}
+	/** true if the run-length encoded form of a point_dt with n points is smaller on disk */
+	static bool compact_is_smaller(const time_axis::piecewise_dt& pw, std::size_t n) {
+		return sizeof(uint32_t) + pw.seg.size()*sizeof(ts_db_segment) < (n + 1)*sizeof(int64_t);
+	}
+	void write_piecewise_time_axis(std::FILE * fh, const time_axis::piecewise_dt& pw) const {
+		uint32_t n_seg = pw.seg.size();
+		std::vector<ts_db_segment> segs;
+		segs.reserve(n_seg);
+		for (const auto& s : pw.seg)
+			segs.push_back(ts_db_segment{ s.t, s.dt, uint32_t(s.n) });
+		write(fh, static_cast<const void*>(&n_seg), sizeof(uint32_t));
+		write(fh, static_cast<const void*>(segs.data()), sizeof(ts_db_segment)*n_seg);
+	}
+	/** write header, point_dt time-axis and values, using the compact 'TS2' time-axis if it's smaller */
+	void write_point_ts(std::FILE * fh, ts_db_header h, const time_axis::point_dt& ta, const std::vector<double>& v) const {
+		time_axis::piecewise_dt pw(ta);
+		bool compact = compact_is_smaller(pw, ta.size());
+		if (compact)
+			h.signature[2] = '2';
+		write(fh, static_cast<const void*>(&h), sizeof(h));
+		if (compact) {
+			write_piecewise_time_axis(fh, pw);
+		} else {
+			write(fh, static_cast<const void*>(&ta.t_end), sizeof(core::utctime));
+			write(fh, static_cast<const void*>(ta.t.data()), sizeof(core::utctime)*ta.t.size());
+		}
+		write_values(fh, v);
+	}
 	void write_time_axis(std::FILE * fh, const gta_t& ta) const {
 		switch (ta.gt) {
 		case time_axis::generic_dt::FIXED: {
@@ -426,7 +476,21 @@ private:
 	void write_values(std::FILE * fh, const std::vector<double>& v) const {
 		write(fh, static_cast<const void*>(v.data()), sizeof(double)*v.size());
 	}
+	/** truncate the file at the current position, after rewriting it with possibly fewer bytes */
+	void truncate_at_pos(std::FILE * fh) const {
+		std::fflush(fh);
+#ifdef _WIN32
+		if (_chsize_s(_fileno(fh), _ftelli64(fh)) != 0)
+#else
+		if (ftruncate(fileno(fh), ftello(fh)) != 0)
+#endif
+			throw std::runtime_error("dtss_store: failed to truncate merged file");
+	}
 	void write_ts(std::FILE * fh, const gts_t& ats) const {
+		if (ats.ta.gt == time_axis::generic_dt::POINT) {
+			write_point_ts(fh, mk_header(ats), ats.ta.p, ats.v);
+			return;
+		}
 		write_header(fh, ats);
 		write_time_axis(fh, ats.ta);
 		write_values(fh, ats.v);
@@ -615,7 +679,7 @@ private:
 			std::vector<double> merged_v(0u, 0.);
 			merged_v.reserve(old_ta.size() + new_ts.size() + 1);  // guaranteed large enough
 																  // -----
-			const std::size_t old_v_offset = sizeof(ts_db_header) + (old_header.n + 1) * sizeof(int64_t);
+			const std::size_t old_v_offset = values_offset(fh, old_header);
 
 			// new start AFTER  =>  start at old
 			if (old_p.start < new_p.start) {
@@ -680,14 +744,9 @@ private:
 			};
 			// -----
 			std::fseek(fh, 0, SEEK_SET);  // seek to begining
-			write(fh, static_cast<const void *>(&new_header), sizeof(ts_db_header));
-
-			// write time-axis
-			write(fh, static_cast<const void *>(&merged_t.at(merged_t.size() - 1)), sizeof(int64_t));
-			write(fh, static_cast<const void *>(merged_t.data()), (merged_t.size() - 1) * sizeof(int64_t));
-
-			// write values
-			write(fh, static_cast<const void *>(merged_v.data()), merged_v.size() * sizeof(double));
+			// write header, time-axis and values
+			write_point_ts(fh, new_header, time_axis::point_dt(std::move(merged_t)), merged_v);
+			truncate_at_pos(fh);// the merged ts could be stored in fewer bytes than the old one
 		} break;
 		}
 	}
@@ -745,6 +804,56 @@ private:
 		read(fh, static_cast<void *>(&h), sizeof(ts_db_header));
 		return h;
 	}
+	/** read the n_seg segments of a compact point_dt time-axis, file positioned at the time-axis */
+	time_axis::piecewise_dt read_piecewise_time_axis(std::FILE * fh) const {
+		uint32_t n_seg{ 0 };
+		read(fh, static_cast<void *>(&n_seg), sizeof(uint32_t));
+		std::vector<ts_db_segment> segs(n_seg);
+		read(fh, static_cast<void *>(segs.data()), sizeof(ts_db_segment)*n_seg);
+		time_axis::piecewise_dt pw;
+		pw.seg.reserve(n_seg);
+		for (const auto& s : segs)
+			pw.seg.emplace_back(s.t, s.dt, s.n);
+		pw.make_index();
+		return pw;
+	}
+	/** read the time-points and end of a point_dt time-axis, in either 'TS1' or compact 'TS2' format */
+	void read_point_time_axis(std::FILE * fh, const ts_db_header& h, std::vector<core::utctime>& t, core::utctime& t_end) const {
+		if (h.is_compact_point_ta()) {
+			auto p = read_piecewise_time_axis(fh).point_time_axis();
+			t = std::move(p.t);
+			t_end = p.t_end;
+		} else {
+			t.resize(h.n);
+			read(fh, static_cast<void *>(&t_end), sizeof(core::utctime));
+			read(fh, static_cast<void *>(t.data()), sizeof(core::utctime)*h.n);
+		}
+	}
+	/** the file offset of the first value, as given by the header and the stored time-axis */
+	std::size_t values_offset(std::FILE * fh, const ts_db_header& h) const {
+		std::fseek(fh, sizeof(ts_db_header), SEEK_SET);
+		switch (h.ta_type) {
+		case time_axis::generic_dt::FIXED: {
+			std::fseek(fh, 2 * sizeof(int64_t), SEEK_CUR);
+		} break;
+		case time_axis::generic_dt::CALENDAR: {
+			std::fseek(fh, 2 * sizeof(int64_t), SEEK_CUR);
+			uint32_t sz{};
+			read(fh, static_cast<void*>(&sz), sizeof(uint32_t));
+			std::fseek(fh, sz * sizeof(uint8_t), SEEK_CUR);
+		} break;
+		case time_axis::generic_dt::POINT: {
+			if (h.is_compact_point_ta()) {
+				uint32_t n_seg{};
+				read(fh, static_cast<void*>(&n_seg), sizeof(uint32_t));
+				std::fseek(fh, n_seg * sizeof(ts_db_segment), SEEK_CUR);
+			} else {
+				std::fseek(fh, (h.n + 1) * sizeof(int64_t), SEEK_CUR);
+			}
+		} break;
+		}
+		return std::ftell(fh);
+	}
 	gta_t read_time_axis(std::FILE * fh, const ts_db_header& h, const utcperiod p, std::size_t& skip_n) const {
 
 		// seek to beginning of time-axis
@@ -821,14 +930,11 @@ private:
 		case time_axis::generic_dt::POINT: {
 			if (t_start <= h.data_period.start && t_end >= h.data_period.end) {
 				// fully around or exact
-				ta.p.t.resize(h.n);
-				read(fh, static_cast<void *>(&ta.p.t_end), sizeof(core::utctime));
-				read(fh, static_cast<void *>(ta.p.t.data()), sizeof(core::utctime)*h.n);
+				read_point_time_axis(fh, h, ta.p.t, ta.p.t_end);
 			} else {
 				core::utctime f_time = 0;
-				std::vector<core::utctime> tmp(h.n, 0.);
-				read(fh, static_cast<void *>(&f_time), sizeof(core::utctime));
-				read(fh, static_cast<void *>(tmp.data()), sizeof(core::utctime)*h.n);
+				std::vector<core::utctime> tmp;
+				read_point_time_axis(fh, h, tmp, f_time);
 				// -----
 				auto it_b = tmp.begin();
 				if (t_start > h.data_period.start) {
@@ -858,21 +964,7 @@ private:
 	std::vector<double> read_values(std::FILE * fh, const ts_db_header& h, const gta_t& ta, const std::size_t skip_n) const {
 
 		// seek to beginning of values
-		std::fseek(fh, sizeof(ts_db_header), SEEK_SET);
-		switch (h.ta_type) {
-		case time_axis::generic_dt::FIXED: {
-			std::fseek(fh, 2 * sizeof(int64_t), SEEK_CUR);
-		} break;
-		case time_axis::generic_dt::CALENDAR: {
-			std::fseek(fh, 2 * sizeof(int64_t), SEEK_CUR);
-			uint32_t sz{};
-			read(fh, static_cast<void*>(&sz), sizeof(uint32_t));
-			std::fseek(fh, sz * sizeof(uint8_t), SEEK_CUR);
-		} break;
-		case time_axis::generic_dt::POINT: {
-			std::fseek(fh, (h.n + 1) * sizeof(int64_t), SEEK_CUR);
-		} break;
-		}
+		values_offset(fh, h);
 
 		const std::size_t points_n = ta.size();
 		std::vector<double> val(points_n, 0.);
@@ -6,6 +6,8 @@
 #include <cmath>
 #include <limits>
 #include <future>
+#include <functional>
+#include <mutex>
 #include <utility>
 #include <memory>
 #include <stdexcept>
@@ -74,10 +76,16 @@ namespace shyft {
             template<class M>
             struct dream_fx : public shyft::core::optimizer::ifx {
                 M& m;
+                vector<unique_ptr<dream_fx>> clones;///< fx for the model clones, provided as worker(1..)
                 explicit dream_fx(M & m) : m(m) {}
+                dream_fx(M & m, const vector<M*>& models) : m(m) {
+                    for (auto mc : models) clones.emplace_back(new dream_fx(*mc));
+                }
                 double evaluate(const vector<double> &x) {
                     return -m(x); // notice that dream find maximumvalue, so we need to negate the goal function, effectively finding the minimum value.
                 }
+                size_t concurrency() const { return 1 + clones.size(); }
+                shyft::core::optimizer::ifx& worker(size_t i) { return i == 0 ? *this : *clones[i - 1]; }
             };
 
             /** \brief template function that find the x that minimizes the evaluated value of model M using DREAM algorithm
@@ -85,13 +93,14 @@ namespace shyft {
              * \param model a reference to the model to be evaluated
              * \param x     the initial x parameters to use (actually not, dream is completely random driven), filled in with the optimal values on return
              * \param max_n_evaluations is the maximum number of iterations, currently not used, the routine returns when convergence is reached
+             * \param clones optional independent copies of model, used to evaluate the chains concurrently
              * \return the goal function of m value, corresponding to the found x-vector
              */
             template  <class M>
-            double min_dream(M& model, vector<double>& x, int max_n_evaluations) {
+            double min_dream(M& model, vector<double>& x, int max_n_evaluations, const vector<M*>& clones = vector<M*>()) {
                 // Scale all parameter ranges to [0, 1]
                 std::vector<double> x_s = model.to_scaled(x);
-                dream_fx<M> fx_m(model);
+                dream_fx<M> fx_m(model, clones);
                 shyft::core::optimizer::dream dr;
                 double res = dr.find_max(fx_m, x_s, max_n_evaluations);
                 // Convert back to real parameter range
@@ -103,10 +112,16 @@ namespace shyft {
             template<class M>
             struct sceua_fx : public shyft::core::optimizer::ifx {
                 M& m;
+                vector<unique_ptr<sceua_fx>> clones;///< fx for the model clones, provided as worker(1..)
                 explicit sceua_fx(M & m) : m(m) {}
+                sceua_fx(M & m, const vector<M*>& models) : m(m) {
+                    for (auto mc : models) clones.emplace_back(new sceua_fx(*mc));
+                }
                 double evaluate(const vector<double> &x) {
                     return m(x);
                 }
+                size_t concurrency() const { return 1 + clones.size(); }
+                shyft::core::optimizer::ifx& worker(size_t i) { return i == 0 ? *this : *clones[i - 1]; }
             };
 
             /** \brief template for the function that finds the x that minimizes the evaluated value of model M using SCEUA algorithm
@@ -116,11 +131,12 @@ namespace shyft {
              * \param max_n_evaluations stop after max_n_interations reached(keep best x until then)
              * \param x_eps stop when all x's changes less than x_eps(recall range 0..1), convergence in x
              * \param y_eps stop when last y-values (model goal functions) seems to have converged (no improvements)
+             * \param clones optional independent copies of model, used to evaluate the sample and evolve the complexes concurrently
              * \return the goal function of m value, and x is the corresponding parameter-set.
              * \throw runtime_error with text sceua: terminated before convergence or max iterations
              */
             template <class M>
-            double min_sceua(M& model, vector<double>& x, size_t max_n_evaluations, double x_eps = 0.0001, double y_eps = 0.0001) {
+            double min_sceua(M& model, vector<double>& x, size_t max_n_evaluations, double x_eps = 0.0001, double y_eps = 0.0001, const vector<M*>& clones = vector<M*>()) {
                 // Scale all parameter ranges to [0, 1]
                 vector<double> x_s = model.to_scaled(x);
                 vector<double> x_min(x_s.size(), 0.0);///normalized range is 0..1 so is min..max
@@ -129,7 +145,7 @@ namespace shyft {
                 // notice that there is some adapter code here, for now, just to keep
                 // the sceua as close to origin as possible(it is fast&efficient, with stack-based mem.allocs)
                 double *xv = __autoalloc__(double, x_s.size()); shyft::core::optimizer::fastcopy(xv, x_s.data(), x_s.size());
-                sceua_fx<M> fx_m(model);
+                sceua_fx<M> fx_m(model, clones);
                 shyft::core::optimizer::sceua opt;
                 double y_result = 0;
                 // optimize with no specific range for y-exit (max-less than min):
@@ -371,6 +387,7 @@ namespace shyft {
                 PA parameter_upper_bound;///< current setting of parameter upper bound
                 vector<PA> parameters_trace;///< parameters_trace contains all parameters tried during optimization
                 vector<double> goal_fn_trace;///< goal-fn-value, corresponding to parameters_trace
+                vector<bool> aborted_trace;///< true if the evaluation was aborted early, and the goal_fn_trace value is a lower bound
                 PA& parameter_accessor; ///<  a *reference* to the model parameters in the target  model, all cells share this!
                 region_model_t& model; ///< a reference to the region model that we optimize
                 vector<target_specification_t> targets; ///<  list of targets ts& catchments indexes to be optimized, used to calculate goal function
@@ -381,10 +398,90 @@ namespace shyft {
                 vector<double> p_max;
                 int print_progress_level;
                 size_t n_catchments=0;///< optimized counted number of model.catchments available
+                size_t n_parallel_models=1;///< number of models used to evaluate populations concurrently, see set_parallel_evaluation
+                bool early_abort=false;///< if true, abort evaluations that can not beat best_goal_fn, see set_early_abort
+                double early_abort_margin=0.0;///< abort only if the lower bound exceeds best_goal_fn by this margin
+                size_t early_abort_checks=4;///< the run is split into this number of blocks, with a check after each block
+                double best_goal_fn=numeric_limits<double>::max();///< best goal-fn value of fully evaluated runs, since prepare_optimize
+                vector<pts_t> catchment_d_sum;///< catchment discharge sums, reused across evaluations
+                vector<pts_t> catchment_charge_sum;///< catchment charge sums, reused across evaluations
+
+                /** observation statistics of a target, used for the lower bound of partial evaluations */
+                struct target_obs_stats {
+                    double sum_obs_mean_diff2=0.0;///< nash-sutcliffe denominator
+                    size_t obs_count=0;
+                    double obs_avg=0.0;
+                };
+                vector<target_obs_stats> target_stats;///< one for each target, computed by prepare_optimize
+                optimizer* trace_owner=nullptr;///< if set, evaluations are traced to this optimizer, see parallel_evaluation_scope
+                std::mutex* trace_mutex=nullptr;///< guards the trace of trace_owner
+                std::function<void(double, const PA&)> trace_callback;///< if set, called for each traced evaluation, see set_trace_callback
+                size_t warm_up_steps=0;///< if > 0, evaluations start from the warm_up_state checkpoint at this time-step, see set_warm_up
+                vector<size_t> warm_up_parameters;///< parameter indexes that invalidates the checkpoint when changed
+                vector<double> warm_up_p;///< the full parameter vector used to compute warm_up_state, empty if no valid checkpoint
+                vector<state_t> warm_up_state;///< the checkpoint, the cell states at warm_up_steps
                 //Need to handle expanded/reduced parameter vector based on min..max range to optimize speed for bobyqa
                 const double activate_limit = 0.000001;
                 bool is_active_parameter(size_t i) const { return fabs(p_max[i] - p_min[i]) > activate_limit; }
 
+                /** keeps the model calculation filter at construction, and restores it on destruction */
+                struct calculation_filter_scope {
+                    region_model_t& m;
+                    vector<int> catchment_ids;
+                    explicit calculation_filter_scope(region_model_t& m) :m(m), catchment_ids(m.get_catchment_calculation_filter()) {}
+                    ~calculation_filter_scope() { m.set_catchment_calculation_filter(catchment_ids); }
+                };
+
+                /** holds the n_parallel_models-1 model clones, with a prepared optimizer for each of them,
+                 * that evaluates populations concurrently with the optimizer o itself.
+                 * The available model cores are split between the models while in scope.
+                 * All evaluations are traced to o, in the order they complete, and early abort is disabled,
+                 * since the best goal-function value, and thus the aborted evaluations, would depend on the timing of the models.
+                 */
+                struct parallel_evaluation_scope {
+                    optimizer& o;
+                    size_t ncore;
+                    bool early_abort;
+                    std::mutex mx;///< guards the trace of o
+                    vector<unique_ptr<region_model_t>> models;
+                    vector<unique_ptr<optimizer>> optimizers;
+                    vector<optimizer*> clones;///< to pass to min_dream/min_sceua
+                    explicit parallel_evaluation_scope(optimizer& o) :o(o), ncore(o.model.ncore), early_abort(o.early_abort) {
+                        if (o.n_parallel_models < 2)
+                            return;
+                        o.early_abort = false;
+                        o.trace_owner = &o;
+                        o.trace_mutex = &mx;
+                        size_t clone_ncore = std::max<size_t>(1, (ncore ? ncore : 4) / o.n_parallel_models);
+                        o.model.ncore = clone_ncore;
+                        for (size_t i = 1; i < o.n_parallel_models; ++i) {
+                            models.emplace_back(new region_model_t(o.model));// state, parameters and calculation filter included
+                            optimizers.emplace_back(new optimizer(*models.back()));
+                            auto& c = *optimizers.back();
+                            c.targets = o.targets;
+                            c.parameter_lower_bound = o.parameter_lower_bound;
+                            c.parameter_upper_bound = o.parameter_upper_bound;
+                            c.p_expanded = o.p_expanded;
+                            c.p_min = o.p_min;
+                            c.p_max = o.p_max;
+                            c.n_catchments = o.n_catchments;
+                            c.print_progress_level = o.print_progress_level;
+                            c.target_stats = o.target_stats;
+                            c.warm_up_steps = o.warm_up_steps;
+                            c.warm_up_parameters = o.warm_up_parameters;
+                            c.trace_owner = &o;
+                            c.trace_mutex = &mx;
+                            clones.push_back(&c);
+                        }
+                    }
+                    ~parallel_evaluation_scope() {
+                        o.model.ncore = ncore;
+                        o.early_abort = early_abort;
+                        o.trace_owner = nullptr;
+                        o.trace_mutex = nullptr;
+                    }
+                };
+
                 vector<double> reduce_p_vector(const vector<double>& fp) const {
                     std::vector<double> r; r.reserve(fp.size());
                     for (size_t i = 0; i < fp.size(); ++i) {
@@ -472,34 +569,60 @@ namespace shyft {
                     n_catchments = model.number_of_catchments();
                     // 3. figure out the catchment indexes to evaluate..
                     //    and if we need to turn on snow collection
-                    vector<int> catchment_indexes;
-
                     model.set_snow_sca_swe_collection(-1, false);//turn off all snow by default.
                     for (const auto&t : targets) {
-                        catchment_indexes.insert(catchment_indexes.end(), begin(t.catchment_indexes), end(t.catchment_indexes));
                         if (t.catchment_property == SNOW_WATER_EQUIVALENT || t.catchment_property==SNOW_COVERED_AREA)
                             for (auto cid : t.catchment_indexes)
                                 model.set_snow_sca_swe_collection(cid, true);//turn on for those with something like snow enabled
-                        if (t.catchment_property == ROUTED_DISCHARGE) {
-                            auto river_cids = model.get_catchment_feeding_to_river(t.river_id);
-                            for (auto rc : river_cids)catchment_indexes.push_back(rc);
-                        }
                     }
-                    if (catchment_indexes.size() > 1) {
-                        sort(begin(catchment_indexes), end(catchment_indexes));
-                        auto unique_end = unique(begin(catchment_indexes), end(catchment_indexes));
-                        catchment_indexes.resize(distance(begin(catchment_indexes), unique_end));
+                    vector<int> catchment_indexes;
+                    vector<int> river_ids;
+                    target_calculation_filter(catchment_indexes, river_ids);
+                    for (auto rid : river_ids) {
+                        for (auto rc : model.get_catchment_feeding_to_river(rid)) {
+                            if (model.has_catchment_parameter(rc))
+                                throw runtime_error("Cannot calibrate on local parameters.");
+                        }
                     }
                     for (auto i : catchment_indexes) {
                         if (model.has_catchment_parameter(i))
                             throw runtime_error("Cannot calibrate on local parameters.");
                     }
-                    model.set_catchment_calculation_filter(catchment_indexes); //Only calculate the catchments that we optimize
+                    model.set_calculation_filter(catchment_indexes, river_ids); //Only calculate the catchments and rivers(incl. upstreams) that we optimize
                     // 4. detects if initial state is established, if not it automatically do a copy of the current state
                     auto_initial_state_check();
                     parameters_trace.clear();// wipe out parameters_trace
                     goal_fn_trace.clear();// and the corresponding goal_fn values
+                    aborted_trace.clear();
+                    // 5. prepare for early abort of evaluations
+                    best_goal_fn = numeric_limits<double>::max();
+                    compute_target_stats();
+                    // 6. the warm-up checkpoint depends on initial state and time-axis, so recompute it on first evaluation
+                    if (warm_up_steps > 0 && warm_up_steps >= model.time_axis.size())
+                        throw runtime_error("warm-up steps must be less than the model time-axis size");
+                    warm_up_p.clear();
+                }
+                /** \brief compute the minimal calculation filter needed to evaluate the current targets
+                 *
+                 * \param catchment_ids filled with the sorted unique catchment ids referenced by the targets
+                 * \param river_ids filled with the sorted unique river ids of ROUTED_DISCHARGE targets,
+                 *        the model extends these to the catchments feeding into the river or any river upstream.
+                 */
+                void target_calculation_filter(vector<int>& catchment_ids, vector<int>& river_ids) const {
+                    catchment_ids.clear();
+                    river_ids.clear();
+                    for (const auto&t : targets) {
+                        if (t.catchment_property == ROUTED_DISCHARGE)
+                            river_ids.push_back(t.river_id);
+                        else
+                            catchment_ids.insert(catchment_ids.end(), begin(t.catchment_indexes), end(t.catchment_indexes));
+                    }
+                    for (auto v : { &catchment_ids, &river_ids }) {
+                        sort(begin(*v), end(*v));
+                        v->erase(unique(begin(*v), end(*v)), end(*v));
+                    }
                 }
+
                 void auto_initial_state_check() {
                     if (model.initial_state.size() != model.get_cells()->size()) {
                         if (print_progress_level > 0)
@@ -509,6 +632,7 @@ namespace shyft {
                 }
                 int trace_size() const {return goal_fn_trace.size();}
                 double trace_goal_fn(int i) const {return goal_fn_trace[size_t(i)];}
+                bool trace_aborted(int i) const {return aborted_trace[size_t(i)];}
                 PA   trace_parameter(int i) const {return parameters_trace[size_t(i)];}
                 /** returns the initial state for the i'th cell */
                 state_t get_initial_state(size_t idx) {
@@ -527,6 +651,7 @@ namespace shyft {
                  * \return the optimized parameter vector
                  */
                 vector<double> optimize(const vector<double>& p, size_t max_n_evaluations = 1500, double tr_start = 0.1, double tr_stop = 1.0e-5) {
+                    calculation_filter_scope filter_scope(model);// restores the current model calculation filter when done
                     prepare_optimize();
                     // reduce using min..max the parameter space,
                     p_expanded = p;//put all parameters into class scope so that we can reduce/expand as needed during optimization
@@ -552,11 +677,13 @@ namespace shyft {
                  * \return the optimized parameter vector
                  */
                 vector<double> optimize_dream(const vector<double>& p, size_t max_n_evaluations = 1500) {
+                    calculation_filter_scope filter_scope(model);// restores the current model calculation filter when done
                     prepare_optimize();
                     // reduce using min..max the parameter space,
                     p_expanded = p;//put all parameters into class scope so that we can reduce/expand as needed during optimization
                     auto rp = reduce_p_vector(p);
-                    min_dream<optimizer>(*this, rp, max_n_evaluations);
+                    parallel_evaluation_scope evaluators(*this);
+                    min_dream<optimizer>(*this, rp, max_n_evaluations, evaluators.clones);
                     return expand_p_vector(rp);// expand,put inplace p to return vector.
                 }
                 /** optimize using the dream algorithm, returning the new optimized parameter set*/
@@ -577,11 +704,13 @@ namespace shyft {
                  * \return the optimized parameter vector
                  */
                 vector<double> optimize_sceua(const vector<double>& p, size_t max_n_evaluations = 1500, double x_eps = 0.0001, double y_eps = 1.0e-5) {
+                    calculation_filter_scope filter_scope(model);// restores the current model calculation filter when done
                     prepare_optimize();
                     // reduce using min..max the parameter space,
                     p_expanded = p;//put all parameters into class scope so that we can reduce/expand as needed during optimization
                     auto rp = reduce_p_vector(p);
-                    min_sceua(*this, rp, max_n_evaluations, x_eps, y_eps);
+                    parallel_evaluation_scope evaluators(*this);
+                    min_sceua<optimizer>(*this, rp, max_n_evaluations, x_eps, y_eps, evaluators.clones);
                     return expand_p_vector(rp);				// expand,put inplace p to return vector.
                 }
 
@@ -603,6 +732,85 @@ namespace shyft {
                 }
 
                 void set_verbose_level(int level) { print_progress_level = level; }
+                /**\brief enable/disable early abort of goal-function evaluations during optimize
+                 *
+                 * When enabled, the model is run in n_checks blocks of time-steps. After each block,
+                 * a lower bound of the goal-function is computed from the elapsed part of the period.
+                 * If the lower bound exceeds the best goal-function value found so far by more than margin,
+                 * the remaining blocks are skipped, and the lower bound is returned as the goal-function value.
+                 * It is thus always worse than the best value, and it is traced with trace_aborted(i) true.
+                 * \note only DISCHARGE targets with nash-sutcliffe, rmse or abs-diff calc mode contributes to the lower bound,
+                 * all other targets are counted with their minimum, 0, so early abort is most effective when these dominates the goal-function.
+                 * Targets without finite observations after the warm-up period are skipped.
+                 * \note the lower bound assumes finite model results, and that all targets evaluates to finite values.
+                 * \note early abort is not applied with parallel evaluation, see set_parallel_evaluation.
+                 * \param enable true to enable early abort, default disabled
+                 * \param margin the lower bound must exceed best value + margin to abort, must be >= 0
+                 * \param n_checks number of blocks to split the run into, must be > 0
+                 */
+                void set_early_abort(bool enable, double margin = 0.0, size_t n_checks = 4) {
+                    if (n_checks == 0)
+                        throw runtime_error("set_early_abort: n_checks must be > 0");
+                    if (!(margin >= 0.0))
+                        throw runtime_error("set_early_abort: margin must be >= 0");
+                    early_abort = enable;
+                    early_abort_margin = margin;
+                    early_abort_checks = n_checks;
+                }
+                bool get_early_abort() const { return early_abort; }
+                /**\brief enable/disable the warm-up checkpoint for goal-function evaluations
+                 *
+                 * When enabled, the first n_steps of the model time-axis is a spin-up period that is
+                 * run once, and the cell states at the end of it is kept as a checkpoint. Each evaluation then starts from the
+                 * checkpoint, running only the remaining time-steps. The spin-up uses the parameters
+                 * that optimize was started with, except for the parameters listed in invalidating_parameters,
+                 * where the evaluated values are used, so that a change in any of those causes a new spin-up run.
+                 * The part of the simulated target properties within the spin-up period is set to nan, and thus
+                 * excluded from the goal-function.
+                 *
+                 * \param n_steps number of spin-up time-steps, 0 disables the checkpoint
+                 * \param invalidating_parameters names, as given by the parameter get_name(i), of parameters that invalidates the checkpoint
+                 * \throw runtime_error if a parameter name is not found
+                 */
+                void set_warm_up(size_t n_steps, const vector<string>& invalidating_parameters) {
+                    PA pa;
+                    vector<size_t> ix;
+                    for (const auto& name : invalidating_parameters) {
+                        size_t i = 0;
+                        while (i < pa.size() && pa.get_name(i) != name) ++i;
+                        if (i == pa.size())
+                            throw runtime_error("set_warm_up: unknown parameter name " + name);
+                        ix.push_back(i);
+                    }
+                    warm_up_steps = n_steps;
+                    warm_up_parameters = ix;
+                    warm_up_p.clear();
+                }
+                size_t get_warm_up_steps() const { return warm_up_steps; }
+                /**\brief set the number of models used to evaluate populations concurrently in optimize_dream and optimize_sceua
+                 *
+                 * The optimizer makes n-1 clones of the model for each optimization,
+                 * and the model cores are split between the n models.
+                 * The trace holds all evaluations in the order they complete, which may vary from run to run when n > 1.
+                 * For sceua, the result is the same for any n. For dream, n > 1 evaluates the proposals of all chains
+                 * in an iteration as one batch, from the chain states of the previous iteration, so the sampler
+                 * differs from the sequential n = 1 case, where each chain sees the updates of the chains before it.
+                 * Early abort, see set_early_abort, is not applied when n > 1.
+                 * \param n number of models, 1 (the default) evaluates sequentially using the model only.
+                 */
+                void set_parallel_evaluation(size_t n) {
+                    if (n == 0)
+                        throw runtime_error("set_parallel_evaluation: number of models must be > 0");
+                    n_parallel_models = n;
+                }
+                size_t get_parallel_evaluation() const { return n_parallel_models; }
+                /**\brief set a callback that is called with the goal-function value and the parameters of each evaluation, as it is traced
+                 *
+                 * This allows progress to be followed while an optimization runs. With parallel evaluation,
+                 * the callback is called from the thread of the evaluating model, one call at a time.
+                 * \param fx the callback, or an empty function to remove it
+                 */
+                void set_trace_callback(std::function<void(double, const PA&)> fx) { trace_callback = std::move(fx); }
                 /**\brief calculate the goal_function as used by minbobyqa,
                  *   using the full set of  parameters vectors (as passed to optimize())
                  *   and also ensures that the shyft state/cell/catchment result is consistent
@@ -661,23 +869,157 @@ namespace shyft {
                 }
             private:
 
-                pts_t compute_discharge_sum(const target_specification_t& t, vector<pts_t>& catchment_d) const {
-                    if (catchment_d.empty())
-                        model.catchment_discharges(catchment_d);
+                pts_t compute_discharge_sum(const target_specification_t& t, const vector<pts_t>& catchment_d) const {
                     pts_t discharge_sum(model.time_axis, 0.0, shyft::time_series::POINT_AVERAGE_VALUE);
                     for (auto i : t.catchment_indexes)
                         discharge_sum.add(catchment_d[model.cix_from_cid(i)]);// important! the catchment_d(ischarge) is in internal index order
                     return discharge_sum;
                 }
-                pts_t compute_charge_sum(const target_specification_t& t, vector<pts_t>& catchment_charges) const {
-                    if (catchment_charges.empty())
-                        model.catchment_charges(catchment_charges);
+                pts_t compute_charge_sum(const target_specification_t& t, const vector<pts_t>& catchment_charges) const {
                     pts_t charge_sum(model.time_axis, 0.0, shyft::time_series::POINT_AVERAGE_VALUE);
                     for (auto i : t.catchment_indexes)
                         charge_sum.add(catchment_charges[model.cix_from_cid(i)]);// important! the catchment_charges is in internal index order
                     return charge_sum;
                 }
 
+                /** \brief adds time-steps [i0..i1) of the cell property tsf(c) into the catchment sums r
+                 *
+                 * Starting at the first evaluated time-step (0, or warm_up_steps), r is zeroed, and only reallocated if the model catchments or time-axis changed,
+                 * so that the buffers are reused across evaluations, and the sums can be built block by block.
+                 */
+                template<class property_ts_function>
+                void accumulate_catchment_sums(vector<pts_t>& r, size_t i0, size_t i1, property_ts_function && tsf) const {
+                    if (i0 == warm_up_steps) {
+                        const size_t n = model.number_of_catchments();
+                        if (r.size() != n || (n > 0 && r.front().ta != model.time_axis))
+                            r.assign(n, pts_t(model.time_axis, 0.0, shyft::time_series::POINT_AVERAGE_VALUE));
+                        else
+                            for (auto& ts : r) ts.fill(0.0);
+                    }
+                    for (const auto& c : *model.get_cells()) {
+                        if (model.is_calculated_by_catchment_ix(c.geo.catchment_ix)) {
+                            const auto& src = tsf(c).v;
+                            if (src.size() < i1)
+                                throw runtime_error("optimizer: a cell response needed by the targets is not collected, verify set_response_collection");
+                            auto& dst = r[c.geo.catchment_ix].v;
+                            for (size_t i = i0; i < i1; ++i)
+                                dst[i] += src[i];
+                        }
+                    }
+                }
+
+                /** \brief compute the observation statistics of the targets, used by partial_goal_function_lower_bound
+                 * \note intervals that ends within the warm-up period are excluded, since they are excluded from the goal-function,
+                 * a target with no finite observations outside the warm-up period gets obs_count 0, and is skipped by the lower bound
+                 */
+                void compute_target_stats() {
+                    target_stats.clear();
+                    const bool warm_up = warm_up_steps > 0 && warm_up_steps < model.time_axis.size();
+                    const utctime t_warm_up = warm_up ? model.time_axis.time(warm_up_steps) : utctime(0);
+                    for (const auto& t : targets) {
+                        shyft::time_series::direct_accessor<decltype(t.ts), typename PS::ta_t> o(t.ts, t.ts.time_axis());
+                        target_obs_stats s;
+                        auto included = [&](size_t i) { return !warm_up || t.ts.time_axis().period(i).end > t_warm_up; };
+                        for (size_t i = 0; i < o.size(); ++i) {
+                            double v = o.value(i);
+                            if (isfinite(v) && included(i)) { s.obs_avg += v; ++s.obs_count; }
+                        }
+                        if (s.obs_count == 0) {
+                            s.obs_avg = 0.0;
+                            target_stats.push_back(s);
+                            continue;
+                        }
+                        s.obs_avg /= double(s.obs_count);
+                        for (size_t i = 0; i < o.size(); ++i) {
+                            double v = o.value(i);
+                            if (isfinite(v) && included(i)) s.sum_obs_mean_diff2 += (v - s.obs_avg)*(v - s.obs_avg);
+                        }
+                        target_stats.push_back(s);
+                    }
+                }
+
+                /** \brief a lower bound of the goal-function, given that the model is computed until t_end
+                 *
+                 * Only target intervals that ends before t_end are considered, and only discharge targets
+                 * with nash-sutcliffe, rmse or abs-diff calc mode contributes, since their (full-period normalized)
+                 * sums can only grow with more time-steps. Other targets contribute with 0, their minimum.
+                 */
+                double partial_goal_function_lower_bound(utctime t_end) const {
+                    double lower_bound = 0.0;
+                    double scale_factor_sum = 0.0;
+                    for (size_t k = 0; k < targets.size(); ++k) {
+                        const auto& t = targets[k];
+                        scale_factor_sum += t.scale_factor;
+                        if (t.catchment_property != DISCHARGE || t.calc_mode == target_spec_calc_type::KLING_GUPTA)
+                            continue;
+                        const auto& s = target_stats[k];
+                        if (s.obs_count == 0 || (t.calc_mode == target_spec_calc_type::RMSE && !(s.obs_avg > 0.0)))
+                            continue;
+                        const auto& ta = t.ts.time_axis();
+                        size_t n = 0;
+                        while (n < ta.size() && ta.period(n).end <= t_end) ++n;
+                        if (n == 0)
+                            continue;
+                        pts_t property_sum = compute_discharge_sum(t, catchment_d_sum);
+                        mask_warm_up(property_sum);
+                        shyft::time_series::direct_accessor<decltype(t.ts), typename PS::ta_t> target_accessor(t.ts, ta);
+                        shyft::time_series::average_accessor<pts_t, typename PS::ta_t> property_sum_accessor(property_sum, ta);
+                        double sse = 0.0, sad = 0.0;
+                        for (size_t i = 0; i < n; ++i) {
+                            double o = target_accessor.value(i);
+                            double m = property_sum_accessor.value(i);
+                            if (isfinite(o) && isfinite(m)) {
+                                sse += (o - m)*(o - m);
+                                sad += fabs(o - m);
+                            }
+                        }
+                        double v;
+                        if (t.calc_mode == target_spec_calc_type::NASH_SUTCLIFFE)
+                            v = sse / s.sum_obs_mean_diff2;
+                        else if (t.calc_mode == target_spec_calc_type::RMSE)
+                            v = sqrt(sse / s.obs_count) / s.obs_avg;
+                        else
+                            v = sad;
+                        if (isfinite(v))
+                            lower_bound += t.scale_factor*v;
+                    }
+                    return scale_factor_sum > 0.0 ? lower_bound / scale_factor_sum : 0.0;
+                }
+
+                /** \brief set the warm-up part of ts to nan, so that it is excluded from the goal-function */
+                void mask_warm_up(pts_t& ts) const {
+                    if (warm_up_steps > 0)
+                        ts.fill_range(shyft::nan, 0, int(std::min(warm_up_steps, ts.size())));
+                }
+
+                /** \brief prepare the model for an evaluation with full parameter vector p, returns the first time-step to run
+                 *
+                 * Without warm-up, this is just reset_states(), returning 0.
+                 * With warm-up, the checkpoint is (re)computed if needed, the model is set to the checkpoint state,
+                 * and the evaluation starts at warm_up_steps.
+                 */
+                size_t start_evaluation(const vector<double>& p) {
+                    if (warm_up_steps == 0) {
+                        reset_states();
+                        return 0;
+                    }
+                    // the spin-up parameters: as optimize was started with, except for the invalidating parameters
+                    vector<double> p_spin_up = p_expanded.size() == p.size() ? p_expanded : p;
+                    for (auto i : warm_up_parameters)
+                        p_spin_up[i] = p[i];
+                    if (p_spin_up != warm_up_p) {
+                        parameter_accessor.set(p_spin_up);
+                        reset_states();
+                        model.run_cells(0, 0, int(warm_up_steps));
+                        model.get_states(warm_up_state);
+                        warm_up_p = p_spin_up;
+                        parameter_accessor.set(p);
+                    } else {
+                        model.set_states(warm_up_state);
+                    }
+                    return warm_up_steps;
+                }
+
                 /** \brief extracts vector of area_ts for all calculated catchments using the
                  * given property function tsf that should have signature pts_t (const cell& c)
                  * \note that this function sum together contributions at cell-level.
@@ -742,6 +1084,24 @@ namespace shyft {
                     throw runtime_error("resource collector doesn't have snow_swe");
                 }
 
+                /** append the current parameters and goal-function value v to the trace, of trace_owner if set */
+                void add_trace(double v, bool aborted = false) {
+                    if (trace_owner) {
+                        std::lock_guard<std::mutex> lock(*trace_mutex);
+                        trace_owner->parameters_trace.push_back(parameter_accessor);
+                        trace_owner->goal_fn_trace.push_back(v);
+                        trace_owner->aborted_trace.push_back(aborted);
+                        if (trace_owner->trace_callback)
+                            trace_owner->trace_callback(v, parameter_accessor);
+                    } else {
+                        parameters_trace.push_back(parameter_accessor);
+                        goal_fn_trace.push_back(v);
+                        aborted_trace.push_back(aborted);
+                        if (trace_callback)
+                            trace_callback(v, parameter_accessor);
+                    }
+                }
+
                 /**\brief from operator(), called by min_bobyqa, for each iteration, so p is bobyqa parameter vector
                 * notice that the function returns the value of the goal function,
                 * as specified by the target specification. The flexibility is rather large:
@@ -752,18 +1112,46 @@ namespace shyft {
                 double run(const vector<double>& rp) {
                     auto p = expand_p_vector(rp);// expand to full vector, then:
                     parameter_accessor.set(p); // Sets global parameters, all cells share a common pointer.
-                    reset_states();
-                    model.run_cells();
+                    const size_t i_start = start_evaluation(p);// reset states, or start from the warm-up checkpoint
+                    bool need_discharge = false, need_charge = false;
+                    for (const auto& t : targets) {
+                        need_discharge = need_discharge || t.catchment_property == DISCHARGE;
+                        need_charge = need_charge || t.catchment_property == CELL_CHARGE;
+                    }
+                    // run the model in blocks, building the catchment sums incrementally, and check for early abort after each block
+                    const size_t n_steps = model.time_axis.size();
+                    const bool check_abort = early_abort && need_discharge && target_stats.size() == targets.size() && best_goal_fn < numeric_limits<double>::max();
+                    const size_t n_blocks = check_abort ? std::max<size_t>(1, std::min(early_abort_checks, n_steps - i_start)) : 1;
+                    for (size_t b = 0; b < n_blocks; ++b) {
+                        size_t i0 = i_start + b*(n_steps - i_start) / n_blocks;
+                        size_t i1 = i_start + (b + 1)*(n_steps - i_start) / n_blocks;
+                        if (i0 == 0 && i1 == n_steps)
+                            model.run_cells();
+                        else
+                            model.run_cells(0, int(i0), int(i1 - i0));
+                        if (need_discharge)
+                            accumulate_catchment_sums(catchment_d_sum, i0, i1, [](const cell_t&c)->const pts_t& {return c.rc.avg_discharge;});
+                        if (need_charge)
+                            accumulate_catchment_sums(catchment_charge_sum, i0, i1, [](const cell_t&c)->const pts_t& {return c.rc.charge_m3s;});
+                        if (b + 1 < n_blocks) {
+                            double lower_bound = partial_goal_function_lower_bound(model.time_axis.time(i1));
+                            if (lower_bound > best_goal_fn + early_abort_margin) {
+                                add_trace(lower_bound, true);
+                                if (print_progress_level > 0)
+                                    cout << lower_bound << " : aborted at step " << i1 << " of " << n_steps << endl;
+                                return lower_bound;
+                            }
+                        }
+                    }
                     double goal_function_value = 0.0;// overall goal-function, intially zero
                     double scale_factor_sum = 0.0; // each target-spec have a weight, -use this to sum up weights
-                    vector<pts_t> catchment_d;
-                    vector<area_ts> catchment_sca, catchment_swe;// "catchment" level simulated discharge,sca,swe
+                    vector<area_ts> catchment_sca, catchment_swe;// "catchment" level simulated sca,swe
                     for (const auto& t : targets) {
                         shyft::time_series::direct_accessor<decltype(t.ts), typename PS::ta_t> target_accessor(t.ts, t.ts.time_axis());
                         pts_t property_sum;
                         switch (t.catchment_property) {
                         case DISCHARGE:
-                            property_sum = compute_discharge_sum(t, catchment_d);
+                            property_sum = compute_discharge_sum(t, catchment_d_sum);
                             break;
                         case SNOW_COVERED_AREA:
                             property_sum = compute_sca_sum(t, catchment_sca);
@@ -775,8 +1163,9 @@ namespace shyft {
                             property_sum = *model.river_output_flow_m3s(t.river_id);
                             break;
                         case CELL_CHARGE:
-                            property_sum = compute_charge_sum(t, catchment_d);
+                            property_sum = compute_charge_sum(t, catchment_charge_sum);
                         }
+                        mask_warm_up(property_sum);
                         shyft::time_series::average_accessor<pts_t, typename PS::ta_t> property_sum_accessor(property_sum, t.ts.time_axis());
                         double partial_goal_function_value;
                         if (t.calc_mode == target_spec_calc_type::NASH_SUTCLIFFE) {
@@ -807,8 +1196,9 @@ namespace shyft {
                         }
                     }
                     goal_function_value /= scale_factor_sum;
-                    parameters_trace.push_back(parameter_accessor);// save to the parameters_trace
-                    goal_fn_trace.push_back(goal_function_value);//
+                    if (goal_function_value < best_goal_fn)
+                        best_goal_fn = goal_function_value;
+                    add_trace(goal_function_value);// save to the parameters_trace
                     if (print_progress_level > 0) {
                         cout << goal_function_value <<" : ParameterVector(";
                         for (size_t i = 0; i < parameter_accessor.size(); ++i) {
@@ -23,6 +23,8 @@
 
 #include <vector>
 #include <cstring>
+#include <algorithm>
+#include <future>
 
 namespace shyft {
     namespace core {
@@ -30,11 +32,52 @@ namespace shyft {
             using namespace std;
             ///< just temporary simple abstract interface for the target function, later just a callable
             struct ifx {
+                virtual ~ifx() {}
                 virtual double evaluate(const vector<double>& x)=0;
                 double evaluate(size_t n,const double *x) {
                     vector<double> xx(x,x+n);
                     return evaluate(xx);
                 }
+                /** \brief number of independent evaluators, see worker(i), that can be used concurrently.
+                 *  The default is 1, meaning that fx can only be evaluated sequentially.
+                 */
+                virtual size_t concurrency() const { return 1; }
+                /** \brief returns the i'th evaluator, i in [0..concurrency()), each of them
+                 *  can be used concurrently with the others, and must compute the same fx as this.
+                 */
+                virtual ifx& worker(size_t i) { return *this; }
+                /** \brief evaluate a population of x-vectors, fxs[i]=evaluate(xs[i])
+                 *
+                 * If concurrency() > 1, the population is evaluated in parallel, where
+                 * x-vector i is always evaluated by worker(i % concurrency()), so that
+                 * the distribution of work, and thus the result, is deterministic.
+                 *
+                 * \param xs the x-vectors to evaluate
+                 * \param fxs (out) resized to xs.size() and filled with the corresponding fx values
+                 */
+                void evaluate_batch(const vector<vector<double>>& xs, vector<double>& fxs) {
+                    fxs.resize(xs.size());
+                    const size_t n_workers = std::min<size_t>(concurrency(), xs.size());
+                    if (n_workers < 2) {
+                        for (size_t i = 0; i < xs.size(); ++i)
+                            fxs[i] = evaluate(xs[i]);
+                        return;
+                    }
+                    vector<future<void>> calcs;
+                    for (size_t w = 0; w < n_workers; ++w) {
+                        calcs.emplace_back(
+                            async(launch::async,
+                                [this, w, n_workers, &xs, &fxs]() {
+                                    auto& fx = worker(w);
+                                    for (size_t i = w; i < xs.size(); i += n_workers)
+                                        fxs[i] = fx.evaluate(xs[i]);
+                                }
+                            )
+                        );
+                    }
+                    for (auto& f : calcs)
+                        f.get();
+                }
             };
 
             /// \brief  __autoalloc__ uses alloca and typecast to allocate an array on stack,
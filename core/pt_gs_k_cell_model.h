@@ -28,6 +28,23 @@ namespace shyft {
             typedef shared_ptr<state_t>     state_t_;
             typedef shared_ptr<response_t>  response_t_;
 
+            /** \brief the response variables of the all_response_collector
+             *
+             * bit-values, combined with | to a mask that selects the variables to collect
+             * \sa region_model::set_response_collection
+             */
+            enum response_variable : unsigned int {
+                AVG_DISCHARGE = 1 << 0,
+                CHARGE_M3S = 1 << 1,
+                SNOW_SCA = 1 << 2,
+                SNOW_SWE = 1 << 3,
+                SNOW_OUTFLOW = 1 << 4,
+                GLACIER_MELT = 1 << 5,
+                AE_OUTPUT = 1 << 6,
+                PE_OUTPUT = 1 << 7,
+                ALL_RESPONSES = 0xff
+            };
+
             /** \brief all_reponse_collector aims to collect all output from a cell run so that it can be studied afterwards.
             *
             * \note could be quite similar between variants of a cell, e.g. ptgsk pthsk ptssk, ptss..
@@ -35,36 +52,41 @@ namespace shyft {
             * TODO: Really make sure that units are correct, precise and useful..
             *       both with respect to measurement unit, and also specifying if this
             *       a 'state in time' value or a average-value for the time-step.
+            * \tparam ts_t the storage type of the collected time-series, pts_t, or pts32_t for float32 storage
             */
-            struct all_response_collector {
+            template <class ts_t>
+            struct basic_all_response_collector {
                 double destination_area;///< in [m^2]
                 // these are the one that we collects from the response, to better understand the model::
-                pts_t avg_discharge; ///< Kirchner Discharge given in [m^3/s] for the timestep
-                pts_t charge_m3s; ///< = precip + glacier - act_evap - avg_discharge [m^3/s] for the timestep
-                pts_t snow_sca; ///< gamma snow covered area fraction, sca.. 0..1 - at the end of timestep (state)
-                pts_t snow_swe;///< gamma snow swe, [mm] over the cell sca.. area, - at the end of timestep ?
-                pts_t snow_outflow;///< gamma snow output [m^3/s] for the timestep
-                pts_t glacier_melt;///< [m3/s] for the timestep
-                pts_t ae_output;///< actual evap mm/h
-                pts_t pe_output;///< actual evap mm/h
+                ts_t avg_discharge; ///< Kirchner Discharge given in [m^3/s] for the timestep
+                ts_t charge_m3s; ///< = precip + glacier - act_evap - avg_discharge [m^3/s] for the timestep
+                ts_t snow_sca; ///< gamma snow covered area fraction, sca.. 0..1 - at the end of timestep (state)
+                ts_t snow_swe;///< gamma snow swe, [mm] over the cell sca.. area, - at the end of timestep ?
+                ts_t snow_outflow;///< gamma snow output [m^3/s] for the timestep
+                ts_t glacier_melt;///< [m3/s] for the timestep
+                ts_t ae_output;///< actual evap mm/h
+                ts_t pe_output;///< actual evap mm/h
                 response_t end_reponse;///<< end_response, at the end of collected
+                unsigned int collect_mask = ALL_RESPONSES;///< response_variable bits to collect, the others are empty time-series
 
-                all_response_collector() : destination_area(0.0) {}
-                explicit all_response_collector(const double destination_area) : destination_area(destination_area) {}
-                all_response_collector(const double destination_area, const timeaxis_t& time_axis)
+                basic_all_response_collector() : destination_area(0.0) {}
+                explicit basic_all_response_collector(const double destination_area) : destination_area(destination_area) {}
+                basic_all_response_collector(const double destination_area, const timeaxis_t& time_axis)
                     : destination_area(destination_area), avg_discharge(time_axis, 0.0),charge_m3s(time_axis,0.0), snow_sca(time_axis, 0.0), snow_swe(time_axis, 0.0), snow_outflow(time_axis, 0.0), glacier_melt(time_axis, 0.0), ae_output(time_axis, 0.0), pe_output(time_axis, 0.0) {}
 
                 /**\brief called before run to allocate space for results */
                 void initialize(const timeaxis_t& time_axis,int start_step,int n_steps, double area) {
                     destination_area = area;
-                    ts_init(avg_discharge, time_axis, start_step, n_steps, ts_point_fx::POINT_AVERAGE_VALUE);
-                    ts_init(charge_m3s, time_axis, start_step, n_steps, ts_point_fx::POINT_AVERAGE_VALUE);
-                    ts_init(snow_sca, time_axis, start_step, n_steps, ts_point_fx::POINT_AVERAGE_VALUE);
-                    ts_init(snow_swe, time_axis, start_step, n_steps, ts_point_fx::POINT_AVERAGE_VALUE);
-                    ts_init(snow_outflow, time_axis, start_step, n_steps, ts_point_fx::POINT_AVERAGE_VALUE);
-                    ts_init(glacier_melt, time_axis, start_step, n_steps, ts_point_fx::POINT_AVERAGE_VALUE);
-                    ts_init(ae_output, time_axis, start_step, n_steps, ts_point_fx::POINT_AVERAGE_VALUE);
-                    ts_init(pe_output, time_axis, start_step, n_steps, ts_point_fx::POINT_AVERAGE_VALUE);
+                    const timeaxis_t no_ta(time_axis.start(), time_axis.delta(), 0);
+                    auto ta = [&](unsigned int v)->const timeaxis_t& { return (collect_mask & v) ? time_axis : no_ta; };
+                    ts_init(avg_discharge, ta(AVG_DISCHARGE), start_step, n_steps, ts_point_fx::POINT_AVERAGE_VALUE);
+                    ts_init(charge_m3s, ta(CHARGE_M3S), start_step, n_steps, ts_point_fx::POINT_AVERAGE_VALUE);
+                    ts_init(snow_sca, ta(SNOW_SCA), start_step, n_steps, ts_point_fx::POINT_AVERAGE_VALUE);
+                    ts_init(snow_swe, ta(SNOW_SWE), start_step, n_steps, ts_point_fx::POINT_AVERAGE_VALUE);
+                    ts_init(snow_outflow, ta(SNOW_OUTFLOW), start_step, n_steps, ts_point_fx::POINT_AVERAGE_VALUE);
+                    ts_init(glacier_melt, ta(GLACIER_MELT), start_step, n_steps, ts_point_fx::POINT_AVERAGE_VALUE);
+                    ts_init(ae_output, ta(AE_OUTPUT), start_step, n_steps, ts_point_fx::POINT_AVERAGE_VALUE);
+                    ts_init(pe_output, ta(PE_OUTPUT), start_step, n_steps, ts_point_fx::POINT_AVERAGE_VALUE);
                 }
 
                 /**\brief Call for each time step, to collect needed information from R
@@ -78,18 +100,20 @@ namespace shyft {
                  */
                 //template<class R>
                 void collect(size_t idx, const response_t& response) {
-                    avg_discharge.set(idx, mmh_to_m3s(response.total_discharge, destination_area)); // wants m3/s, q_avg is given in mm/h, so compute the totals in  mm/s
-                    charge_m3s.set(idx, response.charge_m3s);
-                    snow_sca.set(idx, response.gs.sca);
-                    snow_outflow.set(idx, mmh_to_m3s(response.gs.outflow,destination_area)); // mm/h @cell-area ->  m3/st
-                    glacier_melt.set(idx, response.gm_melt_m3s);
-                    snow_swe.set(idx, response.gs.storage);
-                    ae_output.set(idx, response.ae.ae);
-                    pe_output.set(idx, response.pt.pot_evapotranspiration);
+                    if (collect_mask & AVG_DISCHARGE) avg_discharge.set(idx, mmh_to_m3s(response.total_discharge, destination_area)); // wants m3/s, q_avg is given in mm/h, so compute the totals in  mm/s
+                    if (collect_mask & CHARGE_M3S) charge_m3s.set(idx, response.charge_m3s);
+                    if (collect_mask & SNOW_SCA) snow_sca.set(idx, response.gs.sca);
+                    if (collect_mask & SNOW_OUTFLOW) snow_outflow.set(idx, mmh_to_m3s(response.gs.outflow, destination_area)); // mm/h @cell-area ->  m3/st
+                    if (collect_mask & GLACIER_MELT) glacier_melt.set(idx, response.gm_melt_m3s);
+                    if (collect_mask & SNOW_SWE) snow_swe.set(idx, response.gs.storage);
+                    if (collect_mask & AE_OUTPUT) ae_output.set(idx, response.ae.ae);
+                    if (collect_mask & PE_OUTPUT) pe_output.set(idx, response.pt.pot_evapotranspiration);
                 }
                 //template<class R>
                 void set_end_response(const response_t& r) {end_reponse=r;}
             };
+            typedef basic_all_response_collector<pts_t> all_response_collector;///< collects all responses, stored as double
+            typedef basic_all_response_collector<pts32_t> all_response_collector32;///< collects all responses, stored as float32
 
             /** \brief a collector that collects/keep discharge only */
             struct discharge_collector {
@@ -127,6 +151,26 @@ namespace shyft {
                 }
                 void set_end_response(const response_t& response) {end_response=response;}
             };
+            /** \brief a collector that adds the cell discharge directly into the catchment sum
+             *
+             * No per-cell series are kept, the region_model sets catchment_acc to the
+             * row for the cell catchment, in the accumulator of the thread running the cell.
+             * \sa is_catchment_accumulator
+             */
+            struct catchment_discharge_collector {
+                double destination_area = 0.0;///< in [m^2]
+                double *catchment_acc = nullptr;///< catchment accumulator row, indexed by time-step, set by region_model before the run
+                response_t end_response;///<< end_response, at the end of collected
+
+                void initialize(const timeaxis_t& time_axis,int start_step,int n_steps, double area) {
+                    destination_area = area;
+                }
+                void collect(size_t idx, const response_t& response) {
+                    if (catchment_acc)
+                        catchment_acc[idx] += mmh_to_m3s(response.total_discharge, destination_area);
+                }
+                void set_end_response(const response_t& response) {end_response=response;}
+            };
             /**\brief a state null collector
              *
              * Used during calibration/optimization when there is no need for state,
@@ -207,6 +251,8 @@ namespace shyft {
             // typedef the variants we need exported.
             typedef cell<parameter_t, environment_t, state_t, state_collector, all_response_collector> cell_complete_response_t;///< used for usual/explorative runs, where we would like all possible info, result and state
             typedef cell<parameter_t, environment_t, state_t, null_collector, discharge_collector> cell_discharge_response_t; ///<used for operational or calibration runs, only needed info is collected.
+            typedef cell<parameter_t, environment_t, state_t, null_collector, catchment_discharge_collector> cell_catchment_discharge_t;///< for production runs where only catchment discharge sums are needed
+            typedef cell<parameter_t, environment32_t, state_t, state_collector, all_response_collector32> cell_complete_response32_t;///< as cell_complete_response_t, but forcing and responses stored as float32, computed as double
 
         }
         //specialize run method for all_response_collector
@@ -236,6 +282,71 @@ namespace shyft {
             ::set_state_collection(bool on_or_off) {
             sc.collect_state = on_or_off;
         }
+        template<>
+        inline void cell<pt_gs_k::parameter_t, environment_t, pt_gs_k::state_t,
+                         pt_gs_k::state_collector, pt_gs_k::all_response_collector>
+            ::set_response_collection(unsigned int mask) {
+            rc.collect_mask = mask;
+        }
+
+        //specialize run method for the float32 storage all_response_collector32
+        template<>
+        inline void cell<pt_gs_k::parameter_t, environment32_t, pt_gs_k::state_t,
+                         pt_gs_k::state_collector, pt_gs_k::all_response_collector32>
+            ::run(const timeaxis_t& time_axis, int start_step, int n_steps) {
+            if (parameter.get() == nullptr)
+                throw std::runtime_error("pt_gs_k::run with null parameter attempted");
+            begin_run(time_axis,start_step,n_steps);
+            pt_gs_k::run_pt_gs_k<direct_accessor, pt_gs_k::response_t>(
+                geo,
+                *parameter,
+                time_axis, start_step, n_steps,
+                env_ts.temperature,
+                env_ts.precipitation,
+                env_ts.wind_speed,
+                env_ts.rel_hum,
+                env_ts.radiation,
+                state,
+                sc,
+                rc);
+        }
+        template<>
+        inline void cell<pt_gs_k::parameter_t, environment32_t, pt_gs_k::state_t,
+                         pt_gs_k::state_collector, pt_gs_k::all_response_collector32>
+            ::set_state_collection(bool on_or_off) {
+            sc.collect_state = on_or_off;
+        }
+        template<>
+        inline void cell<pt_gs_k::parameter_t, environment32_t, pt_gs_k::state_t,
+                         pt_gs_k::state_collector, pt_gs_k::all_response_collector32>
+            ::set_response_collection(unsigned int mask) {
+            rc.collect_mask = mask;
+        }
+
+        template<>
+        struct is_catchment_accumulator<pt_gs_k::catchment_discharge_collector> : std::true_type {};
+
+        //specialize run method for catchment_discharge_collector
+        template<>
+        inline void cell<pt_gs_k::parameter_t, environment_t, pt_gs_k::state_t,
+                         pt_gs_k::null_collector, pt_gs_k::catchment_discharge_collector>
+            ::run(const timeaxis_t& time_axis, int start_step, int n_steps) {
+            if (parameter.get() == nullptr)
+                throw std::runtime_error("pt_gs_k::run with null parameter attempted");
+            begin_run(time_axis, start_step, n_steps);
+            pt_gs_k::run_pt_gs_k<direct_accessor, pt_gs_k::response_t>(
+                geo,
+                *parameter,
+                time_axis, start_step, n_steps,
+                env_ts.temperature,
+                env_ts.precipitation,
+                env_ts.wind_speed,
+                env_ts.rel_hum,
+                env_ts.radiation,
+                state,
+                sc,
+                rc);
+        }
 
         //specialize run method for discharge_collector
         template<>
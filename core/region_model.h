@@ -14,6 +14,7 @@
 #include <stdexcept>
 #include <future>
 #include <mutex>
+#include <functional>
 
 #include "core_pch.h"
 
@@ -27,6 +28,7 @@
 #include "pt_hs_k.h"
 #include "geo_cell_data.h"
 #include "routing.h"
+#include "cell_model.h"
 
 /**
  * This file now contains mostly things to provide the PTxxK model,or
@@ -218,6 +220,8 @@ namespace shyft {
             typedef std::shared_ptr<parameter_t> parameter_t_;
             typedef typename cell_vec_t::iterator cell_iterator;
             typedef RE region_env_t;
+            /** sink for run_cells_streamed: (block time-axis, catchment ids, row-major catchment x block-steps discharge [m3/s]) */
+            typedef std::function<void(const timeaxis_t&, const std::vector<int>&, const std::vector<double>&)> block_sink_t;
         protected:
 
             cell_vec_t_ cells;///< a region consists of cells that orchestrate the distributed correlation
@@ -227,6 +231,7 @@ namespace shyft {
             std::vector<bool> catchment_filter;///<if active (alias .size()>0), only calc if catchment_filter[catchment_id] is true.
             std::vector<int> cix_to_cid;///< maps internal zero-based catchment index ix to externally supplied catchment id.
             std::map<int,int> cid_to_cix;///< map external catchment id to internal index
+            std::shared_ptr<catchment_cell_index> cell_index;///< catchment to cells lookup for statistics, rebuilt when cells are set
 
             void update_ix_to_id_mapping() {
                 // iterate over cell-vector
@@ -244,9 +249,12 @@ namespace shyft {
 						c.geo.catchment_ix = found->second;// assign corresponding ix.
 					}
                 }
+                cell_index = std::make_shared<catchment_cell_index>(*cells);
             }
 
             size_t n_catchments=0;///< optimized//extracted as max(cell.geo.catchment_id())+1 in run interpolate
+            std::vector<double> catchment_acc;///< catchment x time-steps discharge sums, internal catchment ix order, filled by run_cells for catchment accumulating cells
+            bool selective_response_collection = false;///< true once set_response_collection is used, then the discharge consumers verify the responses are collected
 
             void clone(const region_model& c) {
                 // First, clear own content
@@ -254,12 +262,14 @@ namespace shyft {
                 time_axis = c.time_axis;
                 catchment_filter = c.catchment_filter;
                 n_catchments = c.n_catchments;
+                selective_response_collection = c.selective_response_collection;
 				ip_parameter = c.ip_parameter;
                 region_env = c.region_env;// todo: verify it is deep or shallow copy
                 catchment_parameters.clear();
                 // Then, clone from c
                 cix_to_cid=c.cix_to_cid;
                 cid_to_cix=c.cid_to_cix;
+                cell_index=c.cell_index;// the cells are copied, so the index is the same, and immutable, share it
                 initial_state = c.initial_state;
                 cells = cell_vec_t_(new cell_vec_t(*(c.cells)));
                 river_network=c.river_network;
@@ -315,6 +325,8 @@ namespace shyft {
             routing::river_network river_network;///< the routing river_network, can be empty
             /** \brief compute and return number of catchments inspecting call cells.geo.catchment_id() */
             size_t number_of_catchments() const { return cix_to_cid.size(); }
+            /** \brief the catchment to cell-index lookup of the cells, used for fast catchment statistics */
+            std::shared_ptr<catchment_cell_index> get_catchment_cell_index() const { return cell_index; }
 
             /** connect all cells in a catchment to a river
              * \param cid catchment id for the cells to be connected to the specified river
@@ -575,6 +587,51 @@ namespace shyft {
                 run_routing(start_step,n_steps);
             }
 
+            /** \brief run interpolation and cells in time-blocks, streaming catchment discharge to a sink
+            *
+            * For long simulations, keeping the cell environment and response time-series for the
+            * complete period resident is costly (cells x steps x number of series).
+            * This function splits the time_axis into blocks of block_steps, and for each block
+            * it initializes the cell environment to the block time-axis, interpolates,
+            * runs the cells, and passes the catchment discharge sums for the block to the sink.
+            * The cell state is carried from one block to the next, and the cell time-series
+            * buffers are reused, so memory is proportional to cells x block_steps.
+            *
+            * \note when done, the model time_axis, cell env_ts and responses are those of the last block.
+            *
+            * \param ip_parameter contains wanted parameters for the interpolation
+            * \param time_axis the complete time-axis to run
+            * \param env contains the \ref region_environment type
+            * \param block_steps number of time-steps in each block, the last block can be shorter
+            * \param catchment_ids the catchment ids to aggregate, if empty, all catchments calculated by the catchment calculation filter
+            * \param sink callable that receives the block time-axis, the catchment ids, and the block discharge
+            * \param use_ncore forwarded to run_cells
+            * \throw runtime_error if block_steps is zero, if a catchment id is not calculated, or if the interpolation of a block fails
+            */
+            void run_cells_streamed(const interpolation_parameter& ip_parameter, const timeaxis_t& time_axis, const region_env_t& env,
+                                    size_t block_steps, const std::vector<int>& catchment_ids, const block_sink_t& sink, size_t use_ncore=0) {
+                if (block_steps == 0)
+                    throw runtime_error("region_model::run_cells_streamed block_steps must be > 0");
+                std::vector<int> cids;
+                if (catchment_ids.size() == 0) {
+                    for (auto cid : cell_index->cids)
+                        if (is_calculated(cid)) cids.push_back(cid);
+                } else {
+                    for (auto cid : catchment_ids)
+                        if (!is_calculated(cid))
+                            throw runtime_error(string("region_model::run_cells_streamed catchment id ") + to_string(cid) + " is not calculated, see set_catchment_calculation_filter");
+                    cids = catchment_ids;
+                }
+                for (size_t i0 = 0; i0 < time_axis.size(); i0 += block_steps) {
+                    timeaxis_t block_ta(time_axis.time(i0), time_axis.delta(), std::min(block_steps, time_axis.size() - i0));
+                    initialize_cell_environment(block_ta);
+                    if (!interpolate(ip_parameter, env))
+                        throw runtime_error(string("region_model::run_cells_streamed interpolation failed for block starting at step ") + to_string(i0));
+                    run_cells(use_ncore);
+                    sink(block_ta, cids, block_discharge(cids, is_catchment_accumulator<typename cell_t::response_collector_t>()));
+                }
+            }
+
             /** \brief set the region parameter, apply it to all cells
              *        that do not have catchment specific parameters.
              * \note that if there already exist a region parameter
@@ -686,6 +743,19 @@ namespace shyft {
                 }
             }
 
+            /** \brief returns the catchment ids that are currently selected by the calculation filter.
+             *
+             * The returned list can be passed to set_catchment_calculation_filter to re-establish
+             * the current filter, e.g. after a temporary change.
+             * \return catchment id vector, empty if there is no active filter (i.e. all catchments are calculated)
+             */
+            std::vector<int> get_catchment_calculation_filter() const {
+                std::vector<int> r;
+                for (size_t cix = 0; cix < catchment_filter.size(); ++cix)
+                    if (catchment_filter[cix]) r.push_back(cix_to_cid[cix]);
+                return r;
+            }
+
             /**compute the unique set of catchments feeding into this river_id, or any river upstream */
             std::set<int> get_catchment_feeding_to_river(int river_id) const {
                 std::set<int> r;
@@ -769,6 +839,23 @@ namespace shyft {
                     if (catchment_id == -1 || (int)cell.geo.catchment_id() == catchment_id )
                         cell.set_snow_sca_swe_collection(on_or_off);
             }
+            /** \brief set which response variables to collect for specified or all cells
+             *
+             * Disabled variables are not allocated, nor written to during the run, so
+             * e.g. forecast runs can collect discharge everywhere, and snow swe only
+             * for a few catchments. Call with -1 first to set the default for all cells,
+             * then for the catchments that should differ.
+             *
+             * \param catchment_id to set the collection for, -1 means all cells
+             * \param mask bit-mask of response variables to collect, as defined by the cell stack, e.g. pt_gs_k::response_variable
+             * \throw runtime_error if the underlying cell do not support selective response collection
+             */
+            void set_response_collection(int catchment_id, unsigned int mask) {
+                for(auto& cell:*cells)
+                    if (catchment_id == -1 || (int)cell.geo.catchment_id() == catchment_id )
+                        cell.set_response_collection(mask);
+                selective_response_collection = true;
+            }
             /** \return cells as shared_ptr<vector<cell_t>> */
             cell_vec_t_ get_cells() const { return cells; }
 
@@ -785,17 +872,67 @@ namespace shyft {
              */
             template <class TSV>
             void catchment_discharges( TSV& cr) const {
+                catchment_discharges(cr, is_catchment_accumulator<typename cell_t::response_collector_t>());
+            }
+            /** \brief the catchment discharge sums, as accumulated by the last run_cells
+             *
+             * Only available for cells with catchment accumulating collectors, see is_catchment_accumulator
+             * \param cid the catchment id
+             * \return discharge sum [m3/s] of the cells of the catchment, on the model time-axis
+             */
+            pts_t get_catchment_discharge_sum(int cid) const {
+                auto f = cid_to_cix.find(cid);
+                if (f == cid_to_cix.end())
+                    throw runtime_error(string("specified catchment id=") + to_string(cid) + string(" not found"));
+                const size_t n = time_axis.size();
+                if (catchment_acc.size() != cix_to_cid.size()*n)
+                    throw runtime_error("no catchment discharge sums, run_cells with catchment accumulating cells first");
+                return pts_t(time_axis, vector<double>(begin(catchment_acc) + f->second*n, begin(catchment_acc) + (f->second + 1)*n), ts_point_fx::POINT_AVERAGE_VALUE);
+            }
+        protected:
+            template <class TSV>
+            void catchment_discharges(TSV& cr, std::true_type) const {
+                typedef typename TSV::value_type ts_t;
+                const size_t n = time_axis.size();
+                cr.clear();
+                cr.reserve(n_catchments);
+                for (size_t i = 0; i < n_catchments; ++i) {
+                    cr.emplace_back(ts_t(time_axis, 0.0));
+                    if (catchment_acc.size() == n_catchments*n && is_calculated_by_catchment_ix(i))
+                        for (size_t t = 0; t < n; ++t)
+                            cr.back().set(t, catchment_acc[i*n + t]);
+                }
+            }
+            template <class TSV>
+            void catchment_discharges( TSV& cr, std::false_type) const {
                 typedef typename TSV::value_type ts_t;
                 cr.clear();
                 cr.reserve(n_catchments);
                 for(size_t i=0;i<n_catchments;++i) {
                     cr.emplace_back(ts_t(time_axis, 0.0));
                 }
+                verify_response_collected("catchment_discharges", [](const cell_t& c)->const auto& { return c.rc.avg_discharge; });
                 for(const auto& c: *cells) {
                     if ( is_calculated_by_catchment_ix(c.geo.catchment_ix))
                         cr[c.geo.catchment_ix].add(c.rc.avg_discharge);
                 }
             }
+        public:
+            /** \brief throws runtime_error unless the calculated cells have the response time-series of the model time-axis
+             *
+             * Only verified once set_response_collection is used, since the response
+             * time-series are then empty for the switched off responses.
+             * \param what the name of the caller, for the message
+             * \param cell_ts a callable that fetches the response ts of a cell, e.g. c.rc.avg_discharge
+             */
+            template <class cell_feature_ts>
+            void verify_response_collected(const char* what, cell_feature_ts&& cell_ts) const {
+                if (!selective_response_collection)
+                    return;
+                for (const auto& c : *cells)
+                    if (is_calculated_by_catchment_ix(c.geo.catchment_ix) && cell_ts(c).size() != time_axis.size())
+                        throw runtime_error(string("region_model::") + what + ": the cell response is not collected for the model time-axis, verify run_cells and set_response_collection");
+            }
 
             template <class TSV>
             void catchment_charges(TSV& cr) const {
@@ -805,6 +942,7 @@ namespace shyft {
                 for (size_t i = 0;i < n_catchments;++i) {
                     cr.emplace_back(ts_t(time_axis, 0.0));
                 }
+                verify_response_collected("catchment_charges", [](const cell_t& c)->const auto& { return c.rc.charge_m3s; });
                 for (const auto& c : *cells) {
                     if (is_calculated_by_catchment_ix(c.geo.catchment_ix)) {
                         cr[c.geo.catchment_ix].add(c.rc.charge_m3s);
@@ -821,46 +959,75 @@ namespace shyft {
              */
             template <class TSV>
             void routing_discharges( TSV& cr) const {
-                //typedef typename TSV::value_type ts_t;
                 cr.clear();
                 if(has_routing()) {
-                    //TODO: iterate over the routing model, return results
-                    routing::model<C> rn(river_network,cells,time_axis);
                     std::vector<int> rids;
                     for(auto r:river_network.rid_map)
                         rids.push_back(r.first);
                     std::sort(begin(rids),end(rids));// ascending order!
-                    for(auto rid:rids) {
-                        cr.emplace_back(rn.output_m3s(rid));
-                    }
+                    with_routing_model("routing_discharges", [&cr,&rids](const auto& rn) {
+                        for(auto rid:rids)
+                            cr.emplace_back(rn.output_m3s(rid));
+                    });
                 }
-                return cr;
             }
             std::shared_ptr<pts_t> river_output_flow_m3s(int rid) const {
                 auto r= std::make_shared<pts_t>(time_axis,0.0,time_series::ts_point_fx::POINT_AVERAGE_VALUE);
-                if(has_routing()) {
-                    routing::model<C> rn(river_network,cells,time_axis);
-                    r=std::make_shared<pts_t>(rn.output_m3s(rid));
-                }
+                if(has_routing())
+                    with_routing_model("river_output_flow_m3s", [&r,rid](const auto& rn) { r = std::make_shared<pts_t>(rn.output_m3s(rid)); });
                 return r;
             }
             std::shared_ptr<pts_t> river_upstream_inflow_m3s(int rid) const {
                 auto r= std::make_shared<pts_t>(time_axis,0.0,time_series::ts_point_fx::POINT_AVERAGE_VALUE);
-                if(has_routing()) {
-                    routing::model<C> rn(river_network,cells,time_axis);
-                    r=std::make_shared<pts_t>(rn.upstream_inflow(rid));
-                }
+                if(has_routing())
+                    with_routing_model("river_upstream_inflow_m3s", [&r,rid](const auto& rn) { r = std::make_shared<pts_t>(rn.upstream_inflow(rid)); });
                 return r;
             }
             std::shared_ptr<pts_t> river_local_inflow_m3s(int rid) const {
                 auto r= std::make_shared<pts_t>(time_axis,0.0,time_series::ts_point_fx::POINT_AVERAGE_VALUE);
-                if(has_routing()) {
-                    routing::model<C> rn(river_network,cells,time_axis);
-                    r=std::make_shared<pts_t>(rn.local_inflow(rid));
-                }
+                if(has_routing())
+                    with_routing_model("river_local_inflow_m3s", [&r,rid](const auto& rn) { r = std::make_shared<pts_t>(rn.local_inflow(rid)); });
                 return r;
             }
         protected:
+            /** \brief calls fx with the routing model of the cells
+             *
+             * Routing needs the discharge of each cell, so cells that accumulate
+             * catchment sums, see is_catchment_accumulator, can not be routed.
+             * \throw runtime_error if the cells do not keep their discharge
+             */
+            template <class Fx>
+            void with_routing_model(const char* what, Fx&& fx) const {
+                with_routing_model(what, fx, is_catchment_accumulator<typename cell_t::response_collector_t>());
+            }
+            template <class Fx>
+            void with_routing_model(const char* what, Fx& fx, std::false_type) const {
+                verify_response_collected(what, [](const cell_t& c)->const auto& { return c.rc.avg_discharge; });
+                routing::model<C> rn(river_network,cells,time_axis);
+                fx(rn);
+            }
+            template <class Fx>
+            void with_routing_model(const char* what, Fx&, std::true_type) const {
+                throw runtime_error(string("region_model::") + what + ": routing is not supported for cells that accumulate catchment discharge");
+            }
+            /** \brief the catchment discharge of the current block for run_cells_streamed, catchment_ids x time-steps */
+            std::vector<double> block_discharge(const std::vector<int>& cids, std::false_type) const {
+                verify_response_collected("run_cells_streamed", [](const cell_t& c)->const auto& { return c.rc.avg_discharge; });
+                size_t n_steps = 0;
+                return cell_statistics::sum_catchment_feature_matrix(*cells, *cell_index, cids,
+                                                                     [](const cell_t& c)->const auto& { return c.rc.avg_discharge; }, n_steps);
+            }
+            std::vector<double> block_discharge(const std::vector<int>& cids, std::true_type) const {
+                const size_t n = time_axis.size();
+                std::vector<double> q;q.reserve(cids.size()*n);
+                for (auto cid : cids) {
+                    auto f = cid_to_cix.find(cid);
+                    if (f == cid_to_cix.end())
+                        throw runtime_error(string("specified catchment id=") + to_string(cid) + string(" not found"));
+                    q.insert(end(q), begin(catchment_acc) + f->second*n, begin(catchment_acc) + (f->second + 1)*n);
+                }
+                return q;
+            }
             /** \brief parallell_run using a mid-point split + async to engange multicore execution
              *
              * \param time_axis forwarded to the cell.run(time_axis)
@@ -889,6 +1056,9 @@ namespace shyft {
              * \param thread_cell_count number of cells given to each async thread
              */
             void parallel_run(const timeaxis_t& time_axis, int start_step, int  n_steps, cell_iterator beg, cell_iterator endc,int use_ncore) {
+                parallel_run(time_axis, start_step, n_steps, beg, endc, use_ncore, is_catchment_accumulator<typename cell_t::response_collector_t>());
+            }
+            void parallel_run(const timeaxis_t& time_axis, int start_step, int  n_steps, cell_iterator beg, cell_iterator endc,int use_ncore, std::false_type) {
                 size_t len = distance(beg, endc);
                 if(len == 0)
                     return;
@@ -919,6 +1089,66 @@ namespace shyft {
                     f.get();
                 return;
             }
+            /** \brief parallel_run for cells that accumulate discharge directly into catchment sums
+             *
+             * Each worker thread keeps one time-steps row, and points the collector of the cell
+             * it runs to that row. When the cell is done, the row is added to the catchment
+             * row of catchment_acc, under a per catchment lock, so there is no per-cell series,
+             * and the extra memory is one row for each thread.
+             * \throw runtime_error if cells are routed, routing needs the discharge of each cell
+             */
+            void parallel_run(const timeaxis_t& time_axis, int start_step, int  n_steps, cell_iterator beg, cell_iterator endc,int use_ncore, std::true_type) {
+                if (has_routing())
+                    throw runtime_error("parallel_run: routing is not supported for cells that accumulate catchment discharge");
+                const size_t n = time_axis.size();
+                const size_t n_cix = cix_to_cid.size();
+                const size_t i0 = start_step;
+                const size_t i1 = n_steps ? i0 + n_steps : n;
+                if (catchment_acc.size() != n_cix*n)
+                    catchment_acc = vector<double>(n_cix*n, 0.0);
+                for (size_t r = 0; r < n_cix; ++r)
+                    std::fill(begin(catchment_acc) + r*n + i0, begin(catchment_acc) + r*n + i1, 0.0);
+                size_t len = distance(beg, endc);
+                if(len == 0)
+                    return;
+                if(use_ncore == 0)
+                    throw runtime_error("parallel_run: use_ncore is zero ");
+                vector<future<void>> calcs;
+                mutex pos_mx;
+                vector<mutex> acc_mx(n_cix);// one for each catchment row
+                size_t pos = 0;
+                for (int i = 0;i < use_ncore;++i) {
+                    calcs.emplace_back(
+                        async(launch::async,
+                            [this,&pos,&pos_mx,&acc_mx,len,&time_axis,&beg,start_step,n_steps,n,i0,i1]() {
+                                vector<double> row(n, 0.0);// thread-local discharge of the running cell
+                                while (true) {
+                                    size_t ci;
+                                    { lock_guard<decltype(pos_mx)> lock(pos_mx);// get work item here
+                                        if (pos < len)
+                                            ci = pos++;
+                                        else
+                                            break;
+                                    }
+                                    auto c = beg + ci;
+                                    if (!is_calculated_by_catchment_ix(c->geo.catchment_ix))
+                                        continue;
+                                    std::fill(begin(row) + i0, begin(row) + i1, 0.0);
+                                    c->rc.catchment_acc = row.data();
+                                    this->single_run(time_axis, start_step, n_steps, c, c + 1);
+                                    c->rc.catchment_acc = nullptr;
+                                    const size_t r = c->geo.catchment_ix;
+                                    lock_guard<mutex> lock(acc_mx[r]);// merge into the model catchment sum
+                                    for (size_t t = i0; t < i1; ++t)
+                                        catchment_acc[r*n + t] += row[t];
+                                }
+                            }
+                        )
+                    );
+                }
+                for(auto &f:calcs)
+                    f.get();
+            }
             void run_routing(int start_step,int n_steps) {
                 // TODO: implement
                 // things to consider:
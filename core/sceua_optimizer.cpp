@@ -30,28 +30,29 @@ namespace shyft {
                 const size_t p		=	5;		// The number of complexes
                 const size_t n_live_points	=	p*m;	// The number of "live" points in the parameter space
 
-                double **ax		= __autoalloc__(double*,m);
                 double **sample = __autoalloc__(double*,n_live_points);
                 double **ssample= __autoalloc__(double*,n_live_points);
 
-                for (i=0; i<m; i++)
-                    ax[i]= __autoalloc__(double,n);
                 for (i=0;i<n_live_points;i++) {// While the x table contains the full parameter vector,
                     sample[i] =__autoalloc__(double,n);	// sample does not contain any fixed parameters.
                     ssample[i]=__autoalloc__(double,n);	// Neither does sample.
                 }
                 size_t*		ind=__autoalloc__(size_t,n_live_points);
-                double*		af =__autoalloc__(double,m);
                 double*		f  =__autoalloc__(double,n_live_points);
                 double*		sf =__autoalloc__(double,n_live_points);
                 bool terminateRequested=false;
                 //  Step 1:	Draw a random sample of parameters and evaluate objective function value for each point
-                fastcopy(sample[0],x,n); // first sample is initial values
-                f[0] = fx.evaluate(n,x);++evaluations;
-                for (i=1;i<n_live_points;i++) {
-                    random_generate_x(n,x,x_min,x_max);
-                    fastcopy(sample[i],x,n);
-                    f[i]= fx.evaluate(n,x);++evaluations;
+                {
+                    vector<vector<double>> xs(n_live_points,vector<double>(n,0.0));
+                    fastcopy(xs[0].data(),x,n); // first sample is initial values
+                    for (i=1;i<n_live_points;i++)
+                        random_generate_x(n,xs[i].data(),x_min,x_max,generator);
+                    vector<double> fxs;
+                    fx.evaluate_batch(xs,fxs);evaluations+=n_live_points;// the whole sample in one batch
+                    for (i=0;i<n_live_points;i++) {
+                        fastcopy(sample[i],xs[i].data(),n);
+                        f[i]=fxs[i];
+                    }
                 }
                 construct_sorted_pivot_table(f,ind,n_live_points);//	Step 2:	Sort the points according to value of objective function
                 for (i=0;i<n_live_points;i++) {
@@ -60,22 +61,57 @@ namespace shyft {
                 }
 
                 //**************** Start the optimization *********************
+                // Steps 3..5 for complex ij, using the evaluator fn. The complexes are disjoint slices of
+                // the sample, so they can be evolved concurrently, each with its own random generator.
+                vector<rng_t> complex_rng(p);
+                vector<size_t> complex_evaluations(p,0);
+                auto evolve_complex=[&](size_t ij,ifx& fn) {
+                    double **ax	= __autoalloc__(double*,m);
+                    for (size_t k=0; k<m; k++)
+                        ax[k]= __autoalloc__(double,n);
+                    double *af = __autoalloc__(double,m);
+                    double *xc = __autoalloc__(double,n);// work-vector for this complex
+                    for (size_t j=0; j<m; j++) {//	Step 3:	Partition the sample into p complexes of m points
+                        size_t jj=(j)*p + ij;
+                        fastcopy(ax[j],ssample[jj],n);
+                        af[j]=sf[jj];
+                    }
+                    //	Step 4: Evolve the complex
+                    evolve(ax,af,m,n,fn,x_min,x_max,xc,complex_evaluations[ij],ij,complex_rng[ij]);
+                    //	Step 5:	Replace the evolved complex
+                    for (size_t j=0; j<m; j++) {
+                        size_t jj=(j)*p+ij;
+                        fastcopy(sample[jj],ax[j],n);
+                        f[jj]=af[j];
+                    }
+                };
+                const size_t n_workers=min<size_t>(fx.concurrency(),p);
                 while(optimizerState==Searching && !terminateRequested) {// This loop performs one "shuffling", that is, sorting the m*p points and distributing them among complexes
-                    for (ij=0; ij<p; ij++) {//	Step 3:	Partition the sample into p complexes of m points
-                        for (j=0; j<m; j++) {
-                            jj=(j)*p + ij;
-                            fastcopy(ax[j],ssample[jj],n);
-                            af[j]=sf[jj];
-                        }
-                        //	Step 4: Evolve each complex
-                        evolve(ax,af,m,n,fx,x_min,x_max,x,evaluations,ij);
-                        //	Step 5:	Replace the evolved complexes
-                        for (j=0; j<m; j++) {
-                            jj=(j)*p+ij;
-                            fastcopy(sample[jj],ax[j],n);
-                            f[jj]=af[j];
+                    for (ij=0; ij<p; ij++) {
+                        complex_rng[ij].seed(generator());// deterministic, independent of n_workers
+                        complex_evaluations[ij]=0;
+                    }
+                    if (n_workers < 2) {
+                        for (ij=0; ij<p; ij++)
+                            evolve_complex(ij,fx);
+                    } else {
+                        vector<future<void>> calcs;
+                        for (size_t w=0; w<n_workers; w++) {
+                            calcs.emplace_back(
+                                async(launch::async,
+                                    [&evolve_complex,&fx,w,n_workers,p]() {
+                                        auto& fn=fx.worker(w);
+                                        for (size_t k=w; k<p; k+=n_workers)
+                                            evolve_complex(k,fn);
+                                    }
+                                )
+                            );
                         }
+                        for (auto &c:calcs)
+                            c.get();
                     }
+                    for (ij=0; ij<p; ij++)
+                        evaluations+=complex_evaluations[ij];
                     construct_sorted_pivot_table(f,ind,n_live_points);// Sort the points according to value of objective function
                     for (i=0;i<n_live_points;i++) {
                         sf[i]=f[ind[i]];
@@ -118,7 +154,8 @@ namespace shyft {
                 double x[],							// x[n]  is all the parameter vector required by the model.
                                                     // The actual length of this vector is not required in this subroutine.
                 size_t& evaluations,				// evaluations is a counter for how many times the model is called.
-                size_t complexno					// For diagnostics: The number of this complex.
+                size_t complexno,					// For diagnostics: The number of this complex.
+                rng_t& rng							// The random generator used for this complex.
                 ) const
             {
                 size_t		i, j, ii, nsel;
@@ -171,7 +208,7 @@ namespace shyft {
                         selected[i]=0;		// location in the original array af;ax is stored in ll.*/
 
                     while (nsel < q) {
-                        ff = random01();	// Formerly:		ff = OptUtil::ran1(idum) ;, which is now called from unif01.
+                        ff = random01(rng);	// Formerly:		ff = OptUtil::ran1(idum) ;, which is now called from unif01.
                         i = sel = 0 ;
                         while (sel == 0 && i < m) {	// Continue until a new point is selected
                             // or the n_live_points of af;ax is reached
@@ -213,7 +250,7 @@ namespace shyft {
                         }
 
                         if (mutation == 1) {
-                            mutate(ax,x, m,n);
+                            mutate(ax,x, m,n,rng);
                         }
                         objf = fn.evaluate(n, x);++evaluations;	// model(x,objf);
 
@@ -228,7 +265,7 @@ namespace shyft {
                             if ( objf < bf[q-1] ) {	// Step 3e: Check whether the contraction step gives a better objective function
                                 ;// Step 3d OK
                             } else {				// Mutation step
-                                mutate(ax, x, m, n);
+                                mutate(ax, x, m, n, rng);
                                 objf = fn.evaluate(n, x);++evaluations;
                             }
                         }	// End contraction step
@@ -259,7 +296,7 @@ namespace shyft {
             }
 
             void
-            sceua::mutate(double *x_alternatives[], double x_new[], size_t na, size_t nprm) const {
+            sceua::mutate(double *x_alternatives[], double x_new[], size_t na, size_t nprm, rng_t& rng) const {
                 double *x_min = __autoalloc__(double,nprm);
                 double *x_max = __autoalloc__(double,nprm);
                 fastcopy(x_min,x_alternatives[0],nprm);
@@ -272,13 +309,13 @@ namespace shyft {
                             x_max[j] = x_alternatives[i][j];
                     }
                 }
-                random_generate_x(nprm, x_new, x_min, x_max);
+                random_generate_x(nprm, x_new, x_min, x_max, rng);
             }
 
             void
-            sceua::random_generate_x(size_t n, double x_new[], const double x_min[], const double x_max[]) const {
+            sceua::random_generate_x(size_t n, double x_new[], const double x_min[], const double x_max[], rng_t& rng) const {
                 for (size_t i=0; i<n; ++i)
-                    x_new[i] = x_min[i] + random01()*(x_max[i]-x_min[i]);
+                    x_new[i] = x_min[i] + random01(rng)*(x_max[i]-x_min[i]);
             }
         }
     }
@@ -58,14 +58,22 @@ namespace shyft {
              */
             class sceua  {
                 #ifdef WIN32
-				mutable std::mt19937 generator;
+                typedef std::mt19937 rng_t;
 #else
-                mutable default_random_engine generator;
+                typedef default_random_engine rng_t;
 #endif
-				mutable uniform_real_distribution<double> distribution;//(0.0,1.0)
+				mutable rng_t generator;///< drives the initial sample, and seeds one generator pr. complex for each shuffle
 
             public:
-                sceua():distribution(0.0,1.0) {}
+                sceua() {}
+                explicit sceua(unsigned seed):generator(seed) {}
+                /** \brief find x so that fx is at minimum.
+                 *
+                 * The initial sample is evaluated using fx.evaluate_batch, and the complexes of
+                 * each shuffle are evolved concurrently using fx.worker(i) if fx.concurrency()>1.
+                 * Each complex is evolved with its own random generator, seeded from this optimizer's generator,
+                 * so the result is the same regardless of the available concurrency.
+                 */
                 OptimizerState find_min(
                     const size_t n,			///< Number of active parameters
                     const double x_min[],	///< Lower limit of all n parameters
@@ -95,13 +103,14 @@ namespace shyft {
                     double x[],					///< x[n]  is all the parameter vector required by the model.
                                                 ///< The actual length of this vector is not required in this subroutine.
                     size_t& evaluations,		///< evaluations is a counter for how many times the model is called.
-                    size_t complexno			///< For diagnostics: The number of this complex.
+                    size_t complexno,			///< For diagnostics: The number of this complex.
+                    rng_t& rng					///< The random generator used for this complex.
                     )
                     const;
 
-                void mutate(double *x_alternatives[], double x_new[], size_t na, size_t nprm) const;
-                void random_generate_x(size_t n, double x_new[], const double x_min[], const double x_max[]) const;
-                double random01() const { return distribution(generator); }
+                void mutate(double *x_alternatives[], double x_new[], size_t na, size_t nprm, rng_t& rng) const;
+                void random_generate_x(size_t n, double x_new[], const double x_min[], const double x_max[], rng_t& rng) const;
+                double random01(rng_t& rng) const { uniform_real_distribution<double> d(0.0, 1.0); return d(rng); }
             };
         }
     }
@@ -341,6 +341,107 @@ namespace shyft {
             x_serialize_decl();
         };
 
+        /** \brief piecewise_dt is a run-length encoded point_dt.
+        *
+        * The time-axis is represented as a sequence of contiguous fixed_dt segments,
+        * where each segment ends where the next one starts.
+        * This is the typical shape of observation series, regular with occasional gaps,
+        * where a gap is just a segment with one (longer) interval.
+        *
+        * Storage is O(segments), and index_of is a binary search over the segments,
+        * followed by a division within the segment, O(log segments).
+        *
+        * \note use the point_dt constructor to compress an existing point_dt,
+        *       and .point_time_axis() to expand it again.
+        */
+        struct piecewise_dt:continuous<true> {
+            vector<fixed_dt> seg;///< contiguous, non-empty segments, seg[i+1].t == seg[i].total_period().end
+            vector<size_t> ix;///< ix[i] is the index of the first period in seg[i], ix.back() is the size
+
+            piecewise_dt():ix(1,0) {}
+            explicit piecewise_dt(const vector<fixed_dt>& segments):seg(segments) {
+                for(size_t i=0;i<seg.size();++i) {
+                    if(seg[i].n==0 || seg[i].dt<=0 || (i>0 && seg[i].t != seg[i-1].t+utctimespan(seg[i-1].n*seg[i-1].dt)))
+                        throw runtime_error("time_axis::piecewise_dt() segments must be non-empty and contiguous");
+                }
+                make_index();
+            }
+            explicit piecewise_dt(const point_dt& p) {
+                const size_t n=p.size();
+                for(size_t i=0;i<n;++i) {
+                    utctimespan dt=(i+1<n?p.t[i+1]:p.t_end)-p.t[i];
+                    if(seg.size() && seg.back().dt==dt)
+                        ++seg.back().n;
+                    else
+                        seg.emplace_back(p.t[i],dt,1);
+                }
+                make_index();
+            }
+
+            bool operator==(const piecewise_dt& other) const {return seg == other.seg;}
+            bool operator!=(const piecewise_dt& other) const { return !this->operator==(other); }
+            size_t size() const {return ix.back();}
+
+            utcperiod total_period() const {
+                return seg.size() == 0 ?
+                       utcperiod( min_utctime, min_utctime ) :  // maybe just a non-valid period?
+                       utcperiod( seg.front().t, seg.back().t + utctimespan(seg.back().n*seg.back().dt) );
+            }
+
+            utctime time( size_t i ) const {
+                if( i < size() ) {
+                    size_t k=segment_of(i);
+                    return seg[k].t + (i-ix[k])*seg[k].dt;
+                }
+                throw std::out_of_range( "piecewise_dt.time(i)" );
+            }
+
+            utcperiod period( size_t i ) const {
+                if( i < size() ) {
+                    size_t k=segment_of(i);
+                    utctime t=seg[k].t + (i-ix[k])*seg[k].dt;
+                    return utcperiod(t,t+seg[k].dt);
+                }
+                throw std::out_of_range( "piecewise_dt.period(i)" );
+            }
+
+            size_t index_of( utctime tx, size_t ix_hint = std::string::npos ) const {
+                if( seg.size() == 0 || tx < seg.front().t || tx >= total_period().end ) return std::string::npos;
+                size_t k;
+                if(ix_hint!=std::string::npos && ix_hint < size() && seg[k=segment_of(ix_hint)].total_period().contains(tx))
+                    ; // hint hit the right segment, no search needed
+                else
+                    k=static_cast<size_t>(upper_bound(seg.cbegin(),seg.cend(),tx,[](utctime t,const fixed_dt& s){return t<s.t;}) - seg.cbegin())-1;
+                return ix[k] + static_cast<size_t>((tx-seg[k].t)/seg[k].dt);
+            }
+            size_t open_range_index_of( utctime tx, size_t ix_hint = std::string::npos) const {return size() > 0 && tx >= total_period().end ? size() - 1 : index_of( tx,ix_hint );}
+
+            /** expand to the equivalent point_dt */
+            point_dt point_time_axis() const {
+                vector<utctime> t;t.reserve(size());
+                for(const auto& s:seg)
+                    for(size_t i=0;i<s.n;++i)
+                        t.push_back(s.t+i*s.dt);
+                return t.size()?point_dt(move(t),total_period().end):point_dt();
+            }
+
+            static piecewise_dt null_range() {
+                return piecewise_dt();
+            }
+            /** (re)build the ix from the seg, needed after changing seg */
+            void make_index() {
+                ix.resize(seg.size()+1);
+                ix[0]=0;
+                for(size_t i=0;i<seg.size();++i)
+                    ix[i+1]=ix[i]+seg[i].n;
+            }
+            /** the segment containing period i, i < size() */
+            size_t segment_of(size_t i) const {
+                return static_cast<size_t>(upper_bound(ix.cbegin(),ix.cend()-1,i) - ix.cbegin())-1;
+            }
+            x_serialize_decl();
+        };
+
         /** \brief a generic (not sparse) time interval time-axis.
          *
          * This is a static dispatch generic time-axis for all dense time-axis.
@@ -513,6 +614,13 @@ namespace shyft {
             return r;
         }
 
+        /** create a new time-shifted dt time-axis */
+        inline piecewise_dt time_shift(const piecewise_dt& src, utctimespan dt) {
+            piecewise_dt r(src);
+            for(auto& s: r.seg) s.t+=dt;
+            return r;
+        }
+
         /** create a new time-shifted dt time-axis */
         inline generic_dt time_shift(const generic_dt&src, utctimespan dt) {
             if(src.gt==generic_dt::FIXED) return generic_dt(time_shift(src.f,dt));
@@ -1577,5 +1685,6 @@ namespace shyft {
 x_serialize_export_key(shyft::time_axis::fixed_dt);
 x_serialize_export_key(shyft::time_axis::calendar_dt);
 x_serialize_export_key(shyft::time_axis::point_dt);
+x_serialize_export_key(shyft::time_axis::piecewise_dt);
 x_serialize_export_key(shyft::time_axis::generic_dt);
 
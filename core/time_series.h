@@ -320,6 +320,8 @@ namespace shyft{
 
 
 
+        template <class TA> struct point_ts32;
+
         /**\brief point time-series, pts, defined by
          * its
          * templated time-axis, ta
@@ -359,6 +361,10 @@ namespace shyft{
 					throw runtime_error("point_ts: time-axis size is different from value-size");
 			}
 
+			/** construct from the float32 storage variant, point_ts32 */
+			explicit point_ts(const point_ts32<TA>& o)
+				: ta{ o.ta }, v(begin(o.v), end(o.v)), fx_policy{ o.fx_policy } { }
+
 			point_ts(const TA & tax, vector<double> && vx, ts_point_fx fx_policy= POINT_INSTANT_VALUE )
 				: ta{ tax }, v{ std::move(vx) }, fx_policy{ fx_policy }
 			{
@@ -407,12 +413,83 @@ namespace shyft{
             void add_scale(const point_ts<TA>&other,double scale) {
                 std::transform(begin(v), end(v), other.v.cbegin(), begin(v), [scale](double a, double b) {return a + b*scale; });
             }
+            void add(const point_ts32<TA>& other) {
+                std::transform(begin(v), end(v), other.v.cbegin(), begin(v), std::plus<double>());
+            }
+            void add_scale(const point_ts32<TA>&other,double scale) {
+                std::transform(begin(v), end(v), other.v.cbegin(), begin(v), [scale](double a, double b) {return a + b*scale; });
+            }
             void fill(double value) { std::fill(begin(v), end(v), value); }
             void fill_range(double value, int start_step, int n_steps) { if (n_steps == 0)fill(value); else std::fill(begin(v) + start_step, begin(v) + start_step + n_steps, value); }
             void scale_by(double value) { std::for_each(begin(v), end(v), [value](double&v){v *= value; }); }
             x_serialize_decl();
         };
 
+        /**\brief point time-series with float32 storage of the values
+         *
+         * Same interface and semantics as point_ts, but the values are stored as float,
+         * halving the memory used, while all computations, and the values returned, are double.
+         * Used as storage type for cell environment and response series in the float32
+         * storage model types, where memory, rather than cpu, limits the number of cells
+         * or ensemble members that can be kept resident.
+         * \note values are rounded to float precision when set, about 7 significant digits.
+         * \sa point_ts
+         */
+        template <class TA>
+        struct point_ts32 {
+            typedef TA ta_t;
+
+            TA ta;
+            vector<float> v;
+            ts_point_fx fx_policy = POINT_INSTANT_VALUE;
+
+            ts_point_fx point_interpretation() const { return fx_policy; }
+            void set_point_interpretation(ts_point_fx point_interpretation) { fx_policy=point_interpretation;}
+
+            point_ts32() = default;
+
+            point_ts32(const TA & ta, double fill_value, ts_point_fx fx_policy = POINT_INSTANT_VALUE)
+                : ta{ ta }, v(ta.size(), float(fill_value)), fx_policy{ fx_policy } { }
+
+            point_ts32(const TA & ta, const vector<double> & vx, ts_point_fx fx_policy = POINT_INSTANT_VALUE)
+                : ta{ ta }, v(begin(vx), end(vx)), fx_policy{ fx_policy }
+            {
+                if(ta.size() != v.size())
+                    throw runtime_error("point_ts32: time-axis size is different from value-size");
+            }
+            /** construct from a point_ts, rounding the values to float */
+            explicit point_ts32(const point_ts<TA>& o) : ta{ o.ta }, v(begin(o.v), end(o.v)), fx_policy{ o.fx_policy } {}
+            /** returns a point_ts with the values as double */
+            point_ts<TA> as_point_ts() const { return point_ts<TA>(*this); }
+
+            const TA & time_axis() const { return ta; }
+
+            /**\brief the function value f(t) at time t, fx_policy taken into account */
+            double operator()(utctime t) const {
+                size_t i = ta.index_of(t);
+                if(i == string::npos) return nan;
+                if( fx_policy==ts_point_fx::POINT_INSTANT_VALUE && i+1<ta.size() && isfinite(v[i+1])) {
+                    utctime t1=ta.time(i);
+                    utctime t2=ta.time(i+1);
+                    double f= double(t2-t)/double(t2-t1);
+                    return double(v[i])*f + (1.0-f)*double(v[i+1]);
+                }
+                return v[i];
+            }
+            double value(size_t i) const  { return v[i]; }
+            size_t size() const { return ta.size();}
+            size_t index_of(utctime t) const {return ta.index_of(t);}
+            utcperiod total_period() const {return ta.total_period();}
+            utctime time(size_t i ) const {return ta.time(i);}
+            point get(size_t i) const {return point(ta.time(i),value(i));}
+
+            void set(size_t i,double x) {v[i]=float(x);}
+            void add(size_t i, double value) { v[i] = float(v[i] + value); }
+            void fill(double value) { std::fill(begin(v), end(v), float(value)); }
+            void fill_range(double value, int start_step, int n_steps) { if (n_steps == 0)fill(value); else std::fill(begin(v) + start_step, begin(v) + start_step + n_steps, float(value)); }
+            void scale_by(double value) { std::for_each(begin(v), end(v), [value](float&v){v = float(v*value); }); }
+        };
+
         /** \brief time_shift ts do a time-shift dt on the supplied ts
          *
          * The values are exactly the same as the supplied ts argument to the constructor
@@ -1963,6 +2040,19 @@ namespace shyft{
         };
 
 
+        /** \brief Specialization of the direct_accessor template for point_ts32<TA>
+         * \note life-time warning: the provided point_ts32 is kept by const ref.
+         */
+        template <class TA>
+        class direct_accessor<point_ts32<TA>, TA> {
+          private:
+            const point_ts32<TA>& source;
+          public:
+            direct_accessor(const point_ts32<TA>& source, const TA& ta) : source(source) { }
+            double value(const size_t i) const { return source.v[i]; }
+            size_t size() const { return source.size(); }
+        };
+
         /** \brief Specialization of direct_accessor for a constant_source
          *
          * utilizes the fact that the values is always the same for the constant.
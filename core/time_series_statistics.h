@@ -6,6 +6,7 @@
 #include <cmath>
 #include <limits>
 #include <future>
+#include <thread>
 #include <utility>
 
 
@@ -157,6 +158,75 @@ namespace shyft {
             return result;
         }
 
+        /** \brief calculate percentiles as calculate_percentiles_excel_method_full_sort, using selection
+        *
+        * Nan samples are removed, then only the order statistics needed by the
+        * requested percentiles are placed using nth_element, in increasing order, so that each
+        * selection works on the remaining upper part of the samples. This is O(n) for each
+        * percentile instead of a O(n log n) full sort, and gives the same result for samples without nans.
+        * If many ranks are needed compared to the number of samples, a full sort is used instead.
+        * \param samples the samples, reordered and possibly resized by the call
+        * \param percentiles the percentiles, 0..100, or statistics_property::AVERAGE
+        * \return the percentiles, nan for other statistics properties
+        */
+        inline vector<double> calculate_percentiles_excel_method_select(vector<double>& samples, const vector<int>& percentiles) {
+            samples.erase(std::remove_if(begin(samples), end(samples), [](double x) {return std::isnan(x);}), end(samples));
+            vector<double> result; result.reserve(percentiles.size());
+            const int n_samples = (int)samples.size();
+            const double silent_nan = std::numeric_limits<double>::quiet_NaN();
+            if (n_samples == 0) {
+                for (size_t i = 0; i < percentiles.size(); ++i)
+                    result.emplace_back(silent_nan);
+                return result;
+            }
+            const double eps = 1e-30;
+            // figure out the ranks needed, same index logic as in the full sort method
+            vector<int> ranks; ranks.reserve(2*percentiles.size());
+            for (auto i : percentiles) {
+                if (i >= 0 && i <= 100) {
+                    double nd = 1.0 + (n_samples - 1)*double(i) / 100.0;
+                    int n = int(nd) - 1;
+                    ranks.push_back(std::min(std::max(n, 0), n_samples - 1));
+                    if (nd - int(nd) >= eps && n >= 0 && n + 1 < n_samples)
+                        ranks.push_back(n + 1);
+                }
+            }
+            sort(begin(ranks), end(ranks));
+            ranks.erase(unique(begin(ranks), end(ranks)), end(ranks));
+            if (3*ranks.size() > std::log2(double(n_samples))) {
+                sort(begin(samples), end(samples));// many ranks relative to the samples, a full sort is cheaper
+            } else {
+                int lo = 0;
+                for (auto k : ranks) {
+                    std::nth_element(begin(samples) + lo, begin(samples) + k, end(samples));
+                    lo = k + 1;
+                }
+            }
+            for (auto i : percentiles) {
+                if (i == statistics_property::AVERAGE) {
+                    double sum = 0;
+                    for (auto x : samples) sum += x;
+                    result.emplace_back(sum / n_samples);
+                } else if (i >= 0 && i <= 100) {
+                    double nd = 1.0 + (n_samples - 1)*double(i) / 100.0;
+                    int  n = int(nd);
+                    double delta = nd - n;
+                    --n;//0 based index
+                    if (n <= 0 && delta <= eps) result.emplace_back(samples[0]);
+                    else if (n >= n_samples) result.emplace_back(samples[n_samples - 1]);
+                    else if (delta < eps) result.emplace_back(samples[n]);
+                    else {
+                        auto lower = samples[n];
+                        auto upper = samples[n < n_samples - 1 ? n + 1 : n];
+                        result.emplace_back(lower + (delta)*(upper - lower));
+                    }
+                } else {
+                    result.emplace_back(silent_nan);//some other statistics property we don't compute here
+                }
+            }
+            return result;
+        }
+
         /** \brief calculate specified percentiles for supplied list of time-series over the specified time-axis
 
         Percentiles for a set of timeseries, over a time-axis
@@ -180,7 +250,7 @@ namespace shyft {
 
         */
         template <class ts_t, class ta_t>
-        inline std::vector< point_ts<ta_t> > calculate_percentiles(const ta_t& ta, const std::vector<ts_t>& ts_list, const std::vector<int>& percentiles, size_t min_t_steps = 1000,bool skip_nans=true) {
+        inline std::vector< point_ts<ta_t> > calculate_percentiles(const ta_t& ta, const std::vector<ts_t>& ts_list, const std::vector<int>& percentiles, size_t min_t_steps = 64,bool skip_nans=true) {
             std::vector<point_ts<ta_t>> result;
             auto fx_p = ts_list.size() ? ts_list.front().point_interpretation() : ts_point_fx::POINT_AVERAGE_VALUE;
             for (size_t r = 0; r < percentiles.size(); ++r) // pre-init the result ts that we are going to fill up
@@ -202,7 +272,7 @@ namespace shyft {
                             samples.emplace_back(v);
                     }
                     // possible with pipe-line to percentile calc here !
-                    std::vector<double> percentiles_at_t(calculate_percentiles_excel_method_full_sort(samples, percentiles));
+                    std::vector<double> percentiles_at_t(calculate_percentiles_excel_method_select(samples, percentiles));
                     for (size_t p = 0; p < result.size(); ++p) {
                         if(!(percentiles[p]==statistics_property::MAX_EXTREME || percentiles[p]==statistics_property::MIN_EXTREME))
                             result[p].set(t, percentiles_at_t[p]);
@@ -213,7 +283,9 @@ namespace shyft {
                 result[x].v = extract_statistic_from_vector(ts_list, ta, percentiles[x] == statistics_property::MIN_EXTREME?nan_min:nan_max);
             };
 
-            if (ta.size() < min_t_steps) {
+            size_t n_threads = std::max(2u, std::thread::hardware_concurrency());
+            size_t ps = std::max(min_t_steps, (ta.size() + n_threads - 1) / n_threads);// one partition of time-steps for each thread
+            if (ta.size() <= ps) {
                 partition_calc(0, ta.size());
                 //if mi-ma extreme calc, do it here
                 for (size_t i = 0;i < percentiles.size();++i) {
@@ -226,7 +298,7 @@ namespace shyft {
             } else {
                 vector<future<void>> calcs;
                 for (size_t p = 0;p < ta.size(); ) {
-                    size_t np = p + min_t_steps <= ta.size() ? min_t_steps : ta.size() - p;
+                    size_t np = p + ps <= ta.size() ? ps : ta.size() - p;
                     calcs.push_back(std::async(std::launch::async, partition_calc, p, np));
                     p += np;
                 }
@@ -2,6 +2,7 @@
 #include "utctime_utilities.h"
 #include <ostream>
 #include <cstring>
+#include <mutex>
 #include <boost/date_time/local_time/local_time.hpp>
 
 namespace shyft {
@@ -79,6 +80,52 @@ namespace shyft {
             return 7 * (jdn / 7);// jd starts on monday.
         }
 
+        // maps local time r (utc-time + utc-offset) back to true utc-time (subtract the tz-offset at the time)
+        static inline utctime utc_from_local(const time_zone::tz_info_t& tz, utctime r) {
+            auto utc_diff_1 = tz.utc_offset(r);// detect if we are in the dst-shift hour
+            auto utc_diff_2 = tz.utc_offset(r - utc_diff_1);
+            return (utc_diff_1 == utc_diff_2) ? r - utc_diff_1 : r - utc_diff_2;
+        }
+
+        // utc start of years 1900..2200, used by utc_year, the hot-spot of tz_table::dst_offset
+        struct utc_year_table {
+            static const int y0 = 1900;
+            static const int n = 301;
+            utctime t[n + 1];
+            utc_year_table() {
+                for (int i = 0; i <= n; ++i)
+                    t[i] = (int(calendar::day_number(YMDhms(y0 + i, 1, 1))) - calendar::UnixDay)*calendar::DAY;
+            }
+        };
+        static const utc_year_table utc_years;
+
+        int calendar::utc_year(utctime t) {
+            if(t == no_utctime  ) throw std::runtime_error("year of no_utctime");
+            if(t == max_utctime ) return YMDhms::YEAR_MAX;
+            if(t == min_utctime ) return YMDhms::YEAR_MIN;
+            if (t >= utc_years.t[0] && t < utc_years.t[utc_years.n]) {
+                int i = std::min(int((t - utc_years.t[0]) / YEAR), utc_years.n - 1);// years are >= 365 days, so this is exact or one too far
+                while (utc_years.t[i] > t) --i;
+                return utc_year_table::y0 + i;
+            }
+            return from_day_number(day_number(t)).year;
+        }
+
+        // calendar day of julian day number jdn, memo of the last month hit, since the
+        // typical pattern is stepping sequentially through days of the same month.
+        static inline void fill_in_ymd_from_day_number(int jdn, YMDhms& r) {
+            struct month_span { int first = 1, end = 0, year = 0, month = 0; };
+            static thread_local month_span m;
+            if (jdn < m.first || jdn >= m.end) {
+                auto x = calendar::from_day_number(jdn);
+                m.first = jdn - (x.day - 1);
+                m.end = int(calendar::day_number(x.month < 12 ? YMDhms(x.year, x.month + 1, 1) : YMDhms(x.year + 1, 1, 1)));
+                m.year = x.year;
+                m.month = x.month;
+            }
+            r.year = m.year; r.month = m.month; r.day = 1 + jdn - m.first;
+        }
+
         utctime calendar::time(YMDhms c) const {
             if(c.is_null()) return no_utctime;
             if(c==YMDhms::max()) return max_utctime;
@@ -87,9 +134,7 @@ namespace shyft {
                 throw std::runtime_error("calendar.time with invalid YMDhms coordinates attempted");
 
             utctime r= ((int(day_number(c)) - UnixDay)*DAY) + seconds(c.hour, c.minute, c.second);
-            auto utc_diff_1= tz_info->utc_offset(r);// detect if we are in the dst-shift hour
-            auto utc_diff_2= tz_info->utc_offset(r-utc_diff_1);
-            return (utc_diff_1==utc_diff_2)?r-utc_diff_1: r-utc_diff_2;
+            return utc_from_local(*tz_info, r);
         }
 
         utctime calendar::time_from_week(int Y, int W, int wd, int h, int m, int s) const {
@@ -114,10 +159,7 @@ namespace shyft {
             // then just add relative weeks days from that
             auto w_daynumber = w1_daynumber + 7 *(c.iso_week-1) + (c.week_day - 1);
             utctime r = (int(w_daynumber) - UnixDay)*DAY + seconds(c.hour, c.minute, c.second);// make it local utc-time
-            // map it back to true utc-time (subtract the tz-offset at the time)
-            auto utc_diff_1 = tz_info->utc_offset(r);// detect if we are in the dst-shift hour
-            auto utc_diff_2 = tz_info->utc_offset(r - utc_diff_1);
-            return (utc_diff_1 == utc_diff_2) ? r - utc_diff_1 : r - utc_diff_2;
+            return utc_from_local(*tz_info, r);
 
         }
 
@@ -139,10 +181,8 @@ namespace shyft {
             if (t == min_utctime) return YMDhms::min();
             auto tz_dt=tz_info->utc_offset(t);
             t += tz_dt;
-            auto jdn = day_number(t);
-            auto x = from_day_number(jdn);
             YMDhms r;
-            r.year = x.year; r.month = x.month; r.day = x.day;
+            fill_in_ymd_from_day_number(day_number(t), r);
             return fill_in_hms_from_t(t, r);
         }
 
@@ -219,10 +259,9 @@ namespace shyft {
                 c.day = 1; c.hour = c.minute = c.second = 0;
                 return time(c);
             }break;
-            case DAY: {
-                auto c = calendar_units(t);
-                c.hour = c.minute = c.second = 0;
-                return time(c);
+            case DAY: {// same as time(calendar_units(t) with h,m,s=0), but directly on local time
+                utctime tl = t + tz_info->utc_offset(t);
+                return utc_from_local(*tz_info, DAY*((UnixSecond + tl) / DAY) - UnixSecond);
             }break;
             }
             auto tz_offset=tz_info->utc_offset(t);
@@ -776,9 +815,20 @@ namespace shyft {
         }
 
         calendar::calendar(std::string region_id) {
+            // building the tz_table(200 years of dst rules) is expensive, so keep one (immutable) tz_info pr. region
+            static mutex mx;
+            static map<string, time_zone::tz_info_t_> region_tz;
+            lock_guard<mutex> lock(mx);
+            auto f = region_tz.find(region_id);
+            if (f != region_tz.end()) {
+                tz_info = f->second;
+                return;
+            }
             for(size_t i=0;i<time_zone::n_tzdef;++i) {
                 if(region_id==time_zone::tzdef[i].region) {
                     tz_info=time_zone::create_from_posix_definition(region_id,time_zone::tzdef[i].posix_definition);
+                    region_tz[region_id] = tz_info;
+                    break;
                 }
             }
             if(!tz_info)
@@ -374,13 +374,13 @@ namespace shyft {
                 return time(YMDhms(Y,M,D,h,m,s));
             }
             utctime time_from_week(int Y, int W = 1, int wd = 1, int h = 0, int m = 0, int s = 0) const;
-            /**\brief returns *utc_year* of t \note for internal dst calculations only */
-			static inline int utc_year(utctime t) {
-                if(t == no_utctime  ) throw std::runtime_error("year of no_utctime");
-                if(t == max_utctime ) return YMDhms::YEAR_MAX;
-                if(t == min_utctime ) return YMDhms::YEAR_MIN;
-				return from_day_number(day_number(t)).year;
-			}
+            /**\brief returns *utc_year* of t \note for internal dst calculations only
+             *
+             * Called for every utc_offset lookup, so for the years 1900..2200 it's
+             * resolved by a table of year-start times, O(1), falling back to the day-number
+             * conversion outside that range.
+             */
+			static int utc_year(utctime t);
             /**\brief return the calendar units of t taking timezone and dst into account
              *
              * Special utctime values, no_utctime max_utctime, min_utctime are mapped to corresponding
@@ -167,7 +167,7 @@ TimeAxis.__iter__ = lambda self: ta_iter(self)
 TimeAxis.__next__ = lambda self: ta_next(self)
 
 
-TimeAxis.time_points = property( lambda self: time_axis_extract_time_points(self).to_numpy(),doc= \
+TimeAxis.time_points = property( lambda self: time_axis_extract_time_points_as_numpy(self),doc= \
 """
  extract all time-points from a TimeAxis
  like
@@ -9,7 +9,7 @@ HbvModel.parameter_t = HbvParameter
 HbvModel.state_t = HbvState
 HbvModel.state_with_id_t = HbvStateWithId
 HbvModel.state = property(lambda self:HbvCellAllStateHandler(self.get_cells()))
-HbvModel.statistics = property(lambda self: HbvCellAllStatistics(self.get_cells()))
+HbvModel.statistics = property(lambda self: HbvCellAllStatistics(self.get_cells(), self.get_catchment_cell_index()))
 HbvModel.hbv_snow_state = property(lambda self: HbvCellHBVSnowStateStatistics(self.get_cells()))
 HbvModel.hbv_snow_response = property(lambda self: HbvCellHBVSnowResponseStatistics(self.get_cells()))
 HbvModel.priestley_taylor_response = property(lambda self: HbvCellPriestleyTaylorResponseStatistics(self.get_cells()))
@@ -26,7 +26,7 @@ HbvOptModel.parameter_t = HbvParameter
 HbvOptModel.state_t = HbvState
 HbvOptModel.state_with_id_t=HbvStateWithId
 HbvOptModel.state = property(lambda self:HbvCellOptStateHandler(self.get_cells()))
-HbvOptModel.statistics = property(lambda self:HbvCellOptStatistics(self.get_cells()))
+HbvOptModel.statistics = property(lambda self: HbvCellOptStatistics(self.get_cells(), self.get_catchment_cell_index()))
 HbvOptModel.optimizer_t = HbvOptimizer
 HbvOptModel.full_model_t =HbvModel
 HbvModel.opt_model_t =HbvOptModel
@@ -11,7 +11,7 @@ PTGSKModel.parameter_t = PTGSKParameter
 PTGSKModel.state_t = PTGSKState
 PTGSKModel.state_with_id_t = PTGSKStateWithId
 PTGSKModel.state = property(lambda self:PTGSKCellAllStateHandler(self.get_cells()))
-PTGSKModel.statistics = property(lambda self: PTGSKCellAllStatistics(self.get_cells()))
+PTGSKModel.statistics = property(lambda self: PTGSKCellAllStatistics(self.get_cells(), self.get_catchment_cell_index()))
 
 PTGSKModel.gamma_snow_state = property(lambda self: PTGSKCellGammaSnowStateStatistics(self.get_cells()))
 PTGSKModel.gamma_snow_response = property(lambda self: PTGSKCellGammaSnowResponseStatistics(self.get_cells()))
@@ -19,12 +19,31 @@ PTGSKModel.priestley_taylor_response = property(lambda self: PTGSKCellPriestleyT
 PTGSKModel.actual_evaptranspiration_response=property(lambda self: PTGSKCellActualEvapotranspirationResponseStatistics(self.get_cells()))
 PTGSKModel.kirchner_state = property(lambda self: PTGSKCellKirchnerStateStatistics(self.get_cells()))
 
+PTGSKModel32.cell_t = PTGSKCellAll32
+PTGSKModel32.parameter_t = PTGSKParameter
+PTGSKModel32.state_t = PTGSKState
+PTGSKModel32.state_with_id_t = PTGSKStateWithId
+PTGSKModel32.state = property(lambda self:PTGSKCellAll32StateHandler(self.get_cells()))
+PTGSKModel32.statistics = property(lambda self: PTGSKCellAll32Statistics(self.get_cells(), self.get_catchment_cell_index()))
+
+PTGSKModel32.gamma_snow_state = property(lambda self: PTGSKCell32GammaSnowStateStatistics(self.get_cells()))
+PTGSKModel32.gamma_snow_response = property(lambda self: PTGSKCell32GammaSnowResponseStatistics(self.get_cells()))
+PTGSKModel32.priestley_taylor_response = property(lambda self: PTGSKCell32PriestleyTaylorResponseStatistics(self.get_cells()))
+PTGSKModel32.actual_evaptranspiration_response=property(lambda self: PTGSKCell32ActualEvapotranspirationResponseStatistics(self.get_cells()))
+PTGSKModel32.kirchner_state = property(lambda self: PTGSKCell32KirchnerStateStatistics(self.get_cells()))
+
 PTGSKOptModel.cell_t = PTGSKCellOpt
 PTGSKOptModel.parameter_t = PTGSKParameter
 PTGSKOptModel.state_t = PTGSKState
 PTGSKOptModel.state_with_id_t = PTGSKStateWithId
 PTGSKOptModel.state = property(lambda self:PTGSKCellOptStateHandler(self.get_cells()))
-PTGSKOptModel.statistics = property(lambda self:PTGSKCellOptStatistics(self.get_cells()))
+PTGSKOptModel.statistics = property(lambda self: PTGSKCellOptStatistics(self.get_cells(), self.get_catchment_cell_index()))
+
+PTGSKCatchmentDischargeModel.cell_t = PTGSKCellCatchmentDischarge
+PTGSKCatchmentDischargeModel.parameter_t = PTGSKParameter
+PTGSKCatchmentDischargeModel.state_t = PTGSKState
+PTGSKCatchmentDischargeModel.state_with_id_t = PTGSKStateWithId
+PTGSKCatchmentDischargeModel.state = property(lambda self:PTGSKCellCatchmentDischargeStateHandler(self.get_cells()))
 
 PTGSKOptModel.optimizer_t = PTGSKOptimizer
 PTGSKOptModel.full_model_t =PTGSKModel
@@ -37,6 +56,8 @@ PTGSKOptModel.create_full_model_clone.__doc__ = create_full_model_clone.__doc__
 
 PTGSKCellAll.vector_t = PTGSKCellAllVector
 PTGSKCellOpt.vector_t = PTGSKCellOptVector
+PTGSKCellAll32.vector_t = PTGSKCellAll32Vector
+PTGSKCellCatchmentDischarge.vector_t = PTGSKCellCatchmentDischargeVector
 PTGSKState.vector_t = PTGSKStateVector
 PTGSKState.serializer_t= PTGSKStateIo
 
@@ -9,7 +9,7 @@ PTHSKModel.parameter_t = PTHSKParameter
 PTHSKModel.state_t = PTHSKState
 PTHSKModel.state_with_id_t = PTHSKStateWithId
 PTHSKModel.state = property(lambda self:PTHSKCellAllStateHandler(self.get_cells()))
-PTHSKModel.statistics = property(lambda self: PTHSKCellAllStatistics(self.get_cells()))
+PTHSKModel.statistics = property(lambda self: PTHSKCellAllStatistics(self.get_cells(), self.get_catchment_cell_index()))
 
 PTHSKModel.hbv_snow_state = property(lambda self: PTHSKCellHBVSnowStateStatistics(self.get_cells()))
 PTHSKModel.hbv_snow_response = property(lambda self: PTHSKCellHBVSnowResponseStatistics(self.get_cells()))
@@ -22,7 +22,7 @@ PTHSKOptModel.parameter_t = PTHSKParameter
 PTHSKOptModel.state_t = PTHSKState
 PTHSKOptModel.state_with_id_t = PTHSKStateWithId
 PTHSKOptModel.state = property(lambda self:PTHSKCellOptStateHandler(self.get_cells()))
-PTHSKOptModel.statistics = property(lambda self:PTHSKCellOptStatistics(self.get_cells()))
+PTHSKOptModel.statistics = property(lambda self: PTHSKCellOptStatistics(self.get_cells(), self.get_catchment_cell_index()))
 
 PTHSKOptModel.optimizer_t = PTHSKOptimizer
 
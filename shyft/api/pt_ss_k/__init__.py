@@ -10,7 +10,7 @@ PTSSKModel.parameter_t = PTSSKParameter
 PTSSKModel.state_t = PTSSKState
 PTSSKModel.state_with_id_t = PTSSKStateWithId
 PTSSKModel.state = property(lambda self:PTSSKCellAllStateHandler(self.get_cells()))
-PTSSKModel.statistics = property(lambda self: PTSSKCellAllStatistics(self.get_cells()))
+PTSSKModel.statistics = property(lambda self: PTSSKCellAllStatistics(self.get_cells(), self.get_catchment_cell_index()))
 
 PTSSKModel.skaugen_snow_state = property(lambda self: PTSSKCellSkaugenStateStatistics(self.get_cells()))
 PTSSKModel.skaugen_snow_response = property(lambda self: PTSSKCellSkaugenResponseStatistics(self.get_cells()))
@@ -23,7 +23,7 @@ PTSSKOptModel.parameter_t = PTSSKParameter
 PTSSKOptModel.state_t = PTSSKState
 PTSSKOptModel.state_with_id_t = PTSSKStateWithId
 PTSSKOptModel.state = property(lambda self:PTSSKCellOptStateHandler(self.get_cells()))
-PTSSKOptModel.statistics = property(lambda self:PTSSKCellOptStatistics(self.get_cells()))
+PTSSKOptModel.statistics = property(lambda self: PTSSKCellOptStatistics(self.get_cells(), self.get_catchment_cell_index()))
 
 PTSSKOptModel.optimizer_t = PTSSKOptimizer
 PTSSKOptModel.full_model_t =PTSSKModel
@@ -4,7 +4,7 @@ Simulator classes for running SHyFT forward simulations.
 from __future__ import print_function
 from __future__ import absolute_import
 import numpy as np
-import math
+from concurrent.futures import ThreadPoolExecutor
 from shyft import api
 
 
@@ -156,6 +156,67 @@ class DefaultSimulator(object):
         self.region_model.interpolation_parameter = self.ip_repos.get_parameters(self.interpolation_id)
         self.simulate()
 
+    def run_chunked(self, time_axis, chunk_steps, state=None, sink=None, catchment_ids=None):
+        """
+        Forward simulation over time axis, in chunks of chunk_steps
+
+        For each chunk, forcing is read from the geo_ts_repository for the chunk period only,
+        interpolated to the cells, and the cells are run from the state carried over from
+        the previous chunk. While a chunk is running, the forcing for the next chunk is
+        read in a background thread. Only one chunk of forcing, cell environment and
+        cell responses is resident at any time, so long simulations need bounded memory.
+
+        When done, the region_model keeps the cell environment and responses of the last chunk.
+
+        Parameters
+        ----------
+        time_axis: shyft.api.TimeAxisFixedDeltaT
+            Time axis defining the simulation period, and step sizes.
+        chunk_steps: int
+            Number of time steps in each chunk, the last chunk can be shorter.
+        state: shyft.api state, optional
+            Initial state, if None, it is fetched from the initial state repository.
+        sink: callable, optional
+            Called as sink(chunk_time_axis, catchment_ids, discharge) for each chunk, where discharge
+            is a numpy array catchment_ids x chunk steps [m3/s].
+        catchment_ids: list of int, optional
+            Catchment ids to aggregate discharge for, default all catchments.
+
+        Returns
+        -------
+        numpy array catchment_ids x time_axis.size() with the discharge [m3/s] if sink is None, otherwise None
+        """
+        if chunk_steps <= 0:
+            raise SimulatorError("chunk_steps must be > 0")
+        self.region_model.initial_state = self.get_initial_state_from_repo() if state is None else state
+        self.region_model.revert_to_initial_state()
+        ip = self.ip_repos.get_parameters(self.interpolation_id)
+        self.region_model.interpolation_parameter = ip
+        cids = api.IntVector(catchment_ids or [])
+        bbox = self.region_model.bounding_region.bounding_box(self.epsg)
+        chunks = [api.TimeAxisFixedDeltaT(time_axis.time(i), time_axis.delta_t, min(chunk_steps, time_axis.size() - i))
+                  for i in range(0, time_axis.size(), chunk_steps)]
+        result = []
+
+        def fetch(chunk_ta):
+            return self.geo_ts_repository.get_timeseries(self._geo_ts_names, chunk_ta.total_period(),
+                                                         geo_location_criteria=bbox)
+
+        def collect(chunk_ta, chunk_cids, discharge):
+            result.append(discharge.copy())
+
+        with ThreadPoolExecutor(max_workers=1) as prefetcher:
+            next_sources = prefetcher.submit(fetch, chunks[0])
+            for i, chunk_ta in enumerate(chunks):
+                sources = next_sources.result()
+                if i + 1 < len(chunks):
+                    next_sources = prefetcher.submit(fetch, chunks[i + 1])
+                region_env = self._get_region_environment(sources)
+                del sources
+                self.region_model.run_cells_streamed(ip, chunk_ta, region_env, chunk_ta.size(), cids, sink or collect)
+                del region_env  # release the chunk forcing before the next chunk is read in
+        return np.hstack(result) if sink is None else None
+
     def run_forecast(self, time_axis, t_c, state):
         bbox = self.region_model.bounding_region.bounding_box(self.epsg)
         period = time_axis.total_period()
@@ -258,16 +319,12 @@ class DefaultSimulator(object):
         if state is None:
             state = self.reg_model_state
         reg_mod = self.region_model
-        areas = np.array([cell.geo.area() for cell in reg_mod.get_cells()])
+        areas = reg_mod.cell_areas()
         area_tot = areas.sum()
         avg_obs_discharge = obs_discharge*3600.*1000./area_tot  # Convert to l/h per m2
-        state_discharge = np.array([state[i].kirchner.q for i in range(state.size())])
+        state_discharge = state.kirchner_q
         avg_state_discharge = (state_discharge*areas).sum()/area_tot
         discharge_ratios = state_discharge/avg_state_discharge
         updated_state_discharge = avg_obs_discharge*discharge_ratios
-        for i in range(state.size()):
-            if not math.isnan(updated_state_discharge[i]):
-                state[i].kirchner.q = updated_state_discharge[i]
-            else:
-                state[i].kirchner.q = 0.5
+        state.kirchner_q = np.where(np.isnan(updated_state_discharge), 0.5, updated_state_discharge)
         return state
@@ -2,6 +2,9 @@ import numpy as np
 import yaml
 import os
 import copy
+import multiprocessing
+import queue
+import time
 
 from .. import simulator
 from shyft import api
@@ -193,6 +196,217 @@ class ConfigCalibrator(simulator.DefaultSimulator):
         return 1-self.optimizer.calculate_goal_function(optim_params_vct)
 
 
+class CalibrationJob(object):
+    """
+    One calibration job for the CalibrationDriver, a catchment group,
+    calibrated from an initial guess with a given optimization method.
+    """
+
+    def __init__(self, catchment_ids, p_init=None, optim_method=None, optim_method_params=None, name=None,
+                 river_ids=None):
+        """
+        Parameters
+        ----------
+        catchment_ids: list of int
+            The catchment group, only the targets with all catchments in the group are used.
+        p_init: list of float, optional
+            Initial guess as a full parameter vector, default the config calibration parameters init values.
+        optim_method: string, optional
+            'min_bobyqa', 'dream' or 'sceua', default the config optimization method.
+        optim_method_params: dict, optional
+            Parameters to the optimization method, default the config optimization method params.
+        name: optional
+            Identifies the catchment group in the results, default the tuple of sorted catchment_ids.
+            Jobs with the same name, e.g. multi-start jobs, compete for the best parameter set.
+        river_ids: list of int, optional
+            The rivers of the group, only the ROUTED_DISCHARGE targets of these rivers are used, default none.
+        """
+        self.catchment_ids = [int(cid) for cid in catchment_ids]
+        self.river_ids = [] if river_ids is None else [int(rid) for rid in river_ids]
+        self.p_init = None if p_init is None else [float(v) for v in p_init]
+        self.optim_method = optim_method
+        self.optim_method_params = optim_method_params
+        self.name = name if name is not None else tuple(sorted(self.catchment_ids))
+
+
+class CalibrationResult(object):
+    """
+    The result of a CalibrationJob, with the optimized parameters and the optimizer trace.
+    Parameters are kept as plain lists of float so that results can be passed between processes.
+    If the job failed, error is the exception, p_opt is None and goal_function_value is nan.
+    """
+
+    def __init__(self, job, p_opt, goal_function_value, trace_goal_function_values, trace_parameters, error=None):
+        self.job = job
+        self.p_opt = p_opt
+        self.goal_function_value = goal_function_value
+        self.trace_goal_function_values = trace_goal_function_values
+        self.trace_parameters = trace_parameters
+        self.error = error
+
+
+_calibration_worker = {}  # the ConfigCalibrator, and the full target specification of a CalibrationDriver worker process
+
+
+def _init_calibration_worker(config, trace_queue=None):
+    calibrator = ConfigCalibrator(config)
+    calibrator.calibrated_model_file = None  # the driver collects the results, workers do not save them
+    if trace_queue is not None:
+        # stream the optimizer trace to the driver, tagged with the index of the running job
+        calibrator.optimizer.set_trace_callback(
+            lambda v, p: trace_queue.put((_calibration_worker['job'], float(v), [p.get(i) for i in range(p.size())])))
+    _calibration_worker['calibrator'] = calibrator
+    # an owned copy, calibrate(tv=...) replaces the optimizer targets that calibrator.tv refers to
+    _calibration_worker['tv'] = api.TargetSpecificationVector(calibrator.tv)
+    # calibrate() keeps the last used settings, so keep the config defaults for jobs that do not specify them
+    _calibration_worker['defaults'] = (calibrator.p_init, calibrator.optim_method, calibrator.optim_method_params)
+    _calibration_worker['interpolated'] = False
+
+
+def _job_targets(job, targets):
+    group = set(job.catchment_ids)
+    tv = api.TargetSpecificationVector()
+    for t in targets:
+        if t.catchment_property == api.ROUTED_DISCHARGE:
+            if t.river_id in job.river_ids:
+                tv.append(t)
+        elif set(t.catchment_indexes).issubset(group):
+            tv.append(t)
+    return tv
+
+
+def _run_calibration_job(i_job, job):
+    calibrator = _calibration_worker['calibrator']
+    _calibration_worker['job'] = i_job
+    tv = _job_targets(job, _calibration_worker['tv'])
+    if len(tv) == 0:
+        raise ConfigSimulatorError("No calibration targets found for catchment group {}.".format(job.name))
+    p_init, optim_method, optim_method_params = _calibration_worker['defaults']
+    if job.p_init is not None:
+        p_init = calibrator.region_model.parameter_t()
+        p_init.set(job.p_init)
+    p_res = calibrator.calibrate(optim_method=job.optim_method or optim_method,
+                                 optim_method_params=job.optim_method_params or optim_method_params,
+                                 p_init=p_init, tv=tv, run_interp=not _calibration_worker['interpolated'],
+                                 verbose_level=0)
+    _calibration_worker['interpolated'] = True  # the forcing is the same for all jobs, interpolate once per worker
+    opt = calibrator.optimizer
+    p_opt = [p_res.get(i) for i in range(p_res.size())]
+    trace_parameters = []
+    for i in range(opt.trace_size):
+        p = opt.trace_parameter(i)
+        trace_parameters.append([p.get(j) for j in range(p.size())])
+    trace_goal_function_values = [float(v) for v in opt.trace_goal_function_values]
+    # the optimizers return the best evaluated parameters, so the best traced value is the goal function of p_opt
+    return CalibrationResult(job, p_opt, min(trace_goal_function_values, default=float('nan')),
+                             trace_goal_function_values, trace_parameters)
+
+
+class CalibrationDriver(object):
+    """
+    Runs a list of CalibrationJob's, e.g. several catchment groups and/or several initial guesses,
+    on a pool of processes. Each worker process sets up its own ConfigCalibrator (and thus region model)
+    from the calibration config, and reuses it for all the jobs it gets.
+    """
+
+    def __init__(self, config, n_workers=None, trace_timeout=10.0):
+        """
+        Parameters
+        ----------
+        config: YAMLCalibConfig
+            The calibration config, as passed to ConfigCalibrator
+        n_workers: int, optional
+            Number of worker processes, default the number of cpus.
+        trace_timeout: float, optional
+            Max seconds to wait for the rest of the streamed trace of a completed job, default 10.0.
+        """
+        self.config = config
+        self.n_workers = n_workers if n_workers is not None else multiprocessing.cpu_count()
+        self.trace_timeout = trace_timeout
+        self.results = []
+
+    def run(self, jobs, progress=None, trace=None):
+        """
+        Run the jobs, returning the results as the jobs completes.
+
+        Parameters
+        ----------
+        jobs: list of CalibrationJob
+        progress: callable, optional
+            Called with each CalibrationResult as soon as the job completes,
+            the result includes the trace of the optimizer (trace_goal_function_value/trace_parameter).
+        trace: callable, optional
+            Called as trace(job, goal_function_value, parameters) for each evaluation of the optimizers,
+            streamed from the optimizer trace while the jobs run. The trace calls of a job are done
+            before the progress call of the job, waiting at most trace_timeout for the trace to arrive.
+
+        Returns
+        -------
+        list of CalibrationResult, in order of completion, a failed job gives a result with the error
+        """
+        self.results = []
+        trace_queue = multiprocessing.Queue() if trace is not None else None
+        n_traced = [0]*len(jobs)
+
+        def dispatch_trace(timeout):
+            try:
+                i_job, v, p = trace_queue.get(timeout=timeout)
+            except queue.Empty:
+                return
+            n_traced[i_job] += 1
+            trace(jobs[i_job], v, p)
+
+        pool = multiprocessing.Pool(processes=min(self.n_workers, max(1, len(jobs))),
+                                    initializer=_init_calibration_worker, initargs=(self.config, trace_queue))
+        try:
+            pending = [(i, pool.apply_async(_run_calibration_job, (i, job))) for i, job in enumerate(jobs)]
+            while pending:
+                if trace_queue is not None:
+                    dispatch_trace(0.1)
+                else:
+                    pending[0][1].wait(0.1)
+                for i, a in [(i, a) for i, a in pending if a.ready()]:
+                    pending.remove((i, a))
+                    try:
+                        r = a.get()
+                    except Exception as e:  # keep running the other jobs
+                        r = CalibrationResult(jobs[i], None, float('nan'), [], [], error=e)
+                    if trace_queue is not None:
+                        # the rest of the trace is on its way, unless entries were lost in the worker
+                        t_end = time.time() + self.trace_timeout
+                        while n_traced[i] < len(r.trace_goal_function_values) and time.time() < t_end:
+                            dispatch_trace(max(0.0, t_end - time.time()))
+                    self.results.append(r)
+                    if progress is not None:
+                        progress(r)
+        finally:
+            pool.terminate()
+            pool.join()
+        return self.results
+
+    def best_parameters(self, results=None):
+        """
+        Returns the best result for each job name (catchment group), i.e. the one with the lowest goal function value.
+        Failed jobs are not considered.
+
+        Parameters
+        ----------
+        results: list of CalibrationResult, optional
+            default the results of the last run
+
+        Returns
+        -------
+        dict of job name -> CalibrationResult
+        """
+        best = {}
+        for r in (results if results is not None else self.results):
+            if r.error is not None:
+                continue
+            if r.job.name not in best or r.goal_function_value < best[r.job.name].goal_function_value:
+                best[r.job.name] = r
+        return best
+
+
 class ConfigForecaster(object):
     def __init__(self, config):
         self.historical_cfg = config.sim_config
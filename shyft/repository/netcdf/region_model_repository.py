@@ -323,12 +323,9 @@ class RegionModelRepository(interfaces.RegionModelRepository):
         radiation_slope_factor = 0.9
 
         # Construct cells
-        cell_vector = self._region_model.cell_t.vector_t()
-        for pt, a, c_id, ff, lf, rf, gf in zip(coordinates, areas, catchments, ff, lf, rf, gf):
-            cell = self._region_model.cell_t()
-            cell.geo = api.GeoCellData(api.GeoPoint(*pt), a, int(c_id), radiation_slope_factor,
-                                       api.LandTypeFractions(gf, lf, rf, ff, 1.0-gf-lf-rf-ff))
-            cell_vector.append(cell)
+        cell_geo_data = np.column_stack([coordinates, areas, catchments.astype(int),
+                                         np.full(len(catchments), radiation_slope_factor), gf, lf, rf, ff])
+        cell_vector = self._region_model.cell_t.vector_t.create_from_geo_cell_data_array(cell_geo_data)
 
         # Construct catchment overrides
         catchment_parameters = self._region_model.parameter_t.map_t()
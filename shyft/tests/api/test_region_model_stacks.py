@@ -1,4 +1,5 @@
 ﻿from numpy import random
+import numpy as np
 import unittest
 import tempfile
 from os import path
@@ -150,6 +151,166 @@ class RegionModel(unittest.TestCase):
         total_area_no_match = model.statistics.total_area(cids)  # now, cids contains 3, that matches no cells
         self.assertAlmostEqual(total_area_no_match, 0.0)
 
+    def test_numpy_geo_and_state_accessors(self):
+        num_cells = 20
+        model = self.build_model(pt_gs_k.PTGSKModel, pt_gs_k.PTGSKParameter, num_cells, num_catchments=3)
+        cells = model.get_cells()
+        areas = model.cell_areas()
+        self.assertEqual(len(areas), num_cells)
+        self.assertAlmostEqual(areas.sum(), model.statistics.total_area(api.IntVector()))
+        mid_points = model.cell_mid_points()
+        self.assertEqual(mid_points.shape, (num_cells, 3))
+        self.assertAlmostEqual(mid_points[3, 0], cells[3].geo.mid_point().x)
+        self.assertAlmostEqual(mid_points[3, 2], cells[3].geo.mid_point().z)
+        cids = model.cell_catchment_ids()
+        self.assertEqual([int(c) for c in cids], [c.geo.catchment_id() for c in cells])
+        ltf = model.cell_land_type_fractions()
+        self.assertEqual(ltf.shape, (num_cells, 5))
+        self.assertAlmostEqual(ltf[0, 0], 0.01)
+        self.assertAlmostEqual(ltf[0, 3], 0.3)
+        self.assertAlmostEqual(ltf[0].sum(), 1.0)
+
+        s = pt_gs_k.PTGSKStateVector()
+        for i in range(num_cells):
+            s.append(pt_gs_k.PTGSKState())
+        q = s.kirchner_q
+        self.assertEqual(len(q), num_cells)
+        s.kirchner_q = np.linspace(1.0, 2.0, num_cells)
+        self.assertAlmostEqual(s[num_cells - 1].kirchner.q, 2.0)
+        s.gs_albedo = np.full(num_cells, 0.7)
+        self.assertAlmostEqual(s[3].gs.albedo, 0.7)
+        self.assertAlmostEqual(s.gs_albedo[4], 0.7)
+        with self.assertRaises(RuntimeError):
+            s.kirchner_q = np.ones(num_cells - 1)
+        hs = hbv_stack.HbvStateVector()
+        hs.append(hbv_stack.HbvState())
+        hs.tank_uz = np.array([3.0])
+        self.assertAlmostEqual(hs[0].tank.uz, 3.0)
+
+    def test_state_vector_bytes(self):
+        n = 1000
+        s = pt_gs_k.PTGSKStateVector()
+        for i in range(n):
+            s.append(pt_gs_k.PTGSKState())
+        s.kirchner_q = np.linspace(0.1, 5.0, n)
+        for compress in [False, True]:
+            blob = s.serialize_to_bytes(compress=compress)
+            r = pt_gs_k.PTGSKStateVector.deserialize_from_bytes(blob)
+            self.assertEqual(len(r), n)
+            self.assertTrue(np.array_equal(r.kirchner_q, s.kirchner_q))
+            self.assertTrue(np.array_equal(r.gs_albedo, s.gs_albedo))
+        view = np.frombuffer(s.serialize_to_bytes(), dtype=np.float64, offset=32).reshape(-1, n)
+        self.assertEqual(view.shape, (9, n))
+        self.assertTrue(np.array_equal(view[8], s.kirchner_q))
+        r = pt_gs_k.PTGSKStateVector.deserialize_from_bytes(bytearray(s.serialize_to_bytes(True)))
+        self.assertEqual(len(r), n)
+        with self.assertRaises(RuntimeError):
+            pt_hs_k.PTHSKStateVector.deserialize_from_bytes(blob)
+
+    def test_float32_model_run(self):
+        num_cells = 20
+        models = [self.build_model(model_type, pt_gs_k.PTGSKParameter, num_cells) for model_type in [pt_gs_k.PTGSKModel, pt_gs_k.PTGSKModel32]]
+        cal = api.Calendar()
+        time_axis = api.TimeAxisFixedDeltaT(cal.time(2015, 1, 1, 0, 0, 0), api.deltahours(1), 240)
+        ip = api.InterpolationParameter()
+        ip.use_idw_for_temperature = True
+        region_env = self.create_dummy_region_environment(time_axis, models[0].get_cells()[int(num_cells / 2)].geo.mid_point())
+        cids = api.IntVector()
+        q = []
+        for model in models:
+            s0 = pt_gs_k.PTGSKStateVector()
+            for i in range(num_cells):
+                si = pt_gs_k.PTGSKState()
+                si.kirchner.q = 40.0
+                s0.append(si)
+            model.set_states(s0)
+            model.run_interpolation(ip, time_axis, region_env)
+            model.run_cells()
+            q.append(model.statistics.discharge(cids))
+        self.assertIsInstance(models[1].cells[0].rc.avg_discharge, api.TsFixed32)
+        for i in range(time_axis.size()):
+            self.assertAlmostEqual(q[1].value(i), q[0].value(i), delta=1e-5*abs(q[0].value(i)))
+
+    def test_set_response_collection(self):
+        num_cells = 10
+        model = self.build_model(pt_gs_k.PTGSKModel, pt_gs_k.PTGSKParameter, num_cells)
+        cal = api.Calendar()
+        time_axis = api.TimeAxisFixedDeltaT(cal.time(2015, 1, 1, 0, 0, 0), api.deltahours(1), 24)
+        region_env = self.create_dummy_region_environment(time_axis, model.get_cells()[int(num_cells / 2)].geo.mid_point())
+        s0 = pt_gs_k.PTGSKStateVector()
+        for i in range(num_cells):
+            s0.append(pt_gs_k.PTGSKState())
+        model.set_states(s0)
+        model.run_interpolation(api.InterpolationParameter(), time_axis, region_env)
+        rv = pt_gs_k.PTGSKResponseVariable
+        model.set_response_collection(-1, rv.AVG_DISCHARGE | rv.SNOW_SWE)
+        model.run_cells()
+        c = model.cells[0]
+        self.assertEqual(c.rc.collect_mask, rv.AVG_DISCHARGE | rv.SNOW_SWE)
+        self.assertEqual(c.rc.avg_discharge.size(), time_axis.size())
+        self.assertEqual(c.rc.snow_swe.size(), time_axis.size())
+        self.assertEqual(c.rc.snow_sca.size(), 0)
+        self.assertEqual(c.rc.ae_output.size(), 0)
+        hbv_model = self.build_model(hbv_stack.HbvModel, hbv_stack.HbvParameter, num_cells)
+        with self.assertRaises(RuntimeError):  # not supported by this stack
+            hbv_model.set_response_collection(-1, 1)
+
+    def test_run_cells_streamed(self):
+        num_cells = 20
+        model = self.build_model(pt_gs_k.PTGSKModel, pt_gs_k.PTGSKParameter, num_cells)
+        cal = api.Calendar()
+        time_axis = api.TimeAxisFixedDeltaT(cal.time(2015, 1, 1, 0, 0, 0), api.deltahours(1), 240)
+        ip = api.InterpolationParameter()
+        region_env = self.create_dummy_region_environment(time_axis, model.get_cells()[int(num_cells / 2)].geo.mid_point())
+        s0 = pt_gs_k.PTGSKStateVector()
+        for i in range(num_cells):
+            si = pt_gs_k.PTGSKState()
+            si.kirchner.q = 40.0
+            s0.append(si)
+        model.set_states(s0)
+        model.run_interpolation(ip, time_axis, region_env)
+        model.run_cells()
+        q = model.statistics.discharge(api.IntVector())
+        model.set_states(s0)
+        blocks = []
+        model.run_cells_streamed(ip, time_axis, region_env, 100, api.IntVector(),
+                                 lambda ta, cids, discharge: blocks.append((ta.time(0), discharge.copy())))
+        self.assertEqual(len(blocks), 3)
+        self.assertEqual(blocks[2][1].shape, (1, 40))
+        i = 0
+        for t0, discharge in blocks:
+            self.assertEqual(t0, time_axis.time(i))
+            for v in discharge[0]:
+                self.assertAlmostEqual(v, q.value(i))
+                i += 1
+
+    def test_catchment_discharge_model(self):
+        num_cells = 20
+        model = self.build_model(pt_gs_k.PTGSKModel, pt_gs_k.PTGSKParameter, num_cells)
+        acc_model = self.build_model(pt_gs_k.PTGSKCatchmentDischargeModel, pt_gs_k.PTGSKParameter, num_cells)
+        cal = api.Calendar()
+        time_axis = api.TimeAxisFixedDeltaT(cal.time(2015, 1, 1, 0, 0, 0), api.deltahours(1), 48)
+        ip = api.InterpolationParameter()
+        region_env = self.create_dummy_region_environment(time_axis, model.get_cells()[int(num_cells / 2)].geo.mid_point())
+        s0 = pt_gs_k.PTGSKStateVector()
+        for i in range(num_cells):
+            si = pt_gs_k.PTGSKState()
+            si.kirchner.q = 40.0
+            s0.append(si)
+        for m in [model, acc_model]:
+            m.set_states(s0)
+            m.run_interpolation(ip, time_axis, region_env)
+            m.run_cells()
+        q = model.statistics.discharge(api.IntVector([0]))
+        acc_q = acc_model.get_catchment_discharge_sum(0)  # no cell time-series, summed during the run
+        self.assertEqual(acc_q.size(), time_axis.size())
+        for i in range(time_axis.size()):
+            self.assertAlmostEqual(acc_q.value(i), q.value(i))
+        acc_model.river_network.add(api.River(1))
+        acc_model.connect_catchment_to_river(0, 1)
+        with self.assertRaises(RuntimeError):  # routing needs the discharge of each cell
+            acc_model.run_cells()
+
     def test_model_initialize_and_run(self):
         num_cells = 20
         model_type = pt_gs_k.PTGSKModel
@@ -213,6 +374,13 @@ class RegionModel(unittest.TestCase):
         sum_discharge_value = model.statistics.discharge_value(cids, 0)  # at the first timestep
         sum_charge = model.statistics.charge(cids)
         sum_charge_value=model.statistics.charge_value(cids, 0)
+        cix = model.get_catchment_cell_index()  # the catchment to cell lookup, kept by the model, used by .statistics
+        self.assertEqual(cix.n_cells, num_cells)
+        self.assertEqual(list(cix.catchment_ids), [0])
+        q_matrix = model.statistics.discharge_matrix(api.IntVector([0, 0]))  # one row for each catchment-id, in one pass
+        self.assertEqual(q_matrix.shape, (2, time_axis.size()))
+        self.assertAlmostEqual(q_matrix[0, 0], sum_discharge_value)
+        self.assertAlmostEqual(q_matrix[1, 0], sum_discharge_value)
         opt_model.run_cells()  # starting out with the same state, same interpolated values, and region-parameters, we should get same results
         sum_discharge_opt_value= opt_model.statistics.discharge_value(cids, 0)
         self.assertAlmostEqual(sum_discharge_opt_value,sum_discharge_value,3)  # verify the opt_model clone gives same value
@@ -500,6 +668,43 @@ class RegionModel(unittest.TestCase):
             self.assertAlmostEqual(cell_vector[i].geo.mid_point().x, cell_vector2[i].mid_point().x)
             self.assertAlmostEqual(cell_vector[i].geo.mid_point().y, cell_vector2[i].mid_point().y)
 
+    def test_create_cell_vector_from_numpy(self):
+        n_cells = 5
+        fields = ["x", "y", "z", "area", "catchment_id", "radiation_slope_factor", "glacier", "lake", "reservoir", "forest"]
+        a = np.zeros(n_cells, dtype=[(f, np.float64) for f in fields])
+        a["x"] = np.arange(n_cells)*1000.0
+        a["y"] = 500.0
+        a["z"] = np.linspace(100.0, 500.0, n_cells)
+        a["area"] = 1000.0*1000.0
+        a["catchment_id"] = [1, 2, 1, 2, 3]
+        a["radiation_slope_factor"] = 0.9
+        a["forest"] = 0.3
+        a["lake"] = 0.1
+        cells = pt_gs_k.PTGSKCellAllVector.create_from_geo_cell_data_array(a)
+        self.assertEqual(len(cells), n_cells)
+        self.assertAlmostEqual(cells[4].geo.mid_point().z, 500.0)
+        self.assertAlmostEqual(cells[3].geo.mid_point().x, 3000.0)
+        self.assertEqual(cells[4].geo.catchment_id(), 3)
+        self.assertAlmostEqual(cells[2].geo.land_type_fractions_info().forest(), 0.3)
+        self.assertAlmostEqual(cells[2].geo.land_type_fractions_info().unspecified(), 0.6)
+        # a plain 2d array, same column order, gives the same cells
+        m = np.column_stack([a[f] for f in fields])
+        cells2 = hbv_stack.HbvCellAllVector.create_from_geo_cell_data_array(m)
+        self.assertEqual(len(cells2), n_cells)
+        self.assertAlmostEqual(cells2[4].geo.area(), cells[4].geo.area())
+        self.assertEqual(cells2[1].geo.catchment_id(), 2)
+        # slightly negative, or summing slightly above 1.0, fractions from gis data are clipped and normalized
+        m[0, 6:10] = [-1e-9, 0.2, 0.0, 0.8000001]
+        m[1, 6:10] = [0.5, 0.3, 0.1, 0.2]
+        cells3 = pt_gs_k.PTGSKCellAllVector.create_from_geo_cell_data_array(m)
+        ltf = cells3[0].geo.land_type_fractions_info()
+        self.assertAlmostEqual(ltf.glacier(), 0.0)
+        self.assertAlmostEqual(ltf.forest(), 0.8)
+        self.assertAlmostEqual(ltf.unspecified(), 0.0)
+        ltf = cells3[1].geo.land_type_fractions_info()
+        self.assertAlmostEqual(ltf.glacier(), 0.5/1.1)
+        self.assertAlmostEqual(ltf.glacier() + ltf.lake() + ltf.reservoir() + ltf.forest(), 1.0)
+
     def test_state_with_id_handler(self):
         num_cells = 20
         model_type = pt_gs_k.PTGSKModel
@@ -281,6 +281,104 @@ class TimeSeries(unittest.TestCase):
             self.assertAlmostEqual(9.0, percentiles[6].value(i), 3, "100-percentile")
             self.assertAlmostEqual(9.0, percentiles[7].value(i), 3, "max-extreme")
 
+    def test_ts_vector_evaluate(self):
+        c = api.Calendar()
+        t0 = c.time(2016, 1, 1)
+        dt = api.deltahours(1)
+        n = 240
+        ta = api.TimeAxis(t0, dt, n)
+        p_fx = api.point_interpretation_policy.POINT_AVERAGE_VALUE
+        a = api.TimeSeries(ta=ta, fill_value=1.0, point_fx=p_fx)
+        tsv = api.TsVector()
+        for i in range(10):
+            tsv.append(a*float(i) + 2.0)
+        r = tsv.evaluate()  # evaluated in parallel, with the GIL released
+        self.assertEqual(len(r), len(tsv))
+        for i in range(len(tsv)):
+            self.assertEqual(r[i].time_axis, ta)
+            self.assertEqual(r[i].point_interpretation(), p_fx)
+            assert_array_almost_equal(r[i].values.to_numpy(), tsv[i].values.to_numpy())
+
+    def test_ts_as_numpy_view(self):
+        ta = api.TimeAxis(api.Calendar().time(2016, 1, 1), api.deltahours(1), 24)
+        a = api.TimeSeries(ta=ta, fill_value=1.0, point_fx=api.point_interpretation_policy.POINT_AVERAGE_VALUE)
+        v = a.as_numpy()
+        self.assertFalse(v.flags.writeable)
+        a.set(0, 2.0)
+        self.assertAlmostEqual(v[0], 2.0)  # a view, not a copy
+        w = a.as_numpy(writable=True)
+        w[1] = 3.0
+        self.assertAlmostEqual(a.value(1), 3.0)
+        c = a*2.0
+        assert_array_almost_equal(c.as_numpy(), a.as_numpy()*2.0)  # expressions are evaluated
+        with self.assertRaises(RuntimeError):
+            c.as_numpy(writable=True)
+        a.append(api.TimeSeries(ta=api.TimeAxis(ta.total_period().end, api.deltahours(1), 24), fill_value=4.0,
+                                point_fx=api.point_interpretation_policy.POINT_AVERAGE_VALUE))
+        v = a.as_numpy()  # views taken before append are not valid, take a new one
+        self.assertEqual(len(v), 48)
+        self.assertAlmostEqual(v[1], 3.0)
+        self.assertAlmostEqual(v[47], 4.0)
+        del a  # the views keeps the values alive
+        self.assertAlmostEqual(v[1], 3.0)
+        tp = ta.time_points
+        self.assertEqual(tp.dtype, np.int64)
+        self.assertEqual(len(tp), len(ta) + 1)
+        self.assertEqual(tp[-1], ta.total_period().end)
+
+    def test_ts_vector_to_and_from_numpy(self):
+        t0 = api.Calendar().time(2016, 1, 1)
+        ta_h = api.TimeAxis(t0, api.deltahours(1), 48)
+        ta_d = api.TimeAxis(t0, api.deltahours(24), 2)
+        p_fx = api.point_interpretation_policy.POINT_AVERAGE_VALUE
+        a = np.vstack([np.arange(48.0), np.full(48, 3.0)])
+        tsv = api.TsVector.from_numpy(ta_h, a, p_fx)
+        self.assertEqual(len(tsv), 2)
+        self.assertEqual(tsv[0].time_axis, ta_h)
+        self.assertEqual(tsv[1].point_interpretation(), p_fx)
+        assert_array_almost_equal(tsv.to_numpy(ta_h), a)
+        tsv.append(tsv[0]*2.0)
+        d = tsv.to_numpy(ta_d)
+        self.assertEqual(d.shape, (3, 2))
+        assert_array_almost_equal(d, np.array([[11.5, 35.5], [3.0, 3.0], [23.0, 71.0]]))
+        with self.assertRaises(RuntimeError):
+            api.TsVector.from_numpy(ta_d, a, p_fx)  # time-axis length mismatch
+
+    def test_materialize_average(self):
+        t0 = api.Calendar().time(2016, 1, 1)
+        ta_h = api.TimeAxis(t0, api.deltahours(1), 48)
+        ta_d = api.TimeAxis(t0, api.deltahours(24), 2)
+        a = api.TimeSeries(ta=ta_h, fill_value=1.0, point_fx=api.point_interpretation_policy.POINT_AVERAGE_VALUE)
+        avg = a.average(ta_d)
+        avg.materialize()
+        self.assertAlmostEqual(avg.value(1), 1.0)
+        a.set(24, 25.0)  # kept values are used until materialized again
+        self.assertAlmostEqual(avg.value(1), 1.0)
+        avg.materialize()
+        self.assertAlmostEqual(avg.value(1), 2.0)
+        s = api.TimeSeries('a')
+        s_avg = s.average(ta_d)
+        with self.assertRaises(RuntimeError):
+            s_avg.materialize()  # unbound symbolic ts
+
+    def test_append_and_update_tail(self):
+        t0 = api.Calendar().time(2016, 1, 1)
+        dt = api.deltahours(1)
+        p_fx = api.point_interpretation_policy.POINT_AVERAGE_VALUE
+        ta_d = api.TimeAxis(t0, api.deltahours(24), 3)
+        obs = api.TimeSeries(api.TimeAxis(t0, dt, 30), fill_value=1.0, point_fx=p_fx)
+        daily = obs.average(ta_d)
+        daily.materialize()
+        self.assertTrue(math.isnan(daily.value(2)))
+        tail = api.TimeSeries(api.TimeAxis(t0 + 30*dt, dt, 42), fill_value=2.0, point_fx=p_fx)
+        obs.append(tail)
+        self.assertEqual(len(obs), 72)
+        daily.update_tail(tail.time_axis.total_period().start)
+        assert_array_almost_equal(daily.values.to_numpy(), obs.average(ta_d).values.to_numpy())
+        self.assertAlmostEqual(daily.value(2), 2.0)
+        with self.assertRaises(RuntimeError):
+            obs.append(tail)  # starts before end of obs
+
     def test_percentiles_with_min_max_extremes(self):
         """ the percentiles function now also supports picking out the min-max peak value
             within each interval.
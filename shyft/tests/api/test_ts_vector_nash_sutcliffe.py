@@ -7,6 +7,7 @@ from shyft.api import TimeSeries
 from shyft.api import TimeAxis
 from shyft.api import point_interpretation_policy as ts_point_fx
 from shyft.api import deltahours
+from shyft.api import nash_sutcliffe, nash_sutcliffe_matrix, kling_gupta, kling_gupta_matrix
 
 
 class TsVectorNashSutcliffe(unittest.TestCase):
@@ -81,4 +82,25 @@ class TsVectorNashSutcliffe(unittest.TestCase):
                         ts_expected = f.average(ta)
                         self.assertTrue(s.time_axis == ts_expected.time_axis)
                         self.assertTrue(np.allclose(s.values.to_numpy(),ts_expected.values.to_numpy()))
-        pass
\ No newline at end of file
+        pass
+
+    def test_nash_sutcliffe_and_kling_gupta_matrix(self):
+        utc = Calendar()
+        t0 = utc.time(2017, 1, 1)
+        dt = deltahours(1)
+        fc_v = self._create_forecasts(t0, dt, 66, deltahours(6), 8)
+        obs = self._create_observation(t0, dt, 6, 20)
+        time_axes = [TimeAxis(t0 + deltahours(6*i + 6), deltahours(3), 4) for i in range(3)]
+        obs_v = TsVector()
+        obs_v.append(obs)
+        ns = nash_sutcliffe_matrix(obs_v, fc_v, time_axes)  # one obs vs all forecasts
+        kg = kling_gupta_matrix(obs_v, fc_v, time_axes, 1.0, 1.0, 1.0)
+        self.assertEqual(ns.shape, (len(fc_v), len(time_axes)))
+        self.assertEqual(kg.shape, (len(fc_v), len(time_axes)))
+        for i in range(len(fc_v)):
+            for k in range(len(time_axes)):
+                self.assertAlmostEqual(ns[i, k], nash_sutcliffe(obs, fc_v[i], time_axes[k]))
+                self.assertAlmostEqual(kg[i, k], kling_gupta(obs, fc_v[i], time_axes[k], 1.0, 1.0, 1.0))
+        with self.assertRaises(RuntimeError):
+            obs_v.append(obs)  # neither one, nor one for each forecast
+            nash_sutcliffe_matrix(obs_v, fc_v, time_axes)
@@ -29,6 +29,19 @@ class Vectors(unittest.TestCase):
         # this does not work yet
         # nv= api.DoubleVector(dv_np).. would be very nice!
 
+    def test_double_vector_as_numpy_view(self):
+        dv = api.DoubleVector.from_numpy(np.arange(10.0)[::2])  # strided input is copied element by element
+        assert_array_almost_equal(dv.to_numpy(), np.array([0.0, 2.0, 4.0, 6.0, 8.0]))
+        v = dv.as_numpy()
+        self.assertFalse(v.flags.writeable)
+        dv[1] = 3.0
+        self.assertAlmostEqual(v[1], 3.0)  # a view, not a copy
+        w = dv.as_numpy(writable=True)
+        w[2] = 5.0
+        self.assertAlmostEqual(dv[2], 5.0)
+        del dv  # the views keeps the vector alive
+        assert_array_almost_equal(w, np.array([0.0, 3.0, 5.0, 6.0, 8.0]))
+
     def test_int_vector(self):
         dv_from_list = api.IntVector([x for x in range(10)])
         dv_np = np.arange(10, dtype=np.int32)  # notice, default is int64, which does not convert automatically to int32
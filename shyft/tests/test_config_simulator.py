@@ -2,9 +2,10 @@ from os import path
 import unittest
 
 from shyft.repository.default_state_repository import DefaultStateRepository
-from shyft.orchestration.configuration.yaml_configs import YAMLSimConfig
-from shyft.orchestration.simulators.config_simulator import ConfigSimulator
-from shyft.api import IntVector, Calendar
+from shyft.orchestration.configuration.yaml_configs import YAMLSimConfig, YAMLCalibConfig
+from shyft.orchestration.simulators.config_simulator import ConfigSimulator, CalibrationDriver, CalibrationJob
+from shyft.orchestration.simulators.config_simulator import _job_targets
+from shyft.api import IntVector, Calendar, TargetSpecificationPts, ROUTED_DISCHARGE
 from shyft.orchestration.config import utctime_from_datetime
 import datetime as dt
 
@@ -48,6 +49,60 @@ class ConfigSimulationTestCase(unittest.TestCase):
         # x self.assertAlmostEqual(simulator.region_model.cells[3383].geo.land_type_fractions_info().lake(),0.7432,3)
         # x self.assertAlmostEqual(simulator.region_model.cells[652].geo.land_type_fractions_info().glacier(),0.1351,3)
 
+    def test_calibration_driver(self):
+        config_file = path.join(path.dirname(__file__), "netcdf", "neanidelva_calibration.yaml")
+        cfg = YAMLCalibConfig(config_file, "neanidelva")
+        params = {'max_n_evaluations': 20, 'tr_start': 0.1, 'tr_stop': 1.0e-5}
+        tya = [1308, 1394, 1867, 2198, 2402, 2545]
+        nea = [1996, 2446, 2640, 3536]
+        jobs = [CalibrationJob(tya, optim_method='min_bobyqa', optim_method_params=params),
+                CalibrationJob(nea, optim_method='min_bobyqa', optim_method_params=params),
+                CalibrationJob(nea, optim_method='sceua', optim_method_params={'max_n_evaluations': 20}, name=tuple(nea)),
+                CalibrationJob(tya, optim_method='min_bobyqa', optim_method_params=params, name='tya2'),
+                CalibrationJob([-1], name='no targets')]  # fails, without stopping the other jobs
+        driver = CalibrationDriver(cfg, n_workers=2)
+        progress = []
+        traced = {}
+
+        def trace(job, v, p):
+            self.assertNotIn(id(job), [id(r.job) for r in progress])  # streamed before the job completes
+            traced.setdefault(id(job), []).append((v, p))
+
+        results = driver.run(jobs, progress=lambda r: progress.append(r), trace=trace)
+        self.assertEqual(len(results), 5)
+        self.assertEqual(sorted(str(r.job.name) for r in progress),
+                         sorted(str(n) for n in [tuple(tya), tuple(nea), tuple(nea), 'tya2', 'no targets']))
+        failed = [r for r in results if r.error is not None]
+        self.assertEqual([r.job.name for r in failed], ['no targets'])
+        results = [r for r in results if r.error is None]
+        for r in results:
+            self.assertGreater(len(r.trace_goal_function_values), 0)
+            self.assertEqual(len(r.trace_goal_function_values), len(r.trace_parameters))
+            self.assertEqual(len(r.p_opt), len(r.trace_parameters[0]))
+            self.assertEqual([v for v, p in traced[id(r.job)]], r.trace_goal_function_values)
+            self.assertEqual(r.goal_function_value, min(r.trace_goal_function_values))
+        best = driver.best_parameters()
+        self.assertEqual(set(best.keys()), {tuple(tya), tuple(nea), 'tya2'})
+        # same targets on a reused worker, the targets of the first job must not be overwritten by the later jobs
+        self.assertEqual(len(best[tuple(tya)].trace_goal_function_values), len(best['tya2'].trace_goal_function_values))
+        self.assertAlmostEqual(best[tuple(tya)].goal_function_value, best['tya2'].goal_function_value)
+        nea_values = [r.goal_function_value for r in results if r.job.name == tuple(nea)]
+        self.assertAlmostEqual(best[tuple(nea)].goal_function_value, min(nea_values))
+
+    def test_calibration_job_targets(self):
+        targets = []
+        for cids, rid in [([1, 2], None), ([2, 3], None), ([], 10), ([], 20)]:
+            t = TargetSpecificationPts()
+            t.catchment_indexes = IntVector(cids)
+            if rid is not None:
+                t.catchment_property = ROUTED_DISCHARGE
+                t.river_id = rid
+            targets.append(t)
+        tv = _job_targets(CalibrationJob([1, 2], river_ids=[20]), targets)
+        self.assertEqual([(list(t.catchment_indexes), t.river_id) for t in tv], [([1, 2], 0), ([], 20)])
+        tv = _job_targets(CalibrationJob([1, 2, 3]), targets)
+        self.assertEqual(len(tv), 2)  # routed discharge targets only with their river in the job
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -5,6 +5,7 @@ Tests for the simple simulator.
 from os import path
 
 import random
+import time
 import unittest
 import numpy as np
 from functools import reduce
@@ -135,6 +136,64 @@ class SimulationTestCase(unittest.TestCase):
         sim_copy.run(cfg.time_axis,state_repos.get_state(0))
 
 
+    def test_run_chunked_simulator(self):
+        config_dir = path.join(path.dirname(__file__), "netcdf")
+        cfg = orchestration.YAMLConfig(
+            "atnsjoen_simulation.yaml", "atnsjoen",
+            config_dir=config_dir, data_dir=shyftdata_dir)
+        simulator = cfg.get_simulator()
+        n_cells = simulator.region_model.size()
+        state_repos = DefaultStateRepository(cfg.model_t, n_cells)
+        time_axis = cfg.time_axis
+        simulator.run(time_axis, state_repos.get_state(0))
+        cids = api.IntVector([1])
+        q = simulator.region_model.statistics.discharge(cids)
+        chunk_steps = time_axis.size()//3 + 1
+        q_chunked = simulator.run_chunked(time_axis, chunk_steps, state_repos.get_state(0), catchment_ids=[1])
+        self.assertEqual(q_chunked.shape, (1, time_axis.size()))
+        for i in range(time_axis.size()):
+            self.assertAlmostEqual(q_chunked[0, i], q.value(i), 3)
+        self.assertEqual(simulator.region_model.time_axis.size(), time_axis.size() - 2*chunk_steps)  # keeps the last chunk
+
+    def test_run_chunked_prefetch_overlaps_run(self):
+        config_dir = path.join(path.dirname(__file__), "netcdf")
+        cfg = orchestration.YAMLConfig(
+            "atnsjoen_simulation.yaml", "atnsjoen",
+            config_dir=config_dir, data_dir=shyftdata_dir)
+        simulator = cfg.get_simulator()
+        n_cells = simulator.region_model.size()
+        state_repos = DefaultStateRepository(cfg.model_t, n_cells)
+        time_axis = cfg.time_axis
+        ticks = []  # times when the prefetch thread was running python code
+        runs = []  # (start, end) of the run of each chunk
+
+        class SlowRepository(object):  # busy in python before reading, like a repository that prepares the request
+            def __init__(self, repo):
+                self.repo = repo
+
+            def get_timeseries(self, *args, **kwargs):
+                t_end = time.perf_counter() + 1.0
+                while time.perf_counter() < t_end:
+                    ticks.append(time.perf_counter())
+                return self.repo.get_timeseries(*args, **kwargs)
+
+        simulator.geo_ts_repository = SlowRepository(simulator.geo_ts_repository)
+        get_region_environment = simulator._get_region_environment
+
+        def run_start(sources):  # called just before run_cells_streamed of each chunk
+            region_env = get_region_environment(sources)
+            runs.append([time.perf_counter(), None])
+            return region_env
+
+        def sink(chunk_ta, chunk_cids, discharge):
+            runs[-1][1] = time.perf_counter()
+
+        simulator._get_region_environment = run_start
+        simulator.run_chunked(time_axis, time_axis.size()//3 + 1, state_repos.get_state(0), sink=sink, catchment_ids=[1])
+        self.assertEqual(len(runs), 3)
+        # the next chunk is fetched while the current chunk runs, so the prefetch thread ticks during the runs
+        self.assertTrue(any(t0 < t < t1 for t0, t1 in runs[:-1] for t in ticks))
+
     def run_calibration(self, model_t):
         # set up configuration
         config_dir = path.join(path.dirname(__file__), "netcdf")
@@ -4,6 +4,7 @@
 #include "core/utctime_utilities.h"
 #include "core/cell_model.h"
 #include "core/pt_gs_k_cell_model.h"
+#include "core/region_model.h"
 
 
 #include "api/api.h"
@@ -188,4 +189,295 @@ TEST_CASE("test_state_with_id_functionality") {
     TS_ASSERT_EQUALS(m0_y.size(), 1u);
     TS_ASSERT_EQUALS(m0_y[0], 0);
 }
+
+TEST_CASE("test_state_vector_bytes") {
+    bool verbose = getenv("SHYFT_VERBOSE") ? true : false;
+    const size_t n = 1000000;
+    vector<pt_gs_k::state> sv(n);
+    for (size_t i = 0;i < n;++i) {
+        sv[i].kirchner.q = 0.5 + 0.001*(i % 100);
+        sv[i].gs.acc_melt = i < n/2 ? 0.0 : 100.0;
+        sv[i].gs.temp_swe = 1.0/(1.0 + i);
+    }
+    for (auto compress : { false, true }) {
+        auto t0 = timing::now();
+        auto b = state_vector_to_bytes(sv, compress);
+        auto t1 = timing::now();
+        auto r = state_vector_from_bytes<pt_gs_k::state>(b.data(), b.size());
+        auto t2 = timing::now();
+        if (verbose) cout << "\nstate bytes, compress=" << compress << ", size " << b.size() << " bytes, serialize " << elapsed_us(t0, t1) / 1000.0 << " ms, deserialize " << elapsed_us(t1, t2) / 1000.0 << " ms\n";
+        FAST_REQUIRE_EQ(r.size(), n);
+        bool equal = true;
+        for (size_t i = 0;i < n && equal;++i)
+            equal = r[i].kirchner.q == sv[i].kirchner.q && r[i].gs.temp_swe == sv[i].gs.temp_swe
+                && r[i].gs.acc_melt == sv[i].gs.acc_melt && r[i].gs.albedo == sv[i].gs.albedo;
+        TS_ASSERT(equal);
+        if (compress) {
+            TS_ASSERT(b.size() < sizeof(state_blob_header) + n*9*sizeof(double)/2);
+        } else {
+            FAST_CHECK_EQ(b.size(), sizeof(state_blob_header) + n*9*sizeof(double));
+            const double *q = reinterpret_cast<const double*>(b.data() + sizeof(state_blob_header)) + 8*n;// kirchner.q is the last field
+            TS_ASSERT_DELTA(q[7], sv[7].kirchner.q, 0.0);
+        }
+    }
+    vector<pt_ss_k::state> ssv(3);
+    ssv[1].snow.num_units = 42;
+    auto sb = state_vector_to_bytes(ssv, true);
+    FAST_CHECK_EQ(state_vector_from_bytes<pt_ss_k::state>(sb.data(), sb.size())[1].snow.num_units, 42u);
+    CHECK_THROWS_AS(state_vector_from_bytes<pt_hs_k::state>(sb.data(), sb.size()), runtime_error);// other stack
+    CHECK_THROWS_AS(state_vector_from_bytes<pt_ss_k::state>(sb.data(), sb.size() - 1), runtime_error);// truncated
+    vector<pt_hs_k::state> empty;
+    auto eb = state_vector_to_bytes(empty);
+    FAST_CHECK_EQ(state_vector_from_bytes<pt_hs_k::state>(eb.data(), eb.size()).size(), 0u);
+}
+
+TEST_CASE("test_catchment_cell_index_statistics") {
+    using cell_t = shyft::core::pt_gs_k::cell_complete_response_t;
+    calendar utc;
+    time_axis::fixed_dt ta(utc.time(2016, 1, 1), deltahours(1), 5);
+    auto gp = make_shared<cell_t::parameter_t>();
+    cell_t::state_t s0;
+    auto cells = make_shared<vector<cell_t>>();
+    vector<int> cids{3, 1, 3, 2, 1, 3};
+    for (size_t i = 0;i < cids.size();++i) {
+        cells->push_back(cell_t{geo_cell_data(geo_point(1000.0*i, 0.0, 100.0), 1000.0*(i + 1), cids[i]), gp, s0});
+        cells->back().rc.avg_discharge = pts_t(ta, double(i + 1), ts_point_fx::POINT_AVERAGE_VALUE);
+        cells->back().rc.avg_discharge.set(4, 10.0*(i + 1));
+    }
+    auto cix = make_shared<catchment_cell_index>(*cells);
+    FAST_CHECK_EQ(cix->size(), 3u);
+    FAST_CHECK_EQ(cix->n_cells, cids.size());
+    FAST_CHECK_EQ(cix->cids, (vector<int>{1, 2, 3}));
+    FAST_CHECK_EQ(cix->cells_of(vector<int>{3}), (vector<size_t>{0, 2, 5}));
+    FAST_CHECK_EQ(cix->cells_of(vector<int>{3, 1, 3}), (vector<size_t>{0, 1, 2, 4, 5}));// ascending cell order, duplicates ignored
+    FAST_CHECK_EQ(cix->cells_of(vector<int>{}).size(), cids.size());
+    CHECK_THROWS_AS(cix->cells_of(vector<int>{4}), runtime_error);
+
+    basic_cell_statistics<cell_t> bcs(cells, cix);
+    CHECK_THROWS_AS(basic_cell_statistics<cell_t>(cells, make_shared<catchment_cell_index>()), runtime_error);
+    TS_ASSERT_DELTA(bcs.total_area(vector<int>{3, 2}), 1000.0*(1 + 3 + 4 + 6), 1e-9);
+    TS_ASSERT_DELTA(bcs.total_area(vector<int>{}), 1000.0*21, 1e-9);
+    TS_ASSERT_DELTA(bcs.total_area(vector<int>{2, 8}), 1000.0*4, 1e-9);// no cells for 8, contributes zero
+    TS_ASSERT_DELTA(bcs.total_area(vector<int>{8}), 0.0, 1e-9);
+    TS_ASSERT_DELTA(bcs.discharge(vector<int>{1, 2}).value(0), 2.0 + 4.0 + 5.0, 1e-12);
+    TS_ASSERT_DELTA(bcs.discharge_value(vector<int>{3}, 4), 10.0*(1 + 3 + 6), 1e-12);
+    CHECK_THROWS_AS(bcs.discharge(vector<int>{7}), runtime_error);
+    // same results as the statistics building the index itself
+    basic_cell_statistics<cell_t> bcs0(cells);
+    TS_ASSERT_DELTA(bcs0.discharge(vector<int>{1, 2}).value(4), bcs.discharge(vector<int>{1, 2}).value(4), 1e-12);
+
+    size_t n_steps = 0;
+    auto m = bcs.discharge_matrix(vector<int>{2, 3, 1}, n_steps);
+    FAST_CHECK_EQ(n_steps, ta.size());
+    FAST_REQUIRE_EQ(m.size(), 3*n_steps);
+    vector<vector<int>> rows{{2}, {3}, {1}};
+    for (size_t r = 0;r < rows.size();++r) {
+        auto q = bcs.discharge(rows[r]);
+        for (size_t i = 0;i < n_steps;++i)
+            TS_ASSERT_DELTA(m[r*n_steps + i], q.value(i), 1e-12);
+    }
+    CHECK_THROWS_AS(bcs.discharge_matrix(vector<int>{1, 5}, n_steps), runtime_error);
+}
+
+TEST_CASE("test_run_cells_streamed") {
+    typedef region_model<pt_gs_k::cell_complete_response_t, a_region_environment> model_t;
+    calendar utc;
+    const size_t n = 30;
+    time_axis::fixed_dt ta(utc.time(2016, 1, 1), deltahours(1), n);
+    vector<double> t(n), p(n), r(n);
+    for (size_t i = 0;i < n;++i) {
+        t[i] = -2.0 + 0.5*i;
+        p[i] = i % 4 ? 0.0 : 2.0;
+        r[i] = 10.0*i;
+    }
+    geo_point gp(500, 500, 100);
+    a_region_environment env;
+    env.temperature->push_back(TemperatureSource(gp, apoint_ts(ta, t, ts_point_fx::POINT_AVERAGE_VALUE)));
+    env.precipitation->push_back(PrecipitationSource(gp, apoint_ts(ta, p, ts_point_fx::POINT_AVERAGE_VALUE)));
+    env.radiation->push_back(RadiationSource(gp, apoint_ts(ta, r, ts_point_fx::POINT_AVERAGE_VALUE)));
+    env.rel_hum->push_back(RelHumSource(gp, apoint_ts(ta, 0.8, ts_point_fx::POINT_AVERAGE_VALUE)));
+    env.wind_speed->push_back(WindSpeedSource(gp, apoint_ts(ta, 2.0, ts_point_fx::POINT_AVERAGE_VALUE)));
+    vector<geo_cell_data> gcd;
+    for (size_t i = 0;i < 4;++i)
+        gcd.push_back(geo_cell_data(geo_point(1000.0*i, 0.0, 100.0), 1000.0*1000.0, int(i % 2)));
+    interpolation_parameter ip;
+    ip.use_idw_for_temperature = true;
+    model_t::state_t s;
+    s.kirchner.q = 1.0;
+    vector<model_t::state_t> s0(gcd.size(), s);
+
+    model_t m(gcd, model_t::parameter_t());
+    m.set_states(s0);
+    m.run_interpolation(ip, ta, env);
+    m.run_cells();
+    vector<int> cids{1, 0};
+    basic_cell_statistics<model_t::cell_t> bcs(m.get_cells());
+    size_t n_steps = 0;
+    auto q = bcs.discharge_matrix(cids, n_steps);
+
+    model_t ms(gcd, model_t::parameter_t());
+    ms.set_states(s0);
+    vector<double> qs(cids.size()*n, shyft::nan);
+    size_t n_blocks = 0;
+    ms.run_cells_streamed(ip, ta, env, 7, cids, [&](const time_axis::fixed_dt& bta, const vector<int>& bcids, const vector<double>& bq) {
+        FAST_CHECK_EQ(bcids, cids);
+        FAST_REQUIRE_EQ(bq.size(), bcids.size()*bta.size());
+        size_t i0 = ta.index_of(bta.time(0));
+        for (size_t j = 0;j < bcids.size();++j)
+            std::copy(begin(bq) + j*bta.size(), begin(bq) + (j + 1)*bta.size(), begin(qs) + j*n + i0);
+        ++n_blocks;
+    });
+    FAST_CHECK_EQ(n_blocks, 5u);// 4 x 7 + 2
+    FAST_CHECK_EQ(ms.time_axis.size(), 2u);// the model keeps the last block
+    FAST_CHECK_EQ((*ms.get_cells())[0].rc.avg_discharge.size(), 2u);
+    for (size_t i = 0;i < q.size();++i)
+        TS_ASSERT_DELTA(qs[i], q[i], 1e-9);
+    CHECK_THROWS_AS(ms.run_cells_streamed(ip, ta, env, 0, cids, [](const time_axis::fixed_dt&, const vector<int>&, const vector<double>&) {}), runtime_error);
+    // with a calculation filter, the default is the calculated catchments, and others are rejected
+    ms.set_catchment_calculation_filter(vector<int>{1});
+    ms.set_states(s0);
+    vector<int> filtered_cids;
+    ms.run_cells_streamed(ip, ta, env, 10, vector<int>{}, [&](const time_axis::fixed_dt&, const vector<int>& bcids, const vector<double>&) { filtered_cids = bcids; });
+    FAST_CHECK_EQ(filtered_cids, vector<int>{1});
+    CHECK_THROWS_AS(ms.run_cells_streamed(ip, ta, env, 10, cids, [](const time_axis::fixed_dt&, const vector<int>&, const vector<double>&) {}), runtime_error);
+}
+TEST_CASE("test_selective_response_collection") {
+    typedef region_model<pt_gs_k::cell_complete_response_t, a_region_environment> model_t;
+    calendar utc;
+    const size_t n = 24;
+    time_axis::fixed_dt ta(utc.time(2016, 1, 1), deltahours(1), n);
+    geo_point gp(500, 500, 100);
+    a_region_environment env;
+    env.temperature->push_back(TemperatureSource(gp, apoint_ts(ta, -1.0, ts_point_fx::POINT_AVERAGE_VALUE)));
+    env.precipitation->push_back(PrecipitationSource(gp, apoint_ts(ta, 1.0, ts_point_fx::POINT_AVERAGE_VALUE)));
+    env.radiation->push_back(RadiationSource(gp, apoint_ts(ta, 100.0, ts_point_fx::POINT_AVERAGE_VALUE)));
+    env.rel_hum->push_back(RelHumSource(gp, apoint_ts(ta, 0.8, ts_point_fx::POINT_AVERAGE_VALUE)));
+    env.wind_speed->push_back(WindSpeedSource(gp, apoint_ts(ta, 2.0, ts_point_fx::POINT_AVERAGE_VALUE)));
+    vector<geo_cell_data> gcd;
+    for (size_t i = 0;i < 6;++i)
+        gcd.push_back(geo_cell_data(geo_point(1000.0*i, 0.0, 100.0), 1000.0*1000.0, int(i % 3)));
+    interpolation_parameter ip;
+    ip.use_idw_for_temperature = true;
+    vector<model_t::state_t> s0(gcd.size());
+
+    model_t m(gcd, model_t::parameter_t());
+    m.river_network.add(routing::river(1, routing_info(0, 0.0)));
+    m.connect_catchment_to_river(1, 1);
+    m.set_states(s0);
+    m.run_interpolation(ip, ta, env);
+    m.run_cells();
+    basic_cell_statistics<model_t::cell_t> all(m.get_cells());
+    auto q = all.discharge(vector<int>{});
+    // without set_response_collection, the discharge consumers works as before
+    vector<pts_t> cq;
+    m.catchment_discharges(cq);
+    FAST_REQUIRE_EQ(cq.size(), 3u);
+    TS_ASSERT_DELTA(cq[0].value(3) + cq[1].value(3) + cq[2].value(3), q.value(3), 1e-9);
+    m.catchment_charges(cq);
+    FAST_CHECK_EQ(cq[1].size(), n);
+    FAST_CHECK_EQ(m.river_output_flow_m3s(1)->size(), n);
+
+    m.set_response_collection(-1, pt_gs_k::AVG_DISCHARGE);// discharge everywhere
+    m.set_response_collection(1, pt_gs_k::AVG_DISCHARGE | pt_gs_k::SNOW_SWE);// and swe for catchment 1
+    m.revert_to_initial_state();
+    m.run_cells();
+    for (const auto& c : *m.get_cells()) {
+        FAST_CHECK_EQ(c.rc.avg_discharge.size(), n);
+        FAST_CHECK_EQ(c.rc.snow_swe.size(), c.geo.catchment_id() == 1 ? n : 0u);
+        FAST_CHECK_EQ(c.rc.charge_m3s.size(), 0u);
+        FAST_CHECK_EQ(c.rc.pe_output.size(), 0u);
+    }
+    basic_cell_statistics<model_t::cell_t> sel(m.get_cells());
+    auto qs = sel.discharge(vector<int>{});
+    for (size_t i = 0;i < n;++i)
+        TS_ASSERT_DELTA(qs.value(i), q.value(i), 1e-12);
+    gamma_snow_cell_response_statistics<model_t::cell_t> gs(m.get_cells());
+    FAST_CHECK_EQ(gs.swe(vector<int>{1}).size(), n);
+    CHECK_THROWS_AS(gs.swe(vector<int>{}), runtime_error);// not collected for all cells
+    FAST_CHECK_EQ(sel.charge(vector<int>{}).size(), 0u);// not collected at all
+
+    // the discharge consumers of the model requires the discharge to be collected
+    m.catchment_discharges(cq);
+    FAST_CHECK_EQ(m.river_output_flow_m3s(1)->size(), n);
+    m.set_response_collection(-1, pt_gs_k::SNOW_SWE);
+    m.revert_to_initial_state();
+    m.run_cells();
+    CHECK_THROWS_AS(m.catchment_discharges(cq), runtime_error);
+    CHECK_THROWS_AS(m.river_output_flow_m3s(1), runtime_error);
+    CHECK_THROWS_AS(m.catchment_charges(cq), runtime_error);
+    // stacks without selective response collection refuse the call
+    typedef region_model<pt_hs_k::cell_complete_response_t, a_region_environment> hs_model_t;
+    hs_model_t mh(gcd, hs_model_t::parameter_t());
+    CHECK_THROWS_AS(mh.set_response_collection(-1, 1u), runtime_error);
+}
+TEST_CASE("test_catchment_accumulating_cells") {
+    typedef region_model<pt_gs_k::cell_complete_response_t, a_region_environment> model_t;
+    typedef region_model<pt_gs_k::cell_catchment_discharge_t, a_region_environment> acc_model_t;
+    calendar utc;
+    const size_t n = 48;
+    time_axis::fixed_dt ta(utc.time(2016, 1, 1), deltahours(1), n);
+    vector<double> p(n);
+    for (size_t i = 0;i < n;++i)
+        p[i] = i % 5 ? 0.0 : 3.0;
+    geo_point gp(500, 500, 100);
+    a_region_environment env;
+    env.temperature->push_back(TemperatureSource(gp, apoint_ts(ta, 2.0, ts_point_fx::POINT_AVERAGE_VALUE)));
+    env.precipitation->push_back(PrecipitationSource(gp, apoint_ts(ta, p, ts_point_fx::POINT_AVERAGE_VALUE)));
+    env.radiation->push_back(RadiationSource(gp, apoint_ts(ta, 100.0, ts_point_fx::POINT_AVERAGE_VALUE)));
+    env.rel_hum->push_back(RelHumSource(gp, apoint_ts(ta, 0.8, ts_point_fx::POINT_AVERAGE_VALUE)));
+    env.wind_speed->push_back(WindSpeedSource(gp, apoint_ts(ta, 2.0, ts_point_fx::POINT_AVERAGE_VALUE)));
+    vector<geo_cell_data> gcd;
+    vector<int> cids{7, 3, 7, 5, 3, 7, 5, 7, 3};
+    for (size_t i = 0;i < cids.size();++i)
+        gcd.push_back(geo_cell_data(geo_point(1000.0*i, 0.0, 100.0 + 10.0*i), 1000.0*1000.0*(1 + i % 2), cids[i]));
+    interpolation_parameter ip;
+    ip.use_idw_for_temperature = true;
+    vector<model_t::state_t> s0(gcd.size());
+    for (auto& s : s0) s.kirchner.q = 1.0;
+
+    model_t m(gcd, model_t::parameter_t());
+    m.set_states(s0);
+    m.run_interpolation(ip, ta, env);
+    m.run_cells(3);
+    vector<pts_t> q;
+    m.catchment_discharges(q);
+
+    acc_model_t am(gcd, acc_model_t::parameter_t());
+    am.set_states(s0);
+    am.run_interpolation(ip, ta, env);
+    CHECK_THROWS_AS(am.get_catchment_discharge_sum(7), runtime_error);// not yet run
+    am.run_cells(3);
+    vector<pts_t> aq;
+    am.catchment_discharges(aq);
+    FAST_REQUIRE_EQ(aq.size(), q.size());
+    for (size_t c = 0;c < q.size();++c)
+        for (size_t i = 0;i < n;++i)
+            TS_ASSERT_DELTA(aq[c].value(i), q[c].value(i), 1e-9);
+    auto q7 = am.get_catchment_discharge_sum(7);
+    FAST_CHECK_EQ(q7.size(), n);
+    TS_ASSERT_DELTA(q7.value(n - 1), q[am.cix_from_cid(7)].value(n - 1), 1e-9);
+    CHECK_THROWS_AS(am.get_catchment_discharge_sum(4), runtime_error);
+    // partial runs replace only their part of the sums
+    am.revert_to_initial_state();
+    am.run_cells(2, 0, 24);
+    am.run_cells(2, 24, 24);
+    auto q7b = am.get_catchment_discharge_sum(7);
+    for (size_t i = 0;i < n;++i)
+        TS_ASSERT_DELTA(q7b.value(i), q7.value(i), 1e-9);
+    // streamed runs use the catchment sums of each block
+    am.revert_to_initial_state();
+    vector<double> qs;
+    am.run_cells_streamed(ip, ta, env, 10, vector<int>{7, 3}, [&](const time_axis::fixed_dt& bta, const vector<int>& bcids, const vector<double>& bq) {
+        FAST_REQUIRE_EQ(bq.size(), bcids.size()*bta.size());
+        qs.insert(end(qs), begin(bq), begin(bq) + bta.size());// catchment 7
+    });
+    FAST_REQUIRE_EQ(qs.size(), n);
+    for (size_t i = 0;i < n;++i)
+        TS_ASSERT_DELTA(qs[i], q7.value(i), 1e-9);
+    // routing needs the discharge of each cell, so it is rejected
+    am.river_network.add(routing::river(1, routing_info(0, 0.0)));
+    am.connect_catchment_to_river(7, 1);
+    CHECK_THROWS_AS(am.run_cells(), runtime_error);
+    CHECK_THROWS_AS(am.river_output_flow_m3s(1), runtime_error);
+}
 }
@@ -439,6 +439,256 @@ TEST_CASE("test_simple") {
 	}
 
 }
+TEST_CASE("optimizer_calculation_filter") {
+    using namespace shyft::core::model_calibration;
+    using cell_t = pt_gs_k::cell_discharge_response_t;
+    using region_model_t = region_model<cell_t>;
+    using parameter_t = cell_t::parameter_t;
+    calendar utc;
+    ta::fixed_dt time_axis(utc.time(2016, 1, 1), deltahours(1), 24*5);
+    // four catchments, 0..3, catchment 2 routes into river 1, and river 1 into river 2, catchment 3 routes into river 2
+    vector<geo_cell_data> gcd;
+    for (int cid = 0;cid < 4;++cid)
+        gcd.emplace_back(geo_point(1000.0*cid, 1000.0, 100.0), 1000.0*1000.0, cid);
+    parameter_t gp;
+    region_model_t rm(gcd, gp);
+    rm.river_network.add(routing::river(2, routing_info(0, 0.0))).add(routing::river(1, routing_info(2, 0.0)));
+    rm.connect_catchment_to_river(2, 1);
+    rm.connect_catchment_to_river(3, 2);
+    rm.initialize_cell_environment(time_axis);
+    for (auto&c : *rm.get_cells()) {
+        c.env_ts.temperature.fill(2.0);
+        c.env_ts.precipitation.fill(1.0);
+        c.env_ts.radiation.fill(100.0);
+        c.env_ts.wind_speed.fill(2.0);
+        c.env_ts.rel_hum.fill(0.7);
+        c.state.kirchner.q = 1.0;
+    }
+    rm.set_catchment_calculation_filter(vector<int>{0});// the user current filter, should survive calibration
+    rm.run_cells();
+    rm.set_catchment_calculation_filter(vector<int>{});
+    rm.run_cells();
+    vector<pts_t> obs;
+    rm.catchment_discharges(obs);
+    vector<target_specification<pts_t>> targets;
+    targets.emplace_back(obs[rm.cix_from_cid(1)], vector<int>{1}, 1.0);
+    targets.emplace_back(*rm.river_output_flow_m3s(2), 2, 1.0);
+    rm.set_catchment_calculation_filter(vector<int>{0});
+    model_calibration::optimizer<region_model_t, parameter_t, pts_t> rm_opt(rm);
+    parameter_t lwr = gp, upr = gp;
+    lwr.kirchner.c1 = -3.0;upr.kirchner.c1 = -2.0;
+    rm_opt.set_target_specification(targets, lwr, upr);
+    vector<int> cids, rids;
+    rm_opt.target_calculation_filter(cids, rids);
+    FAST_CHECK_EQ(cids, vector<int>{1});
+    FAST_CHECK_EQ(rids, vector<int>{2});
+    rm_opt.prepare_optimize();// installs the minimal filter, river 2 pulls in catchment 2 through river 1 upstream
+    FAST_CHECK_EQ(rm.get_catchment_calculation_filter(), (vector<int>{1, 2, 3}));
+    FAST_CHECK_UNARY_FALSE(rm.is_calculated(0));
+    rm.set_catchment_calculation_filter(vector<int>{0});
+    auto p_opt = rm_opt.optimize(gp, 20, 0.1, 1e-3);
+    FAST_CHECK_EQ(rm.get_catchment_calculation_filter(), vector<int>{0});// restored after optimize
+    FAST_CHECK_GT(rm_opt.trace_size(), 0);
+    rm.set_catchment_calculation_filter(vector<int>{});
+    p_opt = rm_opt.optimize_sceua(gp, 20, 0.1, 1e-3);
+    FAST_CHECK_EQ(rm.get_catchment_calculation_filter().size(), 0u);// no filter before, none after
+}
+
+TEST_CASE("optimizer_parallel_evaluation") {
+    using namespace shyft::core::model_calibration;
+    using cell_t = pt_gs_k::cell_discharge_response_t;
+    using region_model_t = region_model<cell_t>;
+    using parameter_t = cell_t::parameter_t;
+    calendar utc;
+    ta::fixed_dt time_axis(utc.time(2016, 1, 1), deltahours(1), 24*5);
+    vector<geo_cell_data> gcd;
+    for (int cid = 0;cid < 2;++cid)
+        gcd.emplace_back(geo_point(1000.0*cid, 1000.0, 100.0), 1000.0*1000.0, cid);
+    parameter_t gp;
+    region_model_t rm(gcd, gp);
+    rm.initialize_cell_environment(time_axis);
+    for (auto&c : *rm.get_cells()) {
+        c.env_ts.temperature.fill(2.0);
+        c.env_ts.precipitation.fill(1.0);
+        c.env_ts.radiation.fill(100.0);
+        c.env_ts.wind_speed.fill(2.0);
+        c.env_ts.rel_hum.fill(0.7);
+        c.state.kirchner.q = 1.0;
+    }
+    rm.get_states(rm.initial_state);
+    rm.run_cells();
+    vector<pts_t> obs;
+    rm.catchment_discharges(obs);
+    vector<target_specification<pts_t>> targets;
+    targets.emplace_back(obs[rm.cix_from_cid(1)], vector<int>{1}, 1.0);
+    parameter_t lwr = gp, upr = gp;
+    lwr.kirchner.c1 = -3.0;upr.kirchner.c1 = -2.0;
+    lwr.kirchner.c2 = 0.5;upr.kirchner.c2 = 1.2;
+    parameter_t p0 = gp;p0.kirchner.c1 = -2.9;p0.kirchner.c2 = 0.6;
+
+    model_calibration::optimizer<region_model_t, parameter_t, pts_t> rm_opt(rm);
+    rm_opt.set_target_specification(targets, lwr, upr);
+    FAST_CHECK_EQ(rm_opt.get_parallel_evaluation(), 1u);
+    CHECK_THROWS_AS(rm_opt.set_parallel_evaluation(0), runtime_error);
+    auto p_seq = rm_opt.optimize_sceua(p0, 150, 0.001, 1e-4);
+    vector<double> seq_trace;
+    for (int i = 0;i < rm_opt.trace_size();++i) seq_trace.push_back(rm_opt.trace_goal_fn(i));
+
+    auto ncore = rm.ncore;
+    rm_opt.set_parallel_evaluation(3);
+    rm_opt.set_early_abort(true, 0.0, 4);// not applied with parallel evaluation
+    vector<double> cb_trace;
+    rm_opt.set_trace_callback([&cb_trace](double v, const parameter_t&) { cb_trace.push_back(v); });
+    auto p_par = rm_opt.optimize_sceua(p0, 150, 0.001, 1e-4);
+    FAST_CHECK_EQ(rm.ncore, ncore);// restored after optimize
+    FAST_CHECK_EQ(rm_opt.get_early_abort(), true);
+    FAST_REQUIRE_EQ(int(cb_trace.size()), rm_opt.trace_size());
+    for (int i = 0;i < rm_opt.trace_size();++i)
+        FAST_CHECK_EQ(cb_trace[i], rm_opt.trace_goal_fn(i));
+    vector<double> par_trace;
+    for (int i = 0;i < rm_opt.trace_size();++i) par_trace.push_back(rm_opt.trace_goal_fn(i));
+    // same result, and same evaluations, but the trace is in the order the models completed them
+    FAST_CHECK_EQ(p_par.kirchner.c1, p_seq.kirchner.c1);
+    FAST_CHECK_EQ(p_par.kirchner.c2, p_seq.kirchner.c2);
+    FAST_CHECK_EQ(par_trace.size(), seq_trace.size());
+    sort(begin(seq_trace), end(seq_trace));
+    sort(begin(par_trace), end(par_trace));
+    FAST_CHECK_EQ(par_trace, seq_trace);
+}
+
+TEST_CASE("optimizer_early_abort") {
+    using namespace shyft::core::model_calibration;
+    using cell_t = pt_gs_k::cell_discharge_response_t;
+    using region_model_t = region_model<cell_t>;
+    using parameter_t = cell_t::parameter_t;
+    calendar utc;
+    ta::fixed_dt time_axis(utc.time(2016, 1, 1), deltahours(1), 24*10);
+    vector<geo_cell_data> gcd;
+    for (int cid = 0;cid < 2;++cid)
+        gcd.emplace_back(geo_point(1000.0*cid, 1000.0, 100.0), 1000.0*1000.0, cid);
+    parameter_t gp;
+    region_model_t rm(gcd, gp);
+    rm.initialize_cell_environment(time_axis);
+    for (auto&c : *rm.get_cells()) {
+        for (size_t i = 0;i < time_axis.size();++i)
+            c.env_ts.precipitation.set(i, i % 24 < 6 ? 3.0 : 0.0);
+        c.env_ts.temperature.fill(2.0);
+        c.env_ts.radiation.fill(100.0);
+        c.env_ts.wind_speed.fill(2.0);
+        c.env_ts.rel_hum.fill(0.7);
+        c.state.kirchner.q = 1.0;
+    }
+    rm.get_states(rm.initial_state);
+    rm.run_cells();
+    vector<pts_t> obs;
+    rm.catchment_discharges(obs);
+    vector<target_specification<pts_t>> targets;
+    targets.emplace_back(obs[rm.cix_from_cid(1)], vector<int>{1}, 1.0);
+    parameter_t lwr = gp, upr = gp;
+    lwr.kirchner.c1 = -8.0;upr.kirchner.c1 = 0.0;
+    parameter_t p_bad = gp;p_bad.kirchner.c1 = -7.5;
+
+    model_calibration::optimizer<region_model_t, parameter_t, pts_t> rm_opt(rm);
+    rm_opt.set_target_specification(targets, lwr, upr);
+    CHECK_THROWS_AS(rm_opt.set_early_abort(true, 0.0, 0), runtime_error);
+    CHECK_THROWS_AS(rm_opt.set_early_abort(true, -0.1, 4), runtime_error);
+    rm_opt.prepare_optimize();
+    double g_bad = rm_opt.calculate_goal_function(p_bad);// full evaluation, no early abort
+    FAST_CHECK_GT(g_bad, 0.1);
+    rm_opt.set_early_abort(true, 0.0, 4);
+    rm_opt.prepare_optimize();// resets best known value
+    TS_ASSERT_DELTA(rm_opt.calculate_goal_function(p_bad), g_bad, 1e-12);// nothing to beat, run in one block
+    rm_opt.prepare_optimize();
+    double g_best = rm_opt.calculate_goal_function(gp);
+    FAST_CHECK_LT(g_best, 1e-10);// perfect fit, now the best known value
+    double g_lb = rm_opt.calculate_goal_function(p_bad);// aborted, returns a lower bound
+    FAST_CHECK_LT(g_lb, g_bad);
+    FAST_CHECK_GT(g_lb, g_best);
+    FAST_CHECK_EQ(rm_opt.trace_size(), 2);
+    FAST_CHECK_EQ(rm_opt.trace_goal_fn(1), g_lb);
+    FAST_CHECK_EQ(rm_opt.trace_aborted(0), false);
+    FAST_CHECK_EQ(rm_opt.trace_aborted(1), true);
+    rm_opt.set_early_abort(true, 1e10, 4);// no abort, but run in blocks
+    TS_ASSERT_DELTA(rm_opt.calculate_goal_function(p_bad), g_bad, 1e-12);
+    TS_ASSERT_DELTA(rm_opt.calculate_goal_function(gp), g_best, 1e-12);
+    FAST_CHECK_EQ(rm_opt.trace_aborted(2), false);
+
+    // a target without observations is skipped by the lower bound
+    targets.emplace_back(pts_t(obs[0].ta, shyft::nan, shyft::time_series::POINT_AVERAGE_VALUE), vector<int>{0}, 1.0);
+    rm_opt.set_target_specification(targets, lwr, upr);
+    rm_opt.set_early_abort(true, 0.0, 4);
+    rm_opt.prepare_optimize();
+    FAST_CHECK_LT(rm_opt.calculate_goal_function(gp), 1e-10);
+    g_lb = rm_opt.calculate_goal_function(p_bad);
+    FAST_CHECK_EQ(rm_opt.trace_aborted(1), true);
+    FAST_CHECK_GT(g_lb, 0.0);
+    FAST_CHECK_LT(g_lb, g_bad);
+}
+
+TEST_CASE("optimizer_warm_up") {
+    using namespace shyft::core::model_calibration;
+    using cell_t = pt_gs_k::cell_discharge_response_t;
+    using region_model_t = region_model<cell_t>;
+    using parameter_t = cell_t::parameter_t;
+    calendar utc;
+    ta::fixed_dt time_axis(utc.time(2016, 1, 1), deltahours(1), 24*10);
+    const size_t n_warm_up = 48;
+    vector<geo_cell_data> gcd;
+    for (int cid = 0;cid < 2;++cid)
+        gcd.emplace_back(geo_point(1000.0*cid, 1000.0, 100.0), 1000.0*1000.0, cid);
+    parameter_t gp;
+    region_model_t rm(gcd, gp);
+    rm.initialize_cell_environment(time_axis);
+    for (auto&c : *rm.get_cells()) {
+        for (size_t i = 0;i < time_axis.size();++i)
+            c.env_ts.precipitation.set(i, i % 24 < 6 ? 3.0 : 0.0);
+        c.env_ts.temperature.fill(2.0);
+        c.env_ts.radiation.fill(100.0);
+        c.env_ts.wind_speed.fill(2.0);
+        c.env_ts.rel_hum.fill(0.7);
+        c.state.kirchner.q = 1.0;
+    }
+    rm.get_states(rm.initial_state);
+    rm.run_cells();
+    vector<pts_t> obs;
+    rm.catchment_discharges(obs);
+    // targets that only covers the period after warm-up, as reference for the full run
+    ta::fixed_dt w_axis(time_axis.time(n_warm_up), time_axis.dt, time_axis.size() - n_warm_up);
+    pts_t obs_w(w_axis, 0.0, shyft::time_series::POINT_AVERAGE_VALUE);
+    for (size_t i = 0;i < w_axis.size();++i)
+        obs_w.set(i, obs[rm.cix_from_cid(1)].value(i + n_warm_up));
+    vector<target_specification<pts_t>> targets, w_targets;
+    targets.emplace_back(obs[rm.cix_from_cid(1)], vector<int>{1}, 1.0);
+    w_targets.emplace_back(obs_w, vector<int>{1}, 1.0);
+    parameter_t lwr = gp, upr = gp;
+    lwr.kirchner.c1 = -8.0;upr.kirchner.c1 = 0.0;
+    parameter_t p_bad = gp;p_bad.kirchner.c1 = -7.5;
+
+    model_calibration::optimizer<region_model_t, parameter_t, pts_t> ref_opt(rm);
+    ref_opt.set_target_specification(w_targets, lwr, upr);
+    ref_opt.prepare_optimize();
+    double g_ref_bad = ref_opt.calculate_goal_function(p_bad);
+    double g_ref = ref_opt.calculate_goal_function(gp);
+    FAST_CHECK_GT(g_ref_bad, 0.1);
+
+    model_calibration::optimizer<region_model_t, parameter_t, pts_t> rm_opt(rm);
+    rm_opt.set_target_specification(targets, lwr, upr);
+    CHECK_THROWS_AS(rm_opt.set_warm_up(n_warm_up, vector<string>{"kirchner.c1", "no.such.parameter"}), runtime_error);
+    FAST_CHECK_EQ(rm_opt.get_warm_up_steps(), 0);
+    rm_opt.set_warm_up(n_warm_up, vector<string>{"kirchner.c1"});
+    FAST_CHECK_EQ(rm_opt.get_warm_up_steps(), n_warm_up);
+    rm_opt.prepare_optimize();
+    TS_ASSERT_DELTA(rm_opt.calculate_goal_function(p_bad), g_ref_bad, 1e-12);
+    TS_ASSERT_DELTA(rm_opt.calculate_goal_function(gp), g_ref, 1e-12);
+    // with same parameters, the checkpoint is reused, so a changed initial state has no effect until next prepare_optimize
+    for (auto& s : rm.initial_state) s.kirchner.q = 5.0;
+    TS_ASSERT_DELTA(rm_opt.calculate_goal_function(gp), g_ref, 1e-12);
+    rm_opt.prepare_optimize();
+    FAST_CHECK_GT(rm_opt.calculate_goal_function(gp), g_ref + 1e-6);
+    rm_opt.set_warm_up(time_axis.size(), vector<string>{});
+    CHECK_THROWS_AS(rm_opt.prepare_optimize(), runtime_error);
+}
+
 TEST_CASE("test_nash_sutcliffe_goal_function") {
 	calendar utc;
 	utctime start = utc.time(YMDhms(2000, 1, 1, 0, 0, 0));
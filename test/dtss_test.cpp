@@ -626,6 +626,76 @@ TEST_CASE("dtss_store_basics") {
             db.remove(fn);
         }
 
+        TEST_SECTION("store_point_dt_with_gaps") {
+            // regular hourly observations with some gaps, stored as compact 'TS2' segments
+            vector<utctime> gp;
+            for (std::size_t i = 0; i < n; ++i)
+                if (i % 1000 < 997) gp.push_back(t + i*dt);
+            time_axis::point_dt gta(gp, t + n*dt);
+            gts_t o(gta_t(gta), 10.0, time_series::ts_point_fx::POINT_AVERAGE_VALUE);
+            for (std::size_t i = 0; i < o.size(); ++i) o.set(i, double(i));
+            string fn("tssf4.db");
+            db.save(fn, o);
+            auto sz = fs::file_size(tmpdir / fn);
+            FAST_CHECK_LT(sz, sizeof(ts_db_header) + (o.size() + 1) * sizeof(int64_t) + o.size() * sizeof(double));
+
+            // read all
+            auto r = db.read(fn, utcperiod{});
+            FAST_CHECK_EQ(o.time_axis(), r.time_axis());
+            FAST_CHECK_EQ(o.v, r.v);
+
+            // read slice
+            core::utctime tb = gta.time(996) + dt_half;
+            core::utctime te = gta.time(2000) + dt_half;
+            auto r2 = db.read(fn, utcperiod{ tb, te });
+            FAST_CHECK_EQ(r2.time_axis(), gta_t(time_axis::point_dt(std::vector<core::utctime>(&gp[996], &gp[2001]), gp[2001])));
+            FAST_CHECK_EQ(r2.value(0), o.value(996));
+            FAST_CHECK_EQ(r2.value(r2.size() - 1), o.value(2000));
+
+            // merge new values into the middle, keeps the compact format
+            time_axis::point_dt mta(std::vector<core::utctime>(&gp[10], &gp[20]), gp[20]);
+            gts_t m(gta_t(mta), -1.0, time_series::ts_point_fx::POINT_AVERAGE_VALUE);
+            db.save(fn, m, false);
+            auto r3 = db.read(fn, utcperiod{});
+            FAST_CHECK_EQ(o.time_axis(), r3.time_axis());
+            for (std::size_t i = 0; i < o.size(); ++i)
+                FAST_CHECK_EQ(r3.value(i), i >= 10 && i < 20 ? -1.0 : o.value(i));
+            string fn_r3("tssf5.db");
+            db.save(fn_r3, r3);
+            FAST_CHECK_EQ(fs::file_size(tmpdir / fn), fs::file_size(tmpdir / fn_r3));// no stale bytes after the merged ts
+            db.remove(fn_r3);
+            db.remove(fn);
+        }
+
+        TEST_SECTION("merge_point_dt_into_compact_shrinks_file") {
+            // irregular time-points in the middle are stored as a plain 'TS1' time-axis
+            vector<utctime> ip;
+            for (std::size_t i = 0; i < n; ++i)
+                ip.push_back(t + i*dt + (i >= 10 && i < n - 10 && i % 2 ? dt_half : 0));
+            gts_t o(gta_t(time_axis::point_dt(ip, t + n*dt)), 1.0, time_series::ts_point_fx::POINT_AVERAGE_VALUE);
+            string fn("tssf6.db");
+            db.save(fn, o);
+            auto sz = fs::file_size(tmpdir / fn);
+            // replacing them with regular hourly points makes the merged ts fit the smaller 'TS2' format
+            vector<utctime> mp;
+            for (std::size_t i = 10; i < n - 10; ++i)
+                mp.push_back(t + i*dt);
+            gts_t m(gta_t(time_axis::point_dt(mp, t + (n - 10)*dt)), 2.0, time_series::ts_point_fx::POINT_AVERAGE_VALUE);
+            db.save(fn, m, false);
+            auto r = db.read(fn, utcperiod{});
+            FAST_REQUIRE_EQ(r.size(), n);
+            for (std::size_t i = 0; i < n; ++i) {
+                FAST_CHECK_EQ(r.time(i), t + i*dt);
+                FAST_CHECK_EQ(r.value(i), i >= 10 && i < n - 10 ? 2.0 : 1.0);
+            }
+            FAST_CHECK_LT(fs::file_size(tmpdir / fn), sz);// truncated after the merge
+            string fn_r("tssf7.db");
+            db.save(fn_r, r);
+            FAST_CHECK_EQ(fs::file_size(tmpdir / fn), fs::file_size(tmpdir / fn_r));
+            db.remove(fn_r);
+            db.remove(fn);
+        }
+
         TEST_SECTION("dtss_db_speed") {
 			int n_ts = 120;
 			vector<gts_t> tsv; tsv.reserve(n_ts);
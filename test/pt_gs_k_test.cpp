@@ -270,4 +270,76 @@ TEST_CASE("test_mass_balance") {
     }
 }
 
+TEST_CASE("float32_storage_cell") {
+    // benchmark the float32 storage cell against the double cell:
+    // same forcing, same parameters, verify memory is halved, and the accuracy delta small
+    calendar cal;
+    utctime t0 = cal.time(2014, 8, 1, 0, 0, 0);
+    const size_t n = 24*365;
+    ta::fixed_dt tax(t0, deltahours(1), n);
+    vector<double> temp(n), prec(n), rad(n), rhum(n), wind(n);
+    for (size_t i = 0; i < n; ++i) {
+        double d = 2*3.14159265*double(i)/24.0;
+        double y = 2*3.14159265*double(i)/double(n);
+        temp[i] = 5.0 - 10.0*cos(y) + 3.0*sin(d);
+        prec[i] = (i/17) % 5 == 0 ? 1.1 + 0.3*sin(d) : 0.0;
+        rad[i] = std::max(0.0, 300.0*sin(d));
+        rhum[i] = 0.7 + 0.2*cos(d);
+        wind[i] = 2.0 + sin(y);
+    }
+    auto p = make_shared<parameter>();
+    state s0;
+    s0.kirchner.q = 1.0;
+    s0.gs.lwc = 0.0;
+    s0.gs.acc_melt = -1;
+    geo_cell_data gcd(geo_point(1000, 1000, 100), 1000*1000, 0);
+
+    cell_complete_response_t c64;
+    c64.geo = gcd; c64.parameter = p; c64.state = s0;
+    c64.env_ts.temperature = pts_t(tax, temp, POINT_AVERAGE_VALUE);
+    c64.env_ts.precipitation = pts_t(tax, prec, POINT_AVERAGE_VALUE);
+    c64.env_ts.radiation = pts_t(tax, rad, POINT_AVERAGE_VALUE);
+    c64.env_ts.rel_hum = pts_t(tax, rhum, POINT_AVERAGE_VALUE);
+    c64.env_ts.wind_speed = pts_t(tax, wind, POINT_AVERAGE_VALUE);
+
+    cell_complete_response32_t c32;
+    c32.geo = gcd; c32.parameter = p; c32.state = s0;
+    c32.env_ts.temperature = pts32_t(tax, temp, POINT_AVERAGE_VALUE);
+    c32.env_ts.precipitation = pts32_t(tax, prec, POINT_AVERAGE_VALUE);
+    c32.env_ts.radiation = pts32_t(tax, rad, POINT_AVERAGE_VALUE);
+    c32.env_ts.rel_hum = pts32_t(tax, rhum, POINT_AVERAGE_VALUE);
+    c32.env_ts.wind_speed = pts32_t(tax, wind, POINT_AVERAGE_VALUE);
+
+    auto t_64 = timing::now();
+    c64.run(tax, 0, 0);
+    auto us_64 = elapsed_us(t_64, timing::now());
+    auto t_32 = timing::now();
+    c32.run(tax, 0, 0);
+    auto us_32 = elapsed_us(t_32, timing::now());
+
+    auto bytes = [](const auto& c) {
+        auto b = [](const auto& ts) { return ts.v.size()*sizeof(ts.v[0]); };
+        return b(c.env_ts.temperature) + b(c.env_ts.precipitation) + b(c.env_ts.radiation) + b(c.env_ts.rel_hum) + b(c.env_ts.wind_speed)
+            + b(c.rc.avg_discharge) + b(c.rc.charge_m3s) + b(c.rc.snow_sca) + b(c.rc.snow_swe)
+            + b(c.rc.snow_outflow) + b(c.rc.glacier_melt) + b(c.rc.ae_output) + b(c.rc.pe_output);
+    };
+    FAST_CHECK_EQ(2*bytes(c32), bytes(c64));
+
+    double max_rel = 0.0, sum_64 = 0.0, sum_32 = 0.0;
+    for (size_t i = 0; i < n; ++i) {
+        double q64 = c64.rc.avg_discharge.value(i), q32 = c32.rc.avg_discharge.value(i);
+        TS_ASSERT(std::isfinite(q32));
+        max_rel = std::max(max_rel, fabs(q32 - q64)/std::max(fabs(q64), 1e-3));
+        sum_64 += q64; sum_32 += q32;
+    }
+    FAST_CHECK_LT(max_rel, 1e-5);
+    FAST_CHECK_LT(fabs(sum_32 - sum_64)/sum_64, 1e-6);
+    TS_ASSERT_DELTA(c32.state.kirchner.q, c64.state.kirchner.q, 1e-5*c64.state.kirchner.q);
+    if (getenv("SHYFT_VERBOSE")) {
+        std::cout << "float32 storage cell, " << n << " steps:\n"
+            << " bytes double " << bytes(c64) << ", float32 " << bytes(c32) << "\n"
+            << " max rel. discharge delta " << max_rel << ", rel. volume delta " << fabs(sum_32 - sum_64)/sum_64 << "\n"
+            << " run time double " << us_64 << " us, float32 " << us_32 << " us\n";
+    }
+}
 }
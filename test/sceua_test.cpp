@@ -26,6 +26,14 @@ struct fx_complex:public ifx {
         return y;
     }
 };
+/** fx_complex, with a set of independent workers for concurrent evaluation */
+struct fx_complex_parallel:public fx_complex {
+    vector<fx_complex> workers;
+    explicit fx_complex_parallel(size_t n):workers(n) {}
+    size_t concurrency() const { return workers.size(); }
+    ifx& worker(size_t i) { return workers[i]; }
+    size_t n_evaluations() const { size_t r=n_eval; for(const auto&w:workers) r+=w.n_eval; return r; }
+};
 TEST_SUITE("sceua") {
 TEST_CASE("test_basic") {
     sceua opt;
@@ -79,4 +87,35 @@ TEST_CASE("test_complex") {
         cout<<endl<<"2. approximate Found solution x{"<<x[0]<<","<<x[1]<<"}(r="<<rr <<") -> "<<y<<endl<<"\t n_iterations:"<<f_complex.n_eval<<endl;
     }
 }
+
+TEST_CASE("test_parallel_evaluation") {
+    const size_t n=2;
+    double x_min[2]= {-10,-10};
+    double x_max[2]= { 10, 10.0};
+    const double eps=1e-5;
+    double x_eps[2]= {eps,eps};
+    double y_eps=1e-3;
+    const size_t max_iterations=150000;
+    // sequential evaluation
+    sceua opt_s(42);
+    double xs[2]={-4.01, -7.5};
+    double ys=-1;
+    fx_complex f_s;
+    auto rs=opt_s.find_min(n,x_min,x_max,xs,ys,f_s,y_eps, -1,-2,x_eps,max_iterations);
+    // concurrent evaluation, using 3 workers, should give exactly the same result
+    sceua opt_p(42);
+    double xp[2]={-4.01, -7.5};
+    double yp=-1;
+    fx_complex_parallel f_p(3);
+    auto rp=opt_p.find_min(n,x_min,x_max,xp,yp,f_p,y_eps, -1,-2,x_eps,max_iterations);
+    TS_ASSERT_EQUALS(rs,rp);
+    TS_ASSERT_EQUALS(ys,yp);
+    TS_ASSERT_EQUALS(xs[0],xp[0]);
+    TS_ASSERT_EQUALS(xs[1],xp[1]);
+    TS_ASSERT_EQUALS(f_s.n_eval,f_p.n_evaluations());
+    TS_ASSERT_EQUALS(f_p.n_eval,0u);// all work done by the workers
+    for(const auto&w:f_p.workers)
+        TS_ASSERT(w.n_eval>0u);
+    TS_ASSERT_DELTA(yp,0.7028,1e-3);
+}
 }
@@ -111,6 +111,12 @@ TEST_CASE("test_serialization") {
     TS_ASSERT_EQUALS(tac.size(),tac2.size());
     TS_ASSERT_EQUALS(tac.total_period(),tac2.total_period());
 
+    time_axis::piecewise_dt tapw(vector<time_axis::fixed_dt>{ta,time_axis::fixed_dt(ta.total_period().end,deltahours(3),1),time_axis::fixed_dt(ta.total_period().end+deltahours(3),ta.dt,ta.n)});
+    auto tapw2 = serialize_loop(tapw);
+    TS_ASSERT_EQUALS(tapw,tapw2);
+    TS_ASSERT_EQUALS(tapw.size(),tapw2.size());
+    TS_ASSERT_EQUALS(tapw.index_of(tapw.total_period().end-1),tapw2.index_of(tapw.total_period().end-1));
+
     time_axis::generic_dt tag(ta);
     auto tag2 = serialize_loop(tag);
     TS_ASSERT_EQUALS(tag.gt,tag2.gt);
@@ -742,6 +742,39 @@ TEST_CASE("time_axis_extend") {
         }
     }
 }
+TEST_CASE("time_axis_piecewise_dt") {
+    calendar utc;
+    utctime t0 = utc.time(2016, 1, 1);
+    auto dt = deltahours(1);
+    vector<utctime> tp;
+    for (size_t i = 0; i < 1000; ++i) {
+        if (i == 100 || i == 101 || i == 102 || i == 500) continue; // gaps, 3 hours and 1 hour
+        tp.push_back(t0 + i*dt);
+    }
+    time_axis::point_dt p(tp, t0 + 1000 * dt);
+    time_axis::piecewise_dt pw(p);
+    FAST_CHECK_EQ(pw.seg.size(), 5u); // hourly, gap, hourly, gap, hourly
+    FAST_CHECK_EQ(pw.size(), p.size());
+    TS_ASSERT(test_if_equal(p, pw));
+    FAST_CHECK_EQ(pw.point_time_axis(), p);
+    for (size_t i = 0; i < p.size(); ++i) {
+        FAST_CHECK_EQ(pw.index_of(p.time(i) + deltaminutes(30), i), i);
+        FAST_CHECK_EQ(pw.index_of(p.time(i), i + 3), i);
+    }
+    FAST_CHECK_EQ(pw.index_of(t0 - 1), string::npos);
+    FAST_CHECK_EQ(pw.index_of(t0 + 1000 * dt), string::npos);
+    FAST_CHECK_EQ(pw.open_range_index_of(t0 + 2000 * dt), p.size() - 1);
+
+    time_axis::piecewise_dt pws(pw.seg);
+    FAST_CHECK_EQ(pws, pw);
+    auto bad = pw.seg; bad[1].t += 1;
+    CHECK_THROWS_AS(time_axis::piecewise_dt{bad}, std::runtime_error);
+    TS_ASSERT(test_if_equal(time_shift(p, deltahours(2)), time_shift(pw, deltahours(2))));
+
+    time_axis::piecewise_dt empty;
+    FAST_CHECK_EQ(empty.size(), 0u);
+    FAST_CHECK_EQ(empty.index_of(t0), string::npos);
+}
 TEST_CASE("test_time_shift") {
     calendar utc;
     utctime t0=utc.time(2015,1,1);
@@ -6,6 +6,8 @@
 #include "api/api.h"
 #include "api/time_series.h"
 #include "core/time_series_statistics.h"
+#include <random>
+#include <future>
 
 namespace shyfttest {
 const double EPS = 1.0e-8;
@@ -1188,6 +1190,257 @@ TEST_SUITE("time_series") {
         //cout<<"Done statistics speed tests,2 threads "<<msec2<<" ms"<<endl;
     }
 
+    TEST_CASE("test_percentiles_select_equals_full_sort") {
+        using namespace shyft::time_series;
+        vector<int> pct{0,1,10,25,50,statistics_property::AVERAGE,70,99,100};
+        std::mt19937 gen(42);
+        std::uniform_real_distribution<double> u(-10.0, 10.0);
+        const double nan = shyft::nan;
+        for (size_t n : {0, 1, 2, 3, 7, 10, 101, 1000}) {
+            vector<double> s; s.reserve(n);
+            for (size_t i = 0; i < n; ++i) s.push_back(i % 5 == 2 ? std::round(u(gen)) : u(gen));// some duplicates
+            vector<double> a(s), b(s);
+            auto r_sort = calculate_percentiles_excel_method_full_sort(a, pct);
+            auto r_sel = calculate_percentiles_excel_method_select(b, pct);
+            FAST_REQUIRE_EQ(r_sort.size(), r_sel.size());
+            for (size_t i = 0; i < r_sort.size(); ++i) {
+                if (n == 0) {
+                    TS_ASSERT(!std::isfinite(r_sel[i]));
+                } else {
+                    TS_ASSERT_DELTA(r_sort[i], r_sel[i], 1e-12);
+                }
+            }
+            // add nans, they should be filtered out, giving same result as without
+            vector<double> c(s);
+            for (size_t i = 0; i < n; i += 3) c.insert(begin(c) + i, nan);
+            c.push_back(nan);
+            auto r_nan = calculate_percentiles_excel_method_select(c, pct);
+            FAST_CHECK_EQ(c.size(), n);
+            for (size_t i = 0; i < r_sel.size(); ++i) {
+                if (n == 0) {
+                    TS_ASSERT(!std::isfinite(r_nan[i]));
+                } else {
+                    TS_ASSERT_DELTA(r_sel[i], r_nan[i], 1e-12);
+                }
+            }
+        }
+        // finally, a speed comparison for a typical ensemble size
+        bool verbose = getenv("SHYFT_VERBOSE") != nullptr;
+        if (verbose) {
+            const size_t n_samples = 51, n_steps = 100000;
+            vector<double> s(n_samples);
+            for (auto& x : s) x = u(gen);
+            for (const auto& p : vector<vector<int>>{pct, {50}, {10,50,90}}) {
+                double sum_a = 0.0, sum_b = 0.0;
+                auto t0 = timing::now();
+                for (size_t t = 0; t < n_steps; ++t) { vector<double> a(s); sum_a += calculate_percentiles_excel_method_full_sort(a, p).back(); }
+                auto us_sort = elapsed_us(t0, timing::now());
+                t0 = timing::now();
+                for (size_t t = 0; t < n_steps; ++t) { vector<double> b(s); sum_b += calculate_percentiles_excel_method_select(b, p).back(); }
+                auto us_sel = elapsed_us(t0, timing::now());
+                cout << "percentiles(" << p.size() << ") " << n_steps << " x " << n_samples << " samples, full sort: " << us_sort / 1000 << " ms, select: " << us_sel / 1000 << " ms\n";
+                TS_ASSERT_DELTA(sum_a, sum_b, 1e-6);
+            }
+        }
+    }
+
+    TEST_CASE("test_ats_vector_average_values") {
+        using namespace shyft::api;
+        calendar utc;
+        utctime t0 = utc.time(2016, 1, 1);
+        gta_t ta_h(t0, deltahours(1), 48);
+        gta_t ta_d(t0, deltahours(24), 2);
+        ats_vector tsv;
+        vector<double> v; for (size_t i = 0; i < ta_h.size(); ++i) v.push_back(double(i));
+        tsv.emplace_back(ta_h, v, POINT_AVERAGE_VALUE);
+        tsv.emplace_back(ta_d, 3.0, POINT_AVERAGE_VALUE);
+        tsv.push_back(tsv[0]*2.0);
+        tsv.push_back(apoint_ts());// empty ts gives nan
+        auto r = tsv.average_values(ta_d);
+        FAST_REQUIRE_EQ(r.size(), tsv.size());
+        for (const auto& x : r) FAST_REQUIRE_EQ(x.size(), ta_d.size());
+        TS_ASSERT_DELTA(r[0][0], 11.5, 1e-9);
+        TS_ASSERT_DELTA(r[0][1], 35.5, 1e-9);
+        TS_ASSERT_DELTA(r[1][0], 3.0, 1e-9);
+        TS_ASSERT_DELTA(r[2][1], 71.0, 1e-9);
+        TS_ASSERT(!std::isfinite(r[3][0]));
+        auto rh = tsv.average_values(ta_h);// same time-axis, values as is
+        TS_ASSERT_DELTA(rh[0][47], 47.0, 1e-9);
+        TS_ASSERT_DELTA(rh[1][30], 3.0, 1e-9);
+        // a linear ts on the same time-axis is averaged, not used as is
+        tsv.emplace_back(ta_d, vector<double>{0.0, 10.0}, POINT_INSTANT_VALUE);
+        auto rl = tsv.average_values(ta_d);
+        TS_ASSERT_DELTA(rl[4][0], 5.0, 1e-9);
+    }
+
+    TEST_CASE("test_materialize_average_integral_accumulate") {
+        using namespace shyft::api;
+        calendar utc;
+        utctime t0 = utc.time(2016, 1, 1);
+        gta_t ta_h(t0, deltahours(1), 48);
+        gta_t ta_d(t0, deltahours(24), 2);
+        apoint_ts a("a");// symbolic, to verify invalidation when re-bound
+        auto avg = a.average(ta_d);
+        auto itg = a.integral(ta_d);
+        auto acc = a.accumulate(ta_d);
+        CHECK_THROWS_AS(avg.materialize(), std::runtime_error);
+        a.bind(apoint_ts(ta_h, 1.0, POINT_AVERAGE_VALUE));
+        for (auto* x : {&avg, &itg, &acc}) {
+            x->do_bind();
+            x->materialize();
+        }
+        TS_ASSERT_DELTA(avg.value(1), 1.0, 1e-9);
+        TS_ASSERT_DELTA(itg.value(1), 24*3600.0, 1e-6);
+        TS_ASSERT_DELTA(acc.value(1), 24*3600.0, 1e-6);
+        TS_ASSERT(!std::isfinite(itg.value(ta_d.size())));// out of range, not read from the kept values
+        TS_ASSERT(!std::isfinite(acc.value(ta_d.size())));
+        auto v = avg.values();
+        FAST_REQUIRE_EQ(v.size(), ta_d.size());
+        TS_ASSERT_DELTA(v[0], 1.0, 1e-9);
+        auto a2 = apoint_ts(ta_h, 2.0, POINT_AVERAGE_VALUE);
+        a.bind(a2);// re-bind, the materialized values are no longer used
+        TS_ASSERT_DELTA(avg.value(1), 2.0, 1e-9);
+        TS_ASSERT_DELTA(itg.values()[0], 2*24*3600.0, 1e-6);
+        TS_ASSERT_DELTA(acc.value(1), 2*24*3600.0, 1e-6);
+        avg.materialize();
+        a2.set(0, 26.0);// changes to the source are not seen until materialized again
+        TS_ASSERT_DELTA(avg.value(0), 2.0, 1e-9);
+        apoint_ts c("c");
+        auto c_avg = c.average(ta_d);
+        c.bind(apoint_ts(ta_h, 5.0, POINT_AVERAGE_VALUE));// binding a ts that avg does not use keeps its values
+        c_avg.materialize();
+        TS_ASSERT_DELTA(avg.value(0), 2.0, 1e-9);
+        TS_ASSERT_DELTA(c_avg.value(0), 5.0, 1e-9);
+        avg.materialize();
+        TS_ASSERT_DELTA(avg.value(0), 3.0, 1e-9);
+        auto reader = std::async(std::launch::async, [&avg]() {// values are replaced atomically by materialize
+            bool ok = true;
+            for (size_t i = 0; i < 2000; ++i) {
+                auto v = avg.values();
+                ok = ok && v.size() == 2 && std::fabs(v[0] - 3.0) < 1e-9 && std::fabs(v[1] - 2.0) < 1e-9;
+            }
+            return ok;
+        });
+        for (size_t i = 0; i < 2000; ++i)
+            avg.materialize();
+        TS_ASSERT(reader.get());
+        apoint_ts b(ta_h, 1.0, POINT_AVERAGE_VALUE);
+        b.materialize();// no effect on other ts
+        TS_ASSERT_DELTA(b.value(0), 1.0, 1e-9);
+    }
+
+    TEST_CASE("test_append_and_update_tail") {
+        using namespace shyft::api;
+        calendar utc;
+        utctime t0 = utc.time(2016, 1, 1);
+        auto dt = deltahours(1);
+        gta_t ta_d(t0, deltahours(24), 10);
+        std::mt19937 gen(7);
+        std::uniform_real_distribution<double> u(0.0, 10.0);
+        auto obs_chunk = [&](utctime t, size_t n) {
+            vector<double> v;
+            for (size_t i = 0; i < n; ++i) v.push_back(i % 7 == 3 ? shyft::nan : u(gen));// some holes
+            return apoint_ts(gta_t(t, dt, n), v, POINT_AVERAGE_VALUE);
+        };
+        for (auto fx : {POINT_AVERAGE_VALUE, POINT_INSTANT_VALUE}) {
+            apoint_ts obs = obs_chunk(t0, 30);
+            obs.set_point_interpretation(fx);
+            auto avg = obs.average(ta_d);
+            auto itg = obs.integral(ta_d);
+            auto acc = obs.accumulate(ta_d);
+            auto qac = obs.min_max_check_linear_fill(1.0, 9.0, deltahours(3));
+            vector<apoint_ts> derived{avg, itg, acc, qac};
+            for (auto& d : derived) d.materialize();
+            utctime t = obs.total_period().end;
+            for (size_t n : {1, 5, 17, 24, 48}) {
+                auto x = obs_chunk(t, n);
+                obs.append(x);
+                for (auto& d : derived) d.update_tail(t);
+                t = obs.total_period().end;
+                FAST_REQUIRE_EQ(obs.time_axis().gt, time_axis::generic_dt::FIXED);// same dt, stays fixed
+                vector<apoint_ts> fresh{obs.average(ta_d), obs.integral(ta_d), obs.accumulate(ta_d), obs.min_max_check_linear_fill(1.0, 9.0, deltahours(3))};
+                for (size_t k = 0; k < derived.size(); ++k) {
+                    auto a = derived[k].values();
+                    auto b = fresh[k].values();
+                    FAST_REQUIRE_EQ(a.size(), b.size());
+                    for (size_t i = 0; i < a.size(); ++i) {
+                        if (std::isfinite(b[i])) {
+                            TS_ASSERT_DELTA(a[i], b[i], 1e-6);
+                        } else {
+                            TS_ASSERT(!std::isfinite(a[i]));
+                        }
+                    }
+                }
+            }
+        }
+        // append with a gap, or different interval gives a point time-axis
+        apoint_ts a(gta_t(t0, dt, 2), vector<double>{1.0, 2.0}, POINT_AVERAGE_VALUE);
+        a.append(apoint_ts(gta_t(t0 + 3*dt, dt, 1), vector<double>{4.0}, POINT_AVERAGE_VALUE));
+        FAST_REQUIRE_EQ(a.time_axis().gt, time_axis::generic_dt::POINT);
+        FAST_REQUIRE_EQ(a.size(), size_t(4));
+        TS_ASSERT(!std::isfinite(a.value(2)));
+        TS_ASSERT_DELTA(a.value(3), 4.0, 1e-9);
+        FAST_CHECK_EQ(a.total_period().end, t0 + 4*dt);
+        CHECK_THROWS_AS(a.append(apoint_ts(gta_t(t0, dt, 1), 1.0, POINT_AVERAGE_VALUE)), std::runtime_error);
+        CHECK_THROWS_AS(a.average(ta_d).append(a), std::runtime_error);
+        for (size_t i = 0; i < 3; ++i)// appending to a point time-axis extends it in place
+            a.append(apoint_ts(gta_t(a.total_period().end + dt, dt, 2), 5.0, POINT_AVERAGE_VALUE));
+        FAST_REQUIRE_EQ(a.time_axis().gt, time_axis::generic_dt::POINT);
+        FAST_REQUIRE_EQ(a.size(), size_t(4 + 3*3));
+        FAST_CHECK_EQ(a.total_period().end, t0 + 13*dt);
+        TS_ASSERT(!std::isfinite(a.value(4)));
+        TS_ASSERT_DELTA(a.value(12), 5.0, 1e-9);
+        // expressions that take the time-axis of the appended ts keep the one they were built with
+        apoint_ts f(gta_t(t0, dt, 3), vector<double>{1.0, 2.0, 3.0}, POINT_AVERAGE_VALUE);
+        apoint_ts g(gta_t(t0, dt, 3), vector<double>{10.0, 20.0, 30.0}, POINT_AVERAGE_VALUE);
+        apoint_ts f_plus_g = f + g, f_plus_f = f + f, f_x2 = 2.0*f, f_abs = f.abs();
+        f.append(apoint_ts(gta_t(t0 + 3*dt, dt, 2), 4.0, POINT_AVERAGE_VALUE));
+        for (const auto& e : {f_plus_g, f_plus_f, f_x2, f_abs}) {
+            FAST_REQUIRE_EQ(e.size(), size_t(3));
+            FAST_REQUIRE_EQ(e.values().size(), e.size());
+        }
+        TS_ASSERT_DELTA(f_plus_g.values()[2], 33.0, 1e-9);
+        TS_ASSERT_DELTA(f_plus_f.values()[2], 6.0, 1e-9);
+        auto ff = (f + f).values();// rebuilt, covers the appended values
+        FAST_REQUIRE_EQ(ff.size(), size_t(5));
+        TS_ASSERT_DELTA(ff[4], 8.0, 1e-9);
+    }
+
+    TEST_CASE("test_batched_skill_scores") {
+        using namespace shyft::api;
+        calendar utc;
+        utctime t0 = utc.time(2016, 1, 1);
+        auto dt = deltahours(1);
+        const size_t n = 24*20;
+        gta_t ta(t0, dt, n);
+        std::mt19937 gen(3);
+        std::normal_distribution<double> noise(0.0, 1.0);
+        vector<double> ov;
+        for (size_t i = 0; i < n; ++i) ov.push_back(10.0 + 5.0*std::sin(i/24.0) + (i % 50 == 7 ? shyft::nan : 0.0));
+        apoint_ts obs(ta, ov, POINT_AVERAGE_VALUE);
+        vector<apoint_ts> models, observations;
+        for (size_t m = 0; m < 5; ++m) {
+            vector<double> mv;
+            for (size_t i = 0; i < n; ++i) mv.push_back(10.0 + 5.0*std::sin(i/24.0 + 0.1*m) + 0.5*noise(gen));
+            models.emplace_back(ta, mv, m % 2 ? POINT_INSTANT_VALUE : POINT_AVERAGE_VALUE);
+            observations.push_back(obs*(1.0 + 0.01*m));
+        }
+        vector<gta_t> tas{ta, gta_t(t0, deltahours(24), 10), gta_t(t0 + deltahours(24*10), deltahours(6), 40)};
+        auto ns1 = nash_sutcliffe(vector<apoint_ts>{obs}, models, tas);// one obs for all
+        auto ns = nash_sutcliffe(observations, models, tas);// one obs for each
+        auto kg = kling_gupta(observations, models, tas, 1.0, 2.0, 0.5);
+        FAST_REQUIRE_EQ(ns.size(), models.size()*tas.size());
+        FAST_REQUIRE_EQ(kg.size(), models.size()*tas.size());
+        for (size_t m = 0; m < models.size(); ++m) {
+            for (size_t k = 0; k < tas.size(); ++k) {
+                TS_ASSERT_DELTA(ns1[m*tas.size() + k], nash_sutcliffe(obs, models[m], tas[k]), 1e-9);
+                TS_ASSERT_DELTA(ns[m*tas.size() + k], nash_sutcliffe(observations[m], models[m], tas[k]), 1e-9);
+                TS_ASSERT_DELTA(kg[m*tas.size() + k], kling_gupta(observations[m], models[m], tas[k], 1.0, 2.0, 0.5), 1e-9);
+            }
+        }
+        CHECK_THROWS_AS(nash_sutcliffe(vector<apoint_ts>{obs, obs}, models, tas), std::runtime_error);
+    }
+
     TEST_CASE("test_timeshift_ts") {
         using namespace shyft;
         using namespace shyft::core;
@@ -1642,4 +1895,148 @@ TEST_SUITE("time_series") {
         }
     }
 
+    TEST_CASE("test_abin_op_ts_merge_walk") {
+        using namespace shyft::core;
+        using namespace shyft;
+        typedef api::apoint_ts ats_t;
+        calendar utc;
+        utctime t0 = utc.time(2016, 1, 1);
+        time_axis::generic_dt ta_h(t0, deltahours(1), 24*10);
+        time_axis::generic_dt ta_3h(t0 + deltahours(2), deltahours(3), 8*12);
+        time_axis::generic_dt ta_cal(make_shared<calendar>("Europe/Oslo"), t0 - deltahours(5), deltahours(24), 12);
+        vector<utctime> tp{ t0 - deltahours(1), t0 + deltaminutes(30), t0 + deltahours(7), t0 + deltahours(8), t0 + deltahours(50), t0 + deltahours(51) };
+        time_axis::generic_dt ta_p(tp, t0 + deltahours(300));
+        vector<time_axis::generic_dt> tas{ ta_h, ta_3h, ta_cal, ta_p };
+        auto make_ts = [](const time_axis::generic_dt& ta, ts_point_fx fx, double k) {
+            vector<double> v(ta.size());
+            for (size_t i = 0;i < v.size();++i)
+                v[i] = (i % 7 == 3) ? shyft::nan : k + 0.5*i + (i % 3);
+            return ats_t(ta, v, fx);
+        };
+        size_t n_checked = 0;
+        for (const auto& ta_l : tas) {
+            for (const auto& ta_r : tas) {
+                for (auto fx_l : { POINT_AVERAGE_VALUE, POINT_INSTANT_VALUE }) {
+                    for (auto fx_r : { POINT_AVERAGE_VALUE, POINT_INSTANT_VALUE }) {
+                        auto a = make_ts(ta_l, fx_l, 1.0);
+                        auto b = make_ts(ta_r, fx_r, 10.0);
+                        // terminal op terminal, terminal op expression, expression op expression
+                        vector<ats_t> exprs{ a + b, a*(b*2.0), (a - 1.0) / (b + 3.0), max(a*1.0, b*1.0) };
+                        for (const auto& e : exprs) {
+                            auto v = e.values();
+                            FAST_REQUIRE_EQ(v.size(), e.time_axis().size());
+                            for (size_t i = 0;i < v.size();++i) {
+                                double expected = e.value(i);// the value by value path
+                                if (std::isfinite(expected))
+                                    TS_ASSERT_DELTA(v[i], expected, 1e-9);
+                                else
+                                    TS_ASSERT(!std::isfinite(v[i]));
+                                ++n_checked;
+                            }
+                        }
+                    }
+                }
+            }
+        }
+        TS_ASSERT(n_checked > 1000);
+    }
+
+    TEST_CASE("test_abin_op_ts_merge_walk_speed") {
+        using namespace shyft::core;
+        using namespace shyft;
+        bool verbose = getenv("SHYFT_VERBOSE") ? true : false;
+        calendar utc;
+        utctime t0 = utc.time(2007, 1, 1);
+        size_t n_h = 10*365*24;
+        time_axis::generic_dt ta_h(t0, deltahours(1), n_h);
+        time_axis::generic_dt ta_3h(t0, deltahours(3), n_h/3);
+        api::apoint_ts obs(ta_h, 1.0, POINT_AVERAGE_VALUE);
+        api::apoint_ts fc(ta_3h, 2.0, POINT_AVERAGE_VALUE);
+        auto e = obs + fc;
+        auto t_0 = timing::now();
+        auto v = e.values();
+        auto t_1 = timing::now();
+        vector<double> vv; vv.reserve(e.time_axis().size());
+        for (size_t i = 0;i < e.time_axis().size();++i)
+            vv.push_back(e.value(i));
+        auto t_2 = timing::now();
+        if (verbose)
+            cout << "\nmerge-walk of " << n_h << " hourly + 3-hourly values: " << elapsed_us(t_0, t_1) / 1000.0
+                 << " ms, value by value: " << elapsed_us(t_1, t_2) / 1000.0 << " ms\n";
+        FAST_REQUIRE_EQ(v.size(), vv.size());
+        TS_ASSERT_DELTA(v[v.size() - 1], 3.0, 1e-12);
+        TS_ASSERT_DELTA(vv[vv.size() - 1], 3.0, 1e-12);
+    }
+
+    TEST_CASE("test_fused_expressions_and_common_subexpressions") {
+        using namespace shyft::core;
+        using namespace shyft;
+        typedef api::apoint_ts ats_t;
+        bool verbose = getenv("SHYFT_VERBOSE") ? true : false;
+        calendar utc;
+        size_t n = 5000;// more than one evaluation block
+        time_axis::generic_dt ta(utc.time(2016, 1, 1), deltahours(1), n);
+        time_axis::generic_dt ta3(utc.time(2016, 1, 1), deltahours(3), n/3);
+        vector<ats_t> src;
+        for (size_t k = 0;k < 6;++k) {
+            vector<double> v(n);
+            for (size_t i = 0;i < n;++i)
+                v[i] = (i + k) % 11 == 0 ? shyft::nan : 1.0 + k + 0.01*i;
+            src.emplace_back(ta, v, POINT_AVERAGE_VALUE);
+        }
+        auto& a = src[0]; auto& b = src[1]; auto& c = src[2]; auto& d = src[3];
+        auto ab = a + b;// shared by identity
+        vector<ats_t> tsv{
+            (a + b)*0.5 - c,
+            ab*2.0,
+            ab/3.0 + (a + b),// (a+b) equal to ab by structure
+            2.0 - max(ab, c)/d,
+            max(min(c, 4.0), 3.0)*(1.0/(d + 1.0)),
+            a + ats_t(ta3, 1.0, POINT_AVERAGE_VALUE)*b,// different time-axis, merge-walk inside the chain
+            ab,
+            src[4],
+        };
+        // reference: the value by value path, that does not use .values() of the nodes
+        auto tsv2 = api::deflate_ts_vector<api::gts_t>(tsv);
+        FAST_REQUIRE_EQ(tsv2.size(), tsv.size());
+        for (size_t j = 0;j < tsv.size();++j) {
+            auto v = tsv[j].values();
+            FAST_REQUIRE_EQ(v.size(), tsv[j].time_axis().size());
+            FAST_REQUIRE_EQ(tsv2[j].size(), v.size());
+            for (size_t i = 0;i < v.size();++i) {
+                double e = tsv[j].value(i);
+                if (std::isfinite(e)) {
+                    TS_ASSERT_DELTA(v[i], e, 1e-9);
+                    TS_ASSERT_DELTA(tsv2[j].value(i), e, 1e-9);
+                } else {
+                    TS_ASSERT(!std::isfinite(v[i]));
+                    TS_ASSERT(!std::isfinite(tsv2[j].value(i)));
+                }
+            }
+        }
+        // dashboard like case: many overlapping sums of the same terminals
+        size_t n_sums = 400;
+        vector<ats_t> sums;
+        for (size_t k = 0;k < n_sums;++k) {
+            ats_t s = src[0] + src[1];
+            for (size_t j = 2;j < 2 + k % 4;++j)
+                s = s + src[j];
+            sums.push_back(s*(1.0 + k));
+        }
+        auto t0 = timing::now();
+        auto r = api::deflate_ts_vector_values(sums);
+        auto t1 = timing::now();
+        vector<vector<double>> r2;
+        for (const auto& s : sums)
+            r2.push_back(s.values());
+        auto t2 = timing::now();
+        if (verbose)
+            cout << "\ndeflate " << n_sums << " overlapping sums: " << elapsed_us(t0, t1) / 1000.0
+                 << " ms, one by one: " << elapsed_us(t1, t2) / 1000.0 << " ms\n";
+        for (size_t k = 0;k < n_sums;++k)
+            for (size_t i = 0;i < n;i += 97)
+                if (std::isfinite(r2[k][i]))
+                    TS_ASSERT_DELTA(r[k][i], r2[k][i], 1e-9);
+    }
+
 }
@@ -1,5 +1,6 @@
 #include "test_pch.h"
 #include "core/utctime_utilities.h"
+#include <random>
 
 using namespace std;
 using namespace shyft;
@@ -364,4 +365,41 @@ TEST_CASE("calendar_iso_week") {
             FAST_CHECK_EQ(c.time(2015, 1, 1 + d, 0, 0, 0), c.time(YWdhms(2015, 1, 4 + d, 0, 0, 0)));
     }
 }
+TEST_CASE("calendar_memo_and_fast_paths") {
+    calendar osl("Europe/Oslo");
+    calendar osl2("Europe/Oslo");
+    FAST_CHECK_EQ(osl.tz_info.get(), osl2.tz_info.get()); // tz_info is shared pr. region
+    CHECK_THROWS_AS(calendar("Europe/Nowhere"), std::runtime_error);
+
+    std::mt19937 gen(42);
+    std::uniform_int_distribution<utctime> rnd(calendar().time(1850, 1, 1), calendar().time(2250, 1, 1));
+    for (size_t i = 0; i < 20000; ++i) {
+        utctime t = rnd(gen);
+        FAST_REQUIRE_EQ(calendar::utc_year(t), calendar::from_day_number(calendar::day_number(t)).year);
+        auto c = osl.calendar_units(t);
+        auto x = calendar::from_day_number(calendar::day_number(t + osl.tz_info->utc_offset(t)));
+        FAST_REQUIRE_EQ(c.year, x.year);
+        FAST_REQUIRE_EQ(c.month, x.month);
+        FAST_REQUIRE_EQ(c.day, x.day);
+        c.hour = c.minute = c.second = 0;
+        FAST_REQUIRE_EQ(osl.trim(t, calendar::DAY), osl.time(c));
+    }
+    // year boundaries
+    calendar utc;
+    for (int y = 1899; y < 2202; ++y) {
+        utctime t = utc.time(y, 1, 1);
+        FAST_REQUIRE_EQ(calendar::utc_year(t), y);
+        FAST_REQUIRE_EQ(calendar::utc_year(t - 1), y - 1);
+    }
+    // sequential daily steps over 30 years, compared with the calendar coordinates
+    utctime t0 = osl.time(1990, 1, 1);
+    const size_t n = 365 * 30 + 7;
+    for (size_t i = 0; i < n; ++i) {
+        utctime t = osl.add(t0, calendar::DAY, long(i));
+        auto c = osl.calendar_units(t);
+        FAST_REQUIRE_EQ(c.hour, 0);
+        FAST_REQUIRE_EQ(osl.diff_units(t0, t, calendar::DAY), utctimespan(i));
+        FAST_REQUIRE_EQ(osl.trim(t + deltahours(c.day % 23), calendar::DAY), t);
+    }
+}
 }